@@ -0,0 +1,95 @@
+"""
+Per-request cost of the API server's AgentStore as the number of cached users grows.
+
+The previous store scanned every entry for expired ones on each get/set and
+sorted the whole LRU map to evict; the current one keeps entries in access
+order and only looks at the front.
+
+Usage:
+    python benchmarks/bench_agent_store.py
+    python benchmarks/bench_agent_store.py --sizes 100 1000 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.api_server import AgentStore  # noqa: E402
+
+
+class ScanningAgentStore:
+    """The previous AgentStore: full scan per access, sort per eviction"""
+
+    def __init__(self, ttl_seconds=3600, max_size=500):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries = {}
+        self._lru = {}
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [
+            user_id
+            for user_id, meta in self._entries.items()
+            if now - meta["last_access"] > self.ttl_seconds
+        ]
+        for user_id in expired:
+            self._entries.pop(user_id, None)
+            self._lru.pop(user_id, None)
+
+    def get(self, user_id):
+        self._purge_expired()
+        if user_id not in self._entries:
+            return None
+        meta = self._entries[user_id]
+        meta["last_access"] = time.time()
+        self._lru[user_id] = meta["last_access"]
+        return meta["agent"]
+
+    def set(self, user_id, agent):
+        now = time.time()
+        self._entries[user_id] = {"agent": agent, "created_at": now, "last_access": now}
+        self._lru[user_id] = now
+        self._purge_expired()
+        if len(self._entries) > self.max_size:
+            to_remove = sorted(self._lru.items(), key=lambda item: item[1])[
+                : len(self._entries) - self.max_size
+            ]
+            for remove_id, _ in to_remove:
+                self._entries.pop(remove_id, None)
+                self._lru.pop(remove_id, None)
+
+
+def workload(store, users, requests, seed=0):
+    """Mostly returning users, some new ones that force evictions"""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(requests):
+        user_id = f"user{rng.randrange(users * 2)}"
+        if store.get(user_id) is None:
+            store.set(user_id, object())
+    return (time.perf_counter() - start) * 1e6 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, mean us/request")
+    print(f"{'users':>6} | {'scanning':>9} | {'ordered':>8}")
+    print("-" * 30)
+    for users in args.sizes:
+        old = workload(ScanningAgentStore(max_size=users), users, args.requests)
+        new_store = AgentStore(max_size=users, on_evict=lambda user_id, agent: None)
+        new = workload(new_store, users, args.requests)
+        print(f"{users:>6} | {old:>9.1f} | {new:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
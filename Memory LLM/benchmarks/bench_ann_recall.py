@@ -0,0 +1,83 @@
+"""
+Recall@k vs. latency of the IVF index against exact search in NumpyVectorStore.
+
+Vectors come from a low-rank latent space plus noise. Like real sentence
+embeddings they have no clean cluster structure, so neighbours straddle cell
+boundaries. (Well-separated clusters give near-perfect recall at any nprobe
+and say nothing.) Recall@k is the overlap between the IVF top-k and the exact
+top-k, averaged over the queries.
+
+Usage:
+    python benchmarks/bench_ann_recall.py
+    python benchmarks/bench_ann_recall.py --rows 1000000 --nprobe 4 8 16 32 64
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.vector_store import NumpyVectorStore  # noqa: E402
+
+
+def latent(rng, n, basis, noise=0.5):
+    codes = rng.normal(size=(n, basis.shape[0]))
+    return (codes @ basis + noise * rng.normal(size=(n, basis.shape[1]))).astype(np.float32)
+
+
+def run_queries(store, queries, limit, nprobe=None):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        hits = store.search_by_vector(query, limit=limit, nprobe=nprobe)
+        results.append({hit["id"] for hit in hits})
+    return results, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--rank", type=int, default=32, help="latent dimensions")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None, help="default: sqrt(rows)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(args.rank, args.dim))
+    vectors = latent(rng, args.rows, basis)
+    queries = latent(rng, args.queries, basis)
+    docs = [{"id": str(i), "text": "", "metadata": {}} for i in range(args.rows)]
+
+    exact = NumpyVectorStore(embedding_function=lambda texts: [])
+    exact.add_embeddings(docs, vectors)
+    truth, exact_ms = run_queries(exact, queries, args.limit)
+
+    ivf = NumpyVectorStore(embedding_function=lambda texts: [], index="ivf", nlist=args.nlist)
+    ivf.IVF_MIN_ROWS = 0
+    start = time.perf_counter()
+    ivf.add_embeddings(docs, vectors)
+    ivf.wait_for_index()  # Cells are trained in the background
+    build_s = time.perf_counter() - start
+    nlist = ivf.get_stats()["ivf"]["nlist"]
+
+    print(f"{args.rows} rows, dim={args.dim}, nlist={nlist}, built in {build_s:.1f}s")
+    print(f"{'search':>12} | {'recall@' + str(args.limit):>9} | {'ms/query':>9} | {'speedup':>7}")
+    print("-" * 47)
+    print(f"{'exact':>12} | {1.0:>9.3f} | {exact_ms:>9.2f} | {1.0:>6.1f}x")
+    for nprobe in args.nprobe:
+        found, ms = run_queries(ivf, queries, args.limit, nprobe=nprobe)
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(
+            f"{'nprobe=' + str(nprobe):>12} | {recall:>9.3f} | {ms:>9.2f} | {exact_ms / ms:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+API throughput with 1, 2, 4... worker processes behind the user-sticky router.
+
+Starts ``python -m mem_llm.api_cluster`` for each worker count in a scratch
+directory, warms every user's session, then has concurrent clients send
+authenticated memory-search requests for many users (every request goes
+through the shared SQLite key and rate-limit store). No LLM is needed. Expect
+scaling only up to the number of CPU cores; the router is one process.
+
+Usage:
+    python benchmarks/bench_api_workers.py
+    python benchmarks/bench_api_workers.py --workers 1 2 4 8 --requests 4000
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+API_KEY = "bench-api-key"
+
+
+def wait_for_port(port, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def load(port, users, requests, concurrency):
+    url = f"http://127.0.0.1:{port}/api/v1/memory/search"
+    headers = {"X-API-Key": API_KEY}
+    async with aiohttp.ClientSession(headers=headers) as session:
+
+        async def search(i):
+            payload = {"user_id": f"user{i % users}", "query": "hello", "limit": 5}
+            async with session.post(url, json=payload) as response:
+                assert response.status == 200, await response.text()
+                await response.read()
+
+        # Warm-up: create each user's session on its worker
+        await asyncio.gather(*(search(i) for i in range(users)))
+
+        queue = iter(range(requests))
+
+        async def client():
+            for i in queue:
+                await search(i)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - start)
+
+
+def run(workers, port, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, MEM_LLM_API_KEY=API_KEY, MEM_LLM_RATE_LIMIT="100000000")
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "mem_llm.api_cluster",
+                "--workers",
+                str(workers),
+                "--port",
+                str(port),
+                "--host",
+                "127.0.0.1",
+            ],
+            cwd=tmp,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port)
+            return asyncio.run(load(port, args.users, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--port", type=int, default=18800)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU cores, {args.requests} requests, {args.concurrency} clients")
+    print(f"{'workers':>7} | {'req/s':>8} | {'speedup':>7}")
+    print("-" * 30)
+    baseline = None
+    for workers in args.workers:
+        # A fresh port range per run: worker ports are port + 1 .. port + workers
+        rate = run(workers, args.port, args)
+        args.port += workers + 1
+        baseline = baseline or rate
+        print(f"{workers:>7} | {rate:>8.0f} | {rate / baseline:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
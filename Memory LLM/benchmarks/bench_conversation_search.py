@@ -0,0 +1,109 @@
+"""
+Conversation recall latency as one user's history grows.
+
+Compares the old unbounded `LIKE '%kw%'` scan (every matching row returned,
+callers slice afterwards) with `search_conversations(..., ranked=True)`, which
+ranks through the conversations FTS5 index and pushes the LIMIT into SQLite.
+History is bulk
+loaded through the normal insert triggers, so the index is built the same way
+it would be in production.
+
+Usage:
+    python benchmarks/bench_conversation_search.py
+    python benchmarks/bench_conversation_search.py --checkpoints 1000 10000 100000 300000
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory_db import SQLMemoryManager  # noqa: E402
+
+TOPICS = ["invoice", "shipping", "password", "refund", "upgrade", "warranty", "coupon", "login"]
+FILLER = "thanks for the quick reply, that makes sense and I will try it later today"
+
+
+def grow(db, user_id, count, rng):
+    rows = [
+        (
+            user_id,
+            f"question about my {rng.choice(TOPICS)}: {FILLER}",
+            f"here is how the {rng.choice(TOPICS)} process works: {FILLER}",
+            "{}",
+        )
+        for _ in range(count)
+    ]
+    db.conn.execute("BEGIN")
+    db.conn.executemany(
+        "INSERT INTO conversations (user_id, user_message, bot_response, metadata) "
+        "VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    db.conn.execute("COMMIT")
+
+
+def like_scan(db, user_id, keyword, limit):
+    """The pre-FTS query: unbounded LIKE scan, sliced by the caller."""
+    rows = db.conn.execute(
+        """
+        SELECT timestamp, user_message, bot_response, metadata, resolved
+        FROM conversations
+        WHERE user_id = ?
+        AND (user_message LIKE ? OR bot_response LIKE ? OR metadata LIKE ?)
+        ORDER BY timestamp DESC
+    """,
+        (user_id, f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"),
+    ).fetchall()
+    return [dict(row) for row in rows][:limit]
+
+
+def timed(fn, repeat):
+    fn()  # warm the page cache
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--query", default="refund warranty")
+    parser.add_argument("--limit", type=int, default=3, help="recall limit (MemoryRouter uses 3)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    workdir = tempfile.mkdtemp(prefix="mem_llm_bench_")
+    try:
+        db = SQLMemoryManager(db_path=str(Path(workdir) / "bench.db"))
+        # Other tenants share the table; recall must not pay for their rows.
+        grow(db, "neighbour", 20000, rng)
+
+        print(f"query={args.query!r} limit={args.limit}; mean ms per search")
+        header = f"{'history':>10} | {'LIKE scan':>10} | {'FTS5 BM25':>10}"
+        print(header)
+        print("-" * len(header))
+        size = 0
+        for checkpoint in args.checkpoints:
+            grow(db, "alice", checkpoint - size, rng)
+            size = checkpoint
+            like_ms = timed(lambda: like_scan(db, "alice", args.query, args.limit), args.repeat)
+            fts_ms = timed(
+                lambda: db.search_conversations("alice", args.query, limit=args.limit, ranked=True),
+                args.repeat,
+            )
+            print(f"{checkpoint:>10} | {like_ms:>10.2f} | {fts_ms:>10.2f}")
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
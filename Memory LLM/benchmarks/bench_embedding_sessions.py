@@ -0,0 +1,101 @@
+"""
+Resident memory and first-request latency of embedding models across sessions.
+
+Simulates the API server creating one vector store per user session. In the
+"per-session" mode every session loads its own SentenceTransformer (the old
+behaviour); in the "shared" mode sessions get the process-wide EmbeddingService.
+Each session then embeds one query, timed from session creation. The two modes
+run in separate processes so their memory does not mix.
+
+Needs sentence-transformers (pip install mem-llm[vector]).
+
+Usage:
+    python benchmarks/bench_embedding_sessions.py
+    python benchmarks/bench_embedding_sessions.py --sessions 200 --model all-mpnet-base-v2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+QUERY = "How do I reset my password on the mobile app?"
+
+
+def rss_mb():
+    """Current resident set size in MB (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, sessions, model_name):
+    from mem_llm.embedding_service import EmbeddingService, get_embedding_service
+
+    baseline = rss_mb()
+    latencies = []
+    keep_alive = []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        if mode == "shared":
+            service = get_embedding_service(model_name)
+        else:
+            service = EmbeddingService(model_name)
+        service.encode(QUERY)
+        latencies.append((time.perf_counter() - start) * 1000)
+        keep_alive.append(service)
+
+    latencies.sort()
+    return {
+        "rss_mb": rss_mb() - baseline,
+        "p50_ms": latencies[len(latencies) // 2],
+        "max_ms": latencies[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--mode", choices=["per-session", "shared"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.sessions, args.model)))
+        return
+
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        sys.exit("sentence-transformers is required: pip install sentence-transformers")
+
+    print(f"{args.sessions} sessions, model={args.model}")
+    print(f"{'mode':>12} | {'RSS growth MB':>13} | {'p50 ms':>8} | {'max ms':>8}")
+    print("-" * 52)
+    for mode in ("per-session", "shared"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--sessions", str(args.sessions)]
+            + ["--model", args.model],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(
+            f"{mode:>12} | {result['rss_mb']:>13.0f} | "
+            f"{result['p50_ms']:>8.1f} | {result['max_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
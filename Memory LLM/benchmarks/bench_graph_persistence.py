@@ -0,0 +1,74 @@
+"""
+Per-turn save and startup cost of the JSON GraphStore vs. SQLiteGraphStore.
+
+Builds graphs of growing size, then times one "turn" (two new triplets plus
+save()) and reopening the store followed by a lookup. The JSON store rewrites
+the whole node-link document on every save and parses it on startup; the
+SQLite store upserts only the changed edges and loads entities on demand.
+
+Usage:
+    python benchmarks/bench_graph_persistence.py
+    python benchmarks/bench_graph_persistence.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory.graph import GraphStore, SQLiteGraphStore  # noqa: E402
+
+
+def build(store, edges):
+    for i in range(edges):
+        store.add_triplet(f"entity{i % (edges // 3 + 1)}", "related_to", f"entity{i}")
+    store.save()
+
+
+def measure(factory, path, edges, turns):
+    store = factory(path)
+    build(store, edges)
+
+    start = time.perf_counter()
+    for turn in range(turns):
+        store.add_triplet("User", "mentioned", f"topic{turn}")
+        store.add_triplet(f"topic{turn}", "related_to", "entity1")
+        store.save()
+    save_ms = (time.perf_counter() - start) * 1000 / turns
+    store.close()
+
+    start = time.perf_counter()
+    reopened = factory(path)
+    reopened.search("entity1")
+    startup_ms = (time.perf_counter() - start) * 1000
+    reopened.close()
+    return save_ms, startup_ms, os.path.getsize(path) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    stores = {
+        "json": (GraphStore, "graph.json"),
+        "sqlite": (SQLiteGraphStore, "graph.db"),
+    }
+    print(f"{'edges':>7} | {'store':>6} | {'save ms/turn':>12} | {'startup ms':>10} | {'MB':>6}")
+    print("-" * 56)
+    for edges in args.sizes:
+        for name, (factory, filename) in stores.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                save_ms, startup_ms, size = measure(
+                    factory, os.path.join(tmp, filename), edges, args.turns
+                )
+            print(f"{edges:>7} | {name:>6} | {save_ms:>12.2f} | {startup_ms:>10.1f} | {size:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
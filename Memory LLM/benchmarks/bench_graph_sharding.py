@@ -0,0 +1,72 @@
+"""
+Per-user graph lookup cost as the number of tenants grows.
+
+Every user states the same kinds of facts ("User lives_in City", ...). With
+one process-wide graph the shared "User" node collects every tenant's edges,
+so a single user's lookup walks all of them; with ShardedGraphStore the user's
+lookup only sees that user's shard.
+
+Usage:
+    python benchmarks/bench_graph_sharding.py
+    python benchmarks/bench_graph_sharding.py --users 10 100 1000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory.graph import ShardedGraphStore, SQLiteGraphStore  # noqa: E402
+
+FACTS = [("lives_in", "City"), ("likes", "Topic"), ("works_at", "Company"), ("knows", "Friend")]
+
+
+def facts(user, per_user):
+    for i in range(per_user):
+        relation, kind = FACTS[i % len(FACTS)]
+        yield "User", relation, f"{kind}{user}_{i}"
+
+
+def timed(call, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--facts", type=int, default=20, help="triplets per user")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.facts} facts per user, mean ms per lookup of one user's 'User' node")
+    print(f"{'users':>6} | {'single graph':>12} | {'sharded':>8}")
+    print("-" * 33)
+    for users in args.users:
+        with tempfile.TemporaryDirectory() as tmp:
+            single = SQLiteGraphStore(os.path.join(tmp, "graph.db"))
+            sharded = ShardedGraphStore(os.path.join(tmp, "shards"), max_open_shards=users)
+            for user in range(users):
+                shard = sharded.shard(f"user{user}")
+                for source, relation, target in facts(user, args.facts):
+                    meta = {"user_id": f"user{user}"}
+                    single.add_triplet(source, relation, target, metadata=meta)
+                    shard.add_triplet(source, relation, target, metadata=meta)
+            single.save()
+            sharded.save()
+
+            old = timed(lambda: single.search_many(["User"]), args.repeat)
+            new = timed(lambda: sharded.shard("user0").search_many(["User"]), args.repeat)
+            print(f"{users:>6} | {old:>12.3f} | {new:>8.3f}")
+            single.close()
+            sharded.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Latency of "what is true now" graph lookups as the knowledge graph grows.
+
+Compares the previous per-token lookup (an undirected ego graph per query
+entity, then datetime.fromisoformat on every edge's validity) with
+GraphStore.search_many, which walks the adjacency directly, checks cached
+numeric validity intervals and answers every token of a query in one call
+(what MemoryRouter does per turn).
+
+Usage:
+    python benchmarks/bench_graph_temporal_search.py
+    python benchmarks/bench_graph_temporal_search.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import networkx as nx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory.graph import GraphStore  # noqa: E402
+
+QUERY = "Where does entity12 live and what does entity345 think about entity6789 now?"
+
+
+def build(edges, seed=0):
+    rng = random.Random(seed)
+    store = GraphStore()
+    entities = max(10, edges // 4)
+    for i in range(edges):
+        year = rng.randint(2020, 2026)
+        store.add_triplet(
+            f"entity{rng.randrange(entities)}",
+            rng.choice(["knows", "lives_in", "likes", "works_at"]),
+            f"entity{rng.randrange(entities)}",
+            metadata={"valid_from": f"{year}-01-01", "supersedes": i % 3 == 0},
+        )
+    return store
+
+
+def ego_graph_search(store, entity, at_time):
+    """The previous _search_temporal: ego graph plus per-edge datetime parsing"""
+    if entity not in store.graph:
+        return []
+    triplets = []
+    subgraph = nx.ego_graph(store.graph, entity, radius=1, undirected=True)
+    for u, v, data in subgraph.edges(data=True):
+        valid_from = store._parse_dt(data.get("valid_from") or data.get("created_at"))
+        valid_to = store._parse_dt(data.get("valid_to"))
+        if valid_from and valid_from > at_time:
+            continue
+        if valid_to and valid_to <= at_time:
+            continue
+        triplets.append((u, data.get("relation", "related_to"), v))
+    return triplets
+
+
+def per_token(store, tokens, at_time):
+    return {token: ego_graph_search(store, token, at_time) for token in tokens}
+
+
+def batched(store, tokens, at_time):
+    return store.search_many(tokens, at_time=at_time)
+
+
+def timed(call, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tokens = [t.strip("?") for t in QUERY.split() if len(t) >= 3]
+    now = datetime.now()
+    print(f"{len(tokens)} query tokens per lookup, mean ms/query")
+    print(f"{'edges':>7} | {'per-token ego graph':>19} | {'search_many':>11}")
+    print("-" * 44)
+    for edges in args.sizes:
+        store = build(edges)
+        assert {k: sorted(v) for k, v in per_token(store, tokens, now).items()} == {
+            k: sorted(v) for k, v in batched(store, tokens, now).items()
+        }
+        old = timed(lambda: per_token(store, tokens, now), args.repeat)
+        new = timed(lambda: batched(store, tokens, now), args.repeat)
+        print(f"{edges:>7} | {old:>19.2f} | {new:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
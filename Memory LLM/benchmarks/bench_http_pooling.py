@@ -0,0 +1,95 @@
+"""
+Per-request overhead of bare requests calls vs. the pooled backend session.
+
+A local stub speaks the Ollama /api/chat protocol and answers instantly, so
+the numbers are pure client and connection cost: a bare requests.post opens
+a new TCP connection per call, the shared session keeps connections alive.
+Also runs OllamaClient.chat end to end, and a concurrent mode where several
+threads (agents) share one backend.
+
+Usage:
+    python benchmarks/bench_http_pooling.py
+    python benchmarks/bench_http_pooling.py --requests 5000 --threads 16
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.base_llm_client import get_http_session  # noqa: E402
+from mem_llm.clients import OllamaClient  # noqa: E402
+
+REPLY = json.dumps({"message": {"content": "ok"}, "done": True}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    wbufsize = -1  # one write per response; split writes stall on delayed ACKs
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(call, count, threads):
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(count):
+            call()
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda _: call(), range(count)))
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    url = f"{base_url}/api/chat"
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "hi"}]}
+
+    session = get_http_session(base_url)
+    client = OllamaClient(model="stub", base_url=base_url)
+    messages = payload["messages"]
+    cases = {
+        "requests.post": lambda: requests.post(url, json=payload, timeout=10),
+        "pooled session": lambda: session.post(url, json=payload, timeout=10),
+        "OllamaClient.chat": lambda: client.chat(messages),
+    }
+
+    print(f"{args.requests} requests against a local stub, mean ms/request")
+    print(f"{'call':>18} | {'1 thread':>9} | {str(args.threads) + ' threads':>10}")
+    print("-" * 43)
+    for name, call in cases.items():
+        serial = timed(call, args.requests, 1)
+        parallel = timed(call, args.requests, args.threads)
+        print(f"{name:>18} | {serial:>9.3f} | {parallel:>10.3f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Per-turn write cost of the JSON memory backends as history grows.
+
+MemoryManager rewrites the user's whole file on every turn, so each write
+gets slower as history grows. SegmentedMemoryManager appends one JSONL record,
+so its per-turn cost should stay flat.
+
+Usage:
+    python benchmarks/bench_json_memory_writes.py
+    python benchmarks/bench_json_memory_writes.py --checkpoints 0 1000 5000 10000 --sample 50
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory_manager import MemoryManager  # noqa: E402
+from mem_llm.segmented_memory import SegmentedMemoryManager  # noqa: E402
+
+MESSAGE = "How do I reset my password on the mobile app? " * 3
+RESPONSE = "Open Settings > Account > Security and tap 'Reset password'. " * 4
+
+
+def measure(memory, checkpoints, sample):
+    """Return {history_size: mean ms per add_interaction} for one backend."""
+    results = {}
+    written = 0
+    for checkpoint in checkpoints:
+        # Grow history up to the checkpoint (not timed).
+        while written < checkpoint:
+            memory.add_interaction("bench", MESSAGE, RESPONSE)
+            written += 1
+
+        start = time.perf_counter()
+        for _ in range(sample):
+            memory.add_interaction("bench", MESSAGE, RESPONSE)
+        results[checkpoint] = (time.perf_counter() - start) * 1000 / sample
+        written += sample
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[0, 1000, 2500, 5000])
+    parser.add_argument("--sample", type=int, default=50, help="timed writes per checkpoint")
+    args = parser.parse_args()
+
+    backends = {
+        "MemoryManager (rewrite)": MemoryManager,
+        "SegmentedMemoryManager": SegmentedMemoryManager,
+    }
+
+    table = {}
+    for name, cls in backends.items():
+        workdir = tempfile.mkdtemp(prefix="mem_llm_bench_")
+        try:
+            memory = cls(workdir)
+            table[name] = measure(memory, args.checkpoints, args.sample)
+            if hasattr(memory, "close"):
+                memory.close()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    header = f"{'history':>10} | " + " | ".join(f"{name:>26}" for name in table)
+    print("Mean add_interaction latency (ms/turn)")
+    print(header)
+    print("-" * len(header))
+    for checkpoint in args.checkpoints:
+        row = " | ".join(f"{table[name][checkpoint]:>26.3f}" for name in table)
+        print(f"{checkpoint:>10} | {row}")
+
+
+if __name__ == "__main__":
+    main()
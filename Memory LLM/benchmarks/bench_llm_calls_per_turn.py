@@ -0,0 +1,94 @@
+"""
+LLM calls and backend latency per turn, combined vs. separate memory extraction.
+
+With graph and hierarchical memory enabled, every turn used to make three LLM
+calls: the chat reply, GraphExtractor.extract and AutoCategorizer.categorize.
+The combined MemoryExtractor folds both extraction calls (plus profile facts)
+into one. A stub LLM answers instantly after a simulated backend latency, so
+the wall time reflects how many round trips each turn makes.
+
+Usage:
+    python benchmarks/bench_llm_calls_per_turn.py
+    python benchmarks/bench_llm_calls_per_turn.py --turns 50 --latency 0.2
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm import MemAgent  # noqa: E402
+
+EXTRACTION = {
+    "triplets": [["User", "lives_in", "Izmir"]],
+    "category": "travel_planning",
+    "domain": "lifestyle",
+    "profile": {"location": "Izmir"},
+}
+
+
+class StubLLM:
+    """Answers every prompt after a fixed delay and counts the calls."""
+
+    model = "stub"
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def chat(self, messages, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        if "return ONLY one JSON object" in prompt:
+            return json.dumps(EXTRACTION)
+        if "triplet" in prompt.lower():
+            return json.dumps(EXTRACTION["triplets"])
+        if "category" in prompt.lower():
+            return json.dumps({"category": "travel_planning", "domain": "lifestyle"})
+        return "Sounds like a great trip!"
+
+
+def run(combined, turns, latency):
+    with tempfile.TemporaryDirectory() as tmp:
+        agent = MemAgent(
+            use_sql=True,
+            db_path=str(Path(tmp) / "agent.db"),
+            check_connection=False,
+            enable_hierarchical_memory=True,
+            enable_graph_memory=True,
+        )
+        if not (agent.hierarchical_memory and agent.graph_store):
+            sys.exit("graph/hierarchical memory unavailable (install networkx)")
+        agent.combined_extraction = combined
+        agent.llm = agent.hierarchical_memory.categorizer.llm = StubLLM(latency)
+
+        start = time.perf_counter()
+        for turn in range(turns):
+            agent.chat(f"I live in Izmir and plan trip number {turn}", user_id="bench")
+        elapsed = time.perf_counter() - start
+        calls = agent.llm.calls
+        agent.close()
+    return calls / turns, elapsed * 1000 / turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per LLM call")
+    args = parser.parse_args()
+
+    print(f"{args.turns} turns, {args.latency * 1000:.0f} ms simulated backend latency")
+    print(f"{'extraction':>10} | {'LLM calls/turn':>14} | {'ms/turn':>8}")
+    print("-" * 38)
+    for name, combined in (("separate", False), ("combined", True)):
+        calls, ms = run(combined, args.turns, args.latency)
+        print(f"{name:>10} | {calls:>14.1f} | {ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
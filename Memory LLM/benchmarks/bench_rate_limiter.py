@@ -0,0 +1,100 @@
+"""
+Cost per rate-limit check and memory per key: timestamp list vs. token bucket.
+
+The previous limiter kept every request time of the window in a list and
+rebuilt it on each check (and again for the remaining count); APIKeyStore now
+keeps a two-number token bucket per key behind a lock.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py
+    python benchmarks/bench_rate_limiter.py --limits 60 1000 10000 100000
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mem_llm.api_auth as api_auth  # noqa: E402
+
+
+@dataclass
+class RateLimitInfo:
+    requests: List[float] = field(default_factory=list)
+    blocked_until: Optional[float] = None
+
+
+class ListLimiter:
+    """The previous APIKeyStore.check_rate_limit"""
+
+    def __init__(self, limit, window=60):
+        self.limit = limit
+        self.window = window
+        self._rate_limits = {}
+
+    def check_rate_limit(self, api_key):
+        hashed = hashlib.sha256(api_key.encode()).hexdigest()
+        now = time.time()
+        if hashed not in self._rate_limits:
+            self._rate_limits[hashed] = RateLimitInfo()
+        info = self._rate_limits[hashed]
+        if info.blocked_until and now < info.blocked_until:
+            return False
+        info.requests = [t for t in info.requests if now - t < self.window]
+        if len(info.requests) >= self.limit:
+            info.blocked_until = now + self.window
+            return False
+        info.requests.append(now)
+        return True
+
+
+def timed(store, key, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        store.check_rate_limit(key)
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def key_memory(factory, key, calls):
+    tracemalloc.start()
+    store = factory()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(calls):
+        store.check_rate_limit(key)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limits", type=int, nargs="+", default=[60, 1000, 10000])
+    args = parser.parse_args()
+
+    key = "bench-key"
+    print("checks up to the limit within one window")
+    print(f"{'limit':>6} | {'list us':>8} | {'bucket us':>9} | {'list KB':>8} | {'bucket KB':>9}")
+    print("-" * 52)
+    for limit in args.limits:
+        api_auth.RATE_LIMIT_REQUESTS = limit
+
+        def bucket_store():
+            store = api_auth.APIKeyStore()
+            store.add_key(key, "bench")
+            return store
+
+        old = timed(ListLimiter(limit), key, limit)
+        new = timed(bucket_store(), key, limit)
+        old_kb = key_memory(lambda: ListLimiter(limit), key, limit)
+        new_kb = key_memory(bucket_store, key, limit)
+        print(f"{limit:>6} | {old:>8.2f} | {new:>9.2f} | {old_kb:>8.1f} | {new_kb:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
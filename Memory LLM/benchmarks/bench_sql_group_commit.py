@@ -0,0 +1,87 @@
+"""
+Committed turns/sec for SQLMemoryManager with and without write-behind.
+
+Each simulated user runs on its own thread and records turns back to back.
+The timer stops only after every turn is committed (flush), so the two modes
+are compared on durable throughput, not on enqueue speed.
+
+Usage:
+    python benchmarks/bench_sql_group_commit.py
+    python benchmarks/bench_sql_group_commit.py --users 32 --turns 200 --synchronous FULL
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory_db import SQLMemoryManager  # noqa: E402
+
+MESSAGE = "Where is my order? It was supposed to arrive yesterday."
+RESPONSE = "Your order shipped on Monday and is out for delivery today."
+
+
+def run(users, turns, synchronous, **kwargs):
+    workdir = tempfile.mkdtemp(prefix="mem_llm_bench_")
+    try:
+        db = SQLMemoryManager(db_path=str(Path(workdir) / "bench.db"), **kwargs)
+        db.conn.execute(f"PRAGMA synchronous={synchronous}")
+        if db._writer_conn is not None:
+            db._writer_conn.execute(f"PRAGMA synchronous={synchronous}")
+
+        barrier = threading.Barrier(users + 1)
+
+        def worker(n):
+            barrier.wait()
+            for _ in range(turns):
+                db.add_interaction(f"user{n}", MESSAGE, RESPONSE, {"order": n})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(users)]
+        for t in threads:
+            t.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for t in threads:
+            t.join()
+        db.flush()
+        elapsed = time.perf_counter() - start
+
+        committed = db.get_statistics()["total_interactions"]
+        db.close()
+        return committed, elapsed
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=32)
+    parser.add_argument("--turns", type=int, default=100, help="turns per user")
+    parser.add_argument(
+        "--synchronous",
+        default="NORMAL",
+        choices=["OFF", "NORMAL", "FULL"],
+        help="SQLite synchronous pragma (FULL fsyncs every commit)",
+    )
+    args = parser.parse_args()
+
+    modes = {
+        "direct (one txn per turn)": {},
+        "write-behind (group commit)": {"write_behind": True},
+    }
+
+    print(f"{args.users} users x {args.turns} turns, synchronous={args.synchronous}")
+    print(f"{'mode':>30} | {'committed':>9} | {'seconds':>8} | {'turns/sec':>10}")
+    print("-" * 67)
+    for name, kwargs in modes.items():
+        committed, elapsed = run(args.users, args.turns, args.synchronous, **kwargs)
+        print(f"{name:>30} | {committed:>9} | {elapsed:>8.2f} | {committed / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
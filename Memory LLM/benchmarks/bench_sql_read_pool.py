@@ -0,0 +1,111 @@
+"""
+Read latency of SQLMemoryManager under a concurrent write load.
+
+Reader threads issue the queries a chat turn makes (recent history, profile,
+knowledge search) while writer threads record turns as fast as they can. With
+the read pool disabled every read queues behind the write lock, so read
+latency tracks the write rate; with the pool, WAL readers run alongside the
+writer and latency should stay close to the no-writer baseline.
+
+Usage:
+    python benchmarks/bench_sql_read_pool.py
+    python benchmarks/bench_sql_read_pool.py --readers 16 --writers 0 2 8 --seconds 3
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.memory_db import SQLMemoryManager  # noqa: E402
+
+MESSAGE = "Where is my order? It was supposed to arrive yesterday."
+RESPONSE = "Your order shipped on Monday and is out for delivery today."
+
+
+def seed(db, users):
+    for n in range(users):
+        db.update_user_profile(f"user{n}", {"name": f"User {n}"})
+        for _ in range(50):
+            db.add_interaction(f"user{n}", MESSAGE, RESPONSE)
+    for i in range(200):
+        db.add_knowledge("shipping", f"Delivery question {i}", f"Orders ship within {i % 5} days.")
+
+
+def run(readers, writers, seconds, pool_size):
+    workdir = tempfile.mkdtemp(prefix="mem_llm_bench_")
+    try:
+        db = SQLMemoryManager(db_path=str(Path(workdir) / "bench.db"), read_pool_size=pool_size)
+        seed(db, readers)
+
+        stop = threading.Event()
+        latencies = [[] for _ in range(readers)]
+        writes = [0] * writers
+
+        def reader(n):
+            user = f"user{n}"
+            while not stop.is_set():
+                start = time.perf_counter()
+                db.get_recent_conversations(user, limit=10)
+                db.get_user_profile(user)
+                db.search_knowledge("when will my order ship", limit=3)
+                latencies[n].append((time.perf_counter() - start) * 1000)
+
+        def writer(n):
+            while not stop.is_set():
+                db.add_interaction(f"writer{n}", MESSAGE, RESPONSE)
+                writes[n] += 1
+
+        threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+        threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        db.close()
+
+        samples = sorted(ms for per_thread in latencies for ms in per_thread)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        return statistics.median(samples), p99, len(samples) / seconds, sum(writes) / seconds
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, nargs="+", default=[0, 1, 4])
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of each run")
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    modes = {"write lock (no pool)": 0, f"read pool ({args.pool_size})": args.pool_size}
+
+    print(
+        f"{args.readers} reader threads, {args.seconds:.0f}s per run; latency is one chat turn's reads"
+    )
+    header = (
+        f"{'mode':>22} | {'writers':>7} | {'p50 ms':>7} | {'p99 ms':>7} | "
+        f"{'reads/s':>8} | {'writes/s':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, pool_size in modes.items():
+        for writers in args.writers:
+            p50, p99, reads, writes = run(args.readers, writers, args.seconds, pool_size)
+            print(
+                f"{name:>22} | {writers:>7} | {p50:>7.2f} | {p99:>7.2f} | "
+                f"{reads:>8.0f} | {writes:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Cold-start time and memory per API user: one MemAgent each vs. shared-engine sessions.
+
+The API server used to build a full MemAgent (database connections, LLM
+client, tool registry, graph store, metrics) for every user_id. It now keeps
+one MemAgent per configuration and hands each user a UserSession. Memory is
+measured with tracemalloc (Python allocations, not full RSS).
+
+Usage:
+    python benchmarks/bench_tenant_sessions.py
+    python benchmarks/bench_tenant_sessions.py --users 200
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm import MemAgent  # noqa: E402
+
+
+def agent_config(tmp):
+    return {
+        "use_sql": True,
+        "db_path": os.path.join(tmp, "memories.db"),
+        "check_connection": False,
+        "load_knowledge_base": False,
+        "enable_graph_memory": True,
+    }
+
+
+def measure(create, users):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    held = [create(f"user{i}") for i in range(users)]
+    elapsed = (time.perf_counter() - start) * 1000 / users
+    per_user = (tracemalloc.get_traced_memory()[0] - before) / users / 1024
+    tracemalloc.stop()
+    return held, elapsed, per_user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = agent_config(tmp)
+
+        def new_agent(user_id):
+            agent = MemAgent(**config)
+            agent.set_user(user_id)
+            return agent
+
+        agents, agent_ms, agent_kb = measure(new_agent, args.users)
+        for agent in agents:
+            agent.close()
+
+        engine = MemAgent(**config)
+        sessions, session_ms, session_kb = measure(engine.session, args.users)
+        engine.close()
+
+    print(f"{args.users} users")
+    print(f"{'model':>16} | {'ms/user':>9} | {'KB/user':>9}")
+    print("-" * 40)
+    print(f"{'agent per user':>16} | {agent_ms:>9.2f} | {agent_kb:>9.1f}")
+    print(f"{'shared engine':>16} | {session_ms:>9.4f} | {session_kb:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
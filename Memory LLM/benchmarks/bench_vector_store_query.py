@@ -0,0 +1,112 @@
+"""
+Query latency of the built-in NumPy vector store vs. ChromaDB as the KB grows.
+
+Both stores are loaded with the same random unit vectors and queried with
+precomputed embeddings, so the numbers measure the index, not the embedding
+model. ChromaDB is skipped when it is not installed.
+
+Usage:
+    python benchmarks/bench_vector_store_query.py
+    python benchmarks/bench_vector_store_query.py --sizes 10000 100000 1000000 --dim 384
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mem_llm.vector_store import CHROMA_AVAILABLE, NumpyVectorStore  # noqa: E402
+
+CATEGORIES = ["billing", "orders", "account", "shipping"]
+
+
+def docs_for(start, count):
+    return [
+        {"id": str(i), "text": f"doc {i}", "metadata": {"category": CATEGORIES[i % 4]}}
+        for i in range(start, start + count)
+    ]
+
+
+def time_queries(search, queries):
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def bench_numpy(vectors, queries, limit, workdir):
+    store = NumpyVectorStore(persist_directory=workdir, embedding_function=lambda texts: [])
+    for i in range(0, len(vectors), 50000):
+        store.add_embeddings(docs_for(i, len(vectors[i : i + 50000])), vectors[i : i + 50000])
+    plain = time_queries(lambda q: store.search_by_vector(q, limit=limit), queries)
+    filtered = time_queries(
+        lambda q: store.search_by_vector(q, limit=limit, filter_metadata={"category": "orders"}),
+        queries,
+    )
+    return plain, filtered
+
+
+def bench_chroma(vectors, queries, limit, workdir):
+    import chromadb
+
+    client = chromadb.PersistentClient(path=workdir)
+    collection = client.create_collection("bench", metadata={"hnsw:space": "cosine"})
+    batch = 5000
+    for i in range(0, len(vectors), batch):
+        docs = docs_for(i, len(vectors[i : i + batch]))
+        collection.add(
+            ids=[d["id"] for d in docs],
+            embeddings=vectors[i : i + batch].tolist(),
+            documents=[d["text"] for d in docs],
+            metadatas=[d["metadata"] for d in docs],
+        )
+    plain = time_queries(
+        lambda q: collection.query(query_embeddings=[q.tolist()], n_results=limit), queries
+    )
+    filtered = time_queries(
+        lambda q: collection.query(
+            query_embeddings=[q.tolist()], n_results=limit, where={"category": "orders"}
+        ),
+        queries,
+    )
+    return plain, filtered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    backends = {"numpy": bench_numpy}
+    if CHROMA_AVAILABLE:
+        backends["chroma"] = bench_chroma
+    else:
+        print("chromadb not installed: measuring the NumPy store only")
+
+    print(f"dim={args.dim}, top-{args.limit}, mean ms/query over {args.queries} queries")
+    print(f"{'rows':>9} | {'backend':>7} | {'query ms':>9} | {'filtered ms':>11}")
+    print("-" * 46)
+    for size in args.sizes:
+        vectors = rng.normal(size=(size, args.dim)).astype(np.float32)
+        queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+        for name, bench in backends.items():
+            workdir = tempfile.mkdtemp(prefix="mem_llm_bench_")
+            try:
+                plain, filtered = bench(vectors, queries, args.limit, workdir)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            print(f"{size:>9} | {name:>7} | {plain:>9.2f} | {filtered:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ from .llm_client_factory import LLMClientFactory  # noqa: F401
 from .mem_agent import MemAgent  # noqa: F401
 from .memory_manager import MemoryManager  # noqa: F401
 from .memory_router import MemoryRouter  # noqa: F401
+from .segmented_memory import SegmentedMemoryManager  # noqa: F401
+from .sessions import UserSession  # noqa: F401
 
 # Tools (optional)
 try:
@@ -172,9 +174,14 @@ except ImportError:
 
 # Graph Memory (v2.3.0+)
 try:
-    from .memory.graph import GraphExtractor, GraphStore  # noqa: F401
+    from .memory.graph import (  # noqa: F401
+        GraphExtractor,
+        GraphStore,
+        ShardedGraphStore,
+        SQLiteGraphStore,
+    )
 
-    __all_graph__ = ["GraphStore", "GraphExtractor"]
+    __all_graph__ = ["GraphStore", "SQLiteGraphStore", "ShardedGraphStore", "GraphExtractor"]
 except ImportError:
     __all_graph__ = []
 
@@ -183,7 +190,9 @@ __all__ = (
     [
         "MemAgent",
         "MemoryManager",
+        "SegmentedMemoryManager",
         "MemoryRouter",
+        "UserSession",
         "OllamaClient",
     ]
     + __all_llm_backends__
@@ -202,4 +211,3 @@ __all__ = (
     + __all_workflow__
     + __all_graph__
 )
-
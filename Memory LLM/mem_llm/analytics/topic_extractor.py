@@ -1,6 +1,6 @@
 import re
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 
 class TopicExtractor:
@@ -172,21 +172,16 @@ class TopicExtractor:
         counter = Counter(filtered)
         return [word for word, _ in counter.most_common(top_n)]
 
-    def extract_topics(self, messages: List[str], top_n: int = 10) -> Dict[str, int]:
-        """Extract topics from multiple messages"""
-        if not messages:
-            return {}
+    def extract_topics(self, messages: Iterable[str], top_n: int = 10) -> Dict[str, int]:
+        """Extract topics from multiple messages
 
-        all_text = " ".join(messages)
-
-        # Count occurrences across messages to find distribution
-        # We want to know how many times each keyword appears in the total corpus
-        # But extract_keywords already gives us the most common ones.
-        # So we can just recount them or use the counter from extract_keywords logic.
-
-        # Let's do it more efficiently:
-        words = re.findall(r"\b\w+\b", all_text.lower())
-        filtered = [w for w in words if w not in self.STOP_WORDS and len(w) > 2]
-        counter = Counter(filtered)
+        Messages are counted one at a time, so a generator can be passed to
+        keep memory bounded by the vocabulary rather than the corpus.
+        """
+        # How many times each keyword appears across the whole corpus
+        counter = Counter()
+        for message in messages:
+            words = re.findall(r"\b\w+\b", message.lower())
+            counter.update(w for w in words if w not in self.STOP_WORDS and len(w) > 2)
 
         return dict(counter.most_common(top_n))
@@ -14,13 +14,19 @@ Author: Cihat Emre Karatas
 Version: 2.4.1
 """
 
+import asyncio
 import hashlib
+import json
+import math
 import os
 import secrets
+import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader, APIKeyQuery
@@ -50,6 +56,26 @@ RATE_LIMIT_REQUESTS = int(os.environ.get("MEM_LLM_RATE_LIMIT", "60"))  # request
 RATE_LIMIT_WINDOW = 60  # seconds
 
 
+def _parse_tiers(spec: str) -> Dict[str, int]:
+    tiers = {}
+    for item in spec.split(","):
+        permission, _, limit = item.partition("=")
+        if permission.strip() and limit.strip():
+            tiers[permission.strip()] = int(limit)
+    return tiers
+
+
+# Per-permission limits per window, e.g. MEM_LLM_RATE_LIMIT_TIERS="admin=600,write=120".
+# A key gets the highest tier among its permissions, else RATE_LIMIT_REQUESTS.
+RATE_LIMIT_TIERS = _parse_tiers(os.environ.get("MEM_LLM_RATE_LIMIT_TIERS", ""))
+
+
+def rate_limit_for(permissions: Iterable[str]) -> int:
+    """Requests per RATE_LIMIT_WINDOW allowed for a key with these permissions"""
+    limits = [RATE_LIMIT_TIERS[p] for p in permissions if p in RATE_LIMIT_TIERS]
+    return max(limits) if limits else RATE_LIMIT_REQUESTS
+
+
 # ============================================================================
 # Data Classes
 # ============================================================================
@@ -68,11 +94,35 @@ class APIUser:
 
 
 @dataclass
-class RateLimitInfo:
-    """Rate limiting information for a user"""
+class TokenBucket:
+    """
+    Rate limit state for one key
+
+    Holds up to ``limit`` tokens and refills at ``limit`` per RATE_LIMIT_WINDOW;
+    each request takes one token. Two numbers per key, whatever the limit.
+    """
+
+    tokens: float
+    updated: float
+
+    def refill(self, limit: int, now: float) -> float:
+        """Tokens available at ``now`` (does not modify the bucket)"""
+        elapsed = max(0.0, now - self.updated)
+        return min(float(limit), self.tokens + elapsed * limit / RATE_LIMIT_WINDOW)
+
+    def consume(self, limit: int, now: float) -> bool:
+        """Take one token if available"""
+        self.tokens = self.refill(limit, now)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
 
-    requests: List[float] = field(default_factory=list)
-    blocked_until: Optional[float] = None
+    def retry_after(self, limit: int, now: float) -> float:
+        """Seconds until the next token"""
+        missing = 1 - self.refill(limit, now)
+        return max(0.0, missing * RATE_LIMIT_WINDOW / limit) if limit > 0 else RATE_LIMIT_WINDOW
 
 
 # ============================================================================
@@ -83,18 +133,27 @@ class RateLimitInfo:
 class APIKeyStore:
     """Manages API keys and users"""
 
+    # Whether lookups do I/O and should be run off the event loop
+    blocking = False
+
     def __init__(self):
         self._keys: Dict[str, APIUser] = {}
-        self._rate_limits: Dict[str, RateLimitInfo] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._rate_lock = threading.Lock()
 
         # Add default development key
-        self.add_key(
+        self._seed_default_key(
             api_key=DEFAULT_API_KEY,
             user_id="admin",
             name="Admin User",
             permissions=["read", "write", "admin"],
         )
 
+    def _seed_default_key(
+        self, api_key: str, user_id: str, name: str, permissions: List[str]
+    ) -> None:
+        self.add_key(api_key, user_id, name, permissions)
+
     def add_key(
         self,
         api_key: str,
@@ -114,7 +173,9 @@ class APIKeyStore:
 
     def validate_key(self, api_key: str) -> Optional[APIUser]:
         """Validate an API key and return the user"""
-        hashed = self._hash_key(api_key)
+        return self._validate_hashed(self._hash_key(api_key))
+
+    def _validate_hashed(self, hashed: str) -> Optional[APIUser]:
         user = self._keys.get(hashed)
         if user and user.is_active:
             return user
@@ -140,46 +201,226 @@ class APIKeyStore:
         """Hash an API key for secure storage"""
         return hashlib.sha256(api_key.encode()).hexdigest()
 
-    def check_rate_limit(self, api_key: str) -> bool:
-        """Check if request is within rate limit"""
-        hashed = self._hash_key(api_key)
-        now = time.time()
-
-        if hashed not in self._rate_limits:
-            self._rate_limits[hashed] = RateLimitInfo()
+    def _rate_limit(self, hashed: str, user: Optional[APIUser] = None) -> int:
+        if user is None:
+            user = self._keys.get(hashed)
+        return rate_limit_for(user.permissions if user else ())
 
-        info = self._rate_limits[hashed]
-
-        # Check if blocked
-        if info.blocked_until and now < info.blocked_until:
-            return False
+    def check_rate_limit(self, api_key: str, user: Optional[APIUser] = None) -> bool:
+        """Take one request from the key's token bucket; False when it is empty"""
+        return self._consume(self._hash_key(api_key), user)
 
-        # Clean old requests
-        info.requests = [t for t in info.requests if now - t < RATE_LIMIT_WINDOW]
-
-        # Check limit
-        if len(info.requests) >= RATE_LIMIT_REQUESTS:
-            info.blocked_until = now + RATE_LIMIT_WINDOW
-            return False
+    def _consume(self, hashed: str, user: Optional[APIUser] = None) -> bool:
+        limit = self._rate_limit(hashed, user)
+        now = time.time()
+        with self._rate_lock:
+            bucket = self._buckets.get(hashed)
+            if bucket is None:
+                bucket = self._buckets[hashed] = TokenBucket(float(limit), now)
+            return bucket.consume(limit, now)
 
-        # Record request
-        info.requests.append(now)
-        return True
+    def _bucket_state(self, hashed: str) -> Optional[TokenBucket]:
+        with self._rate_lock:
+            bucket = self._buckets.get(hashed)
+            return TokenBucket(bucket.tokens, bucket.updated) if bucket else None
 
     def get_rate_limit_remaining(self, api_key: str) -> int:
         """Get remaining requests in current window"""
         hashed = self._hash_key(api_key)
-        if hashed not in self._rate_limits:
-            return RATE_LIMIT_REQUESTS
+        limit = self._rate_limit(hashed)
+        bucket = self._bucket_state(hashed)
+        if bucket is None:
+            return limit
+        return int(bucket.refill(limit, time.time()))
+
+    def get_retry_after(self, api_key: str) -> float:
+        """Seconds until the key may send another request"""
+        return self._retry_after(self._hash_key(api_key))
+
+    def _retry_after(self, hashed: str) -> float:
+        bucket = self._bucket_state(hashed)
+        if bucket is None:
+            return 0.0
+        return bucket.retry_after(self._rate_limit(hashed), time.time())
+
+
+class SQLiteAPIKeyStore(APIKeyStore):
+    """
+    APIKeyStore kept in a SQLite file
+
+    Several server processes pointed at the same file share keys, revocations
+    and rate-limit buckets. Every rate-limit check is one BEGIN IMMEDIATE
+    transaction, so concurrent processes cannot both take the last request.
+    """
+
+    blocking = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(
+            db_path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,  # Autocommit; writes use explicit transactions
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL commits stay atomic without an fsync each; only the last few
+        # rate-limit updates can be lost on power failure
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS api_keys (
+                key_hash TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                name TEXT,
+                permissions TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                is_active INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE TABLE IF NOT EXISTS api_rate_buckets (
+                key_hash TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            """
+        )
+        super().__init__()
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block of statements as one BEGIN IMMEDIATE transaction"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except BaseException:
+                if self.conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _row_to_user(row) -> APIUser:
+        key_hash, user_id, name, permissions, created_at, is_active = row
+        return APIUser(
+            api_key=key_hash,
+            user_id=user_id,
+            name=name,
+            permissions=json.loads(permissions),
+            created_at=datetime.fromisoformat(created_at),
+            is_active=bool(is_active),
+        )
 
+    def add_key(
+        self,
+        api_key: str,
+        user_id: str,
+        name: str = "API User",
+        permissions: Optional[List[str]] = None,
+    ) -> APIUser:
+        """Add a new API key"""
+        user = APIUser(
+            api_key=self._hash_key(api_key),
+            user_id=user_id,
+            name=name,
+            permissions=permissions or ["read", "write"],
+        )
+        with self._transaction() as cursor:
+            cursor.execute(
+                "INSERT OR REPLACE INTO api_keys VALUES (?, ?, ?, ?, ?, 1)",
+                (
+                    user.api_key,
+                    user.user_id,
+                    user.name,
+                    json.dumps(user.permissions),
+                    user.created_at.isoformat(),
+                ),
+            )
+        return user
+
+    def _seed_default_key(
+        self, api_key: str, user_id: str, name: str, permissions: List[str]
+    ) -> None:
+        # Every process seeds the same key; keep an existing row so a revoked
+        # admin key stays revoked and keeps its created_at
+        with self._transaction() as cursor:
+            cursor.execute(
+                "INSERT OR IGNORE INTO api_keys VALUES (?, ?, ?, ?, ?, 1)",
+                (
+                    self._hash_key(api_key),
+                    user_id,
+                    name,
+                    json.dumps(permissions),
+                    datetime.now().isoformat(),
+                ),
+            )
+
+    def _validate_hashed(self, hashed: str) -> Optional[APIUser]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM api_keys WHERE key_hash = ? AND is_active = 1", (hashed,)
+            ).fetchone()
+        return self._row_to_user(row) if row else None
+
+    def revoke_key(self, api_key: str) -> bool:
+        """Revoke an API key"""
+        with self._transaction() as cursor:
+            cursor.execute(
+                "UPDATE api_keys SET is_active = 0 WHERE key_hash = ?", (self._hash_key(api_key),)
+            )
+            return cursor.rowcount > 0
+
+    def list_users(self) -> List[APIUser]:
+        """List all API users (keys are stored hashed)."""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM api_keys ORDER BY created_at").fetchall()
+        return [self._row_to_user(row) for row in rows]
+
+    def _rate_limit(self, hashed: str, user: Optional[APIUser] = None) -> int:
+        if user is None:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT permissions FROM api_keys WHERE key_hash = ?", (hashed,)
+                ).fetchone()
+            return rate_limit_for(json.loads(row[0]) if row else ())
+        return rate_limit_for(user.permissions)
+
+    def _consume(self, hashed: str, user: Optional[APIUser] = None) -> bool:
+        limit = self._rate_limit(hashed, user)
         now = time.time()
-        info = self._rate_limits[hashed]
-        recent = [t for t in info.requests if now - t < RATE_LIMIT_WINDOW]
-        return max(0, RATE_LIMIT_REQUESTS - len(recent))
+        with self._transaction() as cursor:
+            row = cursor.execute(
+                "SELECT tokens, updated FROM api_rate_buckets WHERE key_hash = ?", (hashed,)
+            ).fetchone()
+            bucket = TokenBucket(*row) if row else TokenBucket(float(limit), now)
+            allowed = bucket.consume(limit, now)
+            cursor.execute(
+                "INSERT OR REPLACE INTO api_rate_buckets VALUES (?, ?, ?)",
+                (hashed, bucket.tokens, bucket.updated),
+            )
+            return allowed
 
+    def _bucket_state(self, hashed: str) -> Optional[TokenBucket]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT tokens, updated FROM api_rate_buckets WHERE key_hash = ?", (hashed,)
+            ).fetchone()
+        return TokenBucket(*row) if row else None
 
-# Global API key store instance
-api_key_store = APIKeyStore()
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+# Global API key store instance. Set MEM_LLM_STATE_DB to share keys and rate
+# limits between server processes (see mem_llm.api_cluster).
+_state_db = os.environ.get("MEM_LLM_STATE_DB")
+api_key_store = SQLiteAPIKeyStore(_state_db) if _state_db else APIKeyStore()
 
 
 # ============================================================================
@@ -208,11 +449,31 @@ async def get_api_key(
     return api_key
 
 
+def _check_key(api_key: str) -> Tuple[Optional[APIUser], bool, float]:
+    """Validate a key and take one request from its bucket: (user, allowed, retry_after)"""
+    # Hash once per request; the stores are keyed by the digest, never the secret
+    hashed = api_key_store._hash_key(api_key)
+    user = api_key_store._validate_hashed(hashed)
+    if not user:
+        return None, False, 0.0
+    if api_key_store._consume(hashed, user):
+        return user, True, 0.0
+    return user, False, api_key_store._retry_after(hashed)
+
+
 async def authenticate(api_key: str = Depends(get_api_key)) -> APIUser:  # noqa: B008
     """Authenticate request using API key"""
     if AUTH_DISABLED:
-        return APIUser(api_key="", user_id="anonymous", name="Anonymous", permissions=["read", "write", "admin"])
-    user = api_key_store.validate_key(api_key)
+        return APIUser(
+            api_key="",
+            user_id="anonymous",
+            name="Anonymous",
+            permissions=["read", "write", "admin"],
+        )
+    if api_key_store.blocking:
+        user, allowed, retry_after = await asyncio.to_thread(_check_key, api_key)
+    else:
+        user, allowed, retry_after = _check_key(api_key)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -221,15 +482,15 @@ async def authenticate(api_key: str = Depends(get_api_key)) -> APIUser:  # noqa:
         )
 
     # Check rate limit
-    if not api_key_store.check_rate_limit(api_key):
-        remaining = api_key_store.get_rate_limit_remaining(api_key)
+    if not allowed:
+        retry_after = math.ceil(retry_after)
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail=f"Rate limit exceeded. Try again in {RATE_LIMIT_WINDOW} seconds.",
+            detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
             headers={
-                "X-RateLimit-Limit": str(RATE_LIMIT_REQUESTS),
-                "X-RateLimit-Remaining": str(remaining),
-                "Retry-After": str(RATE_LIMIT_WINDOW),
+                "X-RateLimit-Limit": str(rate_limit_for(user.permissions)),
+                "X-RateLimit-Remaining": "0",
+                "Retry-After": str(retry_after),
             },
         )
 
@@ -261,15 +522,21 @@ async def optional_authenticate(
 ) -> Optional[APIUser]:
     """Optionally authenticate - returns None if no key provided"""
     if AUTH_DISABLED:
-        return APIUser(api_key="", user_id="anonymous", name="Anonymous", permissions=["read", "write", "admin"])
+        return APIUser(
+            api_key="",
+            user_id="anonymous",
+            name="Anonymous",
+            permissions=["read", "write", "admin"],
+        )
     api_key = api_key_header or api_key_query
     if not api_key:
         return None
 
-    user = api_key_store.validate_key(api_key)
-    if user and api_key_store.check_rate_limit(api_key):
-        return user
-    return None
+    if api_key_store.blocking:
+        user, allowed, _ = await asyncio.to_thread(_check_key, api_key)
+    else:
+        user, allowed, _ = _check_key(api_key)
+    return user if allowed else None
 
 
 # ============================================================================
@@ -289,5 +556,3 @@ def create_api_key(
 def revoke_api_key(api_key: str) -> bool:
     """Revoke an API key"""
     return api_key_store.revoke_key(api_key)
-
-
@@ -0,0 +1,287 @@
+"""
+Multi-Process API Server
+========================
+
+Runs several ``mem_llm.api_server`` worker processes behind a small router.
+
+The router sends every request for a user to the same worker (a hash of the
+user_id), so each user's session, turn ordering and caches live in exactly one
+process. Requests without a user go round-robin. API keys and rate-limit
+buckets are kept in a shared SQLite file (``MEM_LLM_STATE_DB``) instead of
+process memory, so a key created or revoked through one worker is valid or
+revoked on all of them. Each worker (``MEM_LLM_WORKER_ID``) keeps its own
+vector store and position in the shared knowledge base change log, so every
+worker sees every knowledge base change.
+
+Usage:
+    python -m mem_llm.api_cluster                 # one worker per CPU core
+    python -m mem_llm.api_cluster --workers 4 --port 8000
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import time
+import zlib
+from contextlib import asynccontextmanager
+from typing import List, Mapping, Optional
+
+import aiohttp
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Endpoints that carry the user in the path; others use ?user_id= or the JSON body
+_PATH_USER = re.compile(
+    r"^/(?:api/v1/users|api/v1/agent/configure|api/v1/agent/info|ws/chat)/([^/]+)"
+)
+
+# Not forwarded between client, router and worker
+_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "upgrade",
+    "host",
+    "content-length",
+}
+
+
+def worker_for(user_id: str, workers: int) -> int:
+    """Worker index that owns a user; stable across restarts and processes"""
+    return zlib.crc32(user_id.encode("utf-8")) % workers
+
+
+def extract_user_id(path: str, query: Mapping[str, str], body: bytes = b"") -> Optional[str]:
+    """Find the user a request is for: path, then ?user_id=, then a JSON body"""
+    match = _PATH_USER.match(path)
+    if match:
+        return match.group(1)
+    if query.get("user_id"):
+        return query["user_id"]
+    if body[:1] == b"{":
+        try:
+            user_id = json.loads(body).get("user_id")
+        except (ValueError, AttributeError):
+            return None
+        return str(user_id) if user_id else None
+    return None
+
+
+def _forward_headers(headers) -> dict:
+    return {key: value for key, value in headers.items() if key.lower() not in _HOP_HEADERS}
+
+
+def create_router_app(worker_urls: List[str]) -> FastAPI:
+    """ASGI app that proxies HTTP, SSE and websocket traffic to the owning worker"""
+    round_robin = itertools.count()
+    sessions = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        for client in sessions.values():
+            await client.close()
+
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None, lifespan=lifespan)
+
+    def pick(user_id: Optional[str]) -> str:
+        if user_id:
+            return worker_urls[worker_for(user_id, len(worker_urls))]
+        return worker_urls[next(round_robin) % len(worker_urls)]
+
+    def session() -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if loop not in sessions or sessions[loop].closed:
+            sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=0),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10),
+                auto_decompress=False,
+            )
+        return sessions[loop]
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"])
+    async def proxy(request: Request, path: str):
+        body = await request.body()
+        base = pick(extract_user_id(request.url.path, request.query_params, body))
+        url = base + request.url.path
+        if request.url.query:
+            url += "?" + request.url.query
+        try:
+            upstream = await session().request(
+                request.method,
+                url,
+                headers=_forward_headers(request.headers),
+                data=body,
+                allow_redirects=False,
+            )
+        except aiohttp.ClientError as e:
+            logger.error(f"Worker {base} unavailable: {e}")
+            return JSONResponse({"detail": "Worker unavailable"}, status_code=502)
+
+        headers = _forward_headers(upstream.headers)
+        if upstream.content_type == "text/event-stream":
+
+            async def relay():
+                try:
+                    async for chunk in upstream.content.iter_any():
+                        yield chunk
+                finally:
+                    upstream.release()
+
+            return StreamingResponse(relay(), status_code=upstream.status, headers=headers)
+
+        content = await upstream.read()
+        upstream.release()
+        return Response(content, status_code=upstream.status, headers=headers)
+
+    @app.websocket("/ws/chat/{user_id}")
+    async def websocket_proxy(websocket: WebSocket, user_id: str):
+        await websocket.accept()
+        url = pick(user_id).replace("http", "ws", 1) + websocket.url.path
+        if websocket.url.query:
+            url += "?" + websocket.url.query
+        headers = {}
+        if websocket.headers.get("x-api-key"):
+            headers["x-api-key"] = websocket.headers["x-api-key"]
+        try:
+            async with session().ws_connect(url, headers=headers) as upstream:
+
+                async def client_to_worker():
+                    try:
+                        while True:
+                            await upstream.send_str(await websocket.receive_text())
+                    except WebSocketDisconnect:
+                        await upstream.close()
+
+                forward = asyncio.create_task(client_to_worker())
+                try:
+                    async for message in upstream:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            await websocket.send_text(message.data)
+                        elif message.type == aiohttp.WSMsgType.BINARY:
+                            await websocket.send_bytes(message.data)
+                finally:
+                    forward.cancel()
+                close_code = upstream.close_code or 1000
+        except aiohttp.ClientError as e:
+            logger.error(f"Worker websocket unavailable: {e}")
+            close_code = 1011
+        try:
+            await websocket.close(code=close_code)
+        except RuntimeError:
+            pass  # Client already gone
+
+    return app
+
+
+def _wait_for_port(host: str, port: int, timeout: float) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_workers(
+    workers: int, base_port: int, state_db: str, log_level: str = "warning"
+) -> List[subprocess.Popen]:
+    """Start uvicorn worker processes sharing one key/rate-limit database"""
+    from .api_auth import AUTH_DISABLED
+
+    env = os.environ.copy()
+    env["MEM_LLM_STATE_DB"] = os.path.abspath(state_db)
+    if not AUTH_DISABLED and not env.get("MEM_LLM_API_KEY"):
+        # Every worker must accept the same admin key
+        env["MEM_LLM_API_KEY"] = secrets.token_urlsafe(32)
+        logger.warning(
+            "MEM_LLM_API_KEY is not set; generated an admin API key for this run: "
+            f"{env['MEM_LLM_API_KEY']}"
+        )
+
+    # Each worker applies knowledge base changes to its own vector store
+    return [
+        subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "mem_llm.api_server:app",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(base_port + i),
+                "--log-level",
+                log_level,
+            ],
+            env=dict(env, MEM_LLM_WORKER_ID=str(i)),
+        )
+        for i in range(workers)
+    ]
+
+
+def run_cluster(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: Optional[int] = None,
+    worker_base_port: Optional[int] = None,
+    state_db: str = "memories/api_state.db",
+) -> None:
+    """
+    Serve the API from several processes behind a user-sticky router
+
+    Args:
+        host: Router bind address
+        port: Router port clients connect to
+        workers: Worker processes (default: CPU count)
+        worker_base_port: First worker port on 127.0.0.1 (default: port + 1)
+        state_db: SQLite file for API keys and rate limits
+    """
+    import uvicorn
+
+    workers = workers or os.cpu_count() or 1
+    base_port = worker_base_port or port + 1
+    processes = start_workers(workers, base_port, state_db)
+    try:
+        for i in range(workers):
+            if not _wait_for_port("127.0.0.1", base_port + i, timeout=60):
+                raise RuntimeError(f"Worker on port {base_port + i} did not start")
+        urls = [f"http://127.0.0.1:{base_port + i}" for i in range(workers)]
+        logger.info(f"Routing {host}:{port} to {workers} workers")
+        uvicorn.run(create_router_app(urls), host=host, port=port, log_level="info")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Mem-LLM API on several processes")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    parser.add_argument("--worker-base-port", type=int, default=None)
+    parser.add_argument("--state-db", default="memories/api_state.db")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run_cluster(args.host, args.port, args.workers, args.worker_base_port, args.state_db)
+
+
+if __name__ == "__main__":
+    main()
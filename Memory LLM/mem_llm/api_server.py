@@ -34,11 +34,12 @@ import json
 import logging
 import os
 import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import (
     Depends,
@@ -56,7 +57,10 @@ from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
 # Import Mem-LLM components
+from .base_llm_client import close_async_session
+from .mailbox import UserMailbox
 from .mem_agent import MemAgent
+from .sessions import UserSession
 from .api_auth import AUTH_DISABLED, create_api_key, require_permission, api_key_store, revoke_api_key
 
 # Note: In a real app, we'd probably have a WorkflowManager attached to the agent or global
@@ -69,67 +73,155 @@ API_VERSION = "2.5.1"
 
 
 class AgentStore:
-    """Simple LRU + TTL in-memory agent store."""
+    """LRU + TTL in-memory store of per-user sessions.
 
-    def __init__(self, ttl_seconds: int = 3600, max_size: int = 500):
+    Entries are kept in access order, so both the least recently used entry
+    and the expired ones sit at the front and are removed without scanning.
+    Removed entries are passed to ``on_evict`` (by default their ``close()``).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 3600,
+        max_size: int = 500,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        sweep_interval: float = 60.0,
+    ):
         self.ttl_seconds = ttl_seconds
         self.max_size = max_size
-        self._entries: Dict[str, Dict[str, Any]] = {}
-        self._lru: Dict[str, float] = {}
+        self.on_evict = on_evict or self._close_entry
+        self.sweep_interval = sweep_interval
+        # user_id -> {"agent", "created_at", "last_access"}, least recent first
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._lock = Lock()
+        self._sweeper: Optional[Thread] = None
+        self._stop_sweeper = Event()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _close_entry(user_id: str, agent: Any) -> None:
+        close = getattr(agent, "close", None)
+        if callable(close):
+            close()
+
+    def _release(self, removed: List[Any]) -> None:
+        """Run the eviction callback outside the lock"""
+        for user_id, agent in removed:
+            try:
+                self.on_evict(user_id, agent)
+            except Exception as e:
+                logger.error(f"Error releasing agent for {user_id}: {e}")
 
-    def _purge_expired(self) -> None:
+    def _purge_expired(self) -> List[Any]:
+        removed = []
         if self.ttl_seconds <= 0:
-            return
+            return removed
         now = time.time()
-        expired = [
-            user_id
-            for user_id, meta in self._entries.items()
-            if now - meta["last_access"] > self.ttl_seconds
-        ]
-        for user_id in expired:
-            self._entries.pop(user_id, None)
-            self._lru.pop(user_id, None)
-
-    def get(self, user_id: str) -> Optional[MemAgent]:
+        while self._entries:
+            user_id, meta = next(iter(self._entries.items()))
+            if now - meta["last_access"] <= self.ttl_seconds:
+                break
+            self._entries.popitem(last=False)
+            self.expirations += 1
+            removed.append((user_id, meta["agent"]))
+        return removed
+
+    def get(self, user_id: str) -> Optional[UserSession]:
         with self._lock:
-            self._purge_expired()
-            if user_id not in self._entries:
-                return None
-            meta = self._entries[user_id]
-            meta["last_access"] = time.time()
-            self._lru[user_id] = meta["last_access"]
-            return meta["agent"]
-
-    def set(self, user_id: str, agent: MemAgent) -> None:
+            removed = self._purge_expired()
+            meta = self._entries.get(user_id)
+            if meta is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                meta["last_access"] = time.time()
+                self._entries.move_to_end(user_id)
+        self._release(removed)
+        return meta["agent"] if meta else None
+
+    def set(self, user_id: str, agent: UserSession) -> None:
         with self._lock:
             now = time.time()
+            removed = []
+            previous = self._entries.pop(user_id, None)
+            if previous and previous["agent"] is not agent:
+                removed.append((user_id, previous["agent"]))
             self._entries[user_id] = {"agent": agent, "created_at": now, "last_access": now}
-            self._lru[user_id] = now
-            self._purge_expired()
-            if self.max_size > 0 and len(self._entries) > self.max_size:
+            removed.extend(self._purge_expired())
+            while self.max_size > 0 and len(self._entries) > self.max_size:
                 # Remove least recently used entries
-                to_remove = sorted(self._lru.items(), key=lambda item: item[1])[
-                    : len(self._entries) - self.max_size
-                ]
-                for remove_id, _ in to_remove:
-                    self._entries.pop(remove_id, None)
-                    self._lru.pop(remove_id, None)
+                evicted_id, meta = self._entries.popitem(last=False)
+                self.evictions += 1
+                removed.append((evicted_id, meta["agent"]))
+        self._release(removed)
 
     def delete(self, user_id: str) -> None:
         with self._lock:
-            self._entries.pop(user_id, None)
-            self._lru.pop(user_id, None)
+            meta = self._entries.pop(user_id, None)
+        if meta:
+            self._release([(user_id, meta["agent"])])
 
     def values(self):
         with self._lock:
-            self._purge_expired()
-            return [meta["agent"] for meta in self._entries.values()]
+            removed = self._purge_expired()
+            agents = [meta["agent"] for meta in self._entries.values()]
+        self._release(removed)
+        return agents
 
     def size(self) -> int:
         with self._lock:
-            self._purge_expired()
-            return len(self._entries)
+            removed = self._purge_expired()
+            size = len(self._entries)
+        self._release(removed)
+        return size
+
+    def sweep(self) -> int:
+        """Remove expired entries now; returns how many were removed"""
+        with self._lock:
+            removed = self._purge_expired()
+        self._release(removed)
+        return len(removed)
+
+    def start_sweeper(self) -> None:
+        """Expire idle entries in the background, not only when the store is used"""
+        if self._sweeper or self.ttl_seconds <= 0:
+            return
+        self._stop_sweeper.clear()
+
+        def run():
+            while not self._stop_sweeper.wait(self.sweep_interval):
+                self.sweep()
+
+        self._sweeper = Thread(target=run, name="mem-llm-agent-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def close(self) -> None:
+        """Stop the sweeper and release every entry"""
+        if self._sweeper:
+            self._stop_sweeper.set()
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+        with self._lock:
+            removed = [(user_id, meta["agent"]) for user_id, meta in self._entries.items()]
+            self._entries.clear()
+        self._release(removed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
 
 
 _fallback_store = AgentStore()
@@ -144,6 +236,21 @@ def _get_agent_store() -> AgentStore:
         pass
     return _fallback_store
 
+
+_fallback_mailbox = UserMailbox()
+
+
+def _get_mailbox() -> UserMailbox:
+    """Per-user turn ordering shared by the REST and websocket endpoints"""
+    try:
+        mailbox = getattr(app.state, "mailbox", None)
+        if mailbox:
+            return mailbox
+    except NameError:
+        pass
+    return _fallback_mailbox
+
+
 # Default agent configuration
 DEFAULT_CONFIG = {
     "model": "granite4:3b",
@@ -155,32 +262,130 @@ DEFAULT_CONFIG = {
 }
 
 
-def get_or_create_agent(user_id: str, config: Optional[Dict] = None) -> MemAgent:
+# Shared agents ("engines") by configuration. Each owns the database
+# connection, LLM client, tools, knowledge base and graph; users only get a
+# UserSession on one of them. An engine is closed once no session uses it and
+# no turn is running on it (a session can be evicted mid-turn), except the
+# default configuration's, which is kept for the next user.
+_engines: Dict[str, Dict[str, Any]] = {}  # key -> {"engine", "sessions", "turns"}
+_engines_lock = Lock()
+
+
+def _engine_config(config: Optional[Dict] = None) -> Tuple[str, Dict]:
+    agent_config = DEFAULT_CONFIG.copy()
+    if config:
+        agent_config.update(config)
+    return json.dumps(agent_config, sort_keys=True, default=str), agent_config
+
+
+def _acquire_engine(config: Optional[Dict] = None, session: bool = True) -> Tuple[str, MemAgent]:
+    key, agent_config = _engine_config(config)
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is None:
+            logger.info(
+                f"Creating shared agent ({agent_config['backend']}/{agent_config['model']})"
+            )
+            entry = {"engine": MemAgent(**agent_config), "sessions": 0, "turns": 0}
+            _engines[key] = entry
+        if session:
+            entry["sessions"] += 1
+        return key, entry["engine"]
+
+
+def _release_engine(key: str, turn: bool = False) -> None:
+    """Drop one session's (or turn's) reference; close the engine when it was the last"""
+    with _engines_lock:
+        entry = _engines.get(key)
+        if entry is None:
+            return
+        entry["turns" if turn else "sessions"] -= 1
+        if entry["sessions"] > 0 or entry["turns"] > 0 or key == _engine_config()[0]:
+            return
+        del _engines[key]
+    logger.info("Closing shared agent with no remaining sessions")
+    try:
+        entry["engine"].close()
+    except Exception as e:
+        logger.error(f"Error closing agent: {e}")
+
+
+def get_engine(config: Optional[Dict] = None) -> MemAgent:
     """
-    Get existing agent or create new one for user
+    Get the shared agent for a configuration, creating it on first use
+
+    Args:
+        config: Overrides for DEFAULT_CONFIG
+
+    Returns:
+        MemAgent shared by every user with the same configuration
+    """
+    return _acquire_engine(config, session=False)[1]
+
+
+def close_engines() -> None:
+    """Close every shared agent (server shutdown)"""
+    with _engines_lock:
+        engines = [entry["engine"] for entry in _engines.values()]
+        _engines.clear()
+    for engine in engines:
+        try:
+            engine.close()
+        except Exception as e:
+            logger.error(f"Error closing agent: {e}")
+
+
+def get_or_create_agent(user_id: str, config: Optional[Dict] = None) -> UserSession:
+    """
+    Get existing session or create new one for user
+
+    New users share the agent for their configuration, so this is a
+    dictionary insert after the first user.
 
     Args:
         user_id: User identifier
         config: Optional agent configuration
 
     Returns:
-        MemAgent instance
+        UserSession bound to user_id
     """
     store = _get_agent_store()
     existing = store.get(user_id)
     if existing:
         return existing
 
-    agent_config = DEFAULT_CONFIG.copy()
-    if config:
-        agent_config.update(config)
+    key, engine = _acquire_engine(config)
+    session = UserSession(engine, user_id, on_close=lambda _: _release_engine(key))
+    store.set(user_id, session)
+    return session
 
-    logger.info(f"Creating new agent for user: {user_id}")
-    agent = MemAgent(**agent_config)
-    agent.set_user(user_id)
-    store.set(user_id, agent)
 
-    return agent
+def _hold_agent(user_id: str) -> Tuple[UserSession, str]:
+    """Get the user's session and count a turn on its engine"""
+    while True:
+        agent = get_or_create_agent(user_id)
+        with _engines_lock:
+            for key, entry in _engines.items():
+                if entry["engine"] is agent.engine:
+                    entry["turns"] += 1
+                    return agent, key
+        # Evicted and its engine closed before the turn was counted; get a new one
+
+
+@asynccontextmanager
+async def _agent_turn(user_id: str):
+    """
+    Run one turn for a user: their session, their mailbox slot, and an open engine
+
+    The engine is held from before the turn waits for the mailbox until it
+    ends, so evicting or deleting the session meanwhile cannot close it.
+    """
+    agent, key = await asyncio.to_thread(_hold_agent, user_id)
+    try:
+        async with _get_mailbox().turn(user_id):
+            yield agent
+    finally:
+        await asyncio.to_thread(_release_engine, key, True)
 
 
 # Lifespan context manager for startup/shutdown events
@@ -193,10 +398,16 @@ async def lifespan(app: FastAPI):
     ttl_seconds = int(os.environ.get("MEM_LLM_AGENT_TTL_SECONDS", "3600"))
     max_size = int(os.environ.get("MEM_LLM_AGENT_MAX_SIZE", "500"))
     app.state.agent_store = AgentStore(ttl_seconds=ttl_seconds, max_size=max_size)
+    app.state.agent_store.start_sweeper()
+    max_concurrent = int(os.environ.get("MEM_LLM_MAX_CONCURRENT_TURNS", "8"))
+    app.state.mailbox = UserMailbox(max_concurrent=max_concurrent)
     yield
     # Shutdown
     logger.info("Mem-LLM API Server shutting down...")
+    await close_async_session()
+    app.state.agent_store.close()
     app.state.agent_store = AgentStore()
+    await asyncio.to_thread(close_engines)
 
 
 # Create FastAPI app
@@ -386,6 +597,8 @@ async def health_check(user=Depends(require_permission("read"))):  # noqa: B008
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "active_users": _get_agent_store().size(),
+        "agents": _get_agent_store().stats(),
+        "turns": _get_mailbox().stats(),
     }
 
 
@@ -403,14 +616,13 @@ async def chat(request: ChatRequest, user=Depends(require_permission("write"))):
     For streaming, use the WebSocket endpoint instead.
     """
     try:
-        # Get or create agent for user
-        agent = get_or_create_agent(request.user_id)
-
-        # Get response
+        # Get response (achat keeps the event loop free during generation);
+        # one turn per user at a time, other users run concurrently
         if request.return_metrics:
-            response = agent.chat(
-                message=request.message, metadata=request.metadata, return_metrics=True
-            )
+            async with _agent_turn(request.user_id) as agent:
+                response = await agent.achat(
+                    message=request.message, metadata=request.metadata, return_metrics=True
+                )
 
             return ChatResponse_API(
                 text=response.text,
@@ -422,7 +634,10 @@ async def chat(request: ChatRequest, user=Depends(require_permission("write"))):
                 metadata=response.metadata,
             )
         else:
-            response_text = agent.chat(message=request.message, metadata=request.metadata)
+            async with _agent_turn(request.user_id) as agent:
+                response_text = await agent.achat(
+                    message=request.message, metadata=request.metadata
+                )
 
             return ChatResponse_API(
                 text=response_text, user_id=request.user_id, timestamp=datetime.now().isoformat()
@@ -441,14 +656,16 @@ async def chat_stream(request: ChatRequest, user=Depends(require_permission("wri
     Returns a Server-Sent Events (SSE) stream.
     """
     try:
-        agent = get_or_create_agent(request.user_id)
 
         async def generate():
             """Generate streaming response"""
             try:
-                for chunk in agent.chat_stream(message=request.message, metadata=request.metadata):
-                    # Send as SSE format
-                    yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+                async with _agent_turn(request.user_id) as agent:
+                    async for chunk in agent.achat_stream(
+                        message=request.message, metadata=request.metadata
+                    ):
+                        # Send as SSE format
+                        yield f"data: {json.dumps({'chunk': chunk})}\n\n"
 
                 # Send completion marker
                 yield f"data: {json.dumps({'done': True})}\n\n"
@@ -496,9 +713,6 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
     logger.info(f"WebSocket connected: {user_id}")
 
     try:
-        # Get or create agent
-        agent = get_or_create_agent(user_id)
-
         while True:
             # Receive message from client
             if not AUTH_DISABLED and not api_key_store.check_rate_limit(api_key):
@@ -519,10 +733,9 @@ async def websocket_chat(websocket: WebSocket, user_id: str):
 
             # Stream response
             try:
-                for chunk in agent.chat_stream(message=message, metadata=metadata):
-                    await websocket.send_json({"type": "chunk", "content": chunk})
-                    # Small delay to prevent overwhelming the client
-                    await asyncio.sleep(0.01)
+                async with _agent_turn(user_id) as agent:
+                    async for chunk in agent.achat_stream(message=message, metadata=metadata):
+                        await websocket.send_json({"type": "chunk", "content": chunk})
 
                 # Send completion
                 await websocket.send_json({"type": "done"})
@@ -623,7 +836,12 @@ async def get_user_profile(user_id: str, user=Depends(require_permission("read")
         agent = get_or_create_agent(user_id)
         profile = agent.get_user_profile()
         interaction_count = 0
-        if hasattr(agent.memory, "get_recent_conversations"):
+        if hasattr(agent.memory, "count_conversations"):
+            try:
+                interaction_count = agent.memory.count_conversations(user_id)
+            except Exception:
+                interaction_count = 0
+        elif hasattr(agent.memory, "get_recent_conversations"):
             try:
                 interaction_count = len(agent.memory.get_recent_conversations(user_id, limit=1000))
             except Exception:
@@ -649,9 +867,9 @@ async def search_memory(search: MemorySearchRequest, user=Depends(require_permis
         # Use appropriate method based on backend
         if hasattr(agent.memory, "search_conversations"):
             # SQL backend
-            results = agent.memory.search_conversations(search.user_id, search.query)[
-                : search.limit
-            ]
+            results = agent.memory.search_conversations(
+                search.user_id, search.query, limit=search.limit
+            )
         elif hasattr(agent.memory, "get_recent_conversations"):
             # SQL backend - if search not available
             history = agent.memory.get_recent_conversations(search.user_id, limit=search.limit)
@@ -674,8 +892,15 @@ async def get_memory_stats(user=Depends(require_permission("read"))):  # noqa: B
         store = _get_agent_store()
         total_users = 0
 
-        # Count memories from all agents
+        # Agents usually share one memory database; ask each store only once
+        seen = set()
         for agent in store.values():
+            memory = getattr(agent, "memory", None)
+            path = getattr(memory, "db_path", None) or getattr(memory, "memory_dir", None)
+            key = str(path) if path is not None and str(path) != ":memory:" else id(memory)
+            if key in seen:
+                continue
+            seen.add(key)
             try:
                 stats = agent.get_statistics() if hasattr(agent, "get_statistics") else {}
                 total_users = max(total_users, int(stats.get("total_users", 0) or 0))
@@ -699,9 +924,11 @@ async def clear_user_memory(user_id: str, user=Depends(require_permission("write
     """Clear user's memory"""
     try:
         store = _get_agent_store()
-        agent = store.get(user_id) or get_or_create_agent(user_id)
-        clear_msg = agent.clear_user_data(user_id=user_id, confirm=True)
-        store.delete(user_id)
+        async with _agent_turn(user_id) as agent:
+            clear_msg = await asyncio.to_thread(
+                agent.clear_user_data, user_id=user_id, confirm=True
+            )
+            await asyncio.to_thread(store.delete, user_id)
         return {"status": "success", "message": clear_msg}
     except HTTPException:
         raise
@@ -814,7 +1041,8 @@ async def get_graph_data(user_id: str, user=Depends(require_permission("read")))
             # Using node-link data which is compatible with D3/Cytoscape usually
             import networkx as nx
 
-            data = nx.node_link_data(agent.graph_store.graph)
+            with agent.graph_store.use(user_id) as graph:
+                data = nx.node_link_data(graph.full_graph())
             return data
         return {"nodes": [], "links": []}
     except Exception as e:
@@ -826,11 +1054,10 @@ async def get_graph_data(user_id: str, user=Depends(require_permission("read")))
 async def clear_graph(user_id: str, user=Depends(require_permission("write"))):  # noqa: B008
     """Clear knowledge graph for a user"""
     try:
-        agent = get_or_create_agent(user_id)
-        if hasattr(agent, "clear_graph_memory"):
-            success = agent.clear_graph_memory(user_id)
-            if success:
-                return {"status": "success", "message": "Graph memory cleared"}
+        async with _agent_turn(user_id) as agent:
+            success = await asyncio.to_thread(agent.clear_graph_memory, user_id)
+        if success:
+            return {"status": "success", "message": "Graph memory cleared"}
         return {"status": "error", "message": "Graph memory not available"}
     except Exception as e:
         logger.error(f"Graph clear error: {e}")
@@ -870,12 +1097,13 @@ async def run_workflow(
     """Run a workflow (Blocking)"""
     # ... existing code ...
     try:
-        agent = get_or_create_agent(user_id)
-
-        workflow = _get_workflow(workflow_id, agent)
+        if workflow_id not in WORKFLOW_DEFINITIONS:
+            raise ValueError("Workflow not found")
 
         # Run workflow
-        context = await workflow.run(initial_data=input_data)
+        async with _agent_turn(user_id) as agent:
+            workflow = _get_workflow(workflow_id, agent)
+            context = await workflow.run(initial_data=input_data)
 
         # Return all context data as result
         return {"status": "completed", "workflow_id": workflow_id, "results": context.data}
@@ -894,15 +1122,17 @@ async def run_workflow_stream(
 ):
     """Run a workflow and stream events (SSE)"""
     try:
-        agent = get_or_create_agent(user_id)
         import json
 
-        workflow = _get_workflow(workflow_id, agent)
+        if workflow_id not in WORKFLOW_DEFINITIONS:
+            raise ValueError("Workflow not found")
 
         async def event_generator():
             try:
-                async for event in workflow.run_generator(initial_data={"topic": topic}):
-                    yield f"data: {json.dumps(event)}\n\n"
+                async with _agent_turn(user_id) as agent:
+                    workflow = _get_workflow(workflow_id, agent)
+                    async for event in workflow.run_generator(initial_data={"topic": topic}):
+                        yield f"data: {json.dumps(event)}\n\n"
             except Exception as e:
                 yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
 
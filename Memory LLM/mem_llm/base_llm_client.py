@@ -9,9 +9,92 @@ Author: Cihat Emre Karataş
 Version: 1.3.0
 """
 
+import asyncio
 import logging
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Default size of a backend's connection pool (concurrent requests kept alive)
+HTTP_POOL_SIZE = 32
+# Transport-level retries for connections that could not be established
+HTTP_CONNECT_RETRIES = 1
+# Default request timeout in seconds
+HTTP_TIMEOUT = 120
+
+# One keep-alive requests session per backend URL, shared by every client (and
+# so every agent) that talks to it
+_http_sessions: Dict[str, requests.Session] = {}
+_http_sessions_lock = threading.Lock()
+
+
+def get_http_session(
+    base_url: str,
+    pool_size: int = HTTP_POOL_SIZE,
+    connect_retries: int = HTTP_CONNECT_RETRIES,
+) -> requests.Session:
+    """
+    Shared connection-pooled session for a backend
+
+    The first call for a base URL sets the pool size and retries; later
+    calls get the same session. Only connection failures are retried here,
+    since a request that reached the server may not be safe to resend;
+    clients retry failed generations themselves.
+
+    Args:
+        base_url: Backend URL the session is shared for
+        pool_size: Connections kept alive to the backend
+        connect_retries: Retries when a connection cannot be established
+
+    Returns:
+        requests.Session
+    """
+    key = base_url.rstrip("/")
+    with _http_sessions_lock:
+        session = _http_sessions.get(key)
+        if session is None:
+            retry = Retry(
+                total=connect_retries,
+                connect=connect_retries,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=0.2,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_sessions[key] = session
+        return session
+
+
+def close_http_sessions() -> None:
+    """Close every shared backend session"""
+    with _http_sessions_lock:
+        sessions = list(_http_sessions.values())
+        _http_sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+# One aiohttp session per event loop, shared by every client: connections to a
+# backend are pooled across agents, and an evicted agent leaves nothing open.
+_async_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()  # loop -> session
+
+
+async def close_async_session() -> None:
+    """Close the shared client session of the running event loop (e.g. on shutdown)"""
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
 
 
 class BaseLLMClient(ABC):
@@ -20,8 +103,15 @@ class BaseLLMClient(ABC):
 
     All LLM backends must implement these methods to ensure
     compatibility with MemAgent and other components.
+
+    Backends with an HTTP API also implement ``achat``/``achat_stream`` on a
+    shared aiohttp session, so an event loop can keep many generations in
+    flight without a thread per request.
     """
 
+    # Connections the shared aiohttp session keeps open to backends
+    ASYNC_CONNECTION_LIMIT = 256
+
     def __init__(self, model: str = None, **kwargs):
         """
         Initialize LLM client
@@ -32,6 +122,20 @@ class BaseLLMClient(ABC):
         """
         self.model = model
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.request_timeout = kwargs.get("timeout", HTTP_TIMEOUT)
+        self.session: Optional[requests.Session] = None
+
+    def _init_http(self, base_url: str, **kwargs) -> None:
+        """
+        Attach the shared pooled session for ``base_url``
+
+        Accepts ``pool_size`` and ``connect_retries`` (see get_http_session).
+        """
+        self.session = get_http_session(
+            base_url,
+            pool_size=kwargs.get("pool_size", HTTP_POOL_SIZE),
+            connect_retries=kwargs.get("connect_retries", HTTP_CONNECT_RETRIES),
+        )
 
     @abstractmethod
     def chat(
@@ -99,6 +203,117 @@ class BaseLLMClient(ABC):
         response = self.chat(messages, temperature, max_tokens, **kwargs)
         yield response
 
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> str:
+        """
+        Async version of chat()
+
+        Backends without a native async implementation run chat() in a
+        worker thread so the event loop is never blocked.
+
+        Args:
+            messages: List of messages in format:
+                     [{"role": "system/user/assistant", "content": "..."}]
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+            **kwargs: Additional backend-specific parameters
+
+        Returns:
+            Model response text
+        """
+        return await asyncio.to_thread(self.chat, messages, temperature, max_tokens, **kwargs)
+
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Async version of chat_stream()
+
+        Args:
+            messages: List of messages in format:
+                     [{"role": "system/user/assistant", "content": "..."}]
+            temperature: Sampling temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+            **kwargs: Additional backend-specific parameters
+
+        Yields:
+            Response text chunks as they arrive
+        """
+        # Default implementation: fall back to non-streaming
+        yield await self.achat(messages, temperature, max_tokens, **kwargs)
+
+    def _get_async_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session of the running event loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        session = _async_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.ASYNC_CONNECTION_LIMIT)
+            )
+            _async_sessions[loop] = session
+        return session
+
+    async def _apost(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, str]:
+        """
+        POST a JSON payload on the shared session
+
+        Returns:
+            HTTP status and response body
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: On transport failures
+        """
+        async with self._get_async_session().post(
+            url, json=payload, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            return response.status, await response.text()
+
+    async def _apost_lines(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        POST a JSON payload and yield the non-empty lines of a streamed response
+
+        The timeout applies to connecting and to each read, like the sync
+        clients' streams; a long generation that keeps sending is not cut off.
+
+        Raises:
+            ConnectionError: If the backend answers with an error status
+            aiohttp.ClientError, asyncio.TimeoutError: On transport failures
+        """
+        stream_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        async with self._get_async_session().post(
+            url, json=payload, headers=headers, timeout=stream_timeout
+        ) as response:
+            if response.status != 200:
+                body = await response.text()
+                raise ConnectionError(
+                    f"{self.__class__.__name__} API error: {response.status} - {body[:200]}"
+                )
+            async for line in response.content:
+                line_text = line.decode("utf-8").strip()
+                if line_text:
+                    yield line_text
+
     def generate(
         self,
         prompt: str,
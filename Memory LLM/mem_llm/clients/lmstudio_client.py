@@ -20,10 +20,12 @@ Author: Cihat Emre Karatas
 Version: 1.3.0
 """
 
+import asyncio
 import json
 import time
-from typing import Dict, Iterator, List
+from typing import AsyncIterator, Dict, Iterator, List
 
+import aiohttp
 import requests
 
 from ..base_llm_client import BaseLLMClient
@@ -59,6 +61,7 @@ class LMStudioClient(BaseLLMClient):
         self.base_url = base_url.rstrip("/")
         self.chat_url = f"{self.base_url}/v1/chat/completions"
         self.models_url = f"{self.base_url}/v1/models"
+        self._init_http(self.base_url, **kwargs)
 
         self.logger.debug(f"Initialized LM Studio client: {base_url}, model: {model}")
 
@@ -70,7 +73,7 @@ class LMStudioClient(BaseLLMClient):
             True if server is available
         """
         try:
-            response = requests.get(self.models_url, timeout=5)
+            response = self.session.get(self.models_url, timeout=5)
             return response.status_code == 200
         except Exception as e:
             self.logger.debug(f"LM Studio connection check failed: {e}")
@@ -84,7 +87,7 @@ class LMStudioClient(BaseLLMClient):
             List of model identifiers
         """
         try:
-            response = requests.get(self.models_url, timeout=5)
+            response = self.session.get(self.models_url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 models = data.get("data", [])
@@ -94,6 +97,42 @@ class LMStudioClient(BaseLLMClient):
             self.logger.error(f"Failed to list models: {e}")
             return []
 
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        **kwargs,
+    ) -> Dict:
+        # OpenAI-compatible payload
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": stream,
+        }
+
+        # Add optional parameters
+        for key in ("top_p", "frequency_penalty", "presence_penalty", "stop"):
+            if key in kwargs:
+                payload[key] = kwargs[key]
+
+        return payload
+
+    def _error_message(self, status: int, body: str) -> str:
+        error_msg = f"LM Studio API error: {status}"
+        try:
+            error_detail = json.loads(body).get("error", {})
+            if isinstance(error_detail, dict):
+                error_msg += f" - {error_detail.get('message', body)}"
+            else:
+                error_msg += f" - {error_detail}"
+        except (ValueError, AttributeError):
+            error_msg += f" - {body[:200]}"
+        return error_msg
+
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -126,31 +165,16 @@ class LMStudioClient(BaseLLMClient):
         # Validate messages
         self._validate_messages(messages)
 
-        # Build OpenAI-compatible payload
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "stream": kwargs.get("stream", False),
-        }
-
-        # Add optional parameters
-        if "top_p" in kwargs:
-            payload["top_p"] = kwargs["top_p"]
-        if "frequency_penalty" in kwargs:
-            payload["frequency_penalty"] = kwargs["frequency_penalty"]
-        if "presence_penalty" in kwargs:
-            payload["presence_penalty"] = kwargs["presence_penalty"]
-        if "stop" in kwargs:
-            payload["stop"] = kwargs["stop"]
+        payload = self._build_payload(
+            messages, temperature, max_tokens, stream=kwargs.get("stream", False), **kwargs
+        )
 
         # Send request with retry logic
         max_retries = kwargs.get("max_retries", 3)
         for attempt in range(max_retries):
             try:
-                response = requests.post(
-                    self.chat_url, json=payload, timeout=kwargs.get("timeout", 120)
+                response = self.session.post(
+                    self.chat_url, json=payload, timeout=kwargs.get("timeout", self.request_timeout)
                 )
 
                 if response.status_code == 200:
@@ -188,16 +212,7 @@ class LMStudioClient(BaseLLMClient):
                     return content
 
                 else:
-                    error_msg = f"LM Studio API error: {response.status_code}"
-                    try:
-                        error_data = response.json()
-                        error_detail = error_data.get("error", {})
-                        if isinstance(error_detail, dict):
-                            error_msg += f" - {error_detail.get('message', response.text)}"
-                        else:
-                            error_msg += f" - {error_detail}"
-                    except (ValueError, json.JSONDecodeError):
-                        error_msg += f" - {response.text[:200]}"
+                    error_msg = self._error_message(response.status_code, response.text)
 
                     self.logger.error(error_msg)
 
@@ -264,91 +279,173 @@ class LMStudioClient(BaseLLMClient):
         # Validate messages
         self._validate_messages(messages)
 
-        # Build OpenAI-compatible payload
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "stream": True,  # Enable streaming
-        }
-
-        # Add optional parameters
-        if "top_p" in kwargs:
-            payload["top_p"] = kwargs["top_p"]
-        if "frequency_penalty" in kwargs:
-            payload["frequency_penalty"] = kwargs["frequency_penalty"]
-        if "presence_penalty" in kwargs:
-            payload["presence_penalty"] = kwargs["presence_penalty"]
-        if "stop" in kwargs:
-            payload["stop"] = kwargs["stop"]
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
 
         try:
-            response = requests.post(
+            with self.session.post(
                 self.chat_url,
                 json=payload,
                 stream=True,  # Enable streaming
-                timeout=kwargs.get("timeout", 120),
-            )
+                timeout=kwargs.get("timeout", self.request_timeout),
+            ) as response:
+                if response.status_code == 200:
+                    # Process OpenAI-compatible streaming response
+                    for line in response.iter_lines():
+                        if line:
+                            line_text = line.decode("utf-8")
+
+                            # Skip empty lines
+                            if not line_text.strip():
+                                continue
+
+                            # OpenAI format uses "data: " prefix
+                            if line_text.startswith("data: "):
+                                line_text = line_text[6:]  # Remove "data: " prefix
+
+                            # Check for stream end
+                            if line_text.strip() == "[DONE]":
+                                break
+
+                            try:
+                                chunk_data = json.loads(line_text)
+
+                                # Extract content from OpenAI format
+                                choices = chunk_data.get("choices", [])
+                                if choices:
+                                    delta = choices[0].get("delta", {})
+                                    content = delta.get("content", "")
+
+                                    if content:
+                                        yield content
+
+                            except json.JSONDecodeError as e:
+                                self.logger.warning(f"Failed to parse streaming chunk: {e}")
+                                continue
+                else:
+                    error_msg = self._error_message(response.status_code, response.text)
 
-            if response.status_code == 200:
-                # Process OpenAI-compatible streaming response
-                for line in response.iter_lines():
-                    if line:
-                        line_text = line.decode("utf-8")
+                    self.logger.error(error_msg)
+                    raise ConnectionError(error_msg)
+
+        except requests.exceptions.Timeout:
+            raise ConnectionError("LM Studio request timeout. Check if server is running.")
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(
+                f"Cannot connect to LM Studio at {self.base_url}. "
+                "Make sure LM Studio is running and server is started."
+            ) from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error in streaming: {e}")
+            raise
+
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> str:
+        """
+        Send chat request to LM Studio without blocking the event loop
+
+        Same arguments, retries and errors as chat().
+        """
+        self._validate_messages(messages)
+        payload = self._build_payload(messages, temperature, max_tokens, stream=False, **kwargs)
+
+        max_retries = kwargs.get("max_retries", 3)
+        for attempt in range(max_retries):
+            try:
+                status, body = await self._apost(
+                    self.chat_url, payload, timeout=kwargs.get("timeout", self.request_timeout)
+                )
 
-                        # Skip empty lines
-                        if not line_text.strip():
+                if status == 200:
+                    choices = json.loads(body).get("choices", [])
+                    content = (
+                        choices[0].get("message", {}).get("content", "").strip() if choices else ""
+                    )
+                    if not content:
+                        self.logger.warning("Empty content in LM Studio response")
+                        if attempt < max_retries - 1:
+                            await asyncio.sleep(1.0 * (2**attempt))
                             continue
+                    return content
+
+                error_msg = self._error_message(status, body)
+                self.logger.error(error_msg)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0 * (2**attempt))
+                    continue
+                raise ConnectionError(error_msg)
+
+            except asyncio.TimeoutError:
+                self.logger.warning(
+                    f"LM Studio request timeout (attempt {attempt + 1}/{max_retries})"
+                )
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2.0 * (2**attempt))
+                    continue
+                raise ConnectionError("LM Studio request timeout. Check if server is running.")
 
-                        # OpenAI format uses "data: " prefix
-                        if line_text.startswith("data: "):
-                            line_text = line_text[6:]  # Remove "data: " prefix
+            except aiohttp.ClientConnectionError as e:
+                self.logger.warning(
+                    f"Cannot connect to LM Studio (attempt {attempt + 1}/{max_retries})"
+                )
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0 * (2**attempt))
+                    continue
+                raise ConnectionError(
+                    f"Cannot connect to LM Studio at {self.base_url}. "
+                    "Make sure LM Studio is running and server is started."
+                ) from e
 
-                        # Check for stream end
-                        if line_text.strip() == "[DONE]":
-                            break
+        raise ConnectionError("Failed to get response after maximum retries")
 
-                        try:
-                            chunk_data = json.loads(line_text)
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response from LM Studio without blocking the event loop
 
-                            # Extract content from OpenAI format
-                            choices = chunk_data.get("choices", [])
-                            if choices:
-                                delta = choices[0].get("delta", {})
-                                content = delta.get("content", "")
+        Same arguments and errors as chat_stream().
+        """
+        self._validate_messages(messages)
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
 
-                                if content:
-                                    yield content
+        try:
+            async for line_text in self._apost_lines(
+                self.chat_url, payload, timeout=kwargs.get("timeout", self.request_timeout)
+            ):
+                # OpenAI format uses "data: " prefix
+                if line_text.startswith("data: "):
+                    line_text = line_text[6:]
+                if line_text == "[DONE]":
+                    break
 
-                        except json.JSONDecodeError as e:
-                            self.logger.warning(f"Failed to parse streaming chunk: {e}")
-                            continue
-            else:
-                error_msg = f"LM Studio API error: {response.status_code}"
                 try:
-                    error_data = response.json()
-                    error_detail = error_data.get("error", {})
-                    if isinstance(error_detail, dict):
-                        error_msg += f" - {error_detail.get('message', response.text)}"
-                    else:
-                        error_msg += f" - {error_detail}"
-                except (ValueError, json.JSONDecodeError):
-                    error_msg += f" - {response.text[:200]}"
+                    chunk_data = json.loads(line_text)
+                except json.JSONDecodeError as e:
+                    self.logger.warning(f"Failed to parse streaming chunk: {e}")
+                    continue
 
-                self.logger.error(error_msg)
-                raise ConnectionError(error_msg)
+                choices = chunk_data.get("choices", [])
+                if choices:
+                    content = choices[0].get("delta", {}).get("content", "")
+                    if content:
+                        yield content
 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             raise ConnectionError("LM Studio request timeout. Check if server is running.")
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             raise ConnectionError(
                 f"Cannot connect to LM Studio at {self.base_url}. "
                 "Make sure LM Studio is running and server is started."
             ) from e
-        except Exception as e:
-            self.logger.error(f"Unexpected error in streaming: {e}")
-            raise
 
     def get_model_info(self) -> Dict:
         """
@@ -358,7 +455,7 @@ class LMStudioClient(BaseLLMClient):
             Dictionary with model information
         """
         try:
-            response = requests.get(self.models_url, timeout=5)
+            response = self.session.get(self.models_url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 models = data.get("data", [])
@@ -391,5 +488,3 @@ class LMStudioClient(BaseLLMClient):
             base_info["available_models"] = self.list_models()
 
         return base_info
-
-
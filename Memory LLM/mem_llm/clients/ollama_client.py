@@ -9,10 +9,12 @@ Author: C. Emre Karatas
 Version: 1.3.0
 """
 
+import asyncio
 import json
 import time
-from typing import Dict, Iterator, List
+from typing import AsyncIterator, Dict, Iterator, List
 
+import aiohttp
 import requests
 
 from ..base_llm_client import BaseLLMClient
@@ -45,6 +47,7 @@ class OllamaClient(BaseLLMClient):
         self.api_url = f"{base_url}/api/generate"
         self.chat_url = f"{base_url}/api/chat"
         self.tags_url = f"{base_url}/api/tags"
+        self._init_http(self.base_url, **kwargs)
 
         self.logger.debug(f"Initialized Ollama client: {base_url}, model: {model}")
 
@@ -56,7 +59,7 @@ class OllamaClient(BaseLLMClient):
             True if service is available
         """
         try:
-            response = requests.get(self.tags_url, timeout=5)
+            response = self.session.get(self.tags_url, timeout=5)
             return response.status_code == 200
         except Exception as e:
             self.logger.debug(f"Ollama connection check failed: {e}")
@@ -70,7 +73,7 @@ class OllamaClient(BaseLLMClient):
             List of model names
         """
         try:
-            response = requests.get(self.tags_url, timeout=5)
+            response = self.session.get(self.tags_url, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 return [model["name"] for model in data.get("models", [])]
@@ -105,44 +108,18 @@ class OllamaClient(BaseLLMClient):
         # Validate messages
         self._validate_messages(messages)
 
-        # Build payload
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                "num_ctx": kwargs.get("num_ctx", 4096),
-                "top_k": kwargs.get("top_k", 40),
-                "top_p": kwargs.get("top_p", 0.9),
-                "num_thread": kwargs.get("num_thread", 8),
-            },
-        }
-
-        # Disable thinking mode for thinking-enabled models
-        # (Qwen3, DeepSeek) to get direct answers
-        if any(name in self.model.lower() for name in ["qwen", "deepseek", "qwq"]):
-            payload["options"]["enable_thinking"] = False
+        payload = self._build_payload(messages, temperature, max_tokens, stream=False, **kwargs)
 
         # Send request with retry logic
         max_retries = kwargs.get("max_retries", 3)
         for attempt in range(max_retries):
             try:
-                response = requests.post(
-                    self.chat_url, json=payload, timeout=kwargs.get("timeout", 120)
+                response = self.session.post(
+                    self.chat_url, json=payload, timeout=kwargs.get("timeout", self.request_timeout)
                 )
 
                 if response.status_code == 200:
-                    response_data = response.json()
-                    message = response_data.get("message", {})
-
-                    # Get content - primary response field
-                    result = message.get("content", "").strip()
-
-                    # Fallback: Extract from thinking if content is empty
-                    if not result and message.get("thinking"):
-                        result = self._extract_from_thinking(message.get("thinking", ""))
+                    result = self._parse_response(response.json())
 
                     if not result:
                         self.logger.warning("Empty response from Ollama")
@@ -186,6 +163,47 @@ class OllamaClient(BaseLLMClient):
 
         raise ConnectionError("Failed to get response after maximum retries")
 
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        **kwargs,
+    ) -> Dict:
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+                "num_ctx": kwargs.get("num_ctx", 4096),
+                "top_k": kwargs.get("top_k", 40),
+                "top_p": kwargs.get("top_p", 0.9),
+                "num_thread": kwargs.get("num_thread", 8),
+            },
+        }
+
+        # Disable thinking mode for thinking-enabled models
+        # (Qwen3, DeepSeek) to get direct answers
+        if any(name in self.model.lower() for name in ["qwen", "deepseek", "qwq"]):
+            payload["options"]["enable_thinking"] = False
+
+        return payload
+
+    def _parse_response(self, response_data: Dict) -> str:
+        message = response_data.get("message", {})
+
+        # Get content - primary response field
+        result = message.get("content", "").strip()
+
+        # Fallback: Extract from thinking if content is empty
+        if not result and message.get("thinking"):
+            result = self._extract_from_thinking(message.get("thinking", ""))
+
+        return result
+
     def _extract_from_thinking(self, thinking: str) -> str:
         """
         Extract actual answer from thinking process
@@ -256,68 +274,149 @@ class OllamaClient(BaseLLMClient):
         # Validate messages
         self._validate_messages(messages)
 
-        # Build payload
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "stream": True,  # Enable streaming
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                "num_ctx": kwargs.get("num_ctx", 4096),
-                "top_k": kwargs.get("top_k", 40),
-                "top_p": kwargs.get("top_p", 0.9),
-                "num_thread": kwargs.get("num_thread", 8),
-            },
-        }
-
-        # Disable thinking mode for thinking-enabled models
-        if any(name in self.model.lower() for name in ["qwen", "deepseek", "qwq"]):
-            payload["options"]["enable_thinking"] = False
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
 
         try:
-            response = requests.post(
+            with self.session.post(
                 self.chat_url,
                 json=payload,
                 stream=True,  # Enable streaming
-                timeout=kwargs.get("timeout", 120),
-            )
+                timeout=kwargs.get("timeout", self.request_timeout),
+            ) as response:
+                if response.status_code == 200:
+                    # Process streaming response
+                    for line in response.iter_lines():
+                        if line:
+                            try:
+                                chunk_data = json.loads(line.decode("utf-8"))
+
+                                # Get message content
+                                message = chunk_data.get("message", {})
+                                content = message.get("content", "")
+
+                                if content:
+                                    yield content
+
+                                # Check if this is the final chunk
+                                if chunk_data.get("done", False):
+                                    break
+
+                            except json.JSONDecodeError as e:
+                                self.logger.warning(f"Failed to parse streaming chunk: {e}")
+                                continue
+                else:
+                    error_msg = f"Ollama API error: {response.status_code} - {response.text}"
+                    self.logger.error(error_msg)
+                    raise ConnectionError(error_msg)
 
-            if response.status_code == 200:
-                # Process streaming response
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            chunk_data = json.loads(line.decode("utf-8"))
+        except requests.exceptions.Timeout:
+            raise ConnectionError("Ollama request timeout. Check if service is running.")
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(
+                f"Cannot connect to Ollama at {self.base_url}. Make sure service is running."
+            ) from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error in streaming: {e}")
+            raise
 
-                            # Get message content
-                            message = chunk_data.get("message", {})
-                            content = message.get("content", "")
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> str:
+        """
+        Send chat request to Ollama without blocking the event loop
+
+        Same arguments, retries and errors as chat().
+        """
+        self._validate_messages(messages)
+        payload = self._build_payload(messages, temperature, max_tokens, stream=False, **kwargs)
 
-                            if content:
-                                yield content
+        max_retries = kwargs.get("max_retries", 3)
+        for attempt in range(max_retries):
+            try:
+                status, body = await self._apost(
+                    self.chat_url, payload, timeout=kwargs.get("timeout", self.request_timeout)
+                )
 
-                            # Check if this is the final chunk
-                            if chunk_data.get("done", False):
-                                break
+                if status == 200:
+                    result = self._parse_response(json.loads(body))
 
-                        except json.JSONDecodeError as e:
-                            self.logger.warning(f"Failed to parse streaming chunk: {e}")
+                    if not result:
+                        self.logger.warning("Empty response from Ollama")
+                        if attempt < max_retries - 1:
+                            await asyncio.sleep(1.0 * (2**attempt))
                             continue
-            else:
-                error_msg = f"Ollama API error: {response.status_code} - {response.text}"
+
+                    return result
+
+                error_msg = f"Ollama API error: {status} - {body}"
                 self.logger.error(error_msg)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0 * (2**attempt))
+                    continue
                 raise ConnectionError(error_msg)
 
-        except requests.exceptions.Timeout:
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Ollama request timeout (attempt {attempt + 1}/{max_retries})")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2.0 * (2**attempt))
+                    continue
+                raise ConnectionError("Ollama request timeout. Check if service is running.")
+
+            except aiohttp.ClientConnectionError as e:
+                self.logger.warning(
+                    f"Cannot connect to Ollama (attempt {attempt + 1}/{max_retries})"
+                )
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0 * (2**attempt))
+                    continue
+                raise ConnectionError(
+                    f"Cannot connect to Ollama at {self.base_url}. Make sure service is running."
+                ) from e
+
+        raise ConnectionError("Failed to get response after maximum retries")
+
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response from Ollama without blocking the event loop
+
+        Same arguments and errors as chat_stream().
+        """
+        self._validate_messages(messages)
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
+
+        try:
+            async for line in self._apost_lines(
+                self.chat_url, payload, timeout=kwargs.get("timeout", self.request_timeout)
+            ):
+                try:
+                    chunk_data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.logger.warning(f"Failed to parse streaming chunk: {e}")
+                    continue
+
+                content = chunk_data.get("message", {}).get("content", "")
+                if content:
+                    yield content
+
+                if chunk_data.get("done", False):
+                    break
+
+        except asyncio.TimeoutError:
             raise ConnectionError("Ollama request timeout. Check if service is running.")
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             raise ConnectionError(
                 f"Cannot connect to Ollama at {self.base_url}. Make sure service is running."
             ) from e
-        except Exception as e:
-            self.logger.error(f"Unexpected error in streaming: {e}")
-            raise
 
     def generate_with_memory_context(
         self, user_message: str, memory_summary: str, recent_conversations: List[Dict]
@@ -357,4 +456,3 @@ Use past interactions intelligently."""
         messages.append({"role": "user", "content": user_message})
 
         return self.chat(messages, temperature=0.7)
-
@@ -7,10 +7,12 @@ Works with LM Studio, llama.cpp server, vLLM, LocalAI, text-generation-webui, an
 similar runtimes.
 """
 
+import asyncio
 import json
 import time
-from typing import Dict, Iterator, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
+import aiohttp
 import requests
 
 from ..base_llm_client import BaseLLMClient
@@ -31,6 +33,7 @@ class OpenAICompatibleClient(BaseLLMClient):
         self.api_key = api_key
         self.chat_url = f"{self.base_url}/v1/chat/completions"
         self.models_url = f"{self.base_url}/v1/models"
+        self._init_http(self.base_url, **kwargs)
 
     def _headers(self) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
@@ -40,12 +43,12 @@ class OpenAICompatibleClient(BaseLLMClient):
 
     def check_connection(self) -> bool:
         try:
-            response = requests.get(self.models_url, headers=self._headers(), timeout=5)
+            response = self.session.get(self.models_url, headers=self._headers(), timeout=5)
             if response.status_code == 200:
                 return True
 
             # Some compatible servers expose chat without a models endpoint.
-            response = requests.post(
+            response = self.session.post(
                 self.chat_url,
                 headers=self._headers(),
                 json={
@@ -64,7 +67,7 @@ class OpenAICompatibleClient(BaseLLMClient):
 
     def list_models(self) -> List[str]:
         try:
-            response = requests.get(self.models_url, headers=self._headers(), timeout=5)
+            response = self.session.get(self.models_url, headers=self._headers(), timeout=5)
             if response.status_code != 200:
                 return [self.model] if self.model else []
 
@@ -105,6 +108,18 @@ class OpenAICompatibleClient(BaseLLMClient):
 
         return payload
 
+    def _error_message(self, status: int, body: str) -> str:
+        error_msg = f"OpenAI-compatible API error: {status}"
+        try:
+            error_detail = json.loads(body).get("error", {})
+            if isinstance(error_detail, dict):
+                error_msg += f" - {error_detail.get('message', body)}"
+            else:
+                error_msg += f" - {error_detail}"
+        except (ValueError, AttributeError):
+            error_msg += f" - {body[:200]}"
+        return error_msg
+
     def chat(
         self,
         messages: List[Dict[str, str]],
@@ -118,11 +133,11 @@ class OpenAICompatibleClient(BaseLLMClient):
         max_retries = kwargs.get("max_retries", 3)
         for attempt in range(max_retries):
             try:
-                response = requests.post(
+                response = self.session.post(
                     self.chat_url,
                     headers=self._headers(),
                     json=payload,
-                    timeout=kwargs.get("timeout", 120),
+                    timeout=kwargs.get("timeout", self.request_timeout),
                 )
 
                 if response.status_code == 200:
@@ -135,17 +150,7 @@ class OpenAICompatibleClient(BaseLLMClient):
                     message = choices[0].get("message", {})
                     return message.get("content", "").strip()
 
-                error_msg = f"OpenAI-compatible API error: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_detail = error_data.get("error", {})
-                    if isinstance(error_detail, dict):
-                        error_msg += f" - {error_detail.get('message', response.text)}"
-                    else:
-                        error_msg += f" - {error_detail}"
-                except (ValueError, json.JSONDecodeError):
-                    error_msg += f" - {response.text[:200]}"
-
+                error_msg = self._error_message(response.status_code, response.text)
                 self.logger.error(error_msg)
                 if attempt < max_retries - 1:
                     time.sleep(1.0 * (2**attempt))
@@ -178,24 +183,112 @@ class OpenAICompatibleClient(BaseLLMClient):
         payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
 
         try:
-            response = requests.post(
+            with self.session.post(
                 self.chat_url,
                 headers=self._headers(),
                 json=payload,
                 stream=True,
-                timeout=kwargs.get("timeout", 120),
-            )
+                timeout=kwargs.get("timeout", self.request_timeout),
+            ) as response:
+                if response.status_code != 200:
+                    raise ConnectionError(
+                        f"OpenAI-compatible API error: {response.status_code} - {response.text[:200]}"
+                    )
+
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+
+                    line_text = line.decode("utf-8").strip()
+                    if line_text.startswith("data: "):
+                        line_text = line_text[6:]
+                    if line_text == "[DONE]":
+                        break
+
+                    try:
+                        chunk_data = json.loads(line_text)
+                    except json.JSONDecodeError:
+                        continue
+
+                    choices = chunk_data.get("choices", [])
+                    if choices:
+                        delta = choices[0].get("delta", {})
+                        content = delta.get("content", "")
+                        if content:
+                            yield content
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(
+                f"Cannot connect to OpenAI-compatible server at {self.base_url}."
+            ) from e
 
-            if response.status_code != 200:
-                raise ConnectionError(
-                    f"OpenAI-compatible API error: {response.status_code} - {response.text[:200]}"
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> str:
+        self._validate_messages(messages)
+        payload = self._build_payload(messages, temperature, max_tokens, stream=False, **kwargs)
+
+        max_retries = kwargs.get("max_retries", 3)
+        for attempt in range(max_retries):
+            try:
+                status, body = await self._apost(
+                    self.chat_url,
+                    payload,
+                    timeout=kwargs.get("timeout", self.request_timeout),
+                    headers=self._headers(),
                 )
 
-            for line in response.iter_lines():
-                if not line:
+                if status == 200:
+                    choices = json.loads(body).get("choices", [])
+                    if not choices:
+                        self.logger.warning("No choices in OpenAI-compatible response")
+                        return ""
+
+                    message = choices[0].get("message", {})
+                    return message.get("content", "").strip()
+
+                error_msg = self._error_message(status, body)
+                self.logger.error(error_msg)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0 * (2**attempt))
                     continue
+                raise ConnectionError(error_msg)
+
+            except asyncio.TimeoutError:
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2.0 * (2**attempt))
+                    continue
+                raise ConnectionError("OpenAI-compatible request timeout.")
+            except aiohttp.ClientConnectionError as e:
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0 * (2**attempt))
+                    continue
+                raise ConnectionError(
+                    f"Cannot connect to OpenAI-compatible server at {self.base_url}."
+                ) from e
 
-                line_text = line.decode("utf-8").strip()
+        raise ConnectionError("Failed to get response after maximum retries")
+
+    async def achat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        self._validate_messages(messages)
+        payload = self._build_payload(messages, temperature, max_tokens, stream=True, **kwargs)
+
+        try:
+            async for line_text in self._apost_lines(
+                self.chat_url,
+                payload,
+                timeout=kwargs.get("timeout", self.request_timeout),
+                headers=self._headers(),
+            ):
                 if line_text.startswith("data: "):
                     line_text = line_text[6:]
                 if line_text == "[DONE]":
@@ -208,11 +301,10 @@ class OpenAICompatibleClient(BaseLLMClient):
 
                 choices = chunk_data.get("choices", [])
                 if choices:
-                    delta = choices[0].get("delta", {})
-                    content = delta.get("content", "")
+                    content = choices[0].get("delta", {}).get("content", "")
                     if content:
                         yield content
-        except requests.exceptions.ConnectionError as e:
+        except aiohttp.ClientConnectionError as e:
             raise ConnectionError(
                 f"Cannot connect to OpenAI-compatible server at {self.base_url}."
             ) from e
@@ -47,6 +47,11 @@ class ConfigManager:
                 "max_conversations_per_user": 1000,
                 "auto_cleanup": True,
                 "cleanup_after_days": 90,
+                "background_enrichment": False,  # Run post-turn memory updates on workers
+                "enrichment_workers": 2,
+                "enrichment_queue_size": 1000,  # Queued turns before chat() blocks
+                "graph_backend": "sqlite",  # "sqlite" (per-user .db, incremental) or "json"
+                "graph_max_open_shards": 64,  # Per-user graphs kept open (LRU)
             },
             "prompt": {
                 "template": "customer_service",
@@ -62,6 +67,9 @@ class ConfigManager:
                 "min_relevance_score": 0.3,
                 "enable_vector_search": False,  # v1.3.2+ - Optional semantic search
                 "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",  # Sentence transformers model
+                "vector_store": "chroma",  # "chroma" or "numpy" (built-in, no extra database)
+                "vector_store_options": None,  # numpy store: {"index": "ivf", "nprobe": 32}
+                "background_vector_sync": False,  # Push KB changes to the vector store off-thread
             },
             "response": {
                 "use_knowledge_base": True,
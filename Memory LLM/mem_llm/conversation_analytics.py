@@ -3,7 +3,7 @@ import io
 import json
 from collections import Counter
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Iterator, Tuple
 
 from .analytics.topic_extractor import TopicExtractor
 
@@ -15,14 +15,16 @@ class ConversationAnalytics:
         self.memory = memory_manager
         self.topic_extractor = TopicExtractor()
 
-    def _get_conversations(self, user_id: str):
-        """Return conversations for either JSON or SQL backends."""
+    def _iter_conversations(self, user_id: str) -> Iterator[Dict]:
+        """Stream conversations, oldest first, for either JSON or SQL backends."""
+        if hasattr(self.memory, "iter_conversations"):
+            return iter(self.memory.iter_conversations(user_id))
         if hasattr(self.memory, "load_memory"):
             data = self.memory.load_memory(user_id)
-            return data.get("conversations", [])
+            return iter(data.get("conversations", []))
         if hasattr(self.memory, "get_recent_conversations"):
-            return self.memory.get_recent_conversations(user_id, limit=100000)
-        return []
+            return iter(self.memory.get_recent_conversations(user_id, limit=100000))
+        return iter(())
 
     def get_conversation_stats(self, user_id: str) -> Dict:
         """
@@ -40,33 +42,15 @@ class ConversationAnalytics:
                 "most_active_day": str,
             }
         """
-        conversations = self._get_conversations(user_id)
-
-        if not conversations:
-            return {
-                "total_messages": 0,
-                "user_messages": 0,
-                "assistant_messages": 0,
-                "avg_message_length": 0.0,
-                "total_conversations": 0,
-                "first_interaction": None,
-                "last_interaction": None,
-                "most_active_day": None,
-            }
-
-        total_conversations = len(conversations)
-        # Each interaction has 1 user message
-        user_messages_count = total_conversations
-        # Each interaction has 1 bot response
-        assistant_messages_count = total_conversations
-        total_messages = user_messages_count + assistant_messages_count
-
+        total_conversations = 0
         total_length = 0
         days_counter = Counter()
         first_interaction = None
         last_interaction = None
 
-        for conv in conversations:
+        for conv in self._iter_conversations(user_id):
+            total_conversations += 1
+
             # Length calculation
             user_msg = conv.get("user_message", "")
             bot_msg = conv.get("bot_response", "")
@@ -87,6 +71,23 @@ class ConversationAnalytics:
                 except (ValueError, TypeError):
                     pass
 
+        if not total_conversations:
+            return {
+                "total_messages": 0,
+                "user_messages": 0,
+                "assistant_messages": 0,
+                "avg_message_length": 0.0,
+                "total_conversations": 0,
+                "first_interaction": None,
+                "last_interaction": None,
+                "most_active_day": None,
+            }
+
+        # Each interaction has 1 user message and 1 bot response
+        user_messages_count = total_conversations
+        assistant_messages_count = total_conversations
+        total_messages = user_messages_count + assistant_messages_count
+
         avg_length = total_length / total_messages if total_messages > 0 else 0.0
         most_active_day = days_counter.most_common(1)[0][0] if days_counter else None
 
@@ -105,16 +106,8 @@ class ConversationAnalytics:
         """
         Extract and count topics from conversations
         """
-        conversations = self._get_conversations(user_id)
-
-        if not conversations:
-            return {}
-
-        messages = []
-        for conv in conversations:
-            messages.append(conv.get("user_message", ""))
-            # Optionally include bot responses too
-
+        # Only user messages; bot responses could optionally be included too
+        messages = (conv.get("user_message", "") for conv in self._iter_conversations(user_id))
         return self.topic_extractor.extract_topics(messages, top_n)
 
     def get_engagement_metrics(self, user_id: str) -> Dict:
@@ -129,9 +122,34 @@ class ConversationAnalytics:
                 "interactions_per_active_day": float
             }
         """
-        conversations = self._get_conversations(user_id)
+        # Turns arrive oldest first, so one day's timestamps are buffered at a
+        # time instead of grouping the whole history in memory.
+        total_interactions = 0
+        active_days = set()
+        day_times = []
+        current_day = None
+        total_session_minutes = 0
+        total_sessions = 0
 
-        if not conversations:
+        for conv in self._iter_conversations(user_id):
+            total_interactions += 1
+            timestamp_str = conv.get("timestamp")
+            if timestamp_str:
+                try:
+                    dt = datetime.fromisoformat(timestamp_str)
+                except (ValueError, TypeError):
+                    continue
+                day = dt.date()
+                if day != current_day:
+                    minutes, sessions = self._session_stats(day_times)
+                    total_session_minutes += minutes
+                    total_sessions += sessions
+                    day_times = []
+                    current_day = day
+                active_days.add(day)
+                day_times.append(dt)
+
+        if not total_interactions:
             return {
                 "engagement_score": 0.0,
                 "avg_session_length": 0.0,
@@ -139,55 +157,10 @@ class ConversationAnalytics:
                 "interactions_per_active_day": 0.0,
             }
 
-        # Group by day
-        interactions_by_day = {}
-        for conv in conversations:
-            timestamp_str = conv.get("timestamp")
-            if timestamp_str:
-                try:
-                    dt = datetime.fromisoformat(timestamp_str)
-                    date_key = dt.date().isoformat()
-                    if date_key not in interactions_by_day:
-                        interactions_by_day[date_key] = []
-                    interactions_by_day[date_key].append(dt)
-                except (ValueError, TypeError):
-                    pass
-
-        active_days = len(interactions_by_day)
-        total_interactions = len(conversations)
-
-        # Calculate session length (approximate)
-        # If interactions are within 30 mins, consider same session
-        total_session_minutes = 0
-        total_sessions = 0
-
-        for day, times in interactions_by_day.items():
-            times.sort()
-            if not times:
-                continue
-
-            current_session_start = times[0]
-            current_session_end = times[0]
-            total_sessions += 1
-
-            for i in range(1, len(times)):
-                diff = (times[i] - times[i - 1]).total_seconds() / 60
-                if diff > 30:  # New session
-                    session_duration = (
-                        current_session_end - current_session_start
-                    ).total_seconds() / 60
-                    # Minimum 1 min
-                    total_session_minutes += max(1, session_duration)
-
-                    current_session_start = times[i]
-                    current_session_end = times[i]
-                    total_sessions += 1
-                else:
-                    current_session_end = times[i]
-
-            # Add last session of the day
-            session_duration = (current_session_end - current_session_start).total_seconds() / 60
-            total_session_minutes += max(1, session_duration)
+        minutes, sessions = self._session_stats(day_times)
+        total_session_minutes += minutes
+        total_sessions += sessions
+        active_days = len(active_days)
 
         avg_session_length = total_session_minutes / total_sessions if total_sessions > 0 else 0
         interactions_per_day = total_interactions / active_days if active_days > 0 else 0
@@ -206,20 +179,46 @@ class ConversationAnalytics:
             "interactions_per_active_day": round(interactions_per_day, 1),
         }
 
+    @staticmethod
+    def _session_stats(times) -> Tuple[float, int]:
+        """Total minutes and count of sessions within one day's timestamps
+
+        Interactions within 30 minutes of each other belong to the same session;
+        every session counts as at least one minute.
+        """
+        if not times:
+            return 0, 0
+
+        times.sort()
+        total_minutes = 0
+        sessions = 1
+        session_start = session_end = times[0]
+
+        for i in range(1, len(times)):
+            diff = (times[i] - times[i - 1]).total_seconds() / 60
+            if diff > 30:  # New session
+                total_minutes += max(1, (session_end - session_start).total_seconds() / 60)
+                session_start = session_end = times[i]
+                sessions += 1
+            else:
+                session_end = times[i]
+
+        # Add last session of the day
+        total_minutes += max(1, (session_end - session_start).total_seconds() / 60)
+        return total_minutes, sessions
+
     def get_time_distribution(self, user_id: str) -> Dict[str, int]:
         """
         Get message distribution by hour of day
 
         Returns: {"00": 5, "01": 2, ..., "23": 10}
         """
-        conversations = self._get_conversations(user_id)
-
         hours_counter = Counter()
         # Initialize all hours with 0
         for h in range(24):
             hours_counter[f"{h:02d}"] = 0
 
-        for conv in conversations:
+        for conv in self._iter_conversations(user_id):
             timestamp_str = conv.get("timestamp")
             if timestamp_str:
                 try:
@@ -8,8 +8,9 @@ import json
 import logging
 import sqlite3
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,24 @@ class DataExporter:
         """
         self.memory = memory_manager
 
+    # Rows handed to a database driver per insert call
+    EXPORT_BATCH_SIZE = 1000
+
+    def _iter_conversations(self, user_id: str) -> Iterator[Dict]:
+        """Stream the user's full history, oldest first, from either backend"""
+        if hasattr(self.memory, "iter_conversations"):
+            return iter(self.memory.iter_conversations(user_id))
+        return iter(self.memory.get_recent_conversations(user_id, limit=1000))
+
+    def _iter_batches(self, user_id: str) -> Iterator[list]:
+        """Stream the user's history in lists of at most EXPORT_BATCH_SIZE"""
+        conversations = self._iter_conversations(user_id)
+        while True:
+            batch = list(islice(conversations, self.EXPORT_BATCH_SIZE))
+            if not batch:
+                return
+            yield batch
+
     def export_to_json(self, user_id: str, output_file: str) -> Dict[str, Any]:
         """
         Export user data to JSON file
@@ -36,35 +55,36 @@ class DataExporter:
             Export statistics
         """
         try:
-            # Get all user data
-            conversations = self.memory.get_recent_conversations(user_id, limit=1000)
             profile = getattr(self.memory, "user_profiles", {}).get(user_id, {})
 
-            data = {
-                "user_id": user_id,
-                "export_date": datetime.now().isoformat(),
-                "conversations": conversations,
-                "profile": profile,
-                "metadata": {
-                    "total_conversations": len(conversations),
-                    "format": "json",
-                    "version": "1.0",
-                },
-            }
-
-            # Write to file
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
+            # Written incrementally, one conversation per line, so memory stays
+            # bounded however long the history is. The layout matches what
+            # json.dump produced before: conversations, then profile and metadata.
+            count = 0
             with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            logger.info(f"Exported {len(conversations)} conversations to {output_file}")
+                f.write("{\n")
+                f.write(f'  "user_id": {json.dumps(user_id, ensure_ascii=False)},\n')
+                f.write(f'  "export_date": {json.dumps(datetime.now().isoformat())},\n')
+                f.write('  "conversations": [')
+                for conv in self._iter_conversations(user_id):
+                    f.write(",\n    " if count else "\n    ")
+                    f.write(json.dumps(conv, ensure_ascii=False, default=str))
+                    count += 1
+                f.write("\n  ],\n" if count else "],\n")
+                f.write(f'  "profile": {json.dumps(profile, ensure_ascii=False, default=str)},\n')
+                metadata = {"total_conversations": count, "format": "json", "version": "1.0"}
+                f.write(f'  "metadata": {json.dumps(metadata)}\n')
+                f.write("}\n")
+
+            logger.info(f"Exported {count} conversations to {output_file}")
 
             return {
                 "success": True,
                 "file": str(output_path),
-                "conversations": len(conversations),
+                "conversations": count,
                 "size_bytes": output_path.stat().st_size,
             }
 
@@ -84,18 +104,18 @@ class DataExporter:
             Export statistics
         """
         try:
-            conversations = self.memory.get_recent_conversations(user_id, limit=1000)
-
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
+            count = 0
             with open(output_path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.DictWriter(
                     f, fieldnames=["timestamp", "user_message", "bot_response", "metadata"]
                 )
                 writer.writeheader()
 
-                for conv in conversations:
+                for conv in self._iter_conversations(user_id):
+                    count += 1
                     writer.writerow(
                         {
                             "timestamp": conv.get("timestamp", ""),
@@ -105,12 +125,12 @@ class DataExporter:
                         }
                     )
 
-            logger.info(f"Exported {len(conversations)} conversations to CSV: {output_file}")
+            logger.info(f"Exported {count} conversations to CSV: {output_file}")
 
             return {
                 "success": True,
                 "file": str(output_path),
-                "conversations": len(conversations),
+                "conversations": count,
                 "size_bytes": output_path.stat().st_size,
             }
 
@@ -130,8 +150,6 @@ class DataExporter:
             Export statistics
         """
         try:
-            conversations = self.memory.get_recent_conversations(user_id, limit=1000)
-
             db_path = Path(db_file)
             db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -152,32 +170,37 @@ class DataExporter:
             """
             )
 
-            # Insert conversations
-            for conv in conversations:
-                cursor.execute(
+            # Insert conversations, one batch at a time
+            count = 0
+            for batch in self._iter_batches(user_id):
+                cursor.executemany(
                     """
                     INSERT INTO conversations
                     (user_id, timestamp, user_message, bot_response, metadata)
                     VALUES (?, ?, ?, ?, ?)
                 """,
-                    (
-                        user_id,
-                        conv.get("timestamp", datetime.now().isoformat()),
-                        conv.get("user_message", ""),
-                        conv.get("bot_response", ""),
-                        json.dumps(conv.get("metadata", {})),
-                    ),
+                    [
+                        (
+                            user_id,
+                            conv.get("timestamp", datetime.now().isoformat()),
+                            conv.get("user_message", ""),
+                            conv.get("bot_response", ""),
+                            json.dumps(conv.get("metadata", {})),
+                        )
+                        for conv in batch
+                    ],
                 )
+                count += len(batch)
 
             conn.commit()
             conn.close()
 
-            logger.info(f"Exported {len(conversations)} conversations to SQLite: {db_file}")
+            logger.info(f"Exported {count} conversations to SQLite: {db_file}")
 
             return {
                 "success": True,
                 "file": str(db_path),
-                "conversations": len(conversations),
+                "conversations": count,
                 "size_bytes": db_path.stat().st_size,
             }
 
@@ -207,8 +230,6 @@ class DataExporter:
             }
 
         try:
-            conversations = self.memory.get_recent_conversations(user_id, limit=1000)
-
             # Parse connection string to get database name
             import re
 
@@ -251,33 +272,38 @@ class DataExporter:
             """
             )
 
-            # Insert conversations
-            for conv in conversations:
-                cursor.execute(
+            # Insert conversations, one batch at a time
+            count = 0
+            for batch in self._iter_batches(user_id):
+                cursor.executemany(
                     """
                     INSERT INTO conversations
                     (user_id, timestamp, user_message, bot_response, metadata)
                     VALUES (%s, %s, %s, %s, %s)
                 """,
-                    (
-                        user_id,
-                        conv.get("timestamp", datetime.now().isoformat()),
-                        conv.get("user_message", ""),
-                        conv.get("bot_response", ""),
-                        json.dumps(conv.get("metadata", {})),
-                    ),
+                    [
+                        (
+                            user_id,
+                            conv.get("timestamp", datetime.now().isoformat()),
+                            conv.get("user_message", ""),
+                            conv.get("bot_response", ""),
+                            json.dumps(conv.get("metadata", {})),
+                        )
+                        for conv in batch
+                    ],
                 )
+                count += len(batch)
 
             conn.commit()
             cursor.close()
             conn.close()
 
-            logger.info(f"Exported {len(conversations)} conversations to PostgreSQL")
+            logger.info(f"Exported {count} conversations to PostgreSQL")
 
             return {
                 "success": True,
                 "database": "postgresql",
-                "conversations": len(conversations),
+                "conversations": count,
                 "database_created": db_name is not None,
             }
 
@@ -314,8 +340,6 @@ class DataExporter:
             }
 
         try:
-            conversations = self.memory.get_recent_conversations(user_id, limit=1000)
-
             client = MongoClient(connection_string)
 
             # MongoDB automatically creates database and collection if they don't exist
@@ -331,31 +355,34 @@ class DataExporter:
             if is_new_collection:
                 logger.info(f"Creating MongoDB collection: {collection}")
 
-            # Prepare documents
-            documents = []
-            for conv in conversations:
-                doc = {
-                    "user_id": user_id,
-                    "timestamp": conv.get("timestamp", datetime.now().isoformat()),
-                    "user_message": conv.get("user_message", ""),
-                    "bot_response": conv.get("bot_response", ""),
-                    "metadata": conv.get("metadata", {}),
-                    "export_date": datetime.now(),
-                }
-                documents.append(doc)
-
-            # Insert documents
-            result = coll.insert_many(documents)
+            # Insert documents, one batch at a time
+            count = 0
+            inserted = 0
+            for batch in self._iter_batches(user_id):
+                documents = [
+                    {
+                        "user_id": user_id,
+                        "timestamp": conv.get("timestamp", datetime.now().isoformat()),
+                        "user_message": conv.get("user_message", ""),
+                        "bot_response": conv.get("bot_response", ""),
+                        "metadata": conv.get("metadata", {}),
+                        "export_date": datetime.now(),
+                    }
+                    for conv in batch
+                ]
+                result = coll.insert_many(documents)
+                count += len(batch)
+                inserted += len(result.inserted_ids)
 
             client.close()
 
-            logger.info(f"Exported {len(conversations)} conversations to MongoDB")
+            logger.info(f"Exported {count} conversations to MongoDB")
 
             return {
                 "success": True,
                 "database": "mongodb",
-                "conversations": len(conversations),
-                "inserted_ids": len(result.inserted_ids),
+                "conversations": count,
+                "inserted_ids": inserted,
                 "database_created": is_new_db,
                 "collection_created": is_new_collection,
             }
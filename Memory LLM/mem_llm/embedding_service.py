@@ -0,0 +1,407 @@
+"""
+Shared Embedding Service
+========================
+One embedding model per process, shared by every vector store and agent.
+
+The API server builds one agent (and so one vector store) per user session.
+Loading a SentenceTransformer per store costs seconds and hundreds of MB each
+time, so models are kept in a process-wide registry keyed by model name.
+
+Encoding is serialized through a single worker thread per model. Concurrent
+``encode`` calls are merged into one ``model.encode`` batch (micro-batching),
+which is both thread-safe and faster than encoding each request on its own.
+
+``EmbeddingCache`` sits in front of the model: vectors are stored by
+(model, sha256(text)), in an in-memory LRU backed by a SQLite file, so
+re-syncing a knowledge base or repeating a query needs no inference.
+"""
+
+import hashlib
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def _load_sentence_transformer(model_name: str) -> Any:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError(
+            "sentence-transformers not installed. "
+            "Install with: pip install sentence-transformers"
+        )
+    return SentenceTransformer(model_name)
+
+
+class EmbeddingService:
+    """Thread-safe, micro-batching encoder around one embedding model"""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        loader: Optional[Callable[[str], Any]] = None,
+    ):
+        """
+        Initialize embedding service (the model is loaded on first use)
+
+        Args:
+            model_name: Embedding model name (sentence-transformers compatible)
+            max_batch_size: Most texts encoded in one model call
+            max_wait_ms: How long the worker waits for more requests to join a batch
+            loader: Callable returning a model with ``encode`` (default: SentenceTransformer)
+        """
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._loader = loader or _load_sentence_transformer
+        self._model = None
+        self._load_lock = threading.Lock()
+
+        self._queue: "queue.Queue[Optional[Tuple[List[str], Future]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        """The underlying model, loaded once"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    start = time.perf_counter()
+                    self._model = self._loader(self.model_name)
+                    logger.info(
+                        f"Loaded embedding model {self.model_name} "
+                        f"in {time.perf_counter() - start:.2f}s"
+                    )
+        return self._model
+
+    def load(self) -> Any:
+        """Load the model now instead of on the first encode"""
+        return self.model
+
+    def encode(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        """
+        Embed texts (thread-safe)
+
+        Requests from concurrent callers are encoded together in one batch.
+
+        Args:
+            texts: Text or list of texts
+
+        Returns:
+            One embedding per text
+        """
+        if isinstance(texts, str):
+            texts = [texts]
+        else:
+            texts = list(texts)
+        if not texts:
+            return []
+
+        self._start_worker()
+        future: Future = Future()
+        self._queue.put((texts, future))
+        return future.result()
+
+    def _start_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"mem-llm-embed-{self.model_name}",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            # Collect more requests until the batch is full or the wait is over
+            batch = [item]
+            size = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            self._encode_batch(batch)
+            if stop:
+                return
+
+    def _encode_batch(self, batch: List[Tuple[List[str], Future]]) -> None:
+        texts = [text for request, _ in batch for text in request]
+        try:
+            vectors = self.model.encode(
+                texts, batch_size=self.max_batch_size, show_progress_bar=False
+            )
+            vectors = vectors.tolist() if hasattr(vectors, "tolist") else list(vectors)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for request, future in batch:
+            future.set_result(vectors[offset : offset + len(request)])
+            offset += len(request)
+
+    def close(self) -> None:
+        """Stop the worker thread after the queued requests are encoded"""
+        with self._worker_lock:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker.join()
+                self._worker = None
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: str, **kwargs) -> EmbeddingService:
+    """
+    Get the process-wide embedding service for a model
+
+    Args:
+        model_name: Embedding model name
+        **kwargs: Passed to EmbeddingService when it is first created
+
+    Returns:
+        The shared EmbeddingService for that model
+    """
+    with _services_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = EmbeddingService(model_name, **kwargs)
+            _services[model_name] = service
+        return service
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache: in-memory LRU over a SQLite store"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000):
+        """
+        Initialize embedding cache
+
+        Args:
+            path: SQLite file for persistent entries (None = in-memory LRU only)
+            max_entries: Vectors kept in the in-memory LRU
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Vectors are held as packed float32 to keep the LRU small
+        self._lru: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID
+            """
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached vectors
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            A vector per text, or None where it is not cached
+        """
+        keys = [(model, self._hash(text)) for text in texts]
+        found: Dict[Tuple[str, str], bytes] = {}
+        with self._lock:
+            for key in keys:
+                blob = self._lru.get(key)
+                if blob is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = blob
+
+            missing = [key[1] for key in keys if key not in found]
+            if missing and self._conn is not None:
+                for i in range(0, len(missing), 500):
+                    chunk = missing[i : i + 500]
+                    rows = self._conn.execute(
+                        f"""
+                        SELECT text_hash, vector FROM embeddings
+                        WHERE model = ? AND text_hash IN ({",".join("?" * len(chunk))})
+                    """,
+                        [model, *chunk],
+                    ).fetchall()
+                    for text_hash, blob in rows:
+                        found[(model, text_hash)] = blob
+                        self._remember((model, text_hash), blob)
+
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+
+        return [self._unpack(found[key]) if key in found else None for key in keys]
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]]) -> None:
+        """
+        Store vectors
+
+        Args:
+            model: Embedding model name
+            texts: Texts that were embedded
+            vectors: Their embeddings
+        """
+        entries = [
+            (model, self._hash(text), array("f", vector).tobytes())
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock:
+            for model_name, text_hash, blob in entries:
+                self._remember((model_name, text_hash), blob)
+            if self._conn is not None:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                    entries,
+                )
+                self._conn.commit()
+
+    def _remember(self, key: Tuple[str, str], blob: bytes) -> None:
+        self._lru[key] = blob
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    @staticmethod
+    def _unpack(blob: bytes) -> List[float]:
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and cache size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._lru),
+                "persistent": self._conn is not None,
+            }
+
+    def close(self) -> None:
+        """Close the SQLite store"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: Optional[str] = None, **kwargs) -> EmbeddingCache:
+    """
+    Get the process-wide embedding cache for a file
+
+    Stores that persist to the same directory share one cache (and one LRU).
+
+    Args:
+        path: SQLite file (None = the shared in-memory-only cache)
+        **kwargs: Passed to EmbeddingCache when it is first created
+
+    Returns:
+        The shared EmbeddingCache for that path
+    """
+    key = str(Path(path).resolve()) if path else ""
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(path, **kwargs)
+            _caches[key] = cache
+        return cache
+
+
+class ServiceEmbeddingFunction:
+    """ChromaDB embedding function backed by a shared EmbeddingService"""
+
+    def __init__(self, service: EmbeddingService, cache: Optional[EmbeddingCache] = None):
+        self.service = service
+        self.cache = cache
+        self.model_name = service.model_name
+
+    # ChromaDB >=1.0 calls name() as a method, and passes the
+    # texts as the keyword argument `input`.
+    def name(self) -> str:
+        return self.model_name
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        texts = list(input)
+        if self.cache is None:
+            return self.service.encode(texts)
+
+        vectors = self.cache.get_many(self.model_name, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Duplicates within one call are embedded once
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = dict(zip(unique, self.service.encode(unique)))
+            self.cache.put_many(self.model_name, unique, [encoded[t] for t in unique])
+            for i in missing:
+                vectors[i] = encoded[texts[i]]
+        return vectors
+
+    def encode_queries(self, queries: List[str]) -> List[List[float]]:
+        return self.__call__(queries)
+
+    def embed_query(self, input) -> List[List[float]]:
+        texts = [input] if isinstance(input, str) else list(input)
+        return self.__call__(texts)
+
+    def embed_documents(self, input) -> List[List[float]]:
+        texts = [input] if isinstance(input, str) else list(input)
+        return self.__call__(texts)
@@ -0,0 +1,183 @@
+"""
+Background Memory Enrichment
+============================
+
+Runs post-turn memory work (extraction calls, hierarchical categorization,
+profile, router and graph updates) on worker threads so ``MemAgent.chat``
+can return once the raw interaction is stored.
+
+Jobs for one user always go to the same worker and run in submission order;
+different users are processed in parallel. Each worker has a bounded queue,
+and ``submit`` blocks while it is full, so a slow LLM backend throttles
+callers instead of growing memory without limit.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentQueue:
+    """Bounded, per-user ordered worker pool for memory enrichment jobs"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 1000):
+        """
+        Args:
+            workers: Worker threads; a user's jobs always run on the same one
+            max_pending: Queued jobs across all workers before submit() blocks
+        """
+        self.workers = max(1, workers)
+        per_worker = max(1, max_pending // self.workers)
+        self._queues: List["queue.Queue"] = [
+            queue.Queue(maxsize=per_worker) for _ in range(self.workers)
+        ]
+
+        self._ids = itertools.count()
+        self._pending: Dict[int, float] = {}  # job id -> submit time
+        self._cond = threading.Condition()
+        self._processed = 0
+        self._failed = 0
+        self._total_lag = 0.0
+        self._max_lag = 0.0
+        self._closed = False
+
+        self._threads = [
+            threading.Thread(
+                target=self._worker_loop, args=(q,), name=f"mem-llm-enrichment-{i}", daemon=True
+            )
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        user_id: str,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Queue ``func(*args)`` behind the user's earlier jobs
+
+        Blocks while the user's worker queue is full (backpressure). After
+        close() the job runs inline.
+
+        Args:
+            user_id: Jobs with the same user_id run in order
+            timeout: Maximum seconds to wait for queue space (None = no limit)
+
+        Raises:
+            queue.Full: If no space freed up within ``timeout``
+        """
+        if self._closed:
+            func(*args)
+            return
+
+        job_id = next(self._ids)
+        with self._cond:
+            self._pending[job_id] = time.monotonic()
+        try:
+            self._queue_for(user_id).put((job_id, func, args), timeout=timeout)
+        except queue.Full:
+            self._finish(job_id, failed=True)
+            raise
+
+    def _queue_for(self, user_id: str) -> "queue.Queue":
+        return self._queues[zlib.crc32(str(user_id).encode("utf-8")) % self.workers]
+
+    def _worker_loop(self, jobs: "queue.Queue") -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            job_id, func, args = job
+            failed = False
+            try:
+                func(*args)
+            except Exception as e:
+                failed = True
+                logger.error(f"Memory enrichment job failed: {e}")
+            self._finish(job_id, failed)
+
+    def _finish(self, job_id: int, failed: bool) -> None:
+        with self._cond:
+            submitted = self._pending.pop(job_id, None)
+            if submitted is not None:
+                lag = time.monotonic() - submitted
+                self._total_lag += lag
+                self._max_lag = max(self._max_lag, lag)
+            if failed:
+                self._failed += 1
+            else:
+                self._processed += 1
+            if not self._pending:
+                self._cond.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every job submitted so far has finished
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue is empty, False if the timeout expired first
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout=timeout)
+
+    def close(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers
+
+        Args:
+            drain: Finish queued jobs first; False drops them
+            timeout: Maximum seconds to wait for the drain
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if drain and not self.drain(timeout):
+            logger.warning(f"Closing with {len(self._pending)} enrichment jobs still queued")
+        for jobs in self._queues:
+            # Drop whatever is left so the stop sentinel fits
+            while True:
+                try:
+                    job_id = jobs.get_nowait()[0]
+                except queue.Empty:
+                    break
+                self._finish(job_id, failed=True)
+            jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth and lag
+
+        Returns:
+            Dict with ``queue_depth`` (submitted, not yet finished),
+            ``lag_ms`` (age of the oldest unfinished job), ``avg_lag_ms`` and
+            ``max_lag_ms`` (submit to finish), ``processed`` and ``failed``
+        """
+        now = time.monotonic()
+        with self._cond:
+            finished = self._processed + self._failed
+            oldest = min(self._pending.values(), default=now)
+            return {
+                "queue_depth": len(self._pending),
+                "lag_ms": round((now - oldest) * 1000, 1),
+                "avg_lag_ms": round(self._total_lag / finished * 1000, 1) if finished else 0.0,
+                "max_lag_ms": round(self._max_lag * 1000, 1),
+                "processed": self._processed,
+                "failed": self._failed,
+                "workers": self.workers,
+            }
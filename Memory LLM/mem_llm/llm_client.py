@@ -8,6 +8,8 @@ from typing import Dict, List, Optional
 
 import requests
 
+from .base_llm_client import get_http_session
+
 
 class OllamaClient:
     """Uses local LLM model with Ollama API"""
@@ -22,6 +24,7 @@ class OllamaClient:
         self.base_url = base_url
         self.api_url = f"{base_url}/api/generate"
         self.chat_url = f"{base_url}/api/chat"
+        self.session = get_http_session(base_url)
 
     def check_connection(self) -> bool:
         """
@@ -31,7 +34,7 @@ class OllamaClient:
             Is service running?
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception:
             return False
@@ -44,7 +47,7 @@ class OllamaClient:
             List of model names
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self.session.get(f"{self.base_url}/api/tags")
             if response.status_code == 200:
                 data = response.json()
                 return [model["name"] for model in data.get("models", [])]
@@ -84,7 +87,7 @@ class OllamaClient:
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = requests.post(self.api_url, json=payload, timeout=60)
+                response = self.session.post(self.api_url, json=payload, timeout=60)
                 if response.status_code == 200:
                     return response.json().get("response", "").strip()
                 else:
@@ -142,7 +145,7 @@ class OllamaClient:
             payload["options"]["enable_thinking"] = False
 
         try:
-            response = requests.post(self.chat_url, json=payload, timeout=120)
+            response = self.session.post(self.chat_url, json=payload, timeout=120)
             if response.status_code == 200:
                 response_data = response.json()
                 message = response_data.get("message", {})
@@ -0,0 +1,102 @@
+"""
+Per-User Mailbox
+================
+
+Orders an async server's work per user: turns for one user run one at a time
+in arrival order, turns for different users run concurrently, up to a fixed
+number at once.
+
+A REST chat and a websocket message for the same user would otherwise read
+and write that user's history interleaved. Waiting for the user's earlier
+turns happens before taking a worker slot, so a busy user never holds slots
+other users could run in.
+
+Usage:
+    mailbox = UserMailbox(max_concurrent=8)
+    async with mailbox.turn(user_id):
+        reply = await session.achat(message)
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+class _UserSlot:
+    __slots__ = ("lock", "pending", "running")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()  # FIFO: waiters acquire in arrival order
+        self.pending = 0  # queued + running turns
+        self.running = 0
+
+
+class UserMailbox:
+    """Per-user serialization with bounded cross-user concurrency"""
+
+    def __init__(self, max_concurrent: int = 8):
+        """
+        Args:
+            max_concurrent: Turns (of different users) running at the same time
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self._workers: Optional[asyncio.Semaphore] = None
+        self._slots: Dict[str, _UserSlot] = {}
+        self._running = 0
+        self._processed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @asynccontextmanager
+    async def turn(self, user_id: str) -> AsyncIterator[None]:
+        """Wait until the user's earlier turns finished and a worker is free"""
+        if self._workers is None:
+            # Created lazily so it binds to the server's event loop
+            self._workers = asyncio.Semaphore(self.max_concurrent)
+        slot = self._slots.get(user_id)
+        if slot is None:
+            slot = self._slots[user_id] = _UserSlot()
+        slot.pending += 1
+        enqueued = time.perf_counter()
+        try:
+            async with slot.lock:
+                async with self._workers:
+                    wait = time.perf_counter() - enqueued
+                    self._processed += 1
+                    self._total_wait += wait
+                    self._max_wait = max(self._max_wait, wait)
+                    self._running += 1
+                    slot.running = 1
+                    try:
+                        yield
+                    finally:
+                        self._running -= 1
+                        slot.running = 0
+        finally:
+            slot.pending -= 1
+            if slot.pending == 0:
+                del self._slots[user_id]
+
+    def queue_depth(self, user_id: Optional[str] = None) -> int:
+        """Turns waiting to start, for one user or in total"""
+        if user_id is not None:
+            slot = self._slots.get(user_id)
+            if slot is None:
+                return 0
+            return slot.pending - slot.running
+        return sum(slot.pending for slot in self._slots.values()) - self._running
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running turns and wait-time metrics"""
+        return {
+            "queue_depth": self.queue_depth(),
+            "running": self._running,
+            "active_users": len(self._slots),
+            "max_concurrent": self.max_concurrent,
+            "processed": self._processed,
+            "avg_wait_ms": (
+                round(self._total_wait * 1000 / self._processed, 1) if self._processed else 0.0
+            ),
+            "max_wait_ms": round(self._max_wait * 1000, 1),
+        }
@@ -29,12 +29,17 @@ agent = MemAgent(
 ```
 """
 
+import asyncio
+import inspect
 import json
 import logging
+import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 
+from .enrichment import EnrichmentQueue
 from .llm_client import OllamaClient  # noqa: F401 Backward compatibility
 from .llm_client_factory import LLMClientFactory
 
@@ -43,6 +48,8 @@ from .memory_manager import MemoryManager
 from .memory_router import MemoryRouter
 from .memory_tools import ToolExecutor
 from .response_metrics import ChatResponse, ResponseMetricsAnalyzer, calculate_confidence
+from .segmented_memory import SegmentedMemoryManager
+from .sessions import UserSession
 from .tool_system import ToolCallParser, ToolRegistry, format_tools_for_prompt
 
 # Advanced features (optional)
@@ -54,6 +61,7 @@ try:
     from .config_manager import get_config
     from .dynamic_prompt import dynamic_prompt_builder
     from .knowledge_loader import KnowledgeLoader
+    from .memory.extraction import MemoryExtractor, TurnExtraction
     from .memory.hierarchy import HierarchicalMemory
     from .memory_db import SQLMemoryManager
 
@@ -61,7 +69,7 @@ try:
 
     # New features v2.3.0 - Managed separately to allow partial failures
     try:
-        from .memory.graph import GraphExtractor, GraphStore
+        from .memory.graph import GraphExtractor, ShardedGraphStore
 
         GRAPH_AVAILABLE = True
     except ImportError as e:
@@ -101,6 +109,8 @@ class MemAgent:
         enable_hierarchical_memory: bool = False,
         enable_graph_memory: bool = False,
         enable_memory_router: bool = True,
+        segmented_json: bool = False,
+        background_enrichment: bool = False,
         **llm_kwargs,
     ):
         """
@@ -123,6 +133,11 @@ class MemAgent:
             embedding_model: Embedding model for vector search
                 (default: "sentence-transformers/all-MiniLM-L6-v2") - NEW
             preset: Configuration preset name (e.g., 'chatbot', 'code_assistant') - NEW in v2.1.4
+            segmented_json: In JSON mode, append each turn to per-user JSONL segments
+                instead of rewriting one file per turn (also ``memory.segmented_json``)
+            background_enrichment: Run memory extraction, categorization, profile,
+                router and graph updates on worker threads; chat() returns once the
+                interaction is stored (also ``memory.background_enrichment``)
             **llm_kwargs: Additional backend-specific parameters
 
         Examples:
@@ -244,12 +259,18 @@ class MemAgent:
             # Get vector search settings from config or parameters
             vector_search_enabled = enable_vector_search
             vector_model = embedding_model
+            vector_store_type = "chroma"
+            vector_store_options = None
 
             if self.config:
                 vector_search_enabled = self.config.get(
                     "knowledge_base.enable_vector_search", vector_search_enabled
                 )
                 vector_model = self.config.get("knowledge_base.embedding_model", vector_model)
+                vector_store_type = self.config.get(
+                    "knowledge_base.vector_store", vector_store_type
+                )
+                vector_store_options = self.config.get("knowledge_base.vector_store_options")
 
             # Ensure memories directory exists (skip for :memory:)
             import os
@@ -262,7 +283,17 @@ class MemAgent:
             self.memory = SQLMemoryManager(
                 final_db_path,
                 enable_vector_search=vector_search_enabled,
+                vector_store_type=vector_store_type,
+                vector_store_options=vector_store_options,
                 embedding_model=vector_model,
+                write_behind=(
+                    self.config.get("memory.write_behind", False) if self.config else False
+                ),
+                background_vector_sync=(
+                    self.config.get("knowledge_base.background_vector_sync", False)
+                    if self.config
+                    else False
+                ),
             )
             self.logger.info(f"SQL memory system active: {final_db_path}")
             if vector_search_enabled:
@@ -274,8 +305,14 @@ class MemAgent:
                 if self.config
                 else "memories"
             )
-            self.memory = MemoryManager(json_dir)
-            self.logger.info(f"JSON memory system active: {json_dir}")
+            if self.config:
+                segmented_json = self.config.get("memory.segmented_json", segmented_json)
+            if segmented_json:
+                self.memory = SegmentedMemoryManager(json_dir)
+                self.logger.info(f"Segmented JSON memory system active: {json_dir}")
+            else:
+                self.memory = MemoryManager(json_dir)
+                self.logger.info(f"JSON memory system active: {json_dir}")
 
         # Active user and system prompt
         self.current_user: Optional[str] = None
@@ -449,28 +486,60 @@ class MemAgent:
         self.metrics_analyzer = ResponseMetricsAnalyzer()
         self.track_metrics = True  # Can be disabled if needed
 
+        # One LLM call extracts graph triplets, category/domain and profile facts
+        # per turn; False restores the separate extractor and categorizer calls
+        self.combined_extraction = True
+
         # Graph Memory (v2.3.0)
         self.graph_store = None
         self.graph_extractor = None
         if enable_graph_memory and ADVANCED_AVAILABLE and GRAPH_AVAILABLE:
             # Determine graph path based on memory configuration
-            graph_path = "memories/graph.json"
+            import os
+
+            graph_dir = "memories"
             if use_sql and db_path and db_path != ":memory:":
                 # Use same dir as DB
-                import os
-
-                db_dir = os.path.dirname(db_path)
-                if db_dir:
-                    graph_path = os.path.join(db_dir, "graph.json")
+                graph_dir = os.path.dirname(db_path) or graph_dir
             elif memory_dir:
-                import os
+                graph_dir = memory_dir
 
-                graph_path = os.path.join(memory_dir, "graph.json")
-
-            self.graph_store = GraphStore(persistence_path=graph_path)
+            # "sqlite" saves only changed edges; "json" rewrites a user's file per turn
+            graph_backend = (
+                self.config.get("memory.graph_backend", "sqlite") if self.config else "sqlite"
+            )
+            max_open_shards = (
+                self.config.get("memory.graph_max_open_shards", 64) if self.config else 64
+            )
+            # One graph per user under graph_shards/; a pre-sharding graph.db
+            # (or graph.json) is split by user the first time
+            legacy_path = os.path.join(graph_dir, "graph.db")
+            if not os.path.exists(legacy_path):
+                legacy_path = os.path.join(graph_dir, "graph.json")
+            graph_path = os.path.join(graph_dir, "graph_shards")
+            self.graph_store = ShardedGraphStore(
+                graph_path,
+                backend=graph_backend,
+                max_open_shards=max_open_shards,
+                legacy_path=legacy_path,
+            )
             self.graph_extractor = GraphExtractor(self)
             self.logger.info(f" Graph Memory enabled (path: {graph_path})")
 
+        # Post-turn memory enrichment (inline unless background_enrichment)
+        self._enrichment_lock = threading.RLock()
+        self.enrichment: Optional[EnrichmentQueue] = None
+        if self.config and not background_enrichment:
+            background_enrichment = self.config.get("memory.background_enrichment", False)
+        if background_enrichment:
+            self.enrichment = EnrichmentQueue(
+                workers=self.config.get("memory.enrichment_workers", 2) if self.config else 2,
+                max_pending=(
+                    self.config.get("memory.enrichment_queue_size", 1000) if self.config else 1000
+                ),
+            )
+            self.logger.info(" Background memory enrichment enabled")
+
         self.memory_router = (
             MemoryRouter(self.memory, graph_store=self.graph_store)
             if self.enable_memory_router
@@ -676,17 +745,30 @@ class MemAgent:
 
         self.logger.debug(f"Active user set: {user_id}")
 
-    def _execute_tool_calls(self, response_text: str, max_iterations: int = 3) -> str:
+    def session(self, user_id: str) -> UserSession:
+        """
+        Lightweight view of this agent bound to one user
+
+        Sessions share this agent's storage, LLM client, tools and graph;
+        creating one does no I/O.
+        """
+        return UserSession(self, user_id)
+
+    def _execute_tool_calls(
+        self, response_text: str, max_iterations: int = 3, user_id: Optional[str] = None
+    ) -> str:
         """
         Execute tool calls found in LLM response and get results.
 
         Args:
             response_text: LLM response that may contain tool calls
             max_iterations: Maximum number of tool execution iterations
+            user_id: User the memory tools act for (defaults to the active user)
 
         Returns:
             Final response after all tool executions
         """
+        user_id = user_id or self.current_user
         iteration = 0
         current_text = response_text
 
@@ -734,10 +816,10 @@ class MemAgent:
                                 limit = int(maybe_limit)
                         try:
                             search_results = []
-                            if self.current_user:
-                                search_results = self.search_history(
-                                    keyword, user_id=self.current_user
-                                )[:limit]
+                            if user_id:
+                                search_results = self.search_history(keyword, user_id=user_id)[
+                                    :limit
+                                ]
 
                             if search_results:
                                 formatted = (
@@ -759,16 +841,16 @@ class MemAgent:
 
                     elif result.result == "MEMORY_USER_INFO":
                         try:
-                            user_info = f"Current user: {self.current_user or 'Not set'}"
-                            if self.current_user:
+                            user_info = f"Current user: {user_id or 'Not set'}"
+                            if user_id:
                                 conv_count = 0
-                                if hasattr(self.memory, "get_recent_conversations"):
+                                if hasattr(self.memory, "count_conversations"):
+                                    conv_count = self.memory.count_conversations(user_id)
+                                elif hasattr(self.memory, "get_recent_conversations"):
                                     conv_count = len(
-                                        self.memory.get_recent_conversations(
-                                            self.current_user, limit=1000
-                                        )
+                                        self.memory.get_recent_conversations(user_id, limit=1000)
                                     )
-                                profile = self.get_user_profile(self.current_user)
+                                profile = self.get_user_profile(user_id)
                                 if profile:
                                     name = profile.get("name")
                                     if name:
@@ -782,12 +864,8 @@ class MemAgent:
                         try:
                             limit = int(result.result.split(":", 1)[1])
                             history = []
-                            if self.current_user and hasattr(
-                                self.memory, "get_recent_conversations"
-                            ):
-                                history = self.memory.get_recent_conversations(
-                                    self.current_user, limit=limit
-                                )
+                            if user_id and hasattr(self.memory, "get_recent_conversations"):
+                                history = self.memory.get_recent_conversations(user_id, limit=limit)
                             if history:
                                 formatted = f"Last {len(history)} conversations:\n"
                                 for idx, conv in enumerate(history, 1):
@@ -934,54 +1012,17 @@ class MemAgent:
         messages.append({"role": "user", "content": final_message})
         return messages, used_memory
 
-    def chat(
-        self,
-        message: str,
-        user_id: Optional[str] = None,
-        metadata: Optional[Dict] = None,
-        return_metrics: bool = False,
-    ) -> Union[str, ChatResponse]:
+    def _prepare_turn(self, message: str, user_id: str) -> Dict[str, Any]:
         """
-        Chat with user
-
-        Args:
-            message: User's message
-            user_id: User ID (optional)
-            metadata: Additional information
-            return_metrics: If True, returns ChatResponse with metrics; if False,
-                            returns only text (default)
+        Everything a chat turn does before calling the LLM
 
-        Returns:
-            Bot's response (str) or ChatResponse object with metrics
+        Runs the security check and user tool commands, then gathers KB and
+        memory context. The returned dict has ``blocked`` or ``tool_result``
+        set when the turn ends here; otherwise it carries the LLM messages
+        and the flags used for metrics.
         """
-        # Start timing
-        start_time = time.time()
-        # Determine user
-        if user_id:
-            self.set_user(user_id)
-        elif not self.current_user:
-            error_response = "Error: User ID not specified."
-            if return_metrics:
-                return ChatResponse(
-                    text=error_response,
-                    confidence=1.0,
-                    source="tool",
-                    latency=(time.time() - start_time) * 1000,
-                    timestamp=datetime.now(),
-                    kb_results_count=0,
-                    metadata={"error": True},
-                )
-            return error_response
-
-        user_id = self.current_user
-
-        # Initialize tracking variables
-        kb_results_count = 0
-        used_kb = False
-        used_memory = False
-        response_source = "model"  # Default source
+        turn: Dict[str, Any] = {"message": message, "blocked": None, "tool_result": None}
 
-        # Security check (v1.1.0+) - opt-in
         # Security check (v1.1.0+) - opt-in
         if self.enable_security and self.security_detector and self.security_sanitizer:
             # Detect injection attempts
@@ -993,10 +1034,11 @@ class MemAgent:
                     f" Blocked {risk_level} risk input from {user_id}: "
                     f"{len(patterns)} patterns detected"
                 )
-                return (
+                turn["blocked"] = (
                     " Your message was blocked due to security concerns. "
                     "Please rephrase your request."
                 )
+                return turn
 
             if is_suspicious:
                 self.logger.info(
@@ -1007,31 +1049,16 @@ class MemAgent:
             # Sanitize input
             original_message = message
             message = self.security_sanitizer.sanitize(message, aggressive=(risk_level == "medium"))
+            turn["message"] = message
 
             if message != original_message:
                 self.logger.debug(f"Input sanitized for {user_id}")
 
-            _ = {  # noqa: F841
-                "risk_level": risk_level,
-                "sanitized": message != original_message,
-                "patterns_detected": len(patterns),
-            }
-
         # Check tool commands first
         tool_result = self.tool_executor.execute_user_command(message, user_id)
         if tool_result:
-            latency = (time.time() - start_time) * 1000
-            if return_metrics:
-                return ChatResponse(
-                    text=tool_result,
-                    confidence=0.95,  # Tools are deterministic
-                    source="tool",
-                    latency=latency,
-                    timestamp=datetime.now(),
-                    kb_results_count=0,
-                    metadata={"tool_command": True},
-                )
-            return tool_result
+            turn["tool_result"] = tool_result
+            return turn
 
         kb_context, kb_results_count, used_kb = self._get_kb_context(message)
 
@@ -1041,21 +1068,37 @@ class MemAgent:
 
         messages, used_memory = self._build_chat_messages(user_id, message, kb_context)
 
-        # Get response from LLM
-        temperature = (
-            self.config.get("llm.temperature", 0.2)
-            if hasattr(self, "config") and self.config
-            else 0.2
+        has_config = hasattr(self, "config") and self.config
+        turn.update(
+            {
+                "messages": messages,
+                "kb_results_count": kb_results_count,
+                "used_kb": used_kb,
+                "used_memory": used_memory,
+                "temperature": self.config.get("llm.temperature", 0.2) if has_config else 0.2,
+                # Enough tokens for thinking models
+                "max_tokens": self.config.get("llm.max_tokens", 500) if has_config else 500,
+            }
         )
+        return turn
+
+    def _simple_messages(self, message: str) -> List[Dict[str, str]]:
+        """Retry prompt for an empty response: just the current message, no history"""
+        return [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant. Respond directly and concisely.",
+            },
+            {"role": "user", "content": message},
+        ]
+
+    def _generate_response(self, turn: Dict[str, Any]) -> str:
+        """Get the LLM response for a prepared turn"""
         try:
             response = self.llm.chat(
-                messages=messages,
-                temperature=temperature,
-                max_tokens=(
-                    self.config.get("llm.max_tokens", 500)
-                    if hasattr(self, "config") and self.config
-                    else 500
-                ),  # Enough tokens for thinking models
+                messages=turn["messages"],
+                temperature=turn["temperature"],
+                max_tokens=turn["max_tokens"],
             )
 
             # Fallback: If response is empty (can happen with thinking models)
@@ -1063,16 +1106,40 @@ class MemAgent:
                 self.logger.warning(
                     f"Empty response from model {self.llm.model}, retrying with simpler prompt..."
                 )
+                response = self.llm.chat(
+                    self._simple_messages(turn["message"]), temperature=0.7, max_tokens=500
+                )
 
-                # Retry with just the current message, no history
-                simple_messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant. Respond directly and concisely.",
-                    },
-                    {"role": "user", "content": message},
-                ]
-                response = self.llm.chat(simple_messages, temperature=0.7, max_tokens=500)
+                # If still empty, provide fallback
+                if not response or response.strip() == "":
+                    response = (
+                        "I'm having trouble responding right now. Could you rephrase your question?"
+                    )
+                    self.logger.error(
+                        f"Model {self.llm.model} returned empty response even after retry"
+                    )
+
+        except Exception as e:
+            self.logger.error(f"LLM response error: {e}")
+            response = "Sorry, I cannot respond right now. Please try again later."
+
+        return response
+
+    async def _agenerate_response(self, turn: Dict[str, Any]) -> str:
+        """Async version of _generate_response()"""
+        try:
+            response = await self._llm_achat(
+                turn["messages"], temperature=turn["temperature"], max_tokens=turn["max_tokens"]
+            )
+
+            # Fallback: If response is empty (can happen with thinking models)
+            if not response or response.strip() == "":
+                self.logger.warning(
+                    f"Empty response from model {self.llm.model}, retrying with simpler prompt..."
+                )
+                response = await self._llm_achat(
+                    self._simple_messages(turn["message"]), temperature=0.7, max_tokens=500
+                )
 
                 # If still empty, provide fallback
                 if not response or response.strip() == "":
@@ -1087,13 +1154,53 @@ class MemAgent:
             self.logger.error(f"LLM response error: {e}")
             response = "Sorry, I cannot respond right now. Please try again later."
 
-        # Execute tool calls if tools are enabled (v2.0+)
-        if self.enable_tools and self.tool_registry and response:
-            try:
-                response = self._execute_tool_calls(response)
-            except Exception as e:
-                self.logger.error(f"Tool execution error: {e}")
-                # Continue with original response
+        return response
+
+    async def _llm_achat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+        """Call the backend's native achat, or its chat in a worker thread"""
+        achat = getattr(self.llm, "achat", None)
+        if inspect.iscoroutinefunction(achat):
+            return await achat(messages=messages, **kwargs)
+        return await asyncio.to_thread(self.llm.chat, messages=messages, **kwargs)
+
+    async def _llm_achat_stream(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream from the backend's native achat_stream, or its chat_stream in a thread"""
+        achat_stream = getattr(self.llm, "achat_stream", None)
+        if inspect.isasyncgenfunction(achat_stream):
+            async for chunk in achat_stream(messages=messages, **kwargs):
+                yield chunk
+            return
+
+        chunks = self.llm.chat_stream(messages=messages, **kwargs)
+        done = object()
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, done)
+            if chunk is done:
+                return
+            yield chunk
+
+    def _complete_turn(
+        self,
+        turn: Dict[str, Any],
+        user_id: str,
+        response: str,
+        metadata: Optional[Dict],
+        start_time: float,
+        streaming: bool = False,
+    ) -> ChatResponse:
+        """
+        Score, save and record a finished turn
+
+        Computes the response metrics, stores the interaction with the
+        profile, router, graph and summary updates, and tracks the metric.
+        """
+        temperature = turn["temperature"]
+        kb_results_count = turn["kb_results_count"]
+        used_kb = turn["used_kb"]
+        used_memory = turn["used_memory"]
+        message = turn["message"]
 
         # Calculate latency
         latency = (time.time() - start_time) * 1000
@@ -1131,56 +1238,41 @@ class MemAgent:
                 "temperature": temperature,
             }
         )
+        if streaming:
+            enriched_metadata["streaming"] = True
 
-        # Save interaction
+        # Save interaction; enrichment runs in the background when enabled
         try:
-            if self.hierarchical_memory:
-                # Use hierarchical memory manager
-                self.hierarchical_memory.add_interaction(
-                    user_id=user_id,
-                    user_message=message,
-                    bot_response=response,
-                    metadata=enriched_metadata,
-                )
-                if self.memory_router:
-                    self.memory_router.update_after_interaction(
-                        user_id=user_id,
-                        user_message=message,
-                        bot_response=response,
-                        metadata=enriched_metadata,
-                    )
-            elif hasattr(self.memory, "add_interaction"):
-                self.memory.add_interaction(
+            if hasattr(self.memory, "add_interaction"):
+                save = self.memory.add_interaction
+                if self.hierarchical_memory and getattr(self.memory, "write_behind", False):
+                    # Write-behind has no row ID until the writer commits; the
+                    # hierarchy gets a future of it and resolves it during enrichment
+                    save = self.memory.queue_interaction
+                episode_id = save(
                     user_id=user_id,
                     user_message=message,
                     bot_response=response,
                     metadata=enriched_metadata,
                 )
-
-                # Extract and save user info to profile
-                self._update_user_profile(user_id, message, response)
-
-                if self.memory_router:
-                    self.memory_router.update_after_interaction(
-                        user_id=user_id,
-                        user_message=message,
-                        bot_response=response,
-                        metadata=enriched_metadata,
-                    )
-
-                # Update graph memory (v2.3.0)
-                self._update_graph_memory(message, response)
-
-                # Always update summary after each conversation (JSON mode)
-                if not self.use_sql and hasattr(self.memory, "conversations"):
-                    self._update_conversation_summary(user_id)
-                    # Save summary update
-                    if user_id in self.memory.user_profiles:
-                        self.memory.save_memory(user_id)
+                job = (user_id, message, response, enriched_metadata, episode_id)
+                if self.enrichment:
+                    self.enrichment.submit(user_id, self._enrich_turn, *job)
+                else:
+                    self._enrich_turn(*job)
         except Exception as e:
             self.logger.error(f"Interaction saving error: {e}")
 
         # Create response metrics object
+        response_metadata = {
+            "model": self.model,
+            "temperature": temperature,
+            "used_memory": used_memory,
+            "used_kb": used_kb,
+            "user_id": user_id,
+        }
+        if streaming:
+            response_metadata["streaming"] = True
         chat_response = ChatResponse(
             text=response,
             confidence=confidence,
@@ -1188,19 +1280,149 @@ class MemAgent:
             latency=latency,
             timestamp=datetime.now(),
             kb_results_count=kb_results_count,
-            metadata={
-                "model": self.model,
-                "temperature": temperature,
-                "used_memory": used_memory,
-                "used_kb": used_kb,
-                "user_id": user_id,
-            },
+            metadata=response_metadata,
         )
 
         # Track metrics if enabled
         if self.track_metrics:
             self.metrics_analyzer.add_metric(chat_response)
 
+        return chat_response
+
+    def _early_response(
+        self, text: str, start_time: float, return_metrics: bool, error: bool = False
+    ) -> Union[str, ChatResponse]:
+        """Response for a turn that ends without the LLM (missing user or tool command)"""
+        if not return_metrics:
+            return text
+        return ChatResponse(
+            text=text,
+            confidence=1.0 if error else 0.95,  # Tools are deterministic
+            source="tool",
+            latency=(time.time() - start_time) * 1000,
+            timestamp=datetime.now(),
+            kb_results_count=0,
+            metadata={"error": True} if error else {"tool_command": True},
+        )
+
+    def chat(
+        self,
+        message: str,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+        return_metrics: bool = False,
+    ) -> Union[str, ChatResponse]:
+        """
+        Chat with user
+
+        Args:
+            message: User's message
+            user_id: User ID (optional)
+            metadata: Additional information
+            return_metrics: If True, returns ChatResponse with metrics; if False,
+                            returns only text (default)
+
+        Returns:
+            Bot's response (str) or ChatResponse object with metrics
+        """
+        # Start timing
+        start_time = time.time()
+        # Determine user
+        if user_id:
+            self.set_user(user_id)
+        elif not self.current_user:
+            return self._early_response(
+                "Error: User ID not specified.", start_time, return_metrics, error=True
+            )
+
+        # Another thread may call set_user() meanwhile; keep this call's user.
+        user_id = user_id or self.current_user
+
+        turn = self._prepare_turn(message, user_id)
+        if turn["blocked"]:
+            return turn["blocked"]
+        if turn["tool_result"]:
+            return self._early_response(turn["tool_result"], start_time, return_metrics)
+
+        # Get response from LLM
+        response = self._generate_response(turn)
+
+        # Execute tool calls if tools are enabled (v2.0+)
+        if self.enable_tools and self.tool_registry and response:
+            try:
+                response = self._execute_tool_calls(response, user_id=user_id)
+            except Exception as e:
+                self.logger.error(f"Tool execution error: {e}")
+                # Continue with original response
+
+        chat_response = self._complete_turn(turn, user_id, response, metadata, start_time)
+
+        # Return based on user preference
+        if return_metrics:
+            return chat_response
+        else:
+            return response
+
+    async def achat(
+        self,
+        message: str,
+        user_id: Optional[str] = None,
+        metadata: Optional[Dict] = None,
+        return_metrics: bool = False,
+    ) -> Union[str, ChatResponse]:
+        """
+        Async version of chat()
+
+        The LLM call awaits the backend's async HTTP client, so an event loop
+        can serve many users while generations are in flight. Memory reads
+        and writes run in worker threads.
+
+        Args:
+            message: User's message
+            user_id: User ID (optional)
+            metadata: Additional information
+            return_metrics: If True, returns ChatResponse with metrics; if False,
+                            returns only text (default)
+
+        Returns:
+            Bot's response (str) or ChatResponse object with metrics
+        """
+        # Start timing
+        start_time = time.time()
+        # Determine user
+        if user_id:
+            await asyncio.to_thread(self.set_user, user_id)
+        elif not self.current_user:
+            return self._early_response(
+                "Error: User ID not specified.", start_time, return_metrics, error=True
+            )
+
+        # Another task may call set_user() meanwhile; keep this call's user.
+        user_id = user_id or self.current_user
+
+        turn = await asyncio.to_thread(self._prepare_turn, message, user_id)
+        if turn["blocked"]:
+            return turn["blocked"]
+        if turn["tool_result"]:
+            return self._early_response(turn["tool_result"], start_time, return_metrics)
+
+        # Get response from LLM
+        response = await self._agenerate_response(turn)
+
+        # Execute tool calls if tools are enabled (v2.0+)
+        if self.enable_tools and self.tool_registry and response:
+            try:
+                response = await asyncio.to_thread(
+                    self._execute_tool_calls, response, user_id=user_id
+                )
+            except Exception as e:
+                self.logger.error(f"Tool execution error: {e}")
+                # Continue with original response
+
+        chat_response = await asyncio.to_thread(
+            self._complete_turn, turn, user_id, response, metadata, start_time
+        )
+
         # Return based on user preference
         if return_metrics:
             return chat_response
@@ -1241,62 +1463,85 @@ class MemAgent:
             yield "Error: User ID not specified."
             return
 
-        user_id = self.current_user
-
-        # Initialize tracking variables
-        kb_results_count = 0
-        used_kb = False
-        used_memory = False
+        # Another thread may call set_user() meanwhile; keep this call's user.
+        user_id = user_id or self.current_user
 
-        # Security check (v1.1.0+) - opt-in
-        if self.enable_security and self.security_detector and self.security_sanitizer:
-            risk_level = self.security_detector.get_risk_level(message)
-            is_suspicious, patterns = self.security_detector.detect(message)
+        turn = self._prepare_turn(message, user_id)
+        if turn["blocked"] or turn["tool_result"]:
+            yield turn["blocked"] or turn["tool_result"]
+            return
 
-            if risk_level in ["high", "critical"]:
-                self.logger.warning(f" Blocked {risk_level} risk input from {user_id}")
-                yield (
-                    " Your message was blocked due to security concerns. "
-                    "Please rephrase your request."
-                )
-                return
+        # Collect full response for saving
+        full_response = ""
 
-            # Sanitize input
-            message = self.security_sanitizer.sanitize(message, aggressive=(risk_level == "medium"))
+        try:
+            # Stream chunks from LLM
+            for chunk in self.llm.chat_stream(
+                messages=turn["messages"],
+                temperature=turn["temperature"],
+                max_tokens=turn["max_tokens"],
+            ):
+                full_response += chunk
+                yield chunk
 
-        # Check tool commands first
-        tool_result = self.tool_executor.execute_user_command(message, user_id)
-        if tool_result:
-            yield tool_result
+        except Exception as e:
+            error_msg = f"Streaming error: {str(e)}"
+            self.logger.error(error_msg)
+            yield f"\n\n {error_msg}"
             return
 
-        kb_context, kb_results_count, used_kb = self._get_kb_context(message)
+        # Execute tool calls in streaming mode (post-processing)
+        final_response = full_response
+        if self.enable_tools and self.tool_registry and ToolCallParser.has_tool_call(full_response):
+            processed_response = self._execute_tool_calls(full_response, user_id=user_id)
+            if processed_response != full_response:
+                final_response = processed_response
+                yield f"\n\n{processed_response}"
 
-        # Rebuild system prompt to include any newly registered tools (v2.1.1+)
-        if self.enable_tools and self.tool_registry:
-            self._build_dynamic_system_prompt()
+        self._complete_turn(turn, user_id, final_response, metadata, start_time, streaming=True)
 
-        messages, used_memory = self._build_chat_messages(user_id, message, kb_context)
+    async def achat_stream(
+        self, message: str, user_id: Optional[str] = None, metadata: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Async version of chat_stream()
 
-        # Get streaming response from LLM
-        temperature = (
-            self.config.get("llm.temperature", 0.2)
-            if hasattr(self, "config") and self.config
-            else 0.2
-        )
-        max_tokens = (
-            self.config.get("llm.max_tokens", 500)
-            if hasattr(self, "config") and self.config
-            else 500
-        )
+        Chunks are read from the backend's async HTTP stream; memory reads
+        and writes run in worker threads.
+
+        Args:
+            message: User's message
+            user_id: User ID (optional)
+            metadata: Additional information
+
+        Yields:
+            Response text chunks as they arrive from the LLM
+        """
+        # Start timing
+        start_time = time.time()
+
+        # Determine user
+        if user_id:
+            await asyncio.to_thread(self.set_user, user_id)
+        elif not self.current_user:
+            yield "Error: User ID not specified."
+            return
+
+        # Another task may call set_user() meanwhile; keep this call's user.
+        user_id = user_id or self.current_user
+
+        turn = await asyncio.to_thread(self._prepare_turn, message, user_id)
+        if turn["blocked"] or turn["tool_result"]:
+            yield turn["blocked"] or turn["tool_result"]
+            return
 
         # Collect full response for saving
         full_response = ""
 
         try:
             # Stream chunks from LLM
-            for chunk in self.llm.chat_stream(
-                messages=messages, temperature=temperature, max_tokens=max_tokens
+            async for chunk in self._llm_achat_stream(
+                turn["messages"], temperature=turn["temperature"], max_tokens=turn["max_tokens"]
             ):
                 full_response += chunk
                 yield chunk
@@ -1310,102 +1555,119 @@ class MemAgent:
         # Execute tool calls in streaming mode (post-processing)
         final_response = full_response
         if self.enable_tools and self.tool_registry and ToolCallParser.has_tool_call(full_response):
-            processed_response = self._execute_tool_calls(full_response)
+            processed_response = await asyncio.to_thread(
+                self._execute_tool_calls, full_response, user_id=user_id
+            )
             if processed_response != full_response:
                 final_response = processed_response
                 yield f"\n\n{processed_response}"
 
-        # Calculate latency
-        latency = (time.time() - start_time) * 1000
-
-        # Determine response source
-        response_source = "model"
-        if used_memory and used_kb:
-            response_source = "hybrid"
-        elif used_kb:
-            response_source = "knowledge_base"
-
-        # Calculate confidence
-        confidence = calculate_confidence(
-            kb_results_count=kb_results_count,
-            temperature=temperature,
-            used_memory=used_memory,
-            response_length=len(final_response),
+        await asyncio.to_thread(
+            self._complete_turn, turn, user_id, final_response, metadata, start_time, True
         )
 
-        # Build enriched metadata
-        enriched_metadata = {}
-        if metadata:
-            enriched_metadata.update(metadata)
-        enriched_metadata.update(
-            {
-                "confidence": round(confidence, 3),
-                "source": response_source,
-                "latency_ms": round(latency, 1),
-                "kb_results_count": kb_results_count,
-                "used_memory": used_memory,
-                "used_kb": used_kb,
-                "response_length": len(final_response),
-                "model": self.model,
-                "temperature": temperature,
-                "streaming": True,
-            }
-        )
+    def _enrich_turn(
+        self,
+        user_id: str,
+        message: str,
+        response: str,
+        metadata: Dict[str, Any],
+        episode_id: Any,
+    ) -> None:
+        """
+        Post-turn memory updates for a stored interaction
 
-        # Save interaction
+        Memory extraction, hierarchical layers, profile, router, graph and
+        JSON summary. Runs on an enrichment worker when background enrichment
+        is enabled, otherwise inline before chat() returns.
+        """
         try:
-            if hasattr(self.memory, "add_interaction"):
-                self.memory.add_interaction(
-                    user_id=user_id,
-                    user_message=message,
-                    bot_response=final_response,
-                    metadata=enriched_metadata,
-                )
+            extraction = self._extract_turn_memory(message, response)
+
+            with self._enrichment_lock:
+                if self.hierarchical_memory:
+                    if isinstance(episode_id, Future):
+                        episode_id = episode_id.result()
+                    self.hierarchical_memory.process_interaction(
+                        user_id,
+                        message,
+                        response,
+                        episode_id,
+                        categorization=(
+                            (extraction.category, extraction.domain) if extraction else None
+                        ),
+                    )
 
                 # Extract and save user info to profile
-                self._update_user_profile(user_id, message, final_response)
+                self._update_user_profile(
+                    user_id, message, response, facts=extraction.profile if extraction else None
+                )
 
                 if self.memory_router:
                     self.memory_router.update_after_interaction(
                         user_id=user_id,
                         user_message=message,
-                        bot_response=final_response,
-                        metadata=enriched_metadata,
+                        bot_response=response,
+                        metadata=metadata,
                     )
 
                 # Update graph memory (v2.3.0)
-                self._update_graph_memory(message, final_response)
+                self._update_graph_memory(
+                    message,
+                    response,
+                    user_id,
+                    triplets=extraction.triplets if extraction else None,
+                )
 
-                # Update summary (JSON mode)
+                # Always update summary after each conversation (JSON mode)
                 if not self.use_sql and hasattr(self.memory, "conversations"):
                     self._update_conversation_summary(user_id)
+                    # Save summary update
                     if user_id in self.memory.user_profiles:
                         self.memory.save_memory(user_id)
         except Exception as e:
-            self.logger.error(f"Interaction saving error: {e}")
+            self.logger.error(f"Memory enrichment error: {e}")
 
-        # Track metrics if enabled
-        if self.track_metrics:
-            chat_response = ChatResponse(
-                text=final_response,
-                confidence=confidence,
-                source=response_source,
-                latency=latency,
-                timestamp=datetime.now(),
-                kb_results_count=kb_results_count,
-                metadata={
-                    "model": self.model,
-                    "temperature": temperature,
-                    "used_memory": used_memory,
-                    "used_kb": used_kb,
-                    "user_id": user_id,
-                    "streaming": True,
-                },
-            )
-            self.metrics_analyzer.add_metric(chat_response)
+    def get_enrichment_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Background enrichment queue depth and lag
+
+        Returns:
+            EnrichmentQueue.stats() dict, or None when enrichment runs inline
+        """
+        return self.enrichment.stats() if self.enrichment else None
+
+    def _extract_turn_memory(self, message: str, response: str) -> Optional["TurnExtraction"]:
+        """
+        Run the combined memory extraction call for a turn
+
+        Returns None when no LLM-backed memory (graph, hierarchical) is enabled
+        or combined extraction is switched off; callers then fall back to
+        their own extraction.
+        """
+        wants_triplets = bool(self.graph_extractor and self.graph_store)
+        wants_category = bool(self.hierarchical_memory and self.hierarchical_memory.categorizer)
+        if not self.combined_extraction or not (wants_triplets or wants_category):
+            return None
+
+        return MemoryExtractor(self.llm).extract(
+            message, response, triplets=wants_triplets, categorize=wants_category
+        )
+
+    def _update_user_profile(
+        self,
+        user_id: str,
+        message: str,
+        response: str,
+        facts: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Extract user info from conversation and update profile
 
-    def _update_user_profile(self, user_id: str, message: str, response: str):
-        """Extract user info from conversation and update profile"""
+        Args:
+            facts: Profile facts from the turn's memory extraction call; they
+                take precedence over the phrase matching below
+        """
         msg_lower = message.lower()
 
         # Extract information
@@ -1466,6 +1728,9 @@ class MemAgent:
                         extracted["location"] = location.strip(".,!?")
                         break
 
+        if facts:
+            extracted.update(facts)
+
         # Save updates
         if extracted:
             try:
@@ -1536,43 +1801,57 @@ class MemAgent:
             except Exception as e:
                 self.logger.error(f"Error updating profile: {e}")
 
-    def _update_graph_memory(self, message: str, response: str) -> None:
-        """Extract triplets from conversation and update graph memory"""
+    def _update_graph_memory(
+        self,
+        message: str,
+        response: str,
+        user_id: Optional[str] = None,
+        triplets: Optional[List[Tuple[str, str, str]]] = None,
+    ) -> None:
+        """
+        Extract triplets from conversation and update graph memory
+
+        Args:
+            triplets: Triplets from the turn's memory extraction call; when
+                None the graph extractor makes its own LLM call
+        """
         if not self.graph_extractor or not self.graph_store:
             return
 
         try:
-            # Combine message and response for context
-            text = f"User: {message}\nAssistant: {response}"
+            if triplets is None:
+                # Combine message and response for context
+                text = f"User: {message}\nAssistant: {response}"
 
-            # Extract triplets
-            triplets = self.graph_extractor.extract(text)
+                # Extract triplets
+                triplets = self.graph_extractor.extract(text)
 
             if triplets:
                 self.logger.info(f" Found {len(triplets)} graph triplets to save")
-                for source, relation, target in triplets:
-                    self.graph_store.add_triplet(
-                        source,
-                        relation,
-                        target,
-                        metadata={
-                            "user_id": self.current_user,
-                            "source": "conversation",
-                            "source_message": message[:500],
-                            "confidence": 0.7,
-                            "supersedes": True,
-                        },
-                    )
+                with self.graph_store.use(user_id or self.current_user) as graph:
+                    for source, relation, target in triplets:
+                        graph.add_triplet(
+                            source,
+                            relation,
+                            target,
+                            metadata={
+                                "user_id": user_id or self.current_user,
+                                "source": "conversation",
+                                "source_message": message[:500],
+                                "confidence": 0.7,
+                                "supersedes": True,
+                            },
+                        )
 
-                # Save graph to disk
-                self.graph_store.save()
+                    # Save the user's graph to disk
+                    graph.save()
         except Exception as e:
             self.logger.error(f"Graph memory update error: {e}")
 
     def clear_graph_memory(self, user_id: str):
-        """Clear knowledge graph memory for user"""
+        """Clear knowledge graph memory for user (other users' graphs are kept)"""
         if self.graph_store:
-            self.graph_store.clear()
+            self.graph_store.clear(user_id)
             self.logger.info(f"Graph memory cleared for {user_id}")
             return True
         return False
@@ -1604,7 +1883,10 @@ class MemAgent:
             topics = self._extract_topics(all_messages)
 
             # Calculate engagement stats
-            total_interactions = len(conversations)
+            if hasattr(self.memory, "count_conversations"):
+                total_interactions = self.memory.count_conversations(user_id)
+            else:
+                total_interactions = len(conversations)
             avg_response_length = (
                 sum(len(c.get("bot_response", "")) for c in recent_convs) / len(recent_convs)
                 if recent_convs
@@ -1829,6 +2111,7 @@ class MemAgent:
             "memory_router_enabled": self.memory_router is not None,
             "hierarchical_memory_enabled": self.hierarchical_memory is not None,
             "graph_memory_enabled": self.graph_store is not None,
+            "enrichment": self.get_enrichment_stats(),
             "llm_available": llm_available,
         }
 
@@ -2037,6 +2320,11 @@ class MemAgent:
 
     def close(self) -> None:
         """Clean up resources"""
+        if self.enrichment:
+            # Finish queued enrichment while the stores are still open
+            self.enrichment.close()
+        if self.graph_store:
+            self.graph_store.close()
         if hasattr(self.memory, "close"):
             self.memory.close()
         self.logger.info("MemAgent closed")
@@ -0,0 +1,146 @@
+"""
+Turn Memory Extraction
+======================
+
+One LLM call per conversation turn that returns everything the memory
+layers need: knowledge graph triplets, the hierarchical category/domain and
+profile facts. Replaces separate GraphExtractor and AutoCategorizer calls.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+
+
+def _snake_case(value: Any) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(value).strip().lower()).strip("_")
+
+
+class TurnExtraction(BaseModel):
+    """Validated result of a memory extraction call"""
+
+    triplets: List[Tuple[str, str, str]] = Field(default_factory=list)
+    category: str = "general"
+    domain: str = "general"
+    profile: Dict[str, str] = Field(default_factory=dict)
+
+    @field_validator("triplets", mode="before")
+    @classmethod
+    def _normalize_triplets(cls, value: Any) -> List[Tuple[str, str, str]]:
+        # Accept [["s", "r", "t"]] and [{"source", "relation", "target"}]; drop the rest
+        triplets = []
+        for item in value if isinstance(value, list) else []:
+            if isinstance(item, dict):
+                item = [item.get("source"), item.get("relation"), item.get("target")]
+            if isinstance(item, (list, tuple)) and len(item) == 3 and all(item):
+                triplets.append(tuple(str(part).strip() for part in item))
+        return triplets
+
+    @field_validator("category", "domain", mode="before")
+    @classmethod
+    def _normalize_label(cls, value: Any) -> str:
+        return (_snake_case(value) if value else "") or "general"
+
+    @field_validator("profile", mode="before")
+    @classmethod
+    def _normalize_profile(cls, value: Any) -> Dict[str, str]:
+        if not isinstance(value, dict):
+            return {}
+        return {
+            _snake_case(key): str(fact).strip()
+            for key, fact in value.items()
+            if _snake_case(key) and isinstance(fact, (str, int, float)) and str(fact).strip()
+        }
+
+
+class MemoryExtractor:
+    """
+    Extracts graph triplets, category/domain and profile facts from a turn
+    with a single LLM call.
+    """
+
+    def __init__(self, llm_client):
+        self.llm = llm_client
+
+    def extract(
+        self,
+        user_message: str,
+        bot_response: str,
+        triplets: bool = True,
+        categorize: bool = True,
+    ) -> TurnExtraction:
+        """
+        Analyze one interaction.
+
+        Args:
+            user_message: User's message
+            bot_response: Assistant's reply
+            triplets: Ask for knowledge graph triplets
+            categorize: Ask for category and domain
+
+        Returns:
+            TurnExtraction (defaults if the call or parsing fails)
+        """
+        prompt = self._build_prompt(user_message, bot_response, triplets, categorize)
+
+        try:
+            response = self.llm.chat(
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.1,  # Low temperature for consistency
+                max_tokens=400,
+            )
+        except Exception as e:
+            logger.error(f"Memory extraction failed: {e}")
+            return TurnExtraction()
+
+        return self.parse(response)
+
+    def _build_prompt(self, user_msg: str, bot_msg: str, triplets: bool, categorize: bool) -> str:
+        fields = []
+        if triplets:
+            fields.append(
+                '"triplets": knowledge graph facts as [["Source", "relation", "Target"]]. '
+                "Only factual knowledge about the user or the topics discussed; never "
+                'conversation metadata like "User says hello". [] if none.'
+            )
+        if categorize:
+            fields.append(
+                '"category": the specific topic in snake_case (e.g. python_coding, '
+                "travel_planning)."
+            )
+            fields.append(
+                '"domain": the high-level field in snake_case (e.g. technology, lifestyle).'
+            )
+        fields.append(
+            '"profile": facts the user stated about themselves, e.g. '
+            '{"name": "Ada", "location": "Izmir", "favorite_food": "pizza"}. {} if none.'
+        )
+        keys = "\n".join(f"- {field}" for field in fields)
+
+        return f"""Analyze the interaction and return ONLY one JSON object with these keys:
+{keys}
+
+INTERACTION:
+User: {user_msg[:1000]}
+Assistant: {bot_msg[:1000]}
+
+JSON:"""
+
+    def parse(self, response: str) -> TurnExtraction:
+        """Parse and validate an extraction response; defaults on any error"""
+        text = (response or "").strip()
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            logger.warning(f"No JSON object in memory extraction response: {text[:200]}")
+            return TurnExtraction()
+
+        try:
+            return TurnExtraction.model_validate(json.loads(text[start : end + 1]))
+        except (json.JSONDecodeError, ValidationError) as e:
+            logger.warning(f"Failed to parse memory extraction: {e}. Response was: {text[:200]}")
+            return TurnExtraction()
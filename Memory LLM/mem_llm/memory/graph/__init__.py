@@ -1,4 +1,12 @@
 from .extractor import GraphExtractor
-from .graph_store import GraphStore
+from .graph_store import GraphStore, normalize_entity
+from .sharded_store import ShardedGraphStore
+from .sqlite_store import SQLiteGraphStore
 
-__all__ = ["GraphStore", "GraphExtractor"]
+__all__ = [
+    "GraphStore",
+    "SQLiteGraphStore",
+    "ShardedGraphStore",
+    "GraphExtractor",
+    "normalize_entity",
+]
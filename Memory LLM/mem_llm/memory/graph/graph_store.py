@@ -1,13 +1,44 @@
 import json
 import logging
+import math
 import os
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import networkx as nx
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_ARTICLES = {"the", "a", "an"}
+# Words too common to identify an entity through the token index
+_INDEX_STOPWORDS = _ARTICLES | {"of", "and", "or", "in", "on", "at", "to", "for", "my", "is"}
+
+
+def normalize_entity(name: str) -> str:
+    """
+    Canonical key for an entity name.
+
+    Casefolded words without punctuation or a leading article, so "User",
+    "user" and "the user" all map to "user".
+    """
+    words = re.findall(r"\w+", str(name).casefold())
+    if len(words) > 1 and words[0] in _ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+def _index_tokens(key: str) -> List[str]:
+    return [word for word in key.split() if word not in _INDEX_STOPWORDS]
+
 
 class GraphStore:
     """
@@ -16,9 +47,33 @@ class GraphStore:
     Edges represent relationships.
     """
 
-    def __init__(self, persistence_path: Optional[str] = None):
+    def __init__(
+        self,
+        persistence_path: Optional[str] = None,
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        merge_threshold: float = 0.9,
+    ):
+        """
+        Args:
+            persistence_path: JSON file the graph is loaded from and saved to
+            embedding_function: Optional texts -> vectors callable; a new entity
+                whose name embeds within ``merge_threshold`` cosine similarity
+                of an existing one is merged into it (requires numpy)
+            merge_threshold: Cosine similarity needed for an embedding merge
+        """
+        if embedding_function is not None and not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is not installed. Install with: pip install numpy")
         self.graph = nx.DiGraph()
         self.persistence_path = persistence_path
+        self.embedding_function = embedding_function
+        self.merge_threshold = merge_threshold
+        # Entity resolution: canonical key -> node id, and word -> node ids
+        self._aliases: Dict[str, Optional[str]] = {}
+        self._token_index: Dict[str, Set[str]] = {}
+        self._entity_vectors: Dict[str, Any] = {}
+        # (source, target) -> (raw valid_from, raw valid_to, start ts, end ts);
+        # re-parsed only when an edge's raw validity strings change
+        self._validity: Dict[Tuple[str, str], Tuple[Any, Any, float, float]] = {}
 
         if self.persistence_path and os.path.exists(self.persistence_path):
             self.load()
@@ -27,6 +82,9 @@ class GraphStore:
         """Add a subject-predicate-object triplet to the graph."""
         now = datetime.now().isoformat()
         metadata = metadata.copy() if metadata else {}
+        source = self._resolve_entity(source, create=True)
+        target = self._resolve_entity(target, create=True)
+        self._load_entities(source, target)
         self.graph.add_node(source)
         self.graph.add_node(target)
 
@@ -57,6 +115,7 @@ class GraphStore:
 
             edge_data["relation"] = relation
             self.graph.add_edge(source, target, **edge_data)
+            self._mark_dirty(source, target)
             logger.debug(f"Updated triplet: {source} -[{relation}]-> {target}")
             return
 
@@ -68,6 +127,7 @@ class GraphStore:
         edge_metadata.setdefault("last_seen", now)
         edge_metadata.setdefault("confidence", 1.0)
         self.graph.add_edge(source, target, relation=relation, **edge_metadata)
+        self._mark_dirty(source, target)
         logger.debug(f"Added triplet: {source} -[{relation}]-> {target}")
 
     def search(self, query_entity: str, depth: int = 1) -> List[Tuple[str, str, str]]:
@@ -75,6 +135,10 @@ class GraphStore:
         Return triplets related to the query entity.
         Returns list of (source, relation, target).
         """
+        query_entity = self._resolve_entity(query_entity)
+        if query_entity is None:
+            return []
+        self._load_neighborhoods([query_entity], depth)
         if query_entity not in self.graph:
             return []
 
@@ -110,6 +174,11 @@ class GraphStore:
         valid_to: Optional[datetime] = None,
     ) -> bool:
         """Mark an existing triplet as no longer current."""
+        source = self._resolve_entity(source)
+        target = self._resolve_entity(target)
+        if source is None or target is None:
+            return False
+        self._load_entities(source)
         if not self.graph.has_edge(source, target):
             return False
 
@@ -120,24 +189,184 @@ class GraphStore:
         edge_data["valid_to"] = (valid_to or datetime.now()).isoformat()
         edge_data["last_updated"] = datetime.now().isoformat()
         self.graph.add_edge(source, target, **edge_data)
+        self._mark_dirty(source, target)
         return True
 
+    def search_many(
+        self,
+        entities: Iterable[str],
+        at_time: Optional[datetime] = None,
+        depth: int = 1,
+    ) -> Dict[str, List[Tuple[str, str, str]]]:
+        """
+        Return the triplets active at ``at_time`` (default: now) around each entity.
+
+        Same neighbourhood as search() (every entity within ``depth`` hops,
+        either direction), but walks the adjacency directly instead of
+        building an undirected ego graph per entity, and checks validity
+        against cached numeric intervals.
+
+        Returns:
+            {entity: [(source, relation, target), ...]} for every requested entity
+        """
+        nodes = {entity: self._resolve_entity(entity) for entity in entities}
+        moment = (at_time or datetime.now()).timestamp()
+        self._load_neighborhoods([node for node in nodes.values() if node is not None], depth)
+
+        results = {}
+        for entity, node in nodes.items():
+            if node is None or node not in self.graph:
+                results[entity] = []
+                continue
+            ball = self._neighborhood(node, depth)
+            results[entity] = [
+                (source, data.get("relation", "related_to"), target)
+                for source in ball
+                for target, data in self.graph.succ[source].items()
+                if target in ball and self._is_active_ts(source, target, data, moment)
+            ]
+        return results
+
     def _search_temporal(
         self, query_entity: str, depth: int, at_time: datetime
     ) -> List[Tuple[str, str, str]]:
-        if query_entity not in self.graph:
-            return []
+        return self.search_many([query_entity], at_time=at_time, depth=depth)[query_entity]
 
-        triplets = []
+    # ------------------------------------------------------------------
+    # Entity resolution
+    # ------------------------------------------------------------------
+
+    def resolve(self, query: Any) -> List[str]:
+        """
+        Graph entities mentioned in a query, in order of first mention.
+
+        Args:
+            query: Text or a list of words
+
+        Each word costs one lookup in the word -> entity index, so a
+        multi-word entity like "New York" is found from "york" as well.
+        """
+        text = query if isinstance(query, str) else " ".join(query)
+        found: Dict[str, None] = {}
+        for word in normalize_entity(text).split():
+            if word in _INDEX_STOPWORDS:
+                continue
+            for node in sorted(self._find_token(word)):
+                found[node] = None
+        return list(found)
+
+    def add_alias(self, alias: str, entity: str) -> str:
+        """
+        Make ``alias`` resolve to ``entity`` (created if needed).
+
+        Returns:
+            The entity's node id
+        """
+        node = self._resolve_entity(entity, create=True)
+        self.graph.add_node(node)
+        key = normalize_entity(alias)
+        if key and self._find_alias(key) != node:
+            self._add_alias(key, node)
+        return node
+
+    def _resolve_entity(self, name: str, create: bool = False) -> Optional[str]:
+        """Node id for an entity name; with ``create`` a new node id is registered"""
+        key = normalize_entity(name)
+        if not key:
+            return (str(name).strip() or None) if create else None
+        node = self._find_alias(key)
+        if node is not None or not create:
+            return node
+
+        node = self._match_embedding(key) if self.embedding_function else None
+        if node is None:
+            node = str(name).strip()
+        self._add_alias(key, node)
+        return node
+
+    def _find_alias(self, key: str) -> Optional[str]:
+        return self._aliases.get(key)
+
+    def _find_token(self, token: str) -> Set[str]:
+        return self._token_index.get(token, set())
+
+    def _add_alias(self, key: str, node: str) -> None:
+        """Register an alias and remember it on the node so it is saved"""
+        self._index_alias(key, node)
+        if key != normalize_entity(node):
+            self.graph.add_node(node)
+            aliases = self.graph.nodes[node].setdefault("aliases", [])
+            if key not in aliases:
+                aliases.append(key)
+
+    def _index_alias(self, key: str, node: str) -> None:
+        self._aliases[key] = node
+        for token in _index_tokens(key):
+            self._token_index.setdefault(token, set()).add(node)
+
+    def _index_graph(self) -> None:
+        """Rebuild the alias and word indexes from the loaded nodes"""
+        self._aliases.clear()
+        self._token_index.clear()
+        self._entity_vectors.clear()
+        for node, data in self.graph.nodes(data=True):
+            for key in [normalize_entity(node)] + list(data.get("aliases", [])):
+                if key and key not in self._aliases:
+                    self._index_alias(key, node)
+
+    def _match_embedding(self, key: str) -> Optional[str]:
+        """Existing entity whose name embeds close enough to ``key``, if any"""
+        missing = [node for node in self.graph.nodes if node not in self._entity_vectors]
+        texts = [key] + [normalize_entity(node) for node in missing]
+        vectors = np.asarray(self.embedding_function(texts), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        self._entity_vectors.update(zip(missing, vectors[1:]))
+        if not self._entity_vectors:
+            return None
+
+        names = list(self._entity_vectors)
+        scores = np.stack([self._entity_vectors[name] for name in names]) @ vectors[0]
+        best = int(np.argmax(scores))
+        if scores[best] < self.merge_threshold:
+            return None
+        logger.debug(f"Merged entity '{key}' into '{names[best]}' ({scores[best]:.2f})")
+        return names[best]
+
+    def _neighborhood(self, entity: str, depth: int) -> Dict[str, None]:
+        """Entities within ``depth`` undirected hops, in BFS order"""
+        seen = {entity: None}
+        frontier = [entity]
+        for _ in range(depth):
+            next_frontier = []
+            for name in frontier:
+                for neighbor in chain(self.graph.succ[name], self.graph.pred[name]):
+                    if neighbor not in seen:
+                        seen[neighbor] = None
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return seen
+
+    def _is_active_ts(self, source: str, target: str, edge_data: Dict[str, Any], moment: float):
+        raw_from = edge_data.get("valid_from") or edge_data.get("created_at")
+        raw_to = edge_data.get("valid_to")
+        cached = self._validity.get((source, target))
+        if cached is None or cached[0] != raw_from or cached[1] != raw_to:
+            start = self._to_timestamp(raw_from, -math.inf)
+            end = self._to_timestamp(raw_to, math.inf)
+            cached = (raw_from, raw_to, start, end)
+            self._validity[(source, target)] = cached
+        return cached[2] <= moment < cached[3]
+
+    def _to_timestamp(self, value: Optional[str], default: float) -> float:
+        parsed = self._parse_dt(value)
+        if parsed is None:
+            return default
         try:
-            subgraph = nx.ego_graph(self.graph, query_entity, radius=depth, undirected=True)
-            for u, v, data in subgraph.edges(data=True):
-                if self._is_active_at(data, at_time):
-                    relation = data.get("relation", "related_to")
-                    triplets.append((u, relation, v))
-        except Exception as e:
-            logger.error(f"Temporal graph search error: {e}")
-        return triplets
+            return parsed.timestamp()
+        except (OverflowError, OSError, ValueError):
+            return default
 
     def _close_conflicting_edges(
         self, source: str, relation: str, target: str, valid_to: str
@@ -152,15 +381,7 @@ class GraphStore:
             data["valid_to"] = valid_to
             data["last_updated"] = valid_to
             self.graph.add_edge(source, existing_target, **data)
-
-    def _is_active_at(self, edge_data: Dict[str, Any], at_time: datetime) -> bool:
-        valid_from = self._parse_dt(edge_data.get("valid_from") or edge_data.get("created_at"))
-        valid_to = self._parse_dt(edge_data.get("valid_to"))
-        if valid_from and valid_from > at_time:
-            return False
-        if valid_to and valid_to <= at_time:
-            return False
-        return True
+            self._mark_dirty(source, existing_target)
 
     def _parse_dt(self, value: Optional[str]) -> Optional[datetime]:
         if not value:
@@ -182,6 +403,22 @@ class GraphStore:
                 merged = list(dict.fromkeys(edge_data[key] + value))
                 edge_data[key] = merged
 
+    # Persistence hooks: no-ops here, the whole graph lives in memory and
+    # save() rewrites the file. SQLiteGraphStore loads and saves by entity.
+
+    def _load_entities(self, *entities: str) -> None:
+        """Make sure the edges touching these entities are in self.graph"""
+
+    def _load_neighborhoods(self, entities: List[str], depth: int) -> None:
+        """Make sure every edge within ``depth`` hops of the entities is in self.graph"""
+
+    def _mark_dirty(self, source: str, target: str) -> None:
+        """Record that an edge changed since the last save()"""
+
+    def full_graph(self) -> nx.DiGraph:
+        """Return the complete graph (loads everything for lazy stores)."""
+        return self.graph
+
     def get_summary(self) -> str:
         """Return a text summary of graph stats."""
         return (
@@ -195,9 +432,14 @@ class GraphStore:
             return
 
         data = nx.node_link_data(self.graph)
-        os.makedirs(os.path.dirname(self.persistence_path), exist_ok=True)
-        with open(self.persistence_path, "w") as f:
+        directory = os.path.dirname(self.persistence_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write a temp file and swap it in, so a crash never leaves half a file
+        tmp_path = f"{self.persistence_path}.tmp"
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.persistence_path)
         logger.info(f"Graph saved to {self.persistence_path}")
 
     def load(self):
@@ -209,6 +451,8 @@ class GraphStore:
             with open(self.persistence_path, "r") as f:
                 data = json.load(f)
             self.graph = nx.node_link_graph(data)
+            self._validity.clear()
+            self._index_graph()
             logger.info(f"Graph loaded from {self.persistence_path}")
         except Exception as e:
             logger.error(f"Failed to load graph: {e}")
@@ -216,6 +460,11 @@ class GraphStore:
     def clear(self):
         """Clear the graph and save empty state."""
         self.graph.clear()
+        self._validity.clear()
+        self._index_graph()
         if self.persistence_path:
             self.save()
         logger.info("Graph cleared")
+
+    def close(self):
+        """Release storage resources (nothing to do for the JSON store)."""
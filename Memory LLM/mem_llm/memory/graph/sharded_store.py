@@ -0,0 +1,261 @@
+"""
+Sharded Graph Store
+===================
+
+One knowledge graph per user (or tenant) instead of one process-wide graph.
+
+Each shard is an independent GraphStore file under a directory, opened the
+first time its user is touched and kept in an LRU of open shards; the least
+recently used shard is saved and dropped when the limit is reached. A user's
+searches, saves and clear() only ever touch that user's shard.
+
+A shard is never open twice: shards in use through ``use()`` are not evicted,
+and an evicted shard that a caller still holds is handed back out instead of
+opening a second store (with its own cache) on the same file.
+
+A pre-sharding graph is split once. The split runs under a lock file, so
+several worker processes starting together do not split it twice, and is
+marked done only after every shard is saved; an interrupted split is thrown
+away and redone on the next start.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .graph_store import GraphStore
+from .sqlite_store import SQLiteGraphStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD = "default"
+
+# Written into the shard directory once the legacy graph is fully split
+SPLIT_MARKER = ".legacy-split-done"
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Exclusive lock across processes, held for the with-block"""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after 10 s; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ShardedGraphStore:
+    """Per-user GraphStore shards with lazy opening and LRU eviction"""
+
+    def __init__(
+        self,
+        directory: str,
+        backend: str = "sqlite",
+        max_open_shards: int = 64,
+        legacy_path: Optional[str] = None,
+        **store_kwargs,
+    ):
+        """
+        Args:
+            directory: Folder holding one graph file per shard
+            backend: "sqlite" (SQLiteGraphStore, .db) or "json" (GraphStore, .json)
+            max_open_shards: Shards kept open before the least recently used
+                one is saved and dropped
+            legacy_path: Single-graph file (graph.db / graph.json) from before
+                sharding; its edges are split by their ``user_id`` metadata
+                until a split has completed in this directory
+            **store_kwargs: Passed to every shard (e.g. embedding_function)
+        """
+        if backend not in ("sqlite", "json"):
+            raise ValueError(f"Unknown graph backend: {backend}")
+        self.directory = directory
+        self.backend = backend
+        self.max_open_shards = max(1, max_open_shards)
+        self.store_kwargs = store_kwargs
+        self._shards: "OrderedDict[str, GraphStore]" = OrderedDict()
+        # Evicted shards stay reachable while someone still holds them
+        self._evicted: "weakref.WeakValueDictionary[str, GraphStore]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        if legacy_path and os.path.exists(legacy_path):
+            self._ensure_legacy_split(legacy_path)
+
+    def shard(self, user_id: Optional[str]) -> GraphStore:
+        """
+        Return the user's graph, opening it if needed
+
+        Prefer ``use()`` for anything that writes: a shard returned here can be
+        evicted (and saved) while the caller is still adding to it.
+        """
+        key = str(user_id) if user_id else DEFAULT_SHARD
+        with self._lock:
+            store = self._shards.get(key)
+            if store is not None:
+                self._shards.move_to_end(key)
+                return store
+
+            store = self._evicted.pop(key, None) or self._open(self.shard_path(key))
+            self._shards[key] = store
+            self._evict(keep=key)
+            return store
+
+    @contextmanager
+    def use(self, user_id: Optional[str]) -> Iterator[GraphStore]:
+        """Pin the user's shard open for the duration of a with-block"""
+        key = str(user_id) if user_id else DEFAULT_SHARD
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+            try:
+                store = self.shard(key)
+            except Exception:
+                self._unpin(key)
+                raise
+        try:
+            yield store
+        finally:
+            with self._lock:
+                self._unpin(key)
+                self._evict()
+
+    def _unpin(self, key: str) -> None:
+        if self._pins[key] > 1:
+            self._pins[key] -= 1
+        else:
+            del self._pins[key]
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Save and drop least recently used shards that are not pinned"""
+        excess = max(0, len(self._shards) - self.max_open_shards)
+        candidates = [key for key in self._shards if key not in self._pins and key != keep]
+        for key in candidates[:excess]:
+            store = self._shards.pop(key)
+            # Only save: a caller may still hold the store, and its
+            # connection closes once the last reference is gone
+            store.save()
+            self._evicted[key] = store
+            self.evictions += 1
+            logger.debug(f"Evicted graph shard {key}")
+
+    def shard_path(self, user_id: str) -> str:
+        """File of a user's shard; readable prefix plus a hash against collisions"""
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)[:64]
+        digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:8]
+        extension = ".db" if self.backend == "sqlite" else ".json"
+        return os.path.join(self.directory, f"{safe}-{digest}{extension}")
+
+    def _open(self, path: str) -> GraphStore:
+        if self.backend == "sqlite":
+            return SQLiteGraphStore(path, **self.store_kwargs)
+        return GraphStore(persistence_path=path, **self.store_kwargs)
+
+    def clear(self, user_id: Optional[str]) -> None:
+        """Clear one user's graph; other shards are untouched"""
+        with self.use(user_id) as store:
+            store.clear()
+
+    def save(self) -> None:
+        """Save every open shard"""
+        with self._lock:
+            for store in self._shards.values():
+                store.save()
+
+    def close(self) -> None:
+        """Save and close every open shard, including evicted ones still held"""
+        with self._lock:
+            for store in [*self._shards.values(), *self._evicted.values()]:
+                store.save()
+                store.close()
+            self._shards.clear()
+            self._evicted.clear()
+
+    def open_shards(self) -> List[str]:
+        """Users whose shards are open, least recently used first"""
+        with self._lock:
+            return list(self._shards)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "open_shards": len(self._shards),
+                "pinned_shards": len(self._pins),
+                "max_open_shards": self.max_open_shards,
+                "evictions": self.evictions,
+            }
+
+    def _ensure_legacy_split(self, path: str) -> None:
+        """Split the legacy graph unless a split has already completed here"""
+        marker = os.path.join(self.directory, SPLIT_MARKER)
+        if os.path.exists(marker):
+            return
+        with _file_lock(os.path.join(self.directory, ".legacy-split.lock")):
+            # Another process may have finished while we waited
+            if os.path.exists(marker):
+                return
+            self._discard_partial_shards()
+            try:
+                self._split_legacy(path)
+            except BaseException:
+                self.close()  # Left for the next start to discard
+                raise
+            with open(marker, "w", encoding="utf-8") as f:
+                f.write(path)
+
+    def _discard_partial_shards(self) -> None:
+        """Remove shards left by an interrupted split; nothing else writes before it"""
+        extension = ".db" if self.backend == "sqlite" else ".json"
+        for name in os.listdir(self.directory):
+            if name.endswith((extension, extension + "-wal", extension + "-shm")):
+                os.remove(os.path.join(self.directory, name))
+
+    def _split_legacy(self, path: str) -> None:
+        """Move a pre-sharding graph into per-user shards by edge ``user_id``"""
+        if path.endswith(".json"):
+            legacy = GraphStore(persistence_path=path)
+        else:
+            legacy = SQLiteGraphStore(path)
+        try:
+            graph = legacy.full_graph()
+            for source, target, data in graph.edges(data=True):
+                metadata = dict(data)
+                relation = metadata.pop("relation", "related_to")
+                # Already applied in the legacy graph; replaying would re-close edges
+                metadata.pop("supersedes", None)
+                self.shard(metadata.get("user_id")).add_triplet(
+                    source, relation, target, metadata=metadata
+                )
+            self.save()
+            logger.info(f"Split {graph.number_of_edges()} legacy graph edges from {path}")
+        finally:
+            legacy.close()
@@ -0,0 +1,399 @@
+"""
+SQLite Graph Store
+==================
+
+GraphStore persisted as SQLite rows instead of one JSON document.
+
+Nodes and edges are rows; save() upserts only the edges that changed since
+the last save in one transaction, so a turn's save cost and a crash's blast
+radius no longer grow with the graph. Nothing is read at startup: an entity's
+edges are loaded into the in-memory NetworkX cache the first time a lookup or
+update touches it.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from .graph_store import GraphStore, _index_tokens, normalize_entity
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteGraphStore(GraphStore):
+    """
+    Knowledge graph with row-level SQLite persistence and lazy loading.
+    Same API as GraphStore; ``graph`` holds the entities loaded so far.
+    """
+
+    def __init__(self, db_path: str = ":memory:", import_path: Optional[str] = None, **kwargs):
+        """
+        Args:
+            db_path: SQLite database file (":memory:" for a throwaway graph)
+            import_path: Legacy GraphStore JSON file imported when the
+                database is created
+            **kwargs: Entity merging options of GraphStore (embedding_function,
+                merge_threshold); only loaded entities are merge candidates
+        """
+        super().__init__(**kwargs)
+        self.persistence_path = db_path
+        self._lock = threading.RLock()
+        self._loaded: Set[str] = set()
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._dirty_aliases: Dict[str, str] = {}
+        self._all_loaded = False
+
+        is_new = db_path == ":memory:" or not os.path.exists(db_path)
+        directory = os.path.dirname(db_path) if db_path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            timeout=30.0,
+            isolation_level=None,  # Autocommit; writes use explicit transactions
+        )
+        if db_path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS graph_nodes (
+                name TEXT PRIMARY KEY,
+                data TEXT NOT NULL DEFAULT '{}'
+            );
+            CREATE TABLE IF NOT EXISTS graph_edges (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                relation TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (source, target)
+            );
+            CREATE INDEX IF NOT EXISTS idx_graph_edges_target ON graph_edges(target);
+            CREATE TABLE IF NOT EXISTS graph_aliases (
+                alias TEXT PRIMARY KEY,
+                name TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS graph_tokens (
+                token TEXT NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (token, name)
+            );
+            """
+        )
+
+        if is_new and import_path and os.path.exists(import_path):
+            self._import_json(import_path)
+        elif not self.conn.execute("SELECT 1 FROM graph_aliases LIMIT 1").fetchone():
+            # Graph written before entity resolution: index the existing names
+            self._index_rows(self.conn.execute("SELECT name, data FROM graph_nodes").fetchall())
+
+    # ------------------------------------------------------------------
+    # Lazy loading
+    # ------------------------------------------------------------------
+
+    def _load_entities(self, *entities: str) -> None:
+        with self._lock:
+            missing = [name for name in entities if name not in self._loaded]
+            if not missing or self._all_loaded:
+                return
+            placeholders = ",".join("?" * len(missing))
+            rows = self.conn.execute(
+                f"""
+                SELECT source, target, data FROM graph_edges WHERE source IN ({placeholders})
+                UNION
+                SELECT source, target, data FROM graph_edges WHERE target IN ({placeholders})
+                """,
+                missing + missing,
+            ).fetchall()
+            for source, target, data in rows:
+                # A cached edge is never older than its row
+                if not self.graph.has_edge(source, target):
+                    self.graph.add_edge(source, target, **json.loads(data))
+            nodes = self.conn.execute(
+                f"SELECT name, data FROM graph_nodes WHERE name IN ({placeholders})", missing
+            ).fetchall()
+            for name, data in nodes:
+                self.graph.add_node(name, **json.loads(data))
+            self._loaded.update(missing)
+
+    def _load_neighborhoods(self, entities: List[str], depth: int) -> None:
+        with self._lock:
+            frontier = set(entities)
+            for _ in range(depth + 1):
+                self._load_entities(*frontier)
+                frontier = {
+                    neighbor
+                    for name in frontier
+                    if name in self.graph
+                    for neighbor in nx.all_neighbors(self.graph, name)
+                } - self._loaded
+                if not frontier:
+                    break
+
+    def _mark_dirty(self, source: str, target: str) -> None:
+        self._dirty.add((source, target))
+
+    # Alias and word lookups go to the indexed tables once and are cached;
+    # a miss is cached as None / an empty set.
+
+    def _find_alias(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._aliases:
+                row = self.conn.execute(
+                    "SELECT name FROM graph_aliases WHERE alias = ?", (key,)
+                ).fetchone()
+                self._aliases[key] = row[0] if row else None
+            return self._aliases[key]
+
+    def _find_token(self, token: str) -> Set[str]:
+        with self._lock:
+            if token not in self._token_index:
+                rows = self.conn.execute("SELECT name FROM graph_tokens WHERE token = ?", (token,))
+                self._token_index[token] = {row[0] for row in rows}
+            return self._token_index[token]
+
+    def _index_alias(self, key: str, node: str) -> None:
+        with self._lock:
+            for token in _index_tokens(key):
+                self._find_token(token)  # cache the stored names before adding
+            super()._index_alias(key, node)
+            self._dirty_aliases[key] = node
+
+    def _index_rows(self, nodes: List[Tuple[str, str]]) -> None:
+        """Write alias and word rows for (name, data) node rows"""
+        aliases, tokens = {}, set()
+        for name, data in nodes:
+            extra = json.loads(data).get("aliases", []) if data else []
+            for key in [normalize_entity(name)] + list(extra):
+                if key and key not in aliases:
+                    aliases[key] = name
+                    tokens.update((token, name) for token in _index_tokens(key))
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO graph_aliases (alias, name) VALUES (?, ?)",
+                list(aliases.items()),
+            )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO graph_tokens (token, name) VALUES (?, ?)", list(tokens)
+            )
+
+    def full_graph(self) -> nx.DiGraph:
+        """Load every entity and return the complete graph."""
+        with self._lock:
+            if not self._all_loaded:
+                for source, target, data in self.conn.execute(
+                    "SELECT source, target, data FROM graph_edges"
+                ):
+                    if not self.graph.has_edge(source, target):
+                        self.graph.add_edge(source, target, **json.loads(data))
+                for name, data in self.conn.execute("SELECT name, data FROM graph_nodes"):
+                    self.graph.add_node(name, **json.loads(data))
+                self._loaded.update(self.graph.nodes)
+                self._all_loaded = True
+            return self.graph
+
+    # ------------------------------------------------------------------
+    # Locked wrappers (lookups may load rows into the shared cache)
+    # ------------------------------------------------------------------
+
+    def add_triplet(self, source: str, relation: str, target: str, metadata: Dict[str, Any] = None):
+        with self._lock:
+            super().add_triplet(source, relation, target, metadata)
+
+    def close_triplet(self, *args, **kwargs) -> bool:
+        with self._lock:
+            return super().close_triplet(*args, **kwargs)
+
+    def add_alias(self, alias: str, entity: str) -> str:
+        with self._lock:
+            return super().add_alias(alias, entity)
+
+    def resolve(self, query: Any) -> List[str]:
+        with self._lock:
+            return super().resolve(query)
+
+    def search(self, query_entity: str, depth: int = 1) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            return super().search(query_entity, depth)
+
+    def search_many(
+        self,
+        entities: Iterable[str],
+        at_time: Optional[datetime] = None,
+        depth: int = 1,
+    ) -> Dict[str, List[Tuple[str, str, str]]]:
+        with self._lock:
+            return super().search_many(entities, at_time=at_time, depth=depth)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self):
+        """Write the edges changed since the last save in one transaction."""
+        with self._lock:
+            if not self._dirty and not self._dirty_aliases:
+                return
+            edges = []
+            nodes = set()
+            for source, target in self._dirty:
+                data = self.graph.get_edge_data(source, target)
+                if data is None:
+                    continue
+                edges.append((source, target, data.get("relation"), json.dumps(data, default=str)))
+                nodes.update((source, target))
+
+            with self._transaction() as cursor:
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO graph_nodes (name) VALUES (?)",
+                    [(name,) for name in nodes],
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO graph_edges (source, target, relation, data)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(source, target) DO UPDATE SET
+                        relation = excluded.relation, data = excluded.data
+                    """,
+                    edges,
+                )
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO graph_aliases (alias, name) VALUES (?, ?)",
+                    list(self._dirty_aliases.items()),
+                )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO graph_tokens (token, name) VALUES (?, ?)",
+                    [
+                        (token, name)
+                        for key, name in self._dirty_aliases.items()
+                        for token in _index_tokens(key)
+                    ],
+                )
+            self._dirty.clear()
+            self._dirty_aliases.clear()
+        logger.debug(f"Graph saved {len(edges)} changed edges to {self.persistence_path}")
+
+    def load(self):
+        """Drop the cache; entities are reloaded from the database on demand."""
+        with self._lock:
+            self.graph = nx.DiGraph()
+            self._validity.clear()
+            self._aliases.clear()
+            self._token_index.clear()
+            self._entity_vectors.clear()
+            self._loaded.clear()
+            self._dirty.clear()
+            self._dirty_aliases.clear()
+            self._all_loaded = False
+
+    @contextmanager
+    def _transaction(self):
+        """Run a block of statements as one BEGIN IMMEDIATE transaction"""
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except BaseException:
+            if self.conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+
+    def _import_json(self, path: str) -> None:
+        try:
+            with open(path, "r") as f:
+                legacy = nx.node_link_graph(json.load(f))
+        except Exception as e:
+            logger.error(f"Failed to import graph from {path}: {e}")
+            return
+
+        nodes = [(name, json.dumps(data, default=str)) for name, data in legacy.nodes(data=True)]
+        with self._transaction() as cursor:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO graph_nodes (name, data) VALUES (?, ?)", nodes
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO graph_edges (source, target, relation, data) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (u, v, data.get("relation"), json.dumps(data, default=str))
+                    for u, v, data in legacy.edges(data=True)
+                ],
+            )
+        self._index_rows(nodes)
+        logger.info(f"Imported {legacy.number_of_edges()} graph edges from {path}")
+
+    def snapshot(self, path: str) -> None:
+        """
+        Write a consistent copy of the graph database to ``path``.
+
+        The copy is built next to the target and renamed into place, so
+        ``path`` is either the previous snapshot or the complete new one.
+        """
+        with self._lock:
+            self.save()
+            tmp_path = f"{path}.tmp"
+            target = sqlite3.connect(tmp_path)
+            try:
+                self.conn.backup(target)
+            finally:
+                target.close()
+            os.replace(tmp_path, path)
+
+    def compact(self) -> None:
+        """Drop entities without edges (and their aliases) and reclaim free pages."""
+        with self._lock:
+            self.save()
+            with self._transaction() as cursor:
+                cursor.execute(
+                    """
+                    DELETE FROM graph_nodes WHERE name NOT IN (
+                        SELECT source FROM graph_edges UNION SELECT target FROM graph_edges
+                    )
+                    """
+                )
+                cursor.execute(
+                    "DELETE FROM graph_aliases WHERE name NOT IN (SELECT name FROM graph_nodes)"
+                )
+                cursor.execute(
+                    "DELETE FROM graph_tokens WHERE name NOT IN (SELECT name FROM graph_nodes)"
+                )
+            self.load()
+            self.conn.execute("VACUUM")
+
+    def get_summary(self) -> str:
+        """Return a text summary of graph stats."""
+        with self._lock:
+            self.save()
+            nodes = self.conn.execute("SELECT COUNT(*) FROM graph_nodes").fetchone()[0]
+            edges = self.conn.execute("SELECT COUNT(*) FROM graph_edges").fetchone()[0]
+        return f"Graph contains {nodes} entities and {edges} relationships."
+
+    def clear(self):
+        """Delete every node and edge."""
+        with self._lock:
+            with self._transaction() as cursor:
+                cursor.execute("DELETE FROM graph_edges")
+                cursor.execute("DELETE FROM graph_nodes")
+                cursor.execute("DELETE FROM graph_aliases")
+                cursor.execute("DELETE FROM graph_tokens")
+            self.load()
+        logger.info("Graph cleared")
+
+    def close(self):
+        """Save pending changes and close the database."""
+        with self._lock:
+            if self.conn is None:
+                return
+            self.save()
+            self.conn.close()
+            self.conn = None
@@ -7,7 +7,7 @@ Orchestrates the 4-layer memory system.
 
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .categorizer import AutoCategorizer
 from .layers import CategoryLayer, DomainLayer, EpisodeLayer, TraceLayer
@@ -68,11 +68,20 @@ class HierarchicalMemory:
             )
 
     def add_interaction(
-        self, user_id: str, user_message: str, bot_response: str, metadata: Optional[Dict] = None
+        self,
+        user_id: str,
+        user_message: str,
+        bot_response: str,
+        metadata: Optional[Dict] = None,
+        categorization: Optional[Tuple[str, str]] = None,
     ) -> Dict[str, str]:
         """
         Process and store interaction across all layers.
 
+        Args:
+            categorization: (Category, Domain) already extracted for this turn,
+                e.g. by MemoryExtractor; skips the categorizer's LLM call
+
         Returns:
             Dict with IDs/status for each layer
         """
@@ -89,13 +98,38 @@ class HierarchicalMemory:
             }
         )
         result["episode_id"] = episode_id
+        result.update(
+            self.process_interaction(
+                user_id, user_message, bot_response, episode_id, categorization
+            )
+        )
+        return result
+
+    def process_interaction(
+        self,
+        user_id: str,
+        user_message: str,
+        bot_response: str,
+        episode_id: Any,
+        categorization: Optional[Tuple[str, str]] = None,
+    ) -> Dict[str, str]:
+        """
+        Update the Trace, Category and Domain layers for a stored episode.
+
+        Split from add_interaction so the agent can store the episode right
+        away and run categorization in the background.
+
+        Returns:
+            Dict with category, domain and trace_id (empty without an LLM)
+        """
+        result = {}
 
         # If no LLM, we can't do smart categorization/abstraction yet
-        if not self.categorizer:
+        if not categorization and not self.categorizer:
             return result
 
         # 2. Categorization
-        category, domain = self.categorizer.categorize(user_message, bot_response)
+        category, domain = categorization or self.categorizer.categorize(user_message, bot_response)
         result["category"] = category
         result["domain"] = domain
 
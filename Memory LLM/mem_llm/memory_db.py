@@ -5,10 +5,15 @@ Stores memory data using SQLite - Production-ready
 
 import json
 import logging
+import os
+import queue
 import sqlite3
 import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +27,180 @@ except ImportError:
     VectorStore = None
 
 
+class ConnectionPool:
+    """Thread-safe SQLite connection pool"""
+
+    def __init__(self, db_path: str, pool_size: int = 5, read_only: bool = False):
+        """
+        Initialize connection pool
+
+        Args:
+            db_path: Path to SQLite database
+            pool_size: Maximum number of connections
+            read_only: Open connections with ``query_only`` so they can never write
+        """
+        self.db_path = Path(db_path)
+        self.pool_size = pool_size
+        self.read_only = read_only
+        self.pool = queue.Queue(maxsize=pool_size)
+        self.local = threading.local()
+        self._lock = threading.Lock()
+
+        # Pre-create connections
+        for _ in range(pool_size):
+            conn = self._create_connection()
+            self.pool.put(conn)
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Create a new connection with proper settings"""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            timeout=30.0,  # 30 second timeout
+            isolation_level=None,  # Autocommit mode for better concurrency
+        )
+        conn.row_factory = sqlite3.Row
+
+        # Enable WAL mode and optimizations
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
+        if self.read_only:
+            # WAL readers never block the writer, and query_only guarantees these
+            # connections stay readers.
+            conn.execute("PRAGMA query_only=ON")
+
+        return conn
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Get a connection from pool (context manager)
+
+        Usage:
+            with pool.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT ...")
+        """
+        # Check if thread already has a connection
+        if hasattr(self.local, "conn") and self.local.conn:
+            yield self.local.conn
+            return
+
+        # Get connection from pool
+        conn = None
+        try:
+            conn = self.pool.get(timeout=10.0)
+            self.local.conn = conn
+            yield conn
+        except queue.Empty:
+            logger.error("Connection pool exhausted")
+            # Create temporary connection
+            conn = self._create_connection()
+            yield conn
+        finally:
+            # Return to pool (a temporary overflow connection is closed on Full)
+            if conn is not None:
+                self.local.conn = None
+                try:
+                    self.pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Execute operations in a transaction
+
+        Usage:
+            with pool.transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute("INSERT ...")
+                cursor.execute("UPDATE ...")
+            # Automatically committed
+        """
+        with self.get_connection() as conn:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.execute("COMMIT")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                logger.error(f"Transaction rolled back: {e}")
+                raise
+
+    def close_all(self):
+        """Close all connections in pool"""
+        while not self.pool.empty():
+            try:
+                conn = self.pool.get_nowait()
+                conn.close()
+            except queue.Empty:
+                break
+
+
 class SQLMemoryManager:
     """SQLite-based memory management system with thread-safety"""
 
+    # Most recent matching turns scored per conversation search
+    SEARCH_CANDIDATES = 1000
+
+    # Knowledge base changes pushed to the vector store per batch, and how
+    # often the background sync checks for changes made elsewhere (seconds)
+    VECTOR_SYNC_BATCH = 1000
+    VECTOR_SYNC_INTERVAL = 5.0
+
+    # A vector store that has not synced for this long (seconds) stops holding
+    # change log entries back; if it comes back it is rebuilt from the
+    # knowledge base. Positions are refreshed at most once a minute when idle.
+    VECTOR_CONSUMER_TTL = 7 * 24 * 3600.0
+    VECTOR_CONSUMER_REFRESH = 60.0
+
+    # Words too common in chat to rank on. Besides adding nothing to BM25, they
+    # match nearly every turn and would crowd real hits out of the candidates.
+    CONVERSATION_STOPWORDS = frozenset(
+        """
+        a an and are as at be but by can could did do does for from had has have
+        how i if in is it its me my no not of on or our so that the their them
+        then there they this to was we were what when where which who why will
+        with would you your bir bu da de ve ile mi mu ne nedir
+        """.split()
+    )
+
     def __init__(
         self,
         db_path: str = "memories/memories.db",
         enable_vector_search: bool = False,
         vector_store_type: str = "chroma",
         embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        write_behind: bool = False,
+        write_batch_size: int = 256,
+        write_batch_interval: float = 0.005,
+        read_pool_size: int = 4,
+        vector_store_options: Optional[Dict[str, Any]] = None,
+        background_vector_sync: bool = False,
+        worker_id: Optional[str] = None,
     ):
         """
         Args:
             db_path: SQLite database file path
             enable_vector_search: Enable vector/semantic search (optional)
-            vector_store_type: Type of vector store ('chroma', etc.)
+            vector_store_type: Type of vector store ('chroma' or 'numpy')
             embedding_model: Embedding model name (sentence-transformers)
+            write_behind: Queue interactions, profile updates and KB inserts for a
+                single writer thread that commits them in batches (opt-in)
+            write_batch_size: Maximum operations per write-behind transaction
+            write_batch_interval: Seconds the writer waits to fill a batch
+            read_pool_size: Read-only connections that serve queries without
+                taking the write lock (0 = read through the write connection)
+            vector_store_options: Extra vector store settings, e.g.
+                ``{"index": "ivf", "nprobe": 32}`` for the NumPy store
+            background_vector_sync: Push knowledge base changes to the vector
+                store from a background thread instead of inside add_knowledge
+            worker_id: Set when several processes share this database (see
+                mem_llm.api_cluster); each worker other than "0" keeps its own
+                vector store and change-log position. Default: MEM_LLM_WORKER_ID
         """
         self.db_path = Path(db_path)
 
@@ -50,7 +213,33 @@ class SQLMemoryManager:
         self._lock = threading.RLock()  # Reentrant lock for thread safety
         self._init_database()
 
-        # Vector store (optional)
+        # Read pool: in WAL mode readers work from a snapshot and never wait on
+        # the writer, so reads skip self._lock entirely. An in-memory database
+        # is private to its connection and has to be read through self.conn.
+        self._read_pool: Optional[ConnectionPool] = None
+        if read_pool_size > 0 and str(db_path) != ":memory:":
+            self._read_pool = ConnectionPool(
+                str(self.db_path), pool_size=read_pool_size, read_only=True
+            )
+
+        # Write-behind group commit (optional)
+        self.write_behind = write_behind
+        self.write_batch_size = max(1, write_batch_size)
+        self.write_batch_interval = max(0.0, write_batch_interval)
+        self._write_queue: "queue.Queue[Optional[Tuple[str, tuple, Future]]]" = queue.Queue()
+        self._pending_writes = 0
+        self._pending_lock = threading.Lock()
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        if write_behind:
+            self._start_writer()
+
+        # Vector store (optional). Every process sharing the database applies
+        # every KB change to its own store, tracked by its own log position.
+        if worker_id is None:
+            worker_id = os.environ.get("MEM_LLM_WORKER_ID")
+        worker_id = str(worker_id) if worker_id not in (None, "", "0", 0) else None
+        self.vector_consumer = f"worker-{worker_id}" if worker_id else "default"
         self.enable_vector_search = enable_vector_search
         self.vector_store: Optional[VectorStore] = None
 
@@ -63,12 +252,15 @@ class SQLMemoryManager:
                 self.enable_vector_search = False
             else:
                 try:
-                    persist_dir = str(db_dir / "vector_store")
+                    persist_dir = str(
+                        db_dir / ("vector_store" if not worker_id else f"vector_store-{worker_id}")
+                    )
                     self.vector_store = create_vector_store(
                         store_type=vector_store_type,
                         collection_name="knowledge_base",
                         persist_directory=persist_dir,
                         embedding_model=embedding_model,
+                        **(vector_store_options or {}),
                     )
                     if self.vector_store:
                         logger.info(f"Vector search enabled: {vector_store_type}")
@@ -84,21 +276,45 @@ class SQLMemoryManager:
                     logger.error(f"An unexpected error occurred initializing vector store: {e}")
                     self.enable_vector_search = False
 
-    def _init_database(self) -> None:
-        """Create database and tables"""
-        self.conn = sqlite3.connect(
+        # Incremental vector sync (see sync_vector_store)
+        self._vector_sync_lock = threading.Lock()
+        self._vector_sync_event = threading.Event()
+        self._vector_sync_stop = threading.Event()
+        self._vector_sync_thread: Optional[threading.Thread] = None
+        if self.vector_store:
+            # A store without a position is loaded in full by its first sync
+            self._queue_resync_if_store_empty()
+            if background_vector_sync:
+                self._vector_sync_thread = threading.Thread(
+                    target=self._vector_sync_loop, name="mem-llm-vector-sync", daemon=True
+                )
+                self._vector_sync_thread.start()
+            else:
+                try:
+                    self.sync_vector_store()
+                except Exception as e:
+                    logger.warning(f"Failed to sync KB to vector store: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the standard settings"""
+        conn = sqlite3.connect(
             str(self.db_path),
             check_same_thread=False,
             timeout=30.0,  # 30 second timeout for busy database
             isolation_level=None,  # Autocommit mode
         )
-        self.conn.row_factory = sqlite3.Row
+        conn.row_factory = sqlite3.Row
 
         # Enable WAL mode for better concurrency
-        self.conn.execute("PRAGMA journal_mode=WAL")
-        self.conn.execute("PRAGMA synchronous=NORMAL")
-        self.conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
-        self.conn.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
+        conn.execute("PRAGMA busy_timeout=30000")  # 30 second busy timeout
+        return conn
+
+    def _init_database(self) -> None:
+        """Create database and tables"""
+        self.conn = self._connect()
 
         cursor = self.conn.cursor()
 
@@ -142,6 +358,14 @@ class SQLMemoryManager:
         """
         )
 
+        # Keyset pagination: a user's conversations in id order
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_user_id
+            ON conversations(user_id, id)
+        """
+        )
+
         cursor.execute(
             """
             CREATE INDEX IF NOT EXISTS idx_resolved
@@ -188,29 +412,180 @@ class SQLMemoryManager:
         """
         )
 
+        self._init_user_stats(cursor)
+        self._init_vector_changes(cursor)
         self._init_fts(cursor)
 
         self.conn.commit()
 
+    # A turn counts as a KB hit when the agent recorded ``used_kb`` in its
+    # metadata. CASE keeps json_extract away from rows with non-JSON metadata.
+    _KB_HIT_SQL = (
+        "CASE WHEN json_valid({row}.metadata) THEN "
+        "(CASE WHEN json_extract({row}.metadata, '$.used_kb') THEN 1 ELSE 0 END) "
+        "ELSE 0 END"
+    )
+
+    def _init_user_stats(self, cursor) -> None:
+        """Create the per-user aggregate table and the triggers that maintain it.
+
+        Counters are updated by triggers on conversations, inside the same
+        transaction as the write, so totals can be read per user in O(1)
+        instead of scanning the history. Deletes and updates (clear_memory,
+        resolving an issue) are reflected as well. The table is rebuilt when
+        its totals disagree with the conversations table, which covers
+        databases written before it existed.
+        """
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS user_stats (
+                user_id TEXT PRIMARY KEY,
+                turn_count INTEGER NOT NULL DEFAULT 0,
+                total_chars INTEGER NOT NULL DEFAULT 0,
+                first_timestamp TIMESTAMP,
+                last_timestamp TIMESTAMP,
+                resolved_count INTEGER NOT NULL DEFAULT 0,
+                kb_hit_count INTEGER NOT NULL DEFAULT 0
+            )
+        """
+        )
+
+        def add(row: str) -> str:
+            return f"""
+                INSERT INTO user_stats (user_id, turn_count, total_chars, first_timestamp,
+                                        last_timestamp, resolved_count, kb_hit_count)
+                VALUES ({row}.user_id, 1,
+                        length({row}.user_message) + length({row}.bot_response),
+                        {row}.timestamp, {row}.timestamp, {row}.resolved != 0,
+                        {self._KB_HIT_SQL.format(row=row)})
+                ON CONFLICT(user_id) DO UPDATE SET
+                    turn_count = turn_count + 1,
+                    total_chars = total_chars + excluded.total_chars,
+                    first_timestamp = MIN(COALESCE(first_timestamp, excluded.first_timestamp),
+                                          excluded.first_timestamp),
+                    last_timestamp = MAX(COALESCE(last_timestamp, excluded.last_timestamp),
+                                         excluded.last_timestamp),
+                    resolved_count = resolved_count + excluded.resolved_count,
+                    kb_hit_count = kb_hit_count + excluded.kb_hit_count;
+            """
+
+        def subtract(row: str) -> str:
+            return f"""
+                UPDATE user_stats SET
+                    turn_count = turn_count - 1,
+                    total_chars = total_chars
+                        - (length({row}.user_message) + length({row}.bot_response)),
+                    resolved_count = resolved_count - ({row}.resolved != 0),
+                    kb_hit_count = kb_hit_count - ({self._KB_HIT_SQL.format(row=row)})
+                WHERE user_id = {row}.user_id;
+            """
+
+        for stmt in (
+            f"""
+            CREATE TRIGGER IF NOT EXISTS user_stats_ai AFTER INSERT ON conversations BEGIN
+                {add("new")}
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS user_stats_ad AFTER DELETE ON conversations BEGIN
+                {subtract("old")}
+                DELETE FROM user_stats WHERE user_id = old.user_id AND turn_count <= 0;
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS user_stats_au AFTER UPDATE ON conversations BEGIN
+                {subtract("old")}
+                {add("new")}
+            END
+            """,
+        ):
+            cursor.execute(stmt)
+
+        counted = cursor.execute("SELECT COALESCE(SUM(turn_count), 0) FROM user_stats").fetchone()
+        stored = cursor.execute("SELECT COUNT(*) FROM conversations").fetchone()
+        if counted[0] != stored[0]:
+            logger.info(f"Rebuilding user_stats from {stored[0]} conversations")
+            cursor.execute("DELETE FROM user_stats")
+            cursor.execute(
+                f"""
+                INSERT INTO user_stats (user_id, turn_count, total_chars, first_timestamp,
+                                        last_timestamp, resolved_count, kb_hit_count)
+                SELECT user_id, COUNT(*),
+                       SUM(length(user_message) + length(bot_response)),
+                       MIN(timestamp), MAX(timestamp), SUM(resolved != 0),
+                       SUM({self._KB_HIT_SQL.format(row="conversations")})
+                FROM conversations
+                GROUP BY user_id
+            """
+            )
+
+    def _init_vector_changes(self, cursor) -> None:
+        """Create the knowledge base change log the vector sync drains.
+
+        Triggers record the id of every inserted, updated or deleted KB row,
+        so a sync only touches rows that changed since the last one and
+        survives restarts. A database that had KB rows before the log existed
+        gets all of them queued once. Each vector store (one per process
+        sharing the database) records how far it has read the log, and when,
+        in kb_vector_sync_state; entries are removed once every store that
+        synced within VECTOR_CONSUMER_TTL has them.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'kb_vector_changes'"
+        ).fetchone()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS kb_vector_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                kb_id INTEGER NOT NULL
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS kb_vector_sync_state (
+                consumer TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL DEFAULT 0,
+                last_seen REAL NOT NULL DEFAULT 0
+            )
+        """
+        )
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(kb_vector_sync_state)")}
+        if "last_seen" not in columns:
+            cursor.execute(
+                "ALTER TABLE kb_vector_sync_state ADD COLUMN last_seen REAL NOT NULL DEFAULT 0"
+            )
+            cursor.execute("UPDATE kb_vector_sync_state SET last_seen = ?", (time.time(),))
+        for event, row in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")):
+            cursor.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS kb_vector_changes_{event.lower()}
+                AFTER {event} ON knowledge_base BEGIN
+                    INSERT INTO kb_vector_changes (kb_id) VALUES ({row}.id);
+                END
+            """
+            )
+        if not exists:
+            cursor.execute("INSERT INTO kb_vector_changes (kb_id) SELECT id FROM knowledge_base")
+
     def _init_fts(self, cursor) -> None:
-        """Create the FTS5 index over knowledge_base and keep it in sync.
+        """Create the FTS5 indexes over knowledge_base and conversations.
 
         FTS5 ships with SQLite itself, so this needs no extra dependency. It
         gives us BM25 relevance ranking, which plain LIKE matching cannot do.
-        Older databases are backfilled once, on creation.
         """
         try:
-            cursor.execute(
-                """
-                CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
-                    question,
-                    answer,
-                    keywords,
-                    content='knowledge_base',
-                    content_rowid='id',
-                    tokenize="porter unicode61"
-                )
-                """
+            self._create_fts_index(
+                cursor,
+                "knowledge_fts",
+                "knowledge_base",
+                ["question", "answer", "keywords"],
+            )
+            self._create_fts_index(
+                cursor,
+                "conversations_fts",
+                "conversations",
+                ["user_message", "bot_response", "metadata"],
             )
         except sqlite3.OperationalError as e:
             # SQLite built without FTS5: keep working with keyword search only.
@@ -218,42 +593,292 @@ class SQLMemoryManager:
             self.fts_available = False
             return
 
-        # Triggers keep the index current without touching the write paths.
-        for stmt in (
+        self.fts_available = True
+
+    @staticmethod
+    def _create_fts_index(cursor, name: str, content: str, columns: List[str]) -> None:
+        """Create an external-content FTS5 table kept in sync by triggers.
+
+        Triggers keep the index current without touching the write paths. The
+        index is rebuilt when its row count disagrees with the content table,
+        which covers databases written before the index existed. (count(*) on
+        the FTS table itself reads the content table, so the check has to use
+        the index's own docsize table.)
+        """
+        cols = ", ".join(columns)
+        new_vals = ", ".join(f"new.{c}" for c in columns)
+        old_vals = ", ".join(f"old.{c}" for c in columns)
+
+        cursor.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+                {cols},
+                content='{content}',
+                content_rowid='id',
+                tokenize="porter unicode61"
+            )
             """
-            CREATE TRIGGER IF NOT EXISTS knowledge_fts_ai AFTER INSERT ON knowledge_base BEGIN
-                INSERT INTO knowledge_fts(rowid, question, answer, keywords)
-                VALUES (new.id, new.question, new.answer, new.keywords);
+        )
+
+        for stmt in (
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {content} BEGIN
+                INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new_vals});
             END
             """,
-            """
-            CREATE TRIGGER IF NOT EXISTS knowledge_fts_ad AFTER DELETE ON knowledge_base BEGIN
-                INSERT INTO knowledge_fts(knowledge_fts, rowid, question, answer, keywords)
-                VALUES ('delete', old.id, old.question, old.answer, old.keywords);
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {content} BEGIN
+                INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
             END
             """,
-            """
-            CREATE TRIGGER IF NOT EXISTS knowledge_fts_au AFTER UPDATE ON knowledge_base BEGIN
-                INSERT INTO knowledge_fts(knowledge_fts, rowid, question, answer, keywords)
-                VALUES ('delete', old.id, old.question, old.answer, old.keywords);
-                INSERT INTO knowledge_fts(rowid, question, answer, keywords)
-                VALUES (new.id, new.question, new.answer, new.keywords);
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE ON {content} BEGIN
+                INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+                INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new_vals});
             END
             """,
         ):
             cursor.execute(stmt)
 
-        # Backfill rows written before the index existed.
-        row = cursor.execute("SELECT count(*) FROM knowledge_fts").fetchone()
-        if row and row[0] == 0:
+        indexed = cursor.execute(f"SELECT count(*) FROM {name}_docsize").fetchone()[0]
+        stored = cursor.execute(f"SELECT count(*) FROM {content}").fetchone()[0]
+        if indexed != stored:
+            logger.info(f"Indexing {stored} existing {content} rows into {name}")
+            cursor.execute(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+    # ------------------------------------------------------------------
+    # Write statements (shared by the direct path and the write-behind writer)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _exec_add_user(
+        cursor, user_id: str, name: Optional[str] = None, metadata: Optional[Dict] = None
+    ) -> None:
+        cursor.execute(
+            """
+            INSERT INTO users (user_id, name, metadata)
+            VALUES (?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                name = COALESCE(excluded.name, users.name),
+                metadata = COALESCE(excluded.metadata, users.metadata)
+        """,
+            (user_id, name, json.dumps(metadata or {})),
+        )
+
+    @staticmethod
+    def _exec_add_interaction(
+        cursor,
+        user_id: str,
+        user_message: str,
+        bot_response: str,
+        metadata: Optional[Dict] = None,
+        resolved: bool = False,
+    ) -> int:
+        # Create the user only if missing, so an existing name/metadata is kept.
+        cursor.execute(
+            """
+            INSERT INTO users (user_id, metadata, last_interaction)
+            VALUES (?, '{}', CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id) DO UPDATE SET last_interaction = CURRENT_TIMESTAMP
+        """,
+            (user_id,),
+        )
+        cursor.execute(
+            """
+            INSERT INTO conversations
+            (user_id, user_message, bot_response, metadata, resolved)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (user_id, user_message, bot_response, json.dumps(metadata or {}), resolved),
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _exec_update_user_profile(cursor, user_id: str, updates: Dict) -> None:
+        allowed_fields = ["name", "preferences", "summary", "metadata"]
+        set_clause = []
+        values = []
+
+        for field, value in updates.items():
+            if field in allowed_fields:
+                set_clause.append(f"{field} = ?")
+                if isinstance(value, (dict, list)):
+                    values.append(json.dumps(value))
+                else:
+                    values.append(value)
+
+        if set_clause:
+            values.append(user_id)
             cursor.execute(
-                """
-                INSERT INTO knowledge_fts(rowid, question, answer, keywords)
-                SELECT id, question, answer, keywords FROM knowledge_base
-                """
+                f"""
+                UPDATE users
+                SET {', '.join(set_clause)}
+                WHERE user_id = ?
+            """,
+                values,
             )
 
-        self.fts_available = True
+    @staticmethod
+    def _exec_add_knowledge(
+        cursor,
+        category: str,
+        question: str,
+        answer: str,
+        keywords: Optional[List[str]] = None,
+        priority: int = 0,
+    ) -> int:
+        cursor.execute(
+            """
+            INSERT INTO knowledge_base
+            (category, question, answer, keywords, priority)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (category, question, answer, json.dumps(keywords or []), priority),
+        )
+        return cursor.lastrowid
+
+    _WRITE_OPS = {
+        "user": "_exec_add_user",
+        "interaction": "_exec_add_interaction",
+        "profile": "_exec_update_user_profile",
+        "knowledge": "_exec_add_knowledge",
+    }
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        """Run a block of statements as one BEGIN IMMEDIATE transaction"""
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+            cursor.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Write-behind group commit
+    # ------------------------------------------------------------------
+
+    def _start_writer(self) -> None:
+        self._writer_conn = self._connect()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="mem-llm-sql-writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def _enqueue_write(self, kind: str, *args) -> Future:
+        """Queue a write for the writer thread and return its future"""
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            raise RuntimeError("SQLMemoryManager writer is not running")
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending_writes += 1
+        self._write_queue.put((kind, args, future))
+        return future
+
+    def _writer_loop(self) -> None:
+        """Drain the queue in batches, one transaction per batch"""
+        running = True
+        while running:
+            op = self._write_queue.get()
+            if op is None:
+                break
+
+            batch = [op]
+            deadline = time.monotonic() + self.write_batch_interval
+            # Take whatever piled up while the last batch committed, then wait
+            # briefly for stragglers unless someone is blocked on a barrier.
+            while len(batch) < self.write_batch_size and batch[-1][0] != "barrier":
+                try:
+                    nxt = self._write_queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        nxt = self._write_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if nxt is None:
+                    running = False
+                    break
+                batch.append(nxt)
+
+            self._commit_batch(batch)
+
+    def _apply_write(self, cursor, kind: str, args: tuple) -> Any:
+        if kind == "barrier":
+            return None
+        return getattr(self, self._WRITE_OPS[kind])(cursor, *args)
+
+    def _commit_batch(self, batch: List[Tuple[str, tuple, Future]]) -> None:
+        try:
+            with self._transaction(self._writer_conn) as cursor:
+                results = [self._apply_write(cursor, kind, args) for kind, args, _ in batch]
+        except Exception as e:
+            # One bad operation must not sink the rest: replay them one by one.
+            logger.warning(f"Write batch of {len(batch)} failed ({e}), retrying individually")
+            for kind, args, future in batch:
+                try:
+                    with self._transaction(self._writer_conn) as cursor:
+                        result = self._apply_write(cursor, kind, args)
+                    future.set_result(result)
+                except Exception as op_error:
+                    logger.error(f"Queued {kind} write failed: {op_error}")
+                    future.set_exception(op_error)
+            self._writes_done(batch)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+        self._writes_done(batch)
+
+    def _writes_done(self, batch: List[Tuple[str, tuple, Future]]) -> None:
+        done = sum(1 for kind, _, _ in batch if kind != "barrier")
+        with self._pending_lock:
+            self._pending_writes -= done
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until every write queued so far is committed (write-behind mode)
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+        """
+        if self._writer_thread is None or not self._writer_thread.is_alive():
+            return
+        self._enqueue_barrier().result(timeout=timeout)
+
+    def _enqueue_barrier(self) -> Future:
+        future: Future = Future()
+        self._write_queue.put(("barrier", (), future))
+        return future
+
+    def _read_barrier(self) -> None:
+        """Make queued writes visible before a read (read-your-writes)"""
+        if self._writer_thread is not None and self._pending_writes > 0:
+            self.flush()
+
+    @contextmanager
+    def _read_connection(self):
+        """Connection for a read-only query.
+
+        Every write commits before its call returns, so a pooled reader opened
+        afterwards sees it. Without a pool, reads share the write connection
+        and serialize on the write lock.
+        """
+        if self._read_pool is None:
+            with self._lock:
+                yield self.conn
+            return
+        with self._read_pool.get_connection() as conn:
+            yield conn
+
+    # ------------------------------------------------------------------
+    # Users and interactions
+    # ------------------------------------------------------------------
 
     def add_user(
         self, user_id: str, name: Optional[str] = None, metadata: Optional[Dict] = None
@@ -266,18 +891,12 @@ class SQLMemoryManager:
             name: User name
             metadata: Additional information
         """
+        if self.write_behind:
+            self._enqueue_write("user", user_id, name, metadata)
+            return
+
         with self._lock:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO users (user_id, name, metadata)
-                VALUES (?, ?, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    name = COALESCE(excluded.name, users.name),
-                    metadata = COALESCE(excluded.metadata, users.metadata)
-            """,
-                (user_id, name, json.dumps(metadata or {})),
-            )
+            self._exec_add_user(self.conn.cursor(), user_id, name, metadata)
 
     def add_interaction(
         self,
@@ -286,10 +905,15 @@ class SQLMemoryManager:
         bot_response: str,
         metadata: Optional[Dict] = None,
         resolved: bool = False,
-    ) -> int:
+    ) -> Optional[int]:
         """
         Record new interaction (thread-safe)
 
+        The user upsert, the insert and the last-interaction update share one
+        transaction. In write-behind mode the interaction is queued and
+        committed with others; its ID is not known yet, so None is returned
+        (use queue_interaction() for a future of the ID).
+
         Args:
             user_id: User ID
             user_message: User's message
@@ -298,40 +922,40 @@ class SQLMemoryManager:
             resolved: Is issue resolved?
 
         Returns:
-            Added record ID
+            Added record ID (None in write-behind mode)
         """
         if not user_message or not bot_response:
             raise ValueError("user_message and bot_response cannot be None or empty")
 
-        with self._lock:
-            cursor = self.conn.cursor()
-
-            # Create user if not exists
-            self.add_user(user_id)
-
-            # Record interaction
-            cursor.execute(
-                """
-                INSERT INTO conversations
-                (user_id, user_message, bot_response, metadata, resolved)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (user_id, user_message, bot_response, json.dumps(metadata or {}), resolved),
-            )
+        if self.write_behind:
+            self.queue_interaction(user_id, user_message, bot_response, metadata, resolved)
+            return None
 
-            interaction_id = cursor.lastrowid
+        with self._lock:
+            with self._transaction(self.conn) as cursor:
+                return self._exec_add_interaction(
+                    cursor, user_id, user_message, bot_response, metadata, resolved
+                )
 
-            # Update user's last interaction time
-            cursor.execute(
-                """
-                UPDATE users
-                SET last_interaction = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-            """,
-                (user_id,),
-            )
+    def queue_interaction(
+        self,
+        user_id: str,
+        user_message: str,
+        bot_response: str,
+        metadata: Optional[Dict] = None,
+        resolved: bool = False,
+    ) -> Future:
+        """
+        Queue an interaction (write-behind mode) and return a future of its ID
 
-            return interaction_id
+        The future resolves once the batch holding the interaction commits, or
+        raises if the write failed.
+        """
+        if not user_message or not bot_response:
+            raise ValueError("user_message and bot_response cannot be None or empty")
+        return self._enqueue_write(
+            "interaction", user_id, user_message, bot_response, metadata, resolved
+        )
 
     # Alias for compatibility
     def add_conversation(
@@ -351,14 +975,15 @@ class SQLMemoryManager:
         Returns:
             List of conversations
         """
-        with self._lock:
-            cursor = self.conn.cursor()
+        self._read_barrier()
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
                 """
                 SELECT timestamp, user_message, bot_response, metadata, resolved
                 FROM conversations
                 WHERE user_id = ?
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
                 LIMIT ?
             """,
                 (user_id, limit),
@@ -367,28 +992,155 @@ class SQLMemoryManager:
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
 
-    def search_conversations(self, user_id: str, keyword: str) -> List[Dict]:
+    def iter_conversations(
+        self, user_id: str, after_id: Optional[int] = None, batch_size: int = 500
+    ) -> Iterator[Dict]:
+        """
+        Stream a user's conversations, oldest first
+
+        Pages are fetched by keyset on id (``id > last_id``), so every page
+        costs the same however deep into the history it is, and no connection
+        or lock is held between pages.
+
+        Args:
+            user_id: User identifier
+            after_id: Resume after this conversation id (exclusive)
+            batch_size: Rows fetched per query
+
+        Yields:
+            Conversations, including their ``id``
+        """
+        self._read_barrier()
+        last_id = after_id or 0
+        while True:
+            with self._read_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, timestamp, user_message, bot_response, metadata, resolved
+                    FROM conversations
+                    WHERE user_id = ? AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """,
+                    (user_id, last_id, batch_size),
+                ).fetchall()
+
+            for row in rows:
+                yield dict(row)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def count_conversations(self, user_id: str) -> int:
+        """
+        Count a user's conversations without loading them
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Number of conversations
+        """
+        stats = self.get_user_stats(user_id)
+        return stats["turn_count"] if stats else 0
+
+    def get_user_stats(self, user_id: str) -> Optional[Dict]:
         """
-        Search for keywords in conversations (thread-safe)
+        Get a user's aggregate counters (one primary-key lookup)
 
         Args:
             user_id: User identifier
-            keyword: Keyword to search for
+
+        Returns:
+            turn_count, total_chars, first_timestamp, last_timestamp,
+            resolved_count and kb_hit_count, or None for an unknown user
+        """
+        self._read_barrier()
+        with self._read_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT turn_count, total_chars, first_timestamp, last_timestamp,
+                       resolved_count, kb_hit_count
+                FROM user_stats
+                WHERE user_id = ?
+            """,
+                (user_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def search_conversations(
+        self, user_id: str, keyword: str, limit: Optional[int] = None, ranked: bool = False
+    ) -> List[Dict]:
+        """
+        Search a user's conversations (thread-safe)
+
+        By default the keyword is matched as a substring, newest first, like
+        the JSON backends. With ``ranked=True`` it is split into terms that are
+        ORed and ranked by BM25 over the conversations FTS5 index; only the
+        most recent SEARCH_CANDIDATES matching turns are scored, so cost does
+        not grow with the length of the user's history. Ranked search falls
+        back to substring matching when FTS5 is unavailable or the keyword has
+        no searchable terms.
+
+        Args:
+            user_id: User identifier
+            keyword: Keyword(s) to search for
+            limit: Maximum number of results (None = all substring matches, or
+                SEARCH_CANDIDATES when ranked)
+            ranked: Rank by relevance instead of matching the exact phrase
 
         Returns:
             Matching conversations
         """
-        with self._lock:
-            cursor = self.conn.cursor()
+        self._read_barrier()
+
+        match = self._to_fts_query(keyword, stopwords=self.CONVERSATION_STOPWORDS)
+        if ranked and getattr(self, "fts_available", False) and match:
+            if limit is None:
+                limit = self.SEARCH_CANDIDATES
+            try:
+                with self._read_connection() as conn:
+                    rows = conn.execute(
+                        """
+                        SELECT c.timestamp, c.user_message, c.bot_response, c.metadata,
+                               c.resolved
+                        FROM (
+                            SELECT conversations_fts.rowid AS id,
+                                   bm25(conversations_fts, 1.0, 1.0, 0.25) AS score
+                            FROM conversations_fts
+                            JOIN conversations m ON m.id = conversations_fts.rowid
+                            WHERE conversations_fts MATCH ? AND m.user_id = ?
+                            ORDER BY conversations_fts.rowid DESC
+                            LIMIT ?
+                        ) hits
+                        JOIN conversations c ON c.id = hits.id
+                        ORDER BY hits.score, hits.id DESC
+                        LIMIT ?
+                    """,
+                        (match, user_id, max(limit, self.SEARCH_CANDIDATES), limit),
+                    ).fetchall()
+                return [dict(row) for row in rows]
+            except sqlite3.OperationalError as e:
+                logger.debug(f"Conversation FTS query failed, falling back: {e}")
+
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
                 """
                 SELECT timestamp, user_message, bot_response, metadata, resolved
                 FROM conversations
                 WHERE user_id = ?
                 AND (user_message LIKE ? OR bot_response LIKE ? OR metadata LIKE ?)
-                ORDER BY timestamp DESC
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
             """,
-                (user_id, f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"),
+                (
+                    user_id,
+                    f"%{keyword}%",
+                    f"%{keyword}%",
+                    f"%{keyword}%",
+                    -1 if limit is None else limit,
+                ),
             )
 
             rows = cursor.fetchall()
@@ -404,15 +1156,17 @@ class SQLMemoryManager:
         Returns:
             User profile or None
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM users WHERE user_id = ?
-        """,
-            (user_id,),
-        )
+        self._read_barrier()
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM users WHERE user_id = ?
+            """,
+                (user_id,),
+            )
+            row = cursor.fetchone()
 
-        row = cursor.fetchone()
         if row:
             return dict(row)
         return None
@@ -425,30 +1179,12 @@ class SQLMemoryManager:
             user_id: User identifier
             updates: Fields to update
         """
-        allowed_fields = ["name", "preferences", "summary", "metadata"]
-        set_clause = []
-        values = []
-
-        for field, value in updates.items():
-            if field in allowed_fields:
-                set_clause.append(f"{field} = ?")
-                if isinstance(value, (dict, list)):
-                    values.append(json.dumps(value))
-                else:
-                    values.append(value)
+        if self.write_behind:
+            self._enqueue_write("profile", user_id, dict(updates))
+            return
 
-        if set_clause:
-            values.append(user_id)
-            cursor = self.conn.cursor()
-            cursor.execute(
-                f"""
-                UPDATE users
-                SET {', '.join(set_clause)}
-                WHERE user_id = ?
-            """,
-                values,
-            )
-            self.conn.commit()
+        with self._lock:
+            self._exec_update_user_profile(self.conn.cursor(), user_id, updates)
 
     def add_knowledge(
         self,
@@ -471,25 +1207,27 @@ class SQLMemoryManager:
         Returns:
             Entry ID
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO knowledge_base
-            (category, question, answer, keywords, priority)
-            VALUES (?, ?, ?, ?, ?)
-        """,
-            (category, question, answer, json.dumps(keywords or []), priority),
-        )
-
-        kb_id = cursor.lastrowid
-        self.conn.commit()
+        if self.write_behind:
+            # Callers need the ID, so wait - the insert still shares a batch
+            # with whatever else is queued.
+            kb_id = self._enqueue_write(
+                "knowledge", category, question, answer, keywords, priority
+            ).result()
+        else:
+            with self._lock:
+                kb_id = self._exec_add_knowledge(
+                    self.conn.cursor(), category, question, answer, keywords, priority
+                )
 
         # Sync to vector store if enabled
         if self.enable_vector_search and self.vector_store:
-            try:
-                self._sync_to_vector_store(kb_id)
-            except Exception as e:
-                logger.warning(f"Failed to sync KB entry to vector store: {e}")
+            if self._vector_sync_thread is not None:
+                self._vector_sync_event.set()
+            else:
+                try:
+                    self.sync_vector_store()
+                except Exception as e:
+                    logger.warning(f"Failed to sync KB entry to vector store: {e}")
 
         return kb_id
 
@@ -512,6 +1250,8 @@ class SQLMemoryManager:
         Returns:
             Found entries
         """
+        self._read_barrier()
+
         # Use vector search if enabled and available
         if use_vector_search is None:
             use_vector_search = self.enable_vector_search
@@ -596,9 +1336,8 @@ class SQLMemoryManager:
         params.append(limit)
 
         try:
-            with self._lock:
-                cursor = self.conn.cursor()
-                rows = cursor.execute(sql, params).fetchall()
+            with self._read_connection() as conn:
+                rows = conn.execute(sql, params).fetchall()
             return [dict(row) for row in rows]
         except sqlite3.OperationalError as e:
             # A malformed MATCH expression should degrade, not raise.
@@ -606,7 +1345,7 @@ class SQLMemoryManager:
             return []
 
     @staticmethod
-    def _to_fts_query(query: str) -> str:
+    def _to_fts_query(query: str, stopwords: frozenset = frozenset()) -> str:
         """Turn free text into a safe FTS5 MATCH expression.
 
         User text can contain FTS operators (AND, NEAR, quotes, *), which would
@@ -615,7 +1354,11 @@ class SQLMemoryManager:
         """
         import re
 
-        terms = [t for t in re.findall(r"\w+", query, flags=re.UNICODE) if len(t) > 1]
+        terms = [
+            t
+            for t in re.findall(r"\w+", query, flags=re.UNICODE)
+            if len(t) > 1 and t.lower() not in stopwords
+        ]
         if not terms:
             return ""
         return " OR ".join(f'"{t}"' for t in terms[:12])
@@ -624,8 +1367,6 @@ class SQLMemoryManager:
         self, query: str, category: Optional[str] = None, limit: int = 5
     ) -> List[Dict]:
         """Traditional keyword-based search"""
-        cursor = self.conn.cursor()
-
         # Extract important keywords from query (remove question words)
         import re
 
@@ -679,7 +1420,7 @@ class SQLMemoryManager:
                 ORDER BY priority DESC, id DESC
                 LIMIT ?
             """
-            cursor.execute(sql, [category] + params + [limit])
+            params = [category] + params
         else:
             sql = f"""
                 SELECT category, question, answer, priority
@@ -689,9 +1430,10 @@ class SQLMemoryManager:
                 ORDER BY priority DESC, id DESC
                 LIMIT ?
             """
-            cursor.execute(sql, params + [limit])
 
-        return [dict(row) for row in cursor.fetchall()]
+        with self._read_connection() as conn:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        return [dict(row) for row in rows]
 
     def _vector_search(
         self, query: str, category: Optional[str] = None, limit: int = 5
@@ -734,40 +1476,117 @@ class SQLMemoryManager:
 
         return results
 
-    def _sync_to_vector_store(self, kb_id: int) -> None:
-        """Sync a single KB entry to vector store"""
-        if not self.vector_store:
-            return
+    @staticmethod
+    def _kb_document(row) -> Dict[str, Any]:
+        """Vector store document for a knowledge base row"""
+        return {
+            "id": str(row["id"]),
+            "text": f"{row['question']}\n{row['answer']}",  # Combine for better search
+            "metadata": {
+                "category": row["category"],
+                "question": row["question"],
+                "answer": row["answer"],
+                "keywords": row["keywords"],
+                "priority": row["priority"],
+                "kb_id": row["id"],
+            },
+        }
 
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, category, question, answer, keywords, priority
-            FROM knowledge_base
-            WHERE id = ?
-        """,
-            (kb_id,),
-        )
+    def sync_vector_store(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Push pending knowledge base changes to the vector store
+
+        Reads the trigger-filled change log from this store's position: rows
+        inserted, updated or reactivated since the last sync are upserted
+        (their texts embedded in one batch), and rows deleted or deactivated
+        are removed. The position only advances after the vector store
+        accepted a batch, so a failed or interrupted sync is picked up again by
+        the next one. Entries every registered store has read are deleted;
+        stores that have not synced within VECTOR_CONSUMER_TTL are dropped
+        first. A store with no position (new, dropped, or wiped) is rebuilt
+        from the knowledge base instead.
 
-        row = cursor.fetchone()
-        if row:
-            doc = {
-                "id": str(row["id"]),
-                "text": f"{row['question']}\n{row['answer']}",  # Combine for better search
-                "metadata": {
-                    "category": row["category"],
-                    "question": row["question"],
-                    "answer": row["answer"],
-                    "keywords": row["keywords"],
-                    "priority": row["priority"],
-                    "kb_id": row["id"],
-                },
-            }
-            self.vector_store.add_documents([doc])
+        Args:
+            batch_size: Changes handled per vector store call
+
+        Returns:
+            Number of upserted and deleted documents
+        """
+        counts = {"upserted": 0, "deleted": 0}
+        if not self.vector_store:
+            return counts
+
+        batch_size = batch_size or self.VECTOR_SYNC_BATCH
+        self._read_barrier()
+        with self._vector_sync_lock:
+            with self._read_connection() as conn:
+                row = conn.execute(
+                    "SELECT seq, last_seen FROM kb_vector_sync_state WHERE consumer = ?",
+                    (self.vector_consumer,),
+                ).fetchone()
+            if row is None or row["seq"] < 0:
+                position, counts["upserted"] = self._reload_vector_store(batch_size)
+            else:
+                position = row["seq"]
+                if time.time() - row["last_seen"] > self.VECTOR_CONSUMER_REFRESH:
+                    with self._lock:
+                        self.conn.execute(
+                            "UPDATE kb_vector_sync_state SET last_seen = ? WHERE consumer = ?",
+                            (time.time(), self.vector_consumer),
+                        )
+            while True:
+                with self._read_connection() as conn:
+                    changes = conn.execute(
+                        "SELECT seq, kb_id FROM kb_vector_changes WHERE seq > ? "
+                        "ORDER BY seq LIMIT ?",
+                        (position, batch_size),
+                    ).fetchall()
+                    if not changes:
+                        break
+                    kb_ids = list(dict.fromkeys(change["kb_id"] for change in changes))
+                    rows = []
+                    for i in range(0, len(kb_ids), 500):
+                        chunk = kb_ids[i : i + 500]
+                        rows += conn.execute(
+                            f"""
+                            SELECT id, category, question, answer, keywords, priority
+                            FROM knowledge_base
+                            WHERE active = 1 AND id IN ({",".join("?" * len(chunk))})
+                        """,
+                            chunk,
+                        ).fetchall()
+
+                documents = [self._kb_document(row) for row in rows]
+                live = {row["id"] for row in rows}
+                removed = [str(kb_id) for kb_id in kb_ids if kb_id not in live]
+
+                if documents:
+                    self.vector_store.add_documents(documents)
+                if removed:
+                    try:
+                        self.vector_store.delete_documents(removed)
+                    except NotImplementedError:
+                        logger.debug("Vector store cannot delete; stale entries kept")
+
+                position = changes[-1]["seq"]
+                self._save_vector_position(position)
+                counts["upserted"] += len(documents)
+                counts["deleted"] += len(removed)
+                logger.debug(f"Vector sync: {len(documents)} upserted, {len(removed)} removed")
+
+        if counts["upserted"] or counts["deleted"]:
+            logger.info(
+                f"Synced KB to vector store: {counts['upserted']} upserted, "
+                f"{counts['deleted']} removed"
+            )
+        return counts
 
     def sync_all_kb_to_vector_store(self) -> int:
         """
-        Sync all existing KB entries to vector store
+        Re-sync every knowledge base entry to the vector store
+
+        Normally unnecessary: changes are tracked and synced incrementally.
+        Use this to rebuild a vector store that was lost or replaced.
 
         Returns:
             Number of entries synced
@@ -775,48 +1594,125 @@ class SQLMemoryManager:
         if not self.vector_store:
             return 0
 
-        cursor = self.conn.cursor()
-        cursor.execute(
+        self._queue_full_vector_sync()
+        try:
+            return self.sync_vector_store()["upserted"]
+        except Exception as e:
+            logger.error(f"Error syncing KB to vector store: {e}")
+            return 0
+
+    def _queue_full_vector_sync(self) -> None:
+        with self._lock:
+            self.conn.execute("INSERT INTO kb_vector_changes (kb_id) SELECT id FROM knowledge_base")
+
+    def _queue_resync_if_store_empty(self) -> None:
+        """Have the next sync reload every KB row when the vector store was wiped"""
+        try:
+            if self.vector_store.get_stats().get("total_documents", 0):
+                return
+        except Exception:
+            return
+        with self._read_connection() as conn:
+            has_rows = conn.execute("SELECT 1 FROM knowledge_base WHERE active = 1 LIMIT 1")
+            if has_rows.fetchone() is None:
+                return
+        logger.info("Vector store is empty; it will be reloaded from the knowledge base")
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM kb_vector_sync_state WHERE consumer = ?", (self.vector_consumer,)
+            )
+
+    def _save_vector_position(self, position: int) -> None:
+        """Record this store's log position, then drop stale stores and read entries"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                """
+                INSERT INTO kb_vector_sync_state (consumer, seq, last_seen) VALUES (?, ?, ?)
+                ON CONFLICT(consumer) DO UPDATE SET seq = excluded.seq, last_seen = excluded.last_seen
+            """,
+                (self.vector_consumer, position, now),
+            )
+            stale = self.conn.execute(
+                "DELETE FROM kb_vector_sync_state WHERE consumer != ? AND last_seen < ?",
+                (self.vector_consumer, now - self.VECTOR_CONSUMER_TTL),
+            ).rowcount
+            if stale:
+                logger.info(f"Dropped {stale} vector store(s) that stopped syncing")
+            self.conn.execute(
+                """
+                DELETE FROM kb_vector_changes
+                WHERE seq <= (SELECT MIN(seq) FROM kb_vector_sync_state)
             """
-            SELECT id, category, question, answer, keywords, priority
-            FROM knowledge_base
-            WHERE active = 1
+            )
+
+    def _reload_vector_store(self, batch_size: int) -> Tuple[int, int]:
         """
-        )
+        Rebuild this process's vector store from the active knowledge base
+
+        The position is parked at -1 while loading, which holds the whole log
+        and makes an interrupted load start over; it is then set to the log
+        end read before loading, so changes made meanwhile are replayed.
+
+        Returns:
+            Log position to sync from, and the number of entries loaded
+        """
+        with self._lock:
+            start = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM kb_vector_changes")
+            start = start.fetchone()[0]
+            self._save_vector_position(-1)
+
+        if self.vector_store.get_stats().get("total_documents", 0):
+            self.vector_store.delete_collection()
+        loaded, last_id = 0, 0
+        while True:
+            with self._read_connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, category, question, answer, keywords, priority
+                    FROM knowledge_base
+                    WHERE active = 1 AND id > ?
+                    ORDER BY id LIMIT ?
+                """,
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                break
+            self.vector_store.add_documents([self._kb_document(row) for row in rows])
+            loaded += len(rows)
+            last_id = rows[-1]["id"]
+
+        self._save_vector_position(start)
+        logger.info(f"Loaded {loaded} knowledge base entries into the vector store")
+        return start, loaded
+
+    def unregister_vector_consumer(self) -> None:
+        """
+        Stop holding change log entries for this process's vector store
 
-        rows = cursor.fetchall()
-        documents = []
-
-        for row in rows:
-            doc = {
-                "id": str(row["id"]),
-                "text": f"{row['question']}\n{row['answer']}",
-                "metadata": {
-                    "category": row["category"],
-                    "question": row["question"],
-                    "answer": row["answer"],
-                    "keywords": row["keywords"],
-                    "priority": row["priority"],
-                    "kb_id": row["id"],
-                },
-            }
-            documents.append(doc)
-
-        if documents:
+        For a worker that is being retired. If it syncs again, its store is
+        rebuilt from the knowledge base.
+        """
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM kb_vector_sync_state WHERE consumer = ?", (self.vector_consumer,)
+            )
+            self.conn.execute(
+                """
+                DELETE FROM kb_vector_changes
+                WHERE seq <= (SELECT COALESCE(MIN(seq), (SELECT MAX(seq) FROM kb_vector_changes))
+                              FROM kb_vector_sync_state)
+            """
+            )
+
+    def _vector_sync_loop(self) -> None:
+        while not self._vector_sync_stop.is_set():
             try:
-                # Add in batches for better performance
-                batch_size = 100
-                for i in range(0, len(documents), batch_size):
-                    batch = documents[i : i + batch_size]
-                    self.vector_store.add_documents(batch)
-                    logger.debug(f"Synced {len(batch)} KB entries to vector store")
-
-                logger.info(f"Synced {len(documents)} KB entries to vector store")
+                self.sync_vector_store()
             except Exception as e:
-                logger.error(f"Error syncing KB to vector store: {e}")
-                return 0
-
-        return len(documents)
+                logger.warning(f"Background vector sync failed: {e}")
+            self._vector_sync_event.wait(self.VECTOR_SYNC_INTERVAL)
+            self._vector_sync_event.clear()
 
     def get_statistics(self) -> Dict:
         """
@@ -825,23 +1721,29 @@ class SQLMemoryManager:
         Returns:
             Statistics information
         """
-        cursor = self.conn.cursor()
+        self._read_barrier()
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
 
-        # Total users
-        cursor.execute("SELECT COUNT(*) as count FROM users")
-        total_users = cursor.fetchone()["count"]
+            # Total users
+            cursor.execute("SELECT COUNT(*) as count FROM users")
+            total_users = cursor.fetchone()["count"]
 
-        # Total interactions
-        cursor.execute("SELECT COUNT(*) as count FROM conversations")
-        total_interactions = cursor.fetchone()["count"]
-
-        # Unresolved issues
-        cursor.execute("SELECT COUNT(*) as count FROM conversations WHERE resolved = 0")
-        unresolved = cursor.fetchone()["count"]
+            # Interaction totals come from the per-user counters, not a scan
+            cursor.execute(
+                """
+                SELECT COALESCE(SUM(turn_count), 0) as total,
+                       COALESCE(SUM(turn_count - resolved_count), 0) as unresolved
+                FROM user_stats
+            """
+            )
+            row = cursor.fetchone()
+            total_interactions = row["total"]
+            unresolved = row["unresolved"]
 
-        # Knowledge base entry count
-        cursor.execute("SELECT COUNT(*) as count FROM knowledge_base WHERE active = 1")
-        kb_count = cursor.fetchone()["count"]
+            # Knowledge base entry count
+            cursor.execute("SELECT COUNT(*) as count FROM knowledge_base WHERE active = 1")
+            kb_count = cursor.fetchone()["count"]
 
         return {
             "total_users": total_users,
@@ -853,12 +1755,29 @@ class SQLMemoryManager:
 
     def clear_memory(self, user_id: str) -> None:
         """Delete all user conversations"""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM conversations WHERE user_id = ?", (user_id,))
-        self.conn.commit()
+        # Queued interactions for this user must not land after the delete.
+        self._read_barrier()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM conversations WHERE user_id = ?", (user_id,))
 
     def close(self) -> None:
-        """Close database connection"""
+        """Commit queued writes, stop the writer and close database connections"""
+        if getattr(self, "_vector_sync_thread", None) is not None:
+            # Unsynced changes stay in the log for the next session
+            self._vector_sync_stop.set()
+            self._vector_sync_event.set()
+            self._vector_sync_thread.join()
+            self._vector_sync_thread = None
+        if self._writer_thread is not None:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+            self._writer_conn.close()
+            self._writer_conn = None
+        if self._read_pool is not None:
+            self._read_pool.close_all()
+            self._read_pool = None
         if self.conn:
             self.conn.close()
 
@@ -6,7 +6,7 @@ Stores, updates and remembers user interactions.
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 
 class MemoryManager:
@@ -144,6 +144,45 @@ class MemoryManager:
 
         return self.conversations[user_id][-limit:]
 
+    def iter_conversations(
+        self, user_id: str, after_id: Optional[int] = None, batch_size: int = 500
+    ) -> Iterator[Dict]:
+        """
+        Iterate conversations oldest first (same interface as the SQL backend)
+
+        JSON conversations have no stored id, so a conversation's 1-based
+        position in the history serves as its id.
+
+        Args:
+            user_id: User ID
+            after_id: Resume after this position (exclusive)
+            batch_size: Accepted for interface compatibility
+
+        Yields:
+            Conversations, including their ``id``
+        """
+        if user_id not in self.conversations:
+            self.load_memory(user_id)
+
+        start = after_id or 0
+        for position, interaction in enumerate(self.conversations[user_id][start:], start + 1):
+            yield {**interaction, "id": position}
+
+    def count_conversations(self, user_id: str) -> int:
+        """
+        Count a user's conversations
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Number of conversations
+        """
+        if user_id not in self.conversations:
+            self.load_memory(user_id)
+
+        return len(self.conversations[user_id])
+
     def search_memory(self, user_id: str, keyword: str) -> List[Dict]:
         """
         Search for keyword in memory
@@ -231,13 +270,18 @@ class MemoryManager:
         if user_id in self.user_profiles:
             del self.user_profiles[user_id]
 
-    def search_conversations(self, user_id: str, keyword: str) -> List[Dict]:
+    def search_conversations(
+        self, user_id: str, keyword: str, limit: Optional[int] = None, ranked: bool = False
+    ) -> List[Dict]:
         """
         Search for keyword in conversations (for JSON version)
 
         Args:
             user_id: User ID
             keyword: Word to search for
+            limit: Maximum number of results (None = all)
+            ranked: Accepted for parity with the SQL backend; JSON search is
+                always a substring match
 
         Returns:
             Matching conversations
@@ -254,6 +298,8 @@ class MemoryManager:
                 or keyword_lower in interaction["bot_response"].lower()
             ):
                 results.append(interaction)
+                if limit is not None and len(results) >= limit:
+                    break
 
         return results
 
@@ -83,7 +83,9 @@ class MemoryRouter:
 
     def search_recall(self, user_id: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         if hasattr(self.base_memory, "search_conversations"):
-            return self.base_memory.search_conversations(user_id, query)[:limit]
+            return self.base_memory.search_conversations(user_id, query, limit=limit, ranked=True)[
+                :limit
+            ]
         return []
 
     def get_recent_conversations(self, user_id: str, limit: Optional[int] = None) -> List[Dict]:
@@ -163,7 +165,9 @@ class MemoryRouter:
         if not hasattr(self.base_memory, "search_knowledge"):
             return []
         results = self.base_memory.search_knowledge(query=query, limit=limit)
-        return [r for r in results if not str(r.get("category", "")).startswith(self.ARCHIVAL_CATEGORY)]
+        return [
+            r for r in results if not str(r.get("category", "")).startswith(self.ARCHIVAL_CATEGORY)
+        ]
 
     def build_context(
         self,
@@ -175,7 +179,7 @@ class MemoryRouter:
         blocks = self.get_core_blocks(user_id)
         archival = self.search_archival_memory(user_id, query, limit=3) if include_archival else []
         recall = self.search_recall(user_id, query, limit=3)
-        graph = self._search_graph(query) if include_graph else []
+        graph = self._search_graph(query, user_id) if include_graph else []
 
         sections = []
         core_text = self._format_core_blocks(blocks)
@@ -299,16 +303,32 @@ class MemoryRouter:
             return message.strip()
         return ""
 
-    def _search_graph(self, query: str) -> List[Any]:
+    def _search_graph(self, query: str, user_id: Optional[str] = None) -> List[Any]:
         if not self.graph_store:
             return []
-        for token in query.replace("?", " ").replace(".", " ").split():
-            if len(token) < 3:
-                continue
-            search = getattr(self.graph_store, "search_current", self.graph_store.search)
-            results = search(token, depth=1)
-            if results:
-                return results[:5]
+        # Sharded stores keep one graph per user; search only the caller's
+        if hasattr(self.graph_store, "use"):
+            with self.graph_store.use(user_id) as graph_store:
+                return self._search_graph_store(graph_store, query)
+        return self._search_graph_store(self.graph_store, query)
+
+    def _search_graph_store(self, graph_store: Any, query: str) -> List[Any]:
+        tokens = [
+            token for token in query.replace("?", " ").replace(".", " ").split() if len(token) >= 3
+        ]
+        if hasattr(graph_store, "resolve"):
+            # Map query words to graph entities through the alias/word index,
+            # so "user" finds "User" and "york" finds "New York"
+            tokens = graph_store.resolve(tokens)
+        if hasattr(graph_store, "search_many"):
+            # One pass over the graph for every token of the query
+            matches = graph_store.search_many(tokens, depth=1)
+        else:
+            search = getattr(graph_store, "search_current", graph_store.search)
+            matches = {token: search(token, depth=1) for token in tokens}
+        for token in tokens:
+            if matches.get(token):
+                return matches[token][:5]
         return []
 
     def _format_core_blocks(self, blocks: Dict[str, Dict[str, Any]]) -> str:
@@ -0,0 +1,747 @@
+"""
+Segmented Memory Manager - Append-only JSON memory backend
+Stores each interaction as one JSONL record instead of rewriting the whole file.
+
+Layout per user (inside ``memory_dir/<user_id>/``)::
+
+    manifest.json        sealed segments, their record counts, active segment
+    profile.json         small profile sidecar, rewritten atomically
+    seg-000001.jsonl     sealed segment (immutable)
+    seg-000002.jsonl     active segment (append-only)
+
+A turn costs one appended line, so write cost no longer grows with history.
+Sealed segments are merged in the background once enough of them pile up.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .memory_manager import MemoryManager
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentedMemoryManager(MemoryManager):
+    """JSON-family memory backend built on per-user append-only segment files"""
+
+    MANIFEST_FILE = "manifest.json"
+    PROFILE_FILE = "profile.json"
+
+    def __init__(
+        self,
+        memory_dir: str = "memories",
+        segment_max_records: int = 1000,
+        compact_after_segments: int = 8,
+        compact_max_records: int = 50000,
+        cache_size: int = 100,
+        background_compaction: bool = True,
+    ):
+        """
+        Args:
+            memory_dir: Directory where memory files will be stored
+            segment_max_records: Records per segment before it is sealed
+            compact_after_segments: Sealed segment count that triggers compaction
+            compact_max_records: Upper bound on records in a merged segment
+            cache_size: Number of recent interactions kept in memory per user
+            background_compaction: Compact on a background thread (False = inline)
+        """
+        super().__init__(memory_dir)
+        self.segment_max_records = max(1, segment_max_records)
+        self.compact_after_segments = max(2, compact_after_segments)
+        self.compact_max_records = max(self.segment_max_records, compact_max_records)
+        self.cache_size = max(1, cache_size)
+        self.background_compaction = background_compaction
+
+        self._lock = threading.RLock()
+        self._state: Dict[str, Dict] = {}
+        self._compacting: Dict[str, threading.Thread] = {}
+
+    # ------------------------------------------------------------------
+    # Paths and manifest
+    # ------------------------------------------------------------------
+
+    def _get_user_dir(self, user_id: str) -> Path:
+        """Returns the directory holding the user's segments"""
+        return self.memory_dir / user_id
+
+    @staticmethod
+    def _write_atomic(path: Path, data: Dict) -> None:
+        """Write JSON to a temp file and rename it over the target"""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _save_manifest(self, user_id: str) -> None:
+        state = self._state[user_id]
+        manifest = {
+            "version": 1,
+            "next_segment": state["next_segment"],
+            "active": state["active"],
+            "segments": state["segments"],
+        }
+        if state.get("migrated"):
+            manifest["migrated"] = True
+        self._write_atomic(self._get_user_dir(user_id) / self.MANIFEST_FILE, manifest)
+
+    def _new_segment_name(self, user_id: str) -> str:
+        state = self._state[user_id]
+        name = f"seg-{state['next_segment']:06d}.jsonl"
+        state["next_segment"] += 1
+        return name
+
+    def _ensure_state(self, user_id: str, create: bool = True) -> Optional[Dict]:
+        """Open (or create) the user's segment set and return its state"""
+        with self._lock:
+            if user_id in self._state:
+                return self._state[user_id]
+
+            user_dir = self._get_user_dir(user_id)
+            manifest_path = user_dir / self.MANIFEST_FILE
+            legacy_exists = self._get_user_file(user_id).exists()
+            if not create and not manifest_path.exists() and not legacy_exists:
+                return None
+
+            if manifest_path.exists():
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                self._state[user_id] = {
+                    "next_segment": manifest.get("next_segment", 1),
+                    "active": manifest["active"],
+                    "segments": manifest.get("segments", []),
+                    "active_records": 0,
+                    "migrated": manifest.get("migrated", False),
+                }
+                self._recover_active_segment(user_id)
+                self._remove_orphans(user_id)
+                if self._state[user_id]["migrated"] and legacy_exists:
+                    # Crashed between writing the manifest and retiring the legacy file
+                    self._retire_legacy_file(user_id)
+            else:
+                # Without a manifest any segment here is a partial import; start over
+                user_dir.mkdir(parents=True, exist_ok=True)
+                for path in user_dir.iterdir():
+                    if path.suffix == ".jsonl" or path.name.endswith(".tmp"):
+                        path.unlink()
+                self._state[user_id] = {
+                    "next_segment": 1,
+                    "active": "",
+                    "segments": [],
+                    "active_records": 0,
+                    "migrated": False,
+                }
+                self._state[user_id]["active"] = self._new_segment_name(user_id)
+                try:
+                    self._migrate_legacy_file(user_id)
+                    self._save_manifest(user_id)
+                except BaseException:
+                    # No manifest was written; the next open starts over
+                    del self._state[user_id]
+                    raise
+                if self._state[user_id]["migrated"]:
+                    self._retire_legacy_file(user_id)
+                    if len(self._state[user_id]["segments"]) >= self.compact_after_segments:
+                        self._schedule_compaction(user_id)
+
+            return self._state[user_id]
+
+    def _recover_active_segment(self, user_id: str) -> None:
+        """Count records in the active segment, dropping a torn final line"""
+        path = self._get_user_dir(user_id) / self._state[user_id]["active"]
+        if not path.exists():
+            path.touch()
+            return
+
+        with open(path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                # A crash mid-append leaves a partial record; keep whole lines only.
+                keep = data.rfind(b"\n") + 1
+                f.truncate(keep)
+                data = data[:keep]
+                logger.warning(f"Truncated partial record in {path}")
+
+        self._state[user_id]["active_records"] = data.count(b"\n")
+
+    def _remove_orphans(self, user_id: str) -> None:
+        """Delete segment files left behind by an interrupted compaction"""
+        state = self._state[user_id]
+        live = {state["active"]} | {seg["file"] for seg in state["segments"]}
+        for path in self._get_user_dir(user_id).iterdir():
+            if path.name.endswith(".tmp") or (path.suffix == ".jsonl" and path.name not in live):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _migrate_legacy_file(self, user_id: str) -> None:
+        """
+        Import a whole-file ``<user_id>.json`` written by MemoryManager
+
+        Segments are written without touching the manifest, so nothing is
+        visible until the caller saves it; an import interrupted before that
+        leaves no manifest and is redone from the legacy file on next open.
+
+        A file that cannot be parsed is moved aside to ``<user_id>.json.corrupt``
+        before the (empty) manifest is saved, so it is neither lost nor
+        silently shadowed. A file that cannot be read raises.
+        """
+        legacy_file = self._get_user_file(user_id)
+        if not legacy_file.exists():
+            return
+
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"expected an object, got {type(data).__name__}")
+        except ValueError as e:
+            corrupt = legacy_file.with_name(legacy_file.name + ".corrupt")
+            os.replace(legacy_file, corrupt)
+            logger.error(
+                f"Legacy memory for {user_id} is not valid JSON ({e}); "
+                f"moved it to {corrupt} and starting with empty memory"
+            )
+            return
+
+        state = self._state[user_id]
+        user_dir = self._get_user_dir(user_id)
+        conversations = data.get("conversations", [])
+        for start in range(0, len(conversations), self.segment_max_records):
+            chunk = conversations[start : start + self.segment_max_records]
+            with open(user_dir / state["active"], "w", encoding="utf-8") as f:
+                for interaction in chunk:
+                    f.write(json.dumps(interaction, ensure_ascii=False, separators=(",", ":")))
+                    f.write("\n")
+            state["active_records"] = len(chunk)
+            if len(chunk) == self.segment_max_records:
+                state["segments"].append({"file": state["active"], "records": len(chunk)})
+                state["active"] = self._new_segment_name(user_id)
+                state["active_records"] = 0
+        (user_dir / state["active"]).touch()
+
+        profile = data.get("profile", {})
+        if profile:
+            self._write_atomic(
+                user_dir / self.PROFILE_FILE,
+                {"profile": profile, "last_updated": data.get("last_updated")},
+            )
+        state["migrated"] = True
+        logger.info(f"Migrated legacy memory file for {user_id} into segments")
+
+    def _retire_legacy_file(self, user_id: str) -> None:
+        """Rename an imported ``<user_id>.json`` so it is kept but never read again"""
+        legacy_file = self._get_user_file(user_id)
+        try:
+            os.replace(legacy_file, legacy_file.with_name(legacy_file.name + ".migrated"))
+        except OSError as e:
+            logger.warning(f"Could not rename migrated legacy file for {user_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Segment I/O
+    # ------------------------------------------------------------------
+
+    def _append_record(self, user_id: str, record: Dict) -> None:
+        """Append one record to the active segment, sealing it when full"""
+        state = self._state[user_id]
+        path = self._get_user_dir(user_id) / state["active"]
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        state["active_records"] += 1
+
+        if state["active_records"] >= self.segment_max_records:
+            state["segments"].append({"file": state["active"], "records": state["active_records"]})
+            state["active"] = self._new_segment_name(user_id)
+            state["active_records"] = 0
+            (self._get_user_dir(user_id) / state["active"]).touch()
+            self._save_manifest(user_id)
+
+            if len(state["segments"]) >= self.compact_after_segments:
+                self._schedule_compaction(user_id)
+
+    def _segment_files(self, user_id: str) -> List[Path]:
+        """All segment paths in write order (sealed first, active last)"""
+        state = self._state[user_id]
+        user_dir = self._get_user_dir(user_id)
+        return [user_dir / seg["file"] for seg in state["segments"]] + [user_dir / state["active"]]
+
+    @staticmethod
+    def _read_tail_lines(path: Path, count: int, block_size: int = 65536) -> List[bytes]:
+        """Read the last ``count`` lines of a file without scanning it from the start"""
+        if count <= 0 or not path.exists():
+            return []
+
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b""
+            while position > 0 and buffer.count(b"\n") <= count:
+                read_size = min(block_size, position)
+                position -= read_size
+                f.seek(position)
+                buffer = f.read(read_size) + buffer
+
+        lines = [line for line in buffer.split(b"\n") if line.strip()]
+        return lines[-count:]
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[Dict]:
+        try:
+            return json.loads(line)
+        except (ValueError, json.JSONDecodeError):
+            return None
+
+    def _tail_records(self, user_id: str, count: int) -> List[Dict]:
+        """Return the last ``count`` records, reading segments newest-first"""
+        if count <= 0:
+            return []
+
+        with self._lock:
+            self._ensure_state(user_id)
+            collected: List[Dict] = []
+            for path in reversed(self._segment_files(user_id)):
+                needed = count - len(collected)
+                if needed <= 0:
+                    break
+                lines = self._read_tail_lines(path, needed)
+                records = [r for r in (self._decode(line) for line in lines) if r is not None]
+                collected = records + collected
+            return collected[-count:]
+
+    def iter_records(self, user_id: str, skip: int = 0) -> Iterator[Dict]:
+        """
+        Yield every stored interaction for a user, oldest first
+
+        All segment files are opened up front while the lock is held, so a
+        compaction finishing mid-iteration cannot pull a file out from under
+        the reader, and the active segment is read only up to its size at
+        that moment. The lock itself is not held while yielding.
+
+        Args:
+            user_id: User ID
+            skip: Number of leading records to skip; whole sealed segments
+                are skipped using the manifest counts without being opened
+
+        Yields:
+            Interaction records
+        """
+        handles = []
+        with self._lock:
+            state = self._ensure_state(user_id, create=False)
+            if state is None:
+                return
+            counts = [seg["records"] for seg in state["segments"]] + [None]
+            for path, count in zip(self._segment_files(user_id), counts):
+                if count is not None and skip >= count:
+                    skip -= count
+                    continue
+                try:
+                    handles.append((open(path, "rb"), path.stat().st_size))
+                except OSError:
+                    continue
+
+        try:
+            for f, size in handles:
+                remaining = size
+                for line in f:
+                    remaining -= len(line)
+                    if remaining < 0:
+                        break
+                    if line.strip():
+                        record = self._decode(line)
+                        if record is not None:
+                            if skip:
+                                skip -= 1
+                                continue
+                            yield record
+        finally:
+            for f, _ in handles:
+                f.close()
+
+    def iter_conversations(
+        self, user_id: str, after_id: Optional[int] = None, batch_size: int = 500
+    ) -> Iterator[Dict]:
+        """
+        Stream conversations oldest first (same interface as the SQL backend)
+
+        A conversation's id is its 1-based position in the history. Compaction
+        keeps record order, so ids stay stable until the history is cleared.
+
+        Args:
+            user_id: User ID
+            after_id: Resume after this position (exclusive)
+            batch_size: Accepted for interface compatibility; records are
+                read line by line
+
+        Yields:
+            Conversations, including their ``id``
+        """
+        start = after_id or 0
+        for position, record in enumerate(self.iter_records(user_id, skip=start), start + 1):
+            yield {**record, "id": position}
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _schedule_compaction(self, user_id: str) -> None:
+        if not self.background_compaction:
+            self.compact(user_id)
+            return
+
+        running = self._compacting.get(user_id)
+        if running and running.is_alive():
+            return
+
+        thread = threading.Thread(
+            target=self.compact, args=(user_id,), name=f"mem-compact-{user_id}", daemon=True
+        )
+        self._compacting[user_id] = thread
+        thread.start()
+
+    def compact(self, user_id: str) -> int:
+        """
+        Merge runs of small sealed segments into larger ones
+
+        Sealed segments never change, so the merged file is written without
+        holding the lock; only the manifest swap and deletion are locked. The
+        manifest is authoritative, so a crash at any point leaves either the
+        old or the new segment set, plus orphans that are removed on next open.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Number of segments removed by the merge
+        """
+        with self._lock:
+            state = self._ensure_state(user_id)
+            sealed = list(state["segments"])
+
+        # Greedily pick the oldest run of segments that fits in one merged file.
+        run: List[Dict] = []
+        total = 0
+        for seg in sealed:
+            if run and total + seg["records"] > self.compact_max_records:
+                if len(run) > 1:
+                    break
+                run, total = [], 0
+            run.append(seg)
+            total += seg["records"]
+        if len(run) < 2:
+            return 0
+
+        user_dir = self._get_user_dir(user_id)
+        with self._lock:
+            merged_name = self._new_segment_name(user_id)
+            self._save_manifest(user_id)
+
+        tmp_path = user_dir / (merged_name + ".tmp")
+        with open(tmp_path, "wb") as out:
+            for seg in run:
+                with open(user_dir / seg["file"], "rb") as f:
+                    for line in f:
+                        if line.strip():
+                            out.write(line if line.endswith(b"\n") else line + b"\n")
+        os.replace(tmp_path, user_dir / merged_name)
+
+        with self._lock:
+            state = self._state.get(user_id)
+            if state is None:
+                # User was cleared while merging.
+                return 0
+            names = [seg["file"] for seg in run]
+            current = [seg["file"] for seg in state["segments"]]
+            start = current.index(names[0]) if names[0] in current else -1
+            if start < 0 or current[start : start + len(names)] != names:
+                # Another compaction already replaced this run.
+                (user_dir / merged_name).unlink()
+                return 0
+            state["segments"][start : start + len(run)] = [{"file": merged_name, "records": total}]
+            self._save_manifest(user_id)
+            for name in names:
+                try:
+                    (user_dir / name).unlink()
+                except OSError:
+                    pass
+
+        logger.debug(f"Compacted {len(run)} segments for {user_id} into {merged_name}")
+        return len(run) - 1
+
+    # ------------------------------------------------------------------
+    # MemoryManager API
+    # ------------------------------------------------------------------
+
+    def load_memory(self, user_id: str) -> Dict:
+        """
+        Load user's profile and the most recent interactions
+
+        Only the last ``cache_size`` records are read, from the end of the
+        newest segments, so loading cost does not depend on history length.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            User's memory data (conversations holds the recent tail only)
+        """
+        with self._lock:
+            self._ensure_state(user_id)
+            profile_file = self._get_user_dir(user_id) / self.PROFILE_FILE
+
+            profile = None
+            if profile_file.exists():
+                try:
+                    with open(profile_file, "r", encoding="utf-8") as f:
+                        profile = json.load(f).get("profile")
+                except (ValueError, json.JSONDecodeError, OSError) as e:
+                    logger.error(f"Could not read profile for {user_id}: {e}")
+
+            if profile is None:
+                profile = {
+                    "user_id": user_id,
+                    "first_seen": datetime.now().isoformat(),
+                    "preferences": {},
+                    "summary": {},
+                }
+            elif isinstance(profile.get("preferences"), str):
+                try:
+                    profile["preferences"] = json.loads(profile["preferences"])
+                except (ValueError, json.JSONDecodeError):
+                    profile["preferences"] = {}
+
+            self.user_profiles[user_id] = profile
+            self.conversations[user_id] = self._tail_records(user_id, self.cache_size)
+            return {"conversations": self.conversations[user_id], "profile": profile}
+
+    def save_memory(self, user_id: str) -> None:
+        """
+        Save user's profile sidecar
+
+        Interactions are already on disk once add_interaction returns, so
+        only the (small) profile is rewritten here.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._ensure_state(user_id)
+            data = {
+                "profile": self.user_profiles.get(user_id, {}),
+                "last_updated": datetime.now().isoformat(),
+            }
+            self._write_atomic(self._get_user_dir(user_id) / self.PROFILE_FILE, data)
+
+    def add_interaction(
+        self, user_id: str, user_message: str, bot_response: str, metadata: Optional[Dict] = None
+    ) -> None:
+        """
+        Record a new interaction by appending one JSONL record
+
+        Args:
+            user_id: User ID
+            user_message: User's message
+            bot_response: Bot's response
+            metadata: Additional information (order no, issue type, etc.)
+        """
+        with self._lock:
+            if user_id not in self.conversations:
+                self.load_memory(user_id)
+
+            interaction = {
+                "timestamp": datetime.now().isoformat(),
+                "user_message": user_message,
+                "bot_response": bot_response,
+                "metadata": metadata or {},
+            }
+
+            self._append_record(user_id, interaction)
+
+            cached = self.conversations[user_id]
+            cached.append(interaction)
+            if len(cached) > self.cache_size:
+                del cached[: len(cached) - self.cache_size]
+
+            if not (self._get_user_dir(user_id) / self.PROFILE_FILE).exists():
+                self.save_memory(user_id)
+
+    def get_recent_conversations(self, user_id: str, limit: int = 5) -> List[Dict]:
+        """
+        Get last N conversations
+
+        Args:
+            user_id: User ID
+            limit: Number of conversations to retrieve
+
+        Returns:
+            List of recent conversations
+        """
+        with self._lock:
+            if user_id not in self.conversations:
+                self.load_memory(user_id)
+
+            cached = self.conversations[user_id]
+            if limit <= len(cached) or len(cached) >= self.count_conversations(user_id):
+                return cached[-limit:] if limit > 0 else []
+            return self._tail_records(user_id, limit)
+
+    def count_conversations(self, user_id: str) -> int:
+        """
+        Count stored interactions without reading them
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Number of interactions
+        """
+        with self._lock:
+            state = self._ensure_state(user_id, create=False)
+            if state is None:
+                return 0
+            return state["active_records"] + sum(seg["records"] for seg in state["segments"])
+
+    def search_memory(self, user_id: str, keyword: str) -> List[Dict]:
+        """
+        Search for keyword in memory (messages and metadata)
+
+        Args:
+            user_id: User ID
+            keyword: Word to search for
+
+        Returns:
+            Matching interactions
+        """
+        keyword_lower = keyword.lower()
+        return [
+            interaction
+            for interaction in self.iter_records(user_id)
+            if keyword_lower in interaction.get("user_message", "").lower()
+            or keyword_lower in interaction.get("bot_response", "").lower()
+            or keyword_lower in str(interaction.get("metadata", {})).lower()
+        ]
+
+    def search_conversations(
+        self, user_id: str, keyword: str, limit: Optional[int] = None, ranked: bool = False
+    ) -> List[Dict]:
+        """
+        Search for keyword in conversations
+
+        Args:
+            user_id: User ID
+            keyword: Word to search for
+            limit: Maximum number of results (None = all)
+            ranked: Accepted for parity with the SQL backend; JSON search is
+                always a substring match
+
+        Returns:
+            Matching conversations
+        """
+        keyword_lower = keyword.lower()
+        matches = (
+            interaction
+            for interaction in self.iter_records(user_id)
+            if keyword_lower in interaction.get("user_message", "").lower()
+            or keyword_lower in interaction.get("bot_response", "").lower()
+        )
+        return list(islice(matches, limit))
+
+    def get_summary(self, user_id: str) -> str:
+        """
+        Create summary of user's past interactions
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Summary text
+        """
+        if user_id not in self.conversations:
+            self.load_memory(user_id)
+
+        total = self.count_conversations(user_id)
+        if not total:
+            return "No interactions with this user yet."
+
+        profile = self.user_profiles.get(user_id, {})
+        conversations = self.conversations.get(user_id, [])
+
+        summary_parts = [
+            f"User ID: {user_id}",
+            f"First conversation: {profile.get('first_seen', 'Unknown')}",
+            f"Total interactions: {total}",
+            "\nRecent interactions:",
+        ]
+        for i, conv in enumerate(conversations[-3:], 1):
+            timestamp = conv.get("timestamp", "Unknown")
+            user_msg = conv.get("user_message", "")[:50]
+            summary_parts.append(f"{i}. {timestamp}: {user_msg}...")
+
+        all_metadata = [c.get("metadata", {}) for c in conversations if c.get("metadata")]
+        if all_metadata:
+            summary_parts.append("\nSaved information:")
+            for meta in all_metadata[-3:]:
+                for key, value in meta.items():
+                    summary_parts.append(f"  - {key}: {value}")
+
+        return "\n".join(summary_parts)
+
+    def clear_memory(self, user_id: str) -> None:
+        """
+        Completely delete user's memory
+
+        Args:
+            user_id: User ID
+        """
+        thread = self._compacting.pop(user_id, None)
+        if thread:
+            thread.join()
+
+        with self._lock:
+            user_dir = self._get_user_dir(user_id)
+            if user_dir.exists():
+                for path in user_dir.iterdir():
+                    path.unlink()
+                user_dir.rmdir()
+
+            legacy_file = self._get_user_file(user_id)
+            for path in (legacy_file, legacy_file.with_name(legacy_file.name + ".migrated")):
+                if path.exists():
+                    path.unlink()
+
+            self._state.pop(user_id, None)
+            self.conversations.pop(user_id, None)
+            self.user_profiles.pop(user_id, None)
+
+    def get_statistics(self) -> Dict:
+        """
+        Get general statistics from the manifests (no segment is read)
+
+        Returns:
+            Statistics dictionary
+        """
+        user_ids = [
+            path.name
+            for path in self.memory_dir.iterdir()
+            if path.is_dir() and (path / self.MANIFEST_FILE).exists()
+        ]
+        total_interactions = sum(self.count_conversations(user_id) for user_id in user_ids)
+
+        return {
+            "total_users": len(user_ids),
+            "total_interactions": total_interactions,
+            "knowledge_base_entries": 0,  # JSON doesn't have KB
+        }
+
+    def close(self) -> None:
+        """Wait for background compactions to finish"""
+        for thread in list(self._compacting.values()):
+            thread.join()
+        self._compacting.clear()
@@ -0,0 +1,153 @@
+"""
+User Sessions
+=============
+
+Lightweight per-user views of one shared MemAgent.
+
+A MemAgent owns the expensive resources (memory database, LLM client, tool
+registry, graph shards, knowledge base). A UserSession only remembers which
+user it speaks for and passes that user to every call, so serving a new user
+costs a small object instead of a new agent. Only shared resources and
+user-independent methods (``memory``, ``tool_registry``, ``add_knowledge``,
+...) are read from the shared agent; anything that would fall back to the
+agent's ``current_user`` is either bound to the session's user here or not
+available, so a session can never act for another user by accident.
+
+Usage:
+    engine = MemAgent(use_sql=True)
+    alice = engine.session("alice")
+    alice.chat("Hi, I'm Alice")
+"""
+
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Union
+
+from .response_metrics import ChatResponse
+
+# Engine attributes a session reads through: shared resources, settings and
+# methods that do not depend on a user. Per-response metrics are left out on
+# purpose, since they hold every user's latest answers.
+SHARED_ATTRIBUTES = frozenset(
+    {
+        "memory",
+        "llm",
+        "model",
+        "backend",
+        "config",
+        "preset_config",
+        "usage_mode",
+        "use_sql",
+        "logger",
+        "graph_store",
+        "graph_extractor",
+        "memory_router",
+        "tool_registry",
+        "tool_executor",
+        "enable_tools",
+        "enable_security",
+        "enable_memory_router",
+        "enable_hierarchical_memory",
+        "track_metrics",
+        "check_setup",
+        "add_knowledge",
+        "add_kb_entry",
+        "get_statistics",
+        "get_enrichment_stats",
+        "list_available_tools",
+    }
+)
+
+
+class UserSession:
+    """One user's context on a shared MemAgent"""
+
+    __slots__ = ("user_id", "engine", "created_at", "last_access", "_on_close")
+
+    def __init__(
+        self, engine, user_id: str, on_close: Optional[Callable[["UserSession"], None]] = None
+    ):
+        """
+        Args:
+            engine: Shared MemAgent
+            user_id: User this session acts for
+            on_close: Called once by close(), e.g. to release the engine
+        """
+        self.engine = engine
+        self.user_id = user_id
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        self._on_close = on_close
+
+    def __getattr__(self, name: str) -> Any:
+        if name in SHARED_ATTRIBUTES:
+            return getattr(self.engine, name)
+        raise AttributeError(
+            f"UserSession does not expose {name!r}; use session.engine.{name} "
+            "for engine-wide access"
+        )
+
+    def __repr__(self) -> str:
+        return f"UserSession(user_id={self.user_id!r})"
+
+    @property
+    def current_user(self) -> str:
+        return self.user_id
+
+    def set_user(self, user_id: str, name: Optional[str] = None) -> None:
+        """Register the user (and name) with the shared memory; the session keeps its user"""
+        if user_id != self.user_id:
+            raise ValueError(f"Session belongs to {self.user_id!r}, not {user_id!r}")
+        self.engine.set_user(user_id, name)
+
+    def chat(
+        self, message: str, metadata: Optional[Dict] = None, return_metrics: bool = False
+    ) -> Union[str, ChatResponse]:
+        self.last_access = time.time()
+        return self.engine.chat(
+            message, user_id=self.user_id, metadata=metadata, return_metrics=return_metrics
+        )
+
+    async def achat(
+        self, message: str, metadata: Optional[Dict] = None, return_metrics: bool = False
+    ) -> Union[str, ChatResponse]:
+        self.last_access = time.time()
+        return await self.engine.achat(
+            message, user_id=self.user_id, metadata=metadata, return_metrics=return_metrics
+        )
+
+    def chat_stream(self, message: str, metadata: Optional[Dict] = None) -> Iterator[str]:
+        self.last_access = time.time()
+        return self.engine.chat_stream(message, user_id=self.user_id, metadata=metadata)
+
+    def achat_stream(self, message: str, metadata: Optional[Dict] = None) -> AsyncIterator[str]:
+        self.last_access = time.time()
+        return self.engine.achat_stream(message, user_id=self.user_id, metadata=metadata)
+
+    def get_user_profile(self, user_id: Optional[str] = None) -> Dict:
+        return self.engine.get_user_profile(user_id or self.user_id)
+
+    def search_history(self, keyword: str, user_id: Optional[str] = None) -> List[Dict]:
+        return self.engine.search_history(keyword, user_id or self.user_id)
+
+    def show_user_info(self, user_id: Optional[str] = None) -> str:
+        return self.engine.show_user_info(user_id or self.user_id)
+
+    def export_memory(self, user_id: Optional[str] = None, format: str = "json") -> str:
+        return self.engine.export_memory(user_id or self.user_id, format=format)
+
+    def clear_user_data(self, user_id: Optional[str] = None, confirm: bool = False) -> str:
+        return self.engine.clear_user_data(user_id or self.user_id, confirm=confirm)
+
+    def clear_graph_memory(self, user_id: Optional[str] = None):
+        return self.engine.clear_graph_memory(user_id or self.user_id)
+
+    def get_info(self) -> Dict[str, Any]:
+        info = self.engine.get_info()
+        info["current_user"] = self.user_id
+        return info
+
+    def close(self) -> None:
+        """Release the session; the shared agent is closed by its owner"""
+        on_close, self._on_close = self._on_close, None
+        if on_close:
+            on_close(self)
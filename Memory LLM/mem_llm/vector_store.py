@@ -1,12 +1,19 @@
 """
 Vector Store Abstraction Layer
-Supports multiple vector databases (Chroma, FAISS, etc.)
+Supports multiple vector databases (Chroma, built-in NumPy, etc.)
 """
 
+import json
 import logging
+import os
+import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .embedding_service import ServiceEmbeddingFunction, get_embedding_cache, get_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +58,28 @@ class VectorStore(ABC):
         """Get statistics about the vector store"""
         pass
 
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by id
+
+        Args:
+            ids: Document ids to remove
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support deleting documents")
+
+
+def _shared_embedding_function(model_name: str, persist_directory: Optional[str]):
+    """Embedding function on the process-wide model and embedding cache.
+
+    Stores (one per agent in the API server) share one loaded model instead
+    of each loading their own copy.
+    """
+    service = get_embedding_service(model_name)
+    # Load now so a missing sentence-transformers fails at construction
+    service.load()
+    cache_path = str(Path(persist_directory) / "embedding_cache.db") if persist_directory else None
+    return ServiceEmbeddingFunction(service, get_embedding_cache(cache_path))
+
 
 try:
     import chromadb
@@ -109,75 +138,11 @@ class ChromaVectorStore(VectorStore):
             raise
 
     def _get_embedding_function(self):
-        """Lazy load embedding function"""
+        """Embedding function backed by the process-wide model for this name"""
         if self._embedding_fn is None:
-            try:
-                # Try to use ChromaDB's native SentenceTransformerEmbeddingFunction
-                try:
-                    # Try different import paths for ChromaDB embedding functions
-                    try:
-                        from chromadb.utils import embedding_functions
-
-                        embedding_fn_class = (
-                            embedding_functions.SentenceTransformerEmbeddingFunction
-                        )
-                    except (ImportError, AttributeError):
-                        try:
-                            from chromadb.utils.embedding_functions import (
-                                SentenceTransformerEmbeddingFunction as embedding_fn_class,
-                            )
-                        except ImportError:
-                            embedding_fn_class = None
-
-                    if embedding_fn_class:
-                        self._embedding_fn = embedding_fn_class(model_name=self.embedding_model)
-                        self.logger.info(
-                            "Loaded embedding model using ChromaDB native function: "
-                            f"{self.embedding_model}"
-                        )
-                    else:
-                        raise AttributeError("SentenceTransformerEmbeddingFunction not found")
-
-                except Exception:
-                    # Fallback: Custom embedding function wrapper compatible with ChromaDB
-                    from sentence_transformers import SentenceTransformer
-
-                    model = SentenceTransformer(self.embedding_model)
-
-                    class CustomEmbeddingFunction:
-                        def __init__(self, model, model_name):
-                            self.model = model
-                            self.model_name = model_name
-
-                        # ChromaDB >=1.0 calls name() as a method, and passes the
-                        # texts as the keyword argument `input`.
-                        def name(self) -> str:
-                            return self.model_name
-
-                        def __call__(self, input: List[str]) -> List[List[float]]:
-                            embeddings = self.model.encode(input, show_progress_bar=False)
-                            return embeddings.tolist()
-
-                        def encode_queries(self, queries: List[str]) -> List[List[float]]:
-                            return self.__call__(queries)
-
-                        def embed_query(self, input) -> List[List[float]]:
-                            texts = [input] if isinstance(input, str) else list(input)
-                            return self.__call__(texts)
-
-                        def embed_documents(self, input) -> List[List[float]]:
-                            texts = [input] if isinstance(input, str) else list(input)
-                            return self.__call__(texts)
-
-                    self._embedding_fn = CustomEmbeddingFunction(model, self.embedding_model)
-                    logger.info(
-                        f"Loaded embedding model using custom wrapper: {self.embedding_model}"
-                    )
-            except ImportError:
-                raise ImportError(
-                    "sentence-transformers not installed. "
-                    "Install with: pip install sentence-transformers"
-                )
+            self._embedding_fn = _shared_embedding_function(
+                self.embedding_model, self.persist_directory
+            )
 
         return self._embedding_fn
 
@@ -211,7 +176,8 @@ class ChromaVectorStore(VectorStore):
 
         # Add to collection (Chroma will use embedding function automatically)
         try:
-            self.collection.add(ids=ids, documents=texts, metadatas=metadatas)
+            # upsert: re-syncing a changed entry must replace, not be ignored
+            self.collection.upsert(ids=ids, documents=texts, metadatas=metadatas)
 
             logger.debug(f"Added {len(documents)} documents to Chroma")
         except Exception as e:
@@ -271,6 +237,11 @@ class ChromaVectorStore(VectorStore):
             logger.error(f"Error searching Chroma: {e}")
             return []
 
+    def delete_documents(self, ids: List[str]) -> None:
+        """Delete documents by id"""
+        if ids:
+            self.collection.delete(ids=[str(doc_id) for doc_id in ids])
+
     def delete_collection(self) -> None:
         """Delete collection"""
         try:
@@ -283,16 +254,887 @@ class ChromaVectorStore(VectorStore):
         """Get collection statistics"""
         try:
             count = self.collection.count()
-            return {
+            stats = {
                 "total_documents": count,
                 "collection_name": self.collection_name,
                 "embedding_model": self.embedding_model,
             }
+            cache = getattr(self._embedding_fn, "cache", None)
+            if cache is not None:
+                stats["embedding_cache"] = cache.get_stats()
+            return stats
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             return {"total_documents": 0}
 
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _resize_array(old, used: int, shape: tuple, dtype, path: Optional[Path], release, fill=0):
+    """Copy the first ``used`` rows of ``old`` into a new array of ``shape``.
+
+    With a path the new array is a memory-mapped ``.npy`` file that replaces
+    the old one. ``release`` must drop the caller's reference to ``old``
+    before the swap, since Windows cannot replace a file that is mapped.
+    """
+    if path is None:
+        array = np.full(shape, fill, dtype=dtype)
+        if old is not None:
+            array[:used] = old[:used]
+        return array
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    array = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=shape)
+    if fill:
+        array[used:] = fill
+    if old is not None:
+        array[:used] = old[:used]
+    array.flush()
+    del array, old
+    release()
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode="r+")
+
+
+class IVFIndex:
+    """Inverted-file (IVF-Flat) approximate nearest-neighbour index
+
+    Rows are grouped into ``nlist`` cells by spherical k-means. A query scores
+    only the rows in the ``nprobe`` cells whose centroids are closest, so cost
+    scales with nprobe/nlist of the collection instead of all of it. New rows
+    are assigned to their nearest existing cell; deleted rows stay in their
+    cell as tombstones and are skipped by the store. Once inserts plus
+    tombstones since the last training exceed ``REBUILD_RATIO`` of the
+    trained size, the store retrains the cells.
+
+    Training is split into ``fit`` and ``assign``, which only read the vectors
+    they are given, and ``install``, which swaps the result in; the store runs
+    the first two on a copy without holding its lock.
+    """
+
+    REBUILD_RATIO = 0.5
+    KMEANS_ITERATIONS = 10
+    TRAIN_SAMPLES_PER_LIST = 64
+    ASSIGN_CHUNK = 16384
+
+    def __init__(
+        self,
+        nlist: Optional[int] = None,
+        nprobe: int = 32,
+        centroid_path: Optional[Path] = None,
+        assignment_path: Optional[Path] = None,
+    ):
+        """
+        Initialize IVF index
+
+        Args:
+            nlist: Number of cells (None = sqrt of the rows at training time)
+            nprobe: Cells scanned per query
+            centroid_path: File for the trained centroids (None = in-memory)
+            assignment_path: File for the per-row cell assignments
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.centroids = None
+        self.trained_rows = 0
+        self.changes = 0
+        self._centroid_path = centroid_path
+        self._assignment_path = assignment_path
+        self._assignments = None  # int32 cell per row, -1 = not indexed
+        self._order = np.zeros(0, dtype=np.int64)  # rows sorted by cell
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._pending: List[List[int]] = []  # rows added since training, per cell
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self.trained and self.changes > self.REBUILD_RATIO * max(self.trained_rows, 1)
+
+    def load(self, capacity: int) -> None:
+        """Load centroids and assignments written by an earlier session"""
+        if self._centroid_path is None or not self._centroid_path.exists():
+            return
+        if not self._assignment_path.exists():
+            return
+        with np.load(self._centroid_path) as data:
+            self.centroids = data["centroids"]
+            self.trained_rows = int(data["trained_rows"])
+        self._assignments = np.load(self._assignment_path, mmap_mode="r+")
+        if len(self._assignments) < capacity:
+            self.resize(capacity)
+        assigned = int((self._assignments >= 0).sum())
+        self.changes = max(0, assigned - self.trained_rows)
+        self._build_lists()
+
+    def resize(self, capacity: int) -> None:
+        """Grow the assignment array to the store's capacity"""
+        used = 0 if self._assignments is None else len(self._assignments)
+
+        def release():
+            self._assignments = None
+
+        self._assignments = _resize_array(
+            self._assignments, used, (capacity,), np.int32, self._assignment_path, release, fill=-1
+        )
+
+    def assign(self, vectors, centroids=None) -> Any:
+        """Nearest cell of each vector (default: the installed centroids)"""
+        centroids = self.centroids if centroids is None else centroids
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for i in range(0, len(vectors), self.ASSIGN_CHUNK):
+            chunk = np.asarray(vectors[i : i + self.ASSIGN_CHUNK])
+            labels[i : i + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+        return labels
+
+    def train(self, vectors, rows, capacity: int) -> None:
+        """
+        Run k-means over the given rows and index them
+
+        Args:
+            vectors: The store's embedding matrix (normalized rows)
+            rows: Live row numbers to index
+            capacity: Rows the store can hold
+        """
+        centroids = self.fit(vectors, rows)
+        labels = np.empty(len(rows), dtype=np.int32)
+        for i in range(0, len(rows), self.ASSIGN_CHUNK):
+            chunk = rows[i : i + self.ASSIGN_CHUNK]
+            labels[i : i + len(chunk)] = self.assign(vectors[chunk], centroids)
+        self.install(centroids, rows, labels, capacity)
+
+    def fit(self, vectors, rows=None) -> Any:
+        """
+        Spherical k-means centroids for the given rows (all rows by default)
+
+        Reads ``vectors`` only; the index itself is not changed.
+        """
+        rows = np.arange(len(vectors)) if rows is None else rows
+        rng = np.random.default_rng(0)
+        nlist = self.nlist or max(1, int(np.sqrt(len(rows))))
+        nlist = min(nlist, len(rows))
+
+        sample_size = min(len(rows), nlist * self.TRAIN_SAMPLES_PER_LIST)
+        sample = np.asarray(vectors[np.sort(rng.choice(rows, sample_size, replace=False))])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(self.KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(labels, kind="stable")
+            counts = np.bincount(labels, minlength=nlist)
+            filled = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+            centroids[filled] = np.add.reduceat(sample[order], starts, axis=0)
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids /= np.where(norms == 0, 1, norms)
+        return centroids.astype(np.float32)
+
+    def install(self, centroids, rows, labels, capacity: int) -> None:
+        """
+        Replace the cells with trained ones
+
+        Args:
+            centroids: From fit()
+            rows: Row numbers that were assigned
+            labels: Cell of each row, from assign()
+            capacity: Rows the store can hold
+        """
+        self.centroids = centroids
+        if self._assignments is None or len(self._assignments) < capacity:
+            self.resize(capacity)
+        self._assignments[:] = -1
+        self._assignments[rows] = labels
+        self.trained_rows = len(rows)
+        self.changes = 0
+        self._build_lists()
+        self._save()
+
+    def _build_lists(self) -> None:
+        rows = np.flatnonzero(np.asarray(self._assignments) >= 0)
+        labels = np.asarray(self._assignments[rows])
+        order = np.argsort(labels, kind="stable")
+        self._order = rows[order]
+        self._offsets = np.searchsorted(labels[order], np.arange(len(self.centroids) + 1))
+        self._pending = [[] for _ in range(len(self.centroids))]
+
+    def _save(self) -> None:
+        if self._centroid_path is None:
+            return
+        tmp_path = self._centroid_path.with_name(self._centroid_path.name + ".tmp.npz")
+        np.savez(tmp_path, centroids=self.centroids, trained_rows=self.trained_rows)
+        os.replace(tmp_path, self._centroid_path)
+        self._assignments.flush()
+
+    def add(self, rows, vectors) -> None:
+        """Assign new rows to their nearest cells"""
+        labels = self.assign(vectors)
+        self._assignments[rows] = labels
+        if isinstance(self._assignments, np.memmap):
+            self._assignments.flush()
+        for row, label in zip(rows, labels):
+            self._pending[label].append(int(row))
+        self.changes += len(rows)
+
+    def remove(self, count: int = 1) -> None:
+        """Record tombstones (the store masks the rows out)"""
+        self.changes += count
+
+    def probe(self, query, nprobe: Optional[int] = None):
+        """
+        Candidate rows for a query
+
+        Args:
+            query: Normalized query embedding
+            nprobe: Cells to scan (default: self.nprobe)
+
+        Returns:
+            Row numbers in the closest cells (may include tombstones)
+        """
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        similarity = self.centroids @ query
+        if nprobe < len(similarity):
+            cells = np.argpartition(-similarity, nprobe - 1)[:nprobe]
+        else:
+            cells = np.arange(len(similarity))
+        parts = [self._order[self._offsets[c] : self._offsets[c + 1]] for c in cells]
+        parts += [np.asarray(self._pending[c], dtype=np.int64) for c in cells if self._pending[c]]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def clear(self) -> None:
+        """Drop the index and its files"""
+        self.centroids = None
+        self._assignments = None
+        self.trained_rows = self.changes = 0
+        for path in (self._centroid_path, self._assignment_path):
+            if path is not None and path.exists():
+                path.unlink()
+
+
+class NumpyVectorStore(VectorStore):
+    """In-process vector store on a NumPy matrix (no vector database needed)
+
+    Embeddings are L2-normalized float32 rows of one contiguous matrix, so a
+    query is a single matrix-vector product followed by an ``argpartition``
+    top-k. With a persist directory the matrix is a memory-mapped ``.npy``
+    file and ids/texts/metadata go to an append-only JSONL log, so adds and
+    deletes never rewrite what is already stored. Deleted and replaced rows
+    are masked out; once they are more than ``COMPACT_RATIO`` of the rows, the
+    matrix and log are rewritten with only the live rows (``compact()``).
+
+    Metadata filters are answered from boolean masks. A key gets masks (one
+    per value) the first time it is filtered on; they are kept current as
+    documents are added and deleted.
+
+    With ``index="ivf"`` queries go through an IVFIndex once the collection
+    has ``IVF_MIN_ROWS`` rows; smaller collections are scored exactly. The
+    cells are (re)trained by a background thread on a copy of the live rows,
+    so adds, deletes and searches are not held up by k-means; until it
+    finishes, searches use the previous cells (or exact scoring).
+    """
+
+    INITIAL_CAPACITY = 1024
+    IVF_MIN_ROWS = 10000
+    COMPACT_RATIO = 0.5
+    COMPACT_MIN_ROWS = 1024  # Dead rows before compaction is worth a rewrite
+
+    def __init__(
+        self,
+        collection_name: str = "knowledge_base",
+        persist_directory: Optional[str] = None,
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        embedding_function: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        index: str = "flat",
+        nlist: Optional[int] = None,
+        nprobe: int = 32,
+    ):
+        """
+        Initialize NumPy vector store
+
+        Args:
+            collection_name: Name of the collection
+            persist_directory: Directory to persist data (None = in-memory)
+            embedding_model: Embedding model name (sentence-transformers compatible)
+            embedding_function: Callable embedding a list of texts (default: the
+                shared model for embedding_model)
+            index: "flat" (exact search) or "ivf" (approximate, for large collections)
+            nlist: IVF cells (None = sqrt of the collection size)
+            nprobe: IVF cells scanned per query; higher is slower but more accurate
+        """
+        if index not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index type: {index}")
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy is not installed. Install with: pip install numpy")
+
+        self.collection_name = collection_name
+        self.persist_directory = persist_directory
+        self.embedding_model = embedding_model
+        self._embedding_fn = embedding_function or _shared_embedding_function(
+            embedding_model, persist_directory
+        )
+        self._lock = threading.RLock()
+
+        self._vectors = None  # (capacity, dim) float32, rows [0, _size) in use
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._ids: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []
+        self._metadatas: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._masks: Dict[str, Dict[Any, Any]] = {}
+
+        self._matrix_path: Optional[Path] = None
+        self._log_path: Optional[Path] = None
+        ivf_paths: Tuple[Optional[Path], Optional[Path]] = (None, None)
+        if persist_directory:
+            base = Path(persist_directory)
+            base.mkdir(parents=True, exist_ok=True)
+            self._matrix_path = base / f"{collection_name}.npy"
+            self._log_path = base / f"{collection_name}.jsonl"
+            ivf_paths = (base / f"{collection_name}.ivf.npz", base / f"{collection_name}.ivf.npy")
+
+        self._ivf: Optional[IVFIndex] = None
+        if index == "ivf":
+            self._ivf = IVFIndex(nlist, nprobe, *ivf_paths)
+        self._rebuild_lock = threading.Lock()  # One retraining at a time
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self._rebuild_due = False
+        self._generation = 0  # Bumped when row numbers change (compaction, delete_collection)
+
+        if persist_directory:
+            self._load()
+            if self._ivf is not None and self._vectors is not None:
+                self._ivf.load(len(self._vectors))
+            with self._lock:
+                self._maybe_compact()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _compaction_paths(self) -> Tuple[Path, Path, Path]:
+        """Rewritten matrix, finished log (the commit point), log being written"""
+        log_done = self._log_path.with_name(self._log_path.name + ".compact")
+        return (
+            self._matrix_path.with_name(self._matrix_path.name + ".compact"),
+            log_done,
+            log_done.with_name(log_done.name + ".tmp"),
+        )
+
+    def _finish_compaction(self) -> None:
+        """Complete a committed compaction, or discard an uncommitted one"""
+        matrix_new, log_done, log_tmp = self._compaction_paths()
+        if log_done.exists():
+            if matrix_new.exists():
+                os.replace(matrix_new, self._matrix_path)
+            os.replace(log_done, self._log_path)
+            return
+        for path in (matrix_new, log_tmp):
+            if path.exists():
+                path.unlink()
+
+    def _load(self) -> None:
+        """Replay the metadata log over the memory-mapped matrix"""
+        self._finish_compaction()
+        if not self._log_path.exists() or not self._matrix_path.exists():
+            return
+
+        self._vectors = np.load(self._matrix_path, mmap_mode="r+")
+        rows: List[Tuple[int, str, str, Dict]] = []
+        deleted: Dict[str, int] = {}
+        with open(self._log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line after a crash
+                if record.get("op") == "delete":
+                    deleted[record["id"]] = record["row"]
+                else:
+                    rows.append((record["row"], record["id"], record["text"], record["metadata"]))
+
+        self._size = max((row for row, *_ in rows), default=-1) + 1
+        self._ids = [None] * self._size
+        self._texts = [None] * self._size
+        self._metadatas = [None] * self._size
+        self._alive = np.zeros(len(self._vectors), dtype=bool)
+        for row, doc_id, text, metadata in rows:
+            previous = self._rows.get(doc_id)
+            if previous is not None:
+                self._alive[previous] = False
+                self._ids[previous] = self._texts[previous] = self._metadatas[previous] = None
+            self._ids[row], self._texts[row], self._metadatas[row] = doc_id, text, metadata
+            self._rows[doc_id] = row
+            self._alive[row] = True
+        for doc_id, row in deleted.items():
+            if self._rows.get(doc_id) == row:
+                del self._rows[doc_id]
+                self._alive[row] = False
+                self._ids[row] = self._texts[row] = self._metadatas[row] = None
+
+    def _ensure_capacity(self, dim: int, needed: int) -> None:
+        if self._vectors is not None and self._vectors.shape[1] != dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match the store's {self._vectors.shape[1]}"
+            )
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if needed <= capacity:
+            return
+        new_capacity = max(self.INITIAL_CAPACITY, capacity)
+        while new_capacity < needed:
+            new_capacity *= 2
+
+        def release():
+            self._vectors = None
+
+        self._vectors = _resize_array(
+            self._vectors, self._size, (new_capacity, dim), np.float32, self._matrix_path, release
+        )
+        if self._ivf is not None and self._ivf.trained:
+            self._ivf.resize(new_capacity)
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        self._alive = alive
+        for masks in self._masks.values():
+            for value, mask in masks.items():
+                grown = np.zeros(new_capacity, dtype=bool)
+                grown[: len(mask)] = mask
+                masks[value] = grown
+
+    def _append_log(self, records: List[Dict[str, Any]]) -> None:
+        if self._log_path is None or not records:
+            return
+        with open(self._log_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def _maybe_compact(self) -> bool:
+        dead = self._size - len(self._rows)
+        if dead < self.COMPACT_MIN_ROWS or dead <= self.COMPACT_RATIO * self._size:
+            return False
+        self.compact()
+        return True
+
+    def compact(self) -> int:
+        """
+        Rewrite the matrix and log with only the live rows
+
+        The new log is renamed into place as ``<name>.jsonl.compact`` once
+        complete; a crash before that keeps the old files, and a crash after
+        it is completed on the next open.
+
+        Returns:
+            Number of dead rows dropped
+        """
+        with self._lock:
+            dead = self._size - len(self._rows)
+            if self._vectors is None or dead == 0:
+                return 0
+            live = np.flatnonzero(self._alive[: self._size])
+            dim = self._vectors.shape[1]
+            capacity = self.INITIAL_CAPACITY
+            while capacity < len(live):
+                capacity *= 2
+
+            if self._matrix_path is None:
+                vectors = np.zeros((capacity, dim), dtype=np.float32)
+            else:
+                matrix_new, log_done, log_tmp = self._compaction_paths()
+                vectors = np.lib.format.open_memmap(
+                    matrix_new, mode="w+", dtype=np.float32, shape=(capacity, dim)
+                )
+            for i in range(0, len(live), IVFIndex.ASSIGN_CHUNK):
+                chunk = live[i : i + IVFIndex.ASSIGN_CHUNK]
+                vectors[i : i + len(chunk)] = self._vectors[chunk]
+
+            if self._matrix_path is not None:
+                vectors.flush()
+                del vectors
+                with open(log_tmp, "w", encoding="utf-8") as f:
+                    for new_row, row in enumerate(live):
+                        record = {
+                            "op": "add",
+                            "row": new_row,
+                            "id": self._ids[row],
+                            "text": self._texts[row],
+                            "metadata": self._metadatas[row],
+                        }
+                        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(log_tmp, log_done)
+                self._vectors = None  # Windows cannot replace a mapped file
+                self._finish_compaction()
+                vectors = np.load(self._matrix_path, mmap_mode="r+")
+
+            self._vectors = vectors
+            self._ids = [self._ids[row] for row in live]
+            self._texts = [self._texts[row] for row in live]
+            self._metadatas = [self._metadatas[row] for row in live]
+            self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+            self._size = len(live)
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._alive[: self._size] = True
+            self._masks = {}
+            self._generation += 1
+            if self._ivf is not None and self._ivf.trained:
+                # Row numbers changed; the cells are retrained from scratch
+                self._ivf.clear()
+                if self._size >= self.IVF_MIN_ROWS:
+                    self._schedule_rebuild()
+        logger.info(f"Compacted NumPy store {self.collection_name}: dropped {dead} dead rows")
+        return dead
+
+    # ------------------------------------------------------------------
+    # Metadata masks
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _mask_value(value: Any) -> Any:
+        return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+    def _build_masks(self, key: str) -> Dict[Any, Any]:
+        masks: Dict[Any, Any] = {}
+        capacity = len(self._alive)
+        for row in np.flatnonzero(self._alive[: self._size]):
+            value = self._mask_value(self._metadatas[row].get(key))
+            if value not in masks:
+                masks[value] = np.zeros(capacity, dtype=bool)
+            masks[value][row] = True
+        self._masks[key] = masks
+        return masks
+
+    def _set_masks(self, row: int, metadata: Dict[str, Any], flag: bool) -> None:
+        for key, masks in self._masks.items():
+            value = self._mask_value(metadata.get(key))
+            if value not in masks:
+                if not flag:
+                    continue
+                masks[value] = np.zeros(len(self._alive), dtype=bool)
+            masks[value][row] = flag
+
+    def _filter_mask(self, filter_metadata: Optional[Dict]):
+        mask = self._alive[: self._size].copy()
+        for key, value in (filter_metadata or {}).items():
+            masks = self._masks.get(key)
+            if masks is None:
+                masks = self._build_masks(key)
+            value_mask = masks.get(self._mask_value(value))
+            if value_mask is None:
+                return None
+            mask &= value_mask[: self._size]
+        return mask
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    def add_documents(self, documents: List[Dict[str, Any]]) -> None:
+        """Add documents; a document whose id is already stored replaces it"""
+        if not documents:
+            return
+
+        vectors = np.asarray(
+            self._embedding_fn([doc["text"] for doc in documents]), dtype=np.float32
+        )
+        self.add_embeddings(documents, vectors)
+
+    def add_embeddings(self, documents: List[Dict[str, Any]], vectors) -> None:
+        """
+        Add documents with precomputed embeddings
+
+        Args:
+            documents: List of dicts with 'id', 'text', 'metadata'
+            vectors: One embedding per document (n x dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) != len(documents):
+            raise ValueError("documents and vectors must have the same length")
+        if not len(documents):
+            return
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            start = self._size
+            self._ensure_capacity(vectors.shape[1], start + len(documents))
+            self._vectors[start : start + len(documents)] = vectors
+            if self._matrix_path is not None:
+                self._vectors.flush()
+
+            records = []
+            for offset, doc in enumerate(documents):
+                row = start + offset
+                doc_id = str(doc.get("id", uuid.uuid4()))
+                metadata = dict(doc.get("metadata") or {})
+
+                previous = self._rows.get(doc_id)
+                if previous is not None:
+                    self._alive[previous] = False
+                    self._set_masks(previous, self._metadatas[previous], False)
+                    self._ids[previous] = self._texts[previous] = self._metadatas[previous] = None
+                    if self._ivf is not None and self._ivf.trained:
+                        self._ivf.remove()
+
+                self._ids.append(doc_id)
+                self._texts.append(doc["text"])
+                self._metadatas.append(metadata)
+                self._rows[doc_id] = row
+                self._alive[row] = True
+                self._set_masks(row, metadata, True)
+                records.append(
+                    {
+                        "op": "add",
+                        "row": row,
+                        "id": doc_id,
+                        "text": doc["text"],
+                        "metadata": metadata,
+                    }
+                )
+            self._size = start + len(documents)
+            self._append_log(records)
+            if not self._maybe_compact():
+                self._update_index(np.arange(start, self._size), vectors)
+
+        logger.debug(f"Added {len(documents)} documents to NumPy store")
+
+    def _update_index(self, rows, vectors) -> None:
+        """Index new rows, training or retraining the IVF cells when due"""
+        if self._ivf is None:
+            return
+        if self._ivf.trained:
+            self._ivf.add(rows, vectors)
+            due = self._ivf.needs_rebuild
+        else:
+            due = len(self._rows) >= self.IVF_MIN_ROWS
+        # A retraining already under way catches up with these rows itself
+        if due and self._rebuild_thread is None:
+            self._schedule_rebuild()
+
+    def _schedule_rebuild(self) -> None:
+        """Ask the background thread to retrain (caller holds self._lock)"""
+        self._rebuild_due = True
+        if self._rebuild_thread is None:
+            self._rebuild_thread = threading.Thread(
+                target=self._rebuild_loop, name="mem-llm-ivf-rebuild", daemon=True
+            )
+            self._rebuild_thread.start()
+
+    def _rebuild_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._rebuild_due:
+                    self._rebuild_thread = None
+                    return
+                self._rebuild_due = False
+            try:
+                self.rebuild_index()
+            except Exception as e:
+                logger.error(f"IVF index rebuild failed: {e}")
+
+    def wait_for_index(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until background retraining has finished
+
+        Returns:
+            True if no retraining is pending or running
+        """
+        with self._lock:
+            thread = self._rebuild_thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._lock:
+            return self._rebuild_thread is None
+
+    def rebuild_index(self) -> None:
+        """
+        Retrain the IVF cells over all live rows (no-op for a flat store)
+
+        k-means and the assignment of every row run on a copy of the live
+        vectors without the store lock; the lock is taken again only to copy
+        them and to install the result. Must not be called with the lock held.
+        """
+        if self._ivf is None:
+            return
+        with self._rebuild_lock:
+            with self._lock:
+                live = np.flatnonzero(self._alive[: self._size])
+                if not len(live):
+                    return
+                snapshot = np.asarray(self._vectors[live])
+                size, generation = self._size, self._generation
+
+            start = time.perf_counter()
+            centroids = self._ivf.fit(snapshot)
+            labels = self._ivf.assign(snapshot, centroids)
+            del snapshot
+
+            with self._lock:
+                if generation != self._generation:
+                    return  # Rows were renumbered meanwhile; that change retrains again
+                self._ivf.install(centroids, live, labels, len(self._vectors))
+                # Catch up with writes made while training
+                added = np.arange(size, self._size)
+                added = added[self._alive[added]]
+                if len(added):
+                    self._ivf.add(added, self._vectors[added])
+                gone = int(len(live) - self._alive[live].sum())
+                if gone:
+                    self._ivf.remove(gone)
+            logger.info(
+                f"Trained IVF index over {len(live)} rows " f"in {time.perf_counter() - start:.2f}s"
+            )
+
+    def delete_documents(self, ids: List[str]) -> None:
+        """Delete documents by id"""
+        with self._lock:
+            records = []
+            for doc_id in map(str, ids):
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                self._alive[row] = False
+                self._set_masks(row, self._metadatas[row], False)
+                self._ids[row] = self._texts[row] = self._metadatas[row] = None
+                records.append({"op": "delete", "id": doc_id, "row": row})
+            self._append_log(records)
+            if not records or self._maybe_compact():
+                return
+            if self._ivf is not None and self._ivf.trained:
+                self._ivf.remove(len(records))
+                if self._ivf.needs_rebuild and self._rebuild_thread is None:
+                    self._schedule_rebuild()
+
+    def search(
+        self, query: str, limit: int = 5, filter_metadata: Optional[Dict] = None
+    ) -> List[Dict[str, Any]]:
+        """Search by cosine similarity"""
+        try:
+            vector = self._embedding_fn([query])[0]
+            return self.search_by_vector(vector, limit=limit, filter_metadata=filter_metadata)
+        except Exception as e:
+            logger.error(f"Error searching NumPy store: {e}")
+            return []
+
+    def search_by_vector(
+        self,
+        vector,
+        limit: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search with a precomputed query embedding
+
+        Args:
+            vector: Query embedding
+            limit: Maximum number of results
+            filter_metadata: Exact-match metadata filters
+            nprobe: IVF cells to scan for this query (default: the store's nprobe)
+
+        Returns:
+            List of similar documents with scores, best first
+        """
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            if self._vectors is None or limit <= 0:
+                return []
+            mask = self._filter_mask(filter_metadata)
+            if mask is None:
+                return []
+            candidates = int(mask.sum())
+            if candidates == 0:
+                return []
+
+            k = min(limit, candidates)
+            rows = None
+            if self._ivf is not None and self._ivf.trained and candidates * 4 >= self._size:
+                rows = self._ivf.probe(query, nprobe)
+                rows = rows[mask[rows]]
+                if len(rows) < k or len(rows) * 4 >= self._size:
+                    # Probed cells too sparse, or so many that a full scan is cheaper
+                    rows = None
+
+            if rows is not None:
+                scores = self._vectors[rows] @ query
+            elif candidates * 4 < self._size:
+                # Selective filter: score only the matching rows
+                rows = np.flatnonzero(mask)
+                scores = self._vectors[rows] @ query
+            else:
+                rows = np.arange(self._size)
+                scores = self._vectors[: self._size] @ query
+                scores[~mask] = -np.inf
+
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(k)
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [
+                {
+                    "id": self._ids[row],
+                    "text": self._texts[row],
+                    "metadata": dict(self._metadatas[row]),
+                    "score": float(score),
+                }
+                for row, score in zip(rows[top], scores[top])
+            ]
+
+    def delete_collection(self) -> None:
+        """Delete collection"""
+        with self._lock:
+            self._vectors = None
+            self._alive = np.zeros(0, dtype=bool)
+            self._size = 0
+            self._ids, self._texts, self._metadatas = [], [], []
+            self._rows = {}
+            self._masks = {}
+            self._generation += 1
+            if self._ivf is not None:
+                self._ivf.clear()
+            for path in (self._matrix_path, self._log_path):
+                if path is not None and path.exists():
+                    path.unlink()
+        logger.info(f"Deleted NumPy collection: {self.collection_name}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get collection statistics"""
+        with self._lock:
+            stats = {
+                "total_documents": len(self._rows),
+                "collection_name": self.collection_name,
+                "embedding_model": self.embedding_model,
+                "backend": "numpy",
+                "dimension": None if self._vectors is None else int(self._vectors.shape[1]),
+                "capacity": 0 if self._vectors is None else len(self._vectors),
+                "dead_rows": self._size - len(self._rows),
+                "index": "flat" if self._ivf is None else "ivf",
+            }
+            if self._ivf is not None:
+                stats["ivf"] = {
+                    "trained": self._ivf.trained,
+                    "nlist": len(self._ivf.centroids) if self._ivf.trained else self._ivf.nlist,
+                    "nprobe": self._ivf.nprobe,
+                    "changes_since_training": self._ivf.changes,
+                }
+        cache = getattr(self._embedding_fn, "cache", None)
+        if cache is not None:
+            stats["embedding_cache"] = cache.get_stats()
+        return stats
+
+
 def create_vector_store(store_type: str = "chroma", **kwargs) -> Optional[VectorStore]:
     """
     Factory function to create vector store
@@ -306,12 +1148,20 @@ def create_vector_store(store_type: str = "chroma", **kwargs) -> Optional[Vector
     """
     if store_type == "chroma":
         if not CHROMA_AVAILABLE:
+            if NUMPY_AVAILABLE:
+                logger.info("ChromaDB not installed, using the built-in NumPy vector store")
+                return NumpyVectorStore(**kwargs)
             logger.info(
                 "ℹ️  Vector search disabled (ChromaDB not installed). "
                 "For semantic search, run: pip install chromadb sentence-transformers"
             )
             return None
         return ChromaVectorStore(**kwargs)
+    elif store_type == "numpy":
+        if not NUMPY_AVAILABLE:
+            logger.info("ℹ️  Vector search disabled (NumPy not installed)")
+            return None
+        return NumpyVectorStore(**kwargs)
     else:
         logger.warning(f"Unknown vector store type: {store_type}")
         return None
@@ -0,0 +1,163 @@
+"""Multi-process API mode: shared key store and user-sticky routing."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from mem_llm.api_auth import SQLiteAPIKeyStore  # noqa: E402
+from mem_llm.api_cluster import create_router_app, extract_user_id, worker_for  # noqa: E402
+
+
+@pytest.mark.unit
+def test_worker_for_is_stable_and_spreads_users():
+    assert worker_for("ada", 4) == worker_for("ada", 4)
+    assert {worker_for(f"user{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "path, query, body, expected",
+    [
+        ("/api/v1/users/ada/profile", {}, b"", "ada"),
+        ("/ws/chat/bob", {}, b"", "bob"),
+        ("/api/v1/graph/data", {"user_id": "carol"}, b"", "carol"),
+        ("/api/v1/chat", {}, b'{"user_id": "dan", "message": "hi"}', "dan"),
+        ("/api/v1/health", {}, b"", None),
+        ("/api/v1/chat", {}, b"{not json", None),
+    ],
+)
+def test_extract_user_id(path, query, body, expected):
+    assert extract_user_id(path, query, body) == expected
+
+
+@pytest.mark.unit
+def test_sqlite_key_store_is_shared_between_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr("mem_llm.api_auth.RATE_LIMIT_REQUESTS", 3)
+    path = str(tmp_path / "state.db")
+    first, second = SQLiteAPIKeyStore(path), SQLiteAPIKeyStore(path)
+    try:
+        key = first.generate_key()
+        first.add_key(key, "ada", "Ada", ["read"])
+        user = second.validate_key(key)
+        assert (user.user_id, user.permissions) == ("ada", ["read"])
+
+        # Both "processes" draw from one window
+        assert [first.check_rate_limit(key), second.check_rate_limit(key)] == [True, True]
+        assert first.check_rate_limit(key)
+        assert not second.check_rate_limit(key)
+        assert first.get_rate_limit_remaining(key) == 0
+
+        assert second.revoke_key(key)
+        assert first.validate_key(key) is None
+        assert {u.user_id for u in first.list_users()} == {"admin", "ada"}
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.unit
+def test_restarting_a_worker_keeps_the_admin_key_revoked(tmp_path):
+    from mem_llm.api_auth import DEFAULT_API_KEY
+
+    path = str(tmp_path / "state.db")
+    store = SQLiteAPIKeyStore(path)
+    created = store.validate_key(DEFAULT_API_KEY).created_at
+    assert store.revoke_key(DEFAULT_API_KEY)
+    store.close()
+
+    store = SQLiteAPIKeyStore(path)
+    try:
+        assert store.validate_key(DEFAULT_API_KEY) is None
+        assert [u.created_at for u in store.list_users() if u.user_id == "admin"] == [created]
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+async def test_authenticate_runs_sqlite_lookups_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+
+    from fastapi import HTTPException
+
+    from mem_llm import api_auth
+
+    store = SQLiteAPIKeyStore(str(tmp_path / "state.db"))
+    threads = []
+    validate = store._validate_hashed
+    monkeypatch.setattr(
+        store,
+        "_validate_hashed",
+        lambda hashed: threads.append(threading.get_ident()) or validate(hashed),
+    )
+    monkeypatch.setattr(api_auth, "api_key_store", store)
+    monkeypatch.setattr(api_auth, "AUTH_DISABLED", False)
+    try:
+        user = await api_auth.authenticate(api_auth.DEFAULT_API_KEY)
+        assert user.user_id == "admin"
+        assert threads and threads[0] != threading.get_ident()
+        with pytest.raises(HTTPException):
+            await api_auth.authenticate("not-a-key")
+    finally:
+        store.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def workers():
+    import uvicorn
+    from fastapi import FastAPI, Request
+    from fastapi.responses import StreamingResponse
+
+    servers, urls = [], []
+    for index in range(2):
+        app = FastAPI()
+
+        @app.get("/api/v1/stream")
+        async def stream():
+            return StreamingResponse(
+                iter(["data: a\n\n", "data: b\n\n"]), media_type="text/event-stream"
+            )
+
+        @app.api_route("/{path:path}", methods=["GET", "POST"])
+        async def echo(request: Request, path: str, index=index):
+            return {"worker": index, "path": path, "body": (await request.body()).decode()}
+
+        port = _free_port()
+        server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="error"))
+        threading.Thread(target=server.run, daemon=True).start()
+        servers.append(server)
+        urls.append(f"http://127.0.0.1:{port}")
+    deadline = time.time() + 10
+    while not all(server.started for server in servers) and time.time() < deadline:
+        time.sleep(0.05)
+    yield urls
+    for server in servers:
+        server.should_exit = True
+
+
+@pytest.mark.unit
+def test_router_sends_a_user_to_one_worker(workers):
+    from fastapi.testclient import TestClient
+
+    with TestClient(create_router_app(workers)) as client:
+        owner = worker_for("ada", 2)
+        for _ in range(3):
+            response = client.post("/api/v1/chat", json={"user_id": "ada", "message": "hi"})
+            assert response.json()["worker"] == owner
+            assert '"hi"' in response.json()["body"]
+        assert client.get("/api/v1/graph/data?user_id=ada").json()["worker"] == owner
+
+        # Requests without a user are spread round-robin
+        assert {client.get("/api/v1/health").json()["worker"] for _ in range(2)} == {0, 1}
+        stream = client.get("/api/v1/stream")
+        assert stream.headers["content-type"].startswith("text/event-stream")
+        assert stream.text == "data: a\n\ndata: b\n\n"
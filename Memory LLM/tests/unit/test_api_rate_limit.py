@@ -0,0 +1,85 @@
+"""Token-bucket API rate limiting."""
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import mem_llm.api_auth as api_auth  # noqa: E402
+from mem_llm.api_auth import APIKeyStore, SQLiteAPIKeyStore, TokenBucket  # noqa: E402
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("mem_llm.api_auth.time.time", clock)
+    monkeypatch.setattr(api_auth, "RATE_LIMIT_REQUESTS", 6)  # one token per 10 s
+    return clock
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("store_type", ["memory", "sqlite"])
+def test_bucket_refills_over_time(clock, tmp_path, store_type):
+    store = APIKeyStore() if store_type == "memory" else SQLiteAPIKeyStore(str(tmp_path / "s.db"))
+    key = store.generate_key()
+    store.add_key(key, "ada")
+
+    assert all(store.check_rate_limit(key) for _ in range(6))
+    assert not store.check_rate_limit(key)
+    assert store.get_rate_limit_remaining(key) == 0
+    assert store.get_retry_after(key) == pytest.approx(10.0)
+
+    clock.now += 25  # 2.5 tokens back
+    assert store.get_rate_limit_remaining(key) == 2
+    assert [store.check_rate_limit(key) for _ in range(3)] == [True, True, False]
+
+    clock.now += 3600  # never more than the limit
+    assert store.get_rate_limit_remaining(key) == 6
+
+
+@pytest.mark.unit
+async def test_authenticate_hashes_the_key_once(clock, monkeypatch):
+    store = APIKeyStore()
+    key = store.generate_key()
+    store.add_key(key, "ada")
+    hashes = []
+    hash_key = store._hash_key
+    monkeypatch.setattr(store, "_hash_key", lambda raw: hashes.append(raw) or hash_key(raw))
+    monkeypatch.setattr(api_auth, "api_key_store", store)
+    monkeypatch.setattr(api_auth, "AUTH_DISABLED", False)
+
+    for _ in range(7):  # the last one is rejected and asks for a retry time
+        try:
+            await api_auth.authenticate(key)
+        except api_auth.HTTPException as e:
+            assert e.status_code == 429
+    assert len(hashes) == 7
+
+
+@pytest.mark.unit
+def test_permission_tiers(clock, monkeypatch):
+    monkeypatch.setattr(api_auth, "RATE_LIMIT_TIERS", api_auth._parse_tiers("admin=20, write=10"))
+    store = APIKeyStore()
+    reader, writer = store.generate_key(), store.generate_key()
+    store.add_key(reader, "r", permissions=["read"])
+    store.add_key(writer, "w", permissions=["read", "write"])
+
+    assert sum(store.check_rate_limit(reader) for _ in range(30)) == 6
+    assert sum(store.check_rate_limit(writer) for _ in range(30)) == 10
+    assert sum(store.check_rate_limit(api_auth.DEFAULT_API_KEY) for _ in range(30)) == 20
+
+
+@pytest.mark.unit
+def test_bucket_state_is_two_numbers():
+    bucket = TokenBucket(tokens=1.0, updated=0.0)
+    assert bucket.consume(limit=60, now=0.0)
+    assert not bucket.consume(limit=60, now=0.5)
+    assert bucket.consume(limit=60, now=1.0)
+    assert vars(bucket).keys() == {"tokens", "updated"}
@@ -0,0 +1,171 @@
+"""Async chat pipeline: aiohttp-based client methods and MemAgent.achat/achat_stream."""
+
+import asyncio
+import json
+import os
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import web
+
+from mem_llm.base_llm_client import close_async_session
+from mem_llm.clients import OllamaClient, OpenAICompatibleClient
+
+
+async def start_server(routes):
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture
+async def ollama_server():
+    async def chat(request):
+        payload = await request.json()
+        question = payload["messages"][-1]["content"]
+        if payload["stream"]:
+            response = web.StreamResponse()
+            await response.prepare(request)
+            for word in ["echo", " ", question]:
+                await asyncio.sleep(float(request.query.get("chunk_delay", 0)))
+                line = {"message": {"content": word}, "done": False}
+                await response.write((json.dumps(line) + "\n").encode())
+            await response.write(b'{"message": {"content": ""}, "done": true}\n')
+            return response
+        await asyncio.sleep(float(request.query.get("delay", 0)))
+        return web.json_response({"message": {"content": f"echo {question}"}})
+
+    runner, url = await start_server([web.post("/api/chat", chat)])
+    yield url
+    await close_async_session()
+    await runner.cleanup()
+
+
+@pytest.mark.unit
+async def test_ollama_achat_and_stream(ollama_server):
+    client = OllamaClient(model="test", base_url=ollama_server)
+    messages = [{"role": "user", "content": "hello"}]
+
+    assert await client.achat(messages) == "echo hello"
+    assert [chunk async for chunk in client.achat_stream(messages)] == ["echo", " ", "hello"]
+
+
+@pytest.mark.unit
+async def test_concurrent_generations_share_the_event_loop(ollama_server):
+    client = OllamaClient(model="test", base_url=ollama_server)
+    client.chat_url += "?delay=0.3"
+
+    start = time.perf_counter()
+    replies = await asyncio.gather(
+        *(client.achat([{"role": "user", "content": str(n)}]) for n in range(50))
+    )
+
+    assert replies == [f"echo {n}" for n in range(50)]
+    assert time.perf_counter() - start < 2.0  # not 50 * 0.3s
+
+
+@pytest.mark.unit
+async def test_request_timeout_becomes_connection_error(ollama_server):
+    client = OllamaClient(model="test", base_url=ollama_server)
+    client.chat_url += "?delay=1"
+
+    with pytest.raises(ConnectionError, match="timeout"):
+        await client.achat([{"role": "user", "content": "hi"}], timeout=0.1, max_retries=1)
+
+
+@pytest.mark.unit
+async def test_stream_timeout_applies_per_chunk(ollama_server):
+    client = OllamaClient(model="test", base_url=ollama_server)
+    client.chat_url += "?chunk_delay=0.15"
+    messages = [{"role": "user", "content": "hi"}]
+
+    # 0.45s in total, but every chunk arrives within the timeout
+    chunks = [chunk async for chunk in client.achat_stream(messages, timeout=0.3)]
+    assert chunks == ["echo", " ", "hi"]
+
+    client.chat_url = client.chat_url.replace("0.15", "0.5")
+    with pytest.raises(ConnectionError, match="timeout"):
+        [chunk async for chunk in client.achat_stream(messages, timeout=0.3)]
+
+
+@pytest.mark.unit
+async def test_openai_compatible_achat_stream():
+    async def completions(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for word in ["Hi", " there"]:
+            chunk = {"choices": [{"delta": {"content": word}}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        return response
+
+    runner, url = await start_server([web.post("/v1/chat/completions", completions)])
+    try:
+        client = OpenAICompatibleClient(model="test", base_url=url)
+        chunks = [c async for c in client.achat_stream([{"role": "user", "content": "x"}])]
+        assert chunks == ["Hi", " there"]
+    finally:
+        await close_async_session()
+        await runner.cleanup()
+
+
+@pytest.mark.unit
+async def test_unreachable_backend_raises_connection_error():
+    client = OllamaClient(model="test", base_url="http://127.0.0.1:9")
+    try:
+        with pytest.raises(ConnectionError):
+            await client.achat([{"role": "user", "content": "hi"}], max_retries=1)
+    finally:
+        await close_async_session()
+
+
+@pytest.fixture
+def agent(tmp_path):
+    from mem_llm import MemAgent
+
+    agent = MemAgent(
+        use_sql=True, memory_dir=os.path.join(tmp_path, "agent.db"), check_connection=False
+    )
+    yield agent
+    agent.close()
+
+
+@pytest.mark.unit
+async def test_agent_achat_saves_the_turn(agent):
+    class AsyncEcho:
+        model = "echo"
+
+        async def achat(self, messages, **kwargs):
+            await asyncio.sleep(0)
+            return "echo " + messages[-1]["content"]
+
+    agent.llm = AsyncEcho()
+
+    replies = await asyncio.gather(*(agent.achat(f"msg {n}", user_id=f"u{n}") for n in range(5)))
+
+    assert replies == [f"echo msg {n}" for n in range(5)]
+    history = agent.memory.get_recent_conversations("u3", limit=5)
+    assert [turn["bot_response"] for turn in history] == ["echo msg 3"]
+
+    response = await agent.achat("again", user_id="u3", return_metrics=True)
+    assert response.text == "echo again"
+    assert response.metadata["user_id"] == "u3"
+
+
+@pytest.mark.unit
+async def test_agent_achat_stream_falls_back_to_sync_backend(agent):
+    agent.llm = MagicMock()
+    agent.llm.chat_stream.side_effect = lambda messages, **kwargs: iter(["a", "b", "c"])
+
+    chunks = [chunk async for chunk in agent.achat_stream("stream me", user_id="alice")]
+
+    assert chunks == ["a", "b", "c"]
+    history = agent.memory.get_recent_conversations("alice", limit=5)
+    assert history[0]["bot_response"] == "abc"
+    assert json.loads(history[0]["metadata"])["streaming"] is True
@@ -12,6 +12,10 @@ class TestConversationAnalytics:
     @pytest.fixture
     def mock_memory_manager(self):
         manager = Mock(spec=MemoryManager)
+        # Analytics streams history; serve it from whatever load_memory returns.
+        manager.iter_conversations.side_effect = lambda user_id, **kwargs: iter(
+            manager.load_memory(user_id).get("conversations", [])
+        )
         return manager
 
     @pytest.fixture
@@ -126,4 +130,3 @@ class TestConversationAnalytics:
 
         with pytest.raises(ValueError):
             analytics.export_report("user1", format="invalid")
-
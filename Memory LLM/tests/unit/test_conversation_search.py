@@ -0,0 +1,157 @@
+"""Conversation search: substring by default, BM25 over the FTS5 index when ranked."""
+
+import sqlite3
+
+import pytest
+
+from mem_llm.memory_db import SQLMemoryManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = SQLMemoryManager(db_path=str(tmp_path / "conv.db"))
+    yield manager
+    manager.close()
+
+
+@pytest.mark.unit
+def test_results_are_ranked_by_relevance_and_limited(db):
+    db.add_interaction("alice", "my invoice is wrong", "let me check the invoice invoice")
+    db.add_interaction("alice", "what's the weather", "sunny")
+    for i in range(10):
+        db.add_interaction("alice", f"note {i} mentions invoice once", "ok")
+
+    results = db.search_conversations("alice", "invoice", limit=3, ranked=True)
+
+    assert len(results) == 3
+    assert results[0]["user_message"] == "my invoice is wrong"
+    assert all("invoice" in r["user_message"] for r in results)
+
+
+@pytest.mark.unit
+def test_search_is_scoped_to_the_exact_user(db):
+    db.add_interaction("alice", "refund my order", "done")
+    db.add_interaction("alice-2", "refund my order too", "done")
+    db.add_interaction("bob", "refund please", "done")
+
+    results = db.search_conversations("alice", "refund", ranked=True)
+    assert [r["user_message"] for r in results] == ["refund my order"]
+
+
+@pytest.mark.unit
+def test_terms_are_stemmed_and_metadata_is_searchable(db):
+    db.add_interaction("alice", "I forgot my password", "use the reset link", {"ticket": "T-991"})
+
+    assert (
+        db.search_conversations("alice", "passwords", ranked=True)[0]["bot_response"]
+        == "use the reset link"
+    )
+    assert db.search_conversations("alice", "T-991", ranked=True), "metadata should be searchable"
+
+
+@pytest.mark.unit
+def test_only_the_most_recent_candidates_are_ranked(db):
+    db.SEARCH_CANDIDATES = 3
+    db.add_interaction("alice", "printer printer printer jammed", "old but strong match")
+    for i in range(3):
+        db.add_interaction("alice", f"printer question {i}", "recent weak match")
+
+    results = db.search_conversations("alice", "printer", limit=2, ranked=True)
+    assert [r["bot_response"] for r in results] == ["recent weak match"] * 2
+    # Without the window the older, denser match would rank first.
+    db.SEARCH_CANDIDATES = 10
+    assert db.search_conversations("alice", "printer", limit=2, ranked=True)[0]["bot_response"] == (
+        "old but strong match"
+    )
+
+
+@pytest.mark.unit
+def test_cleared_conversations_leave_the_index(db):
+    db.add_interaction("alice", "secret plans", "noted")
+    db.clear_memory("alice")
+
+    assert db.search_conversations("alice", "secret", ranked=True) == []
+    assert db.conn.execute("SELECT count(*) FROM conversations_fts_docsize").fetchone()[0] == 0
+
+
+@pytest.mark.unit
+def test_keyword_without_terms_falls_back_to_like(db):
+    db.add_interaction("alice", "is 2+2=4?", "yes")
+    assert db.search_conversations("alice", "+", ranked=True)[0]["bot_response"] == "yes"
+
+
+@pytest.mark.unit
+def test_existing_rows_are_indexed_on_open(tmp_path):
+    """Rows written before an index existed, or that it missed, are rebuilt in."""
+    path = tmp_path / "legacy.db"
+    SQLMemoryManager(db_path=str(path)).close()
+
+    # Simulate a database whose indexes are out of step with their tables.
+    conn = sqlite3.connect(path)
+    for name in ("conversations_fts_ai", "knowledge_fts_ai"):
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("INSERT INTO users (user_id) VALUES ('alice')")
+    conn.execute(
+        "INSERT INTO conversations (user_id, user_message, bot_response) "
+        "VALUES ('alice', 'where is my parcel', 'in transit')"
+    )
+    conn.execute(
+        "INSERT INTO knowledge_base (category, question, answer) "
+        "VALUES ('billing', 'Refund policy', 'Refunds are issued within 5 days.')"
+    )
+    conn.commit()
+    conn.close()
+
+    db = SQLMemoryManager(db_path=str(path))
+    try:
+        assert (
+            db.search_conversations("alice", "parcel", ranked=True)[0]["bot_response"]
+            == "in transit"
+        )
+        assert db._bm25_search("refund")[0]["question"] == "Refund policy"
+        # Triggers are recreated, so new rows keep flowing into the index.
+        db.add_interaction("alice", "parcel arrived", "great")
+        assert len(db.search_conversations("alice", "parcel", ranked=True)) == 2
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_write_behind_turns_are_searchable(tmp_path):
+    db = SQLMemoryManager(db_path=str(tmp_path / "wb.db"), write_behind=True)
+    try:
+        db.add_interaction("alice", "upgrade my plan", "upgraded")
+        assert (
+            db.search_conversations("alice", "upgrade", ranked=True)[0]["bot_response"]
+            == "upgraded"
+        )
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_stopwords_do_not_crowd_out_real_matches(db):
+    db.SEARCH_CANDIDATES = 5
+    db.add_interaction("alice", "my printer is jammed", "open the rear tray")
+    for i in range(10):
+        db.add_interaction("alice", f"how do I do thing {i}", "like this")
+
+    results = db.search_conversations("alice", "how do I fix my printer", limit=1, ranked=True)
+    assert results[0]["bot_response"] == "open the rear tray"
+
+
+@pytest.mark.unit
+def test_default_search_keeps_substring_phrase_semantics(db):
+    db.add_interaction("alice", "the blue car is parked", "ok")
+    db.add_interaction("alice", "a car that is blue", "ok")
+    for i in range(150):
+        db.add_interaction("alice", f"questionnaire {i}", "ok")
+
+    assert [r["user_message"] for r in db.search_conversations("alice", "blue car")] == [
+        "the blue car is parked"
+    ]
+    # Substrings inside words match, and every hit comes back newest first.
+    hits = db.search_conversations("alice", "question")
+    assert len(hits) == 150
+    assert hits[0]["user_message"] == "questionnaire 149"
+    assert len(db.search_conversations("alice", "question", limit=5)) == 5
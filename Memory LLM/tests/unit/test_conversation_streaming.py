@@ -0,0 +1,77 @@
+"""Keyset-paginated conversation streaming and counting across memory backends."""
+
+import json
+from itertools import islice
+
+import pytest
+
+from mem_llm.data_export_import import DataExporter
+from mem_llm.memory_db import SQLMemoryManager
+from mem_llm.memory_manager import MemoryManager
+from mem_llm.segmented_memory import SegmentedMemoryManager
+
+
+@pytest.fixture(params=["sql", "json", "segmented"])
+def memory(request, tmp_path):
+    if request.param == "sql":
+        manager = SQLMemoryManager(db_path=str(tmp_path / "stream.db"))
+    elif request.param == "json":
+        manager = MemoryManager(str(tmp_path / "json"))
+    else:
+        manager = SegmentedMemoryManager(str(tmp_path / "segments"), segment_max_records=7)
+    yield manager
+    if hasattr(manager, "close"):
+        manager.close()
+
+
+@pytest.mark.unit
+def test_iter_yields_full_history_oldest_first(memory):
+    for i in range(23):
+        memory.add_interaction("alice", f"msg {i}", f"resp {i}")
+    memory.add_interaction("bob", "other", "user")
+
+    streamed = list(memory.iter_conversations("alice", batch_size=5))
+
+    assert [c["user_message"] for c in streamed] == [f"msg {i}" for i in range(23)]
+    ids = [c["id"] for c in streamed]
+    assert ids == sorted(ids) and len(set(ids)) == 23
+    assert memory.count_conversations("alice") == 23
+    assert memory.count_conversations("bob") == 1
+
+
+@pytest.mark.unit
+def test_resume_after_last_seen_id(memory):
+    for i in range(12):
+        memory.add_interaction("alice", f"msg {i}", f"resp {i}")
+
+    first_page = list(islice(memory.iter_conversations("alice", batch_size=4), 5))
+    rest = list(memory.iter_conversations("alice", after_id=first_page[-1]["id"]))
+
+    assert [c["user_message"] for c in first_page + rest] == [f"msg {i}" for i in range(12)]
+
+
+@pytest.mark.unit
+def test_unknown_user_streams_nothing(memory):
+    assert list(memory.iter_conversations("nobody")) == []
+    assert memory.count_conversations("nobody") == 0
+
+
+@pytest.mark.unit
+def test_export_is_not_capped_at_a_thousand_turns(tmp_path):
+    db = SQLMemoryManager(db_path=str(tmp_path / "big.db"))
+    try:
+        for i in range(1205):
+            db.add_interaction("alice", f"msg {i}", f"resp {i}")
+        exporter = DataExporter(db)
+
+        result = exporter.export_to_json("alice", str(tmp_path / "alice.json"))
+        data = json.loads((tmp_path / "alice.json").read_text(encoding="utf-8"))
+        assert result["conversations"] == 1205
+        assert data["metadata"]["total_conversations"] == 1205
+        assert data["conversations"][0]["user_message"] == "msg 0"
+        assert data["conversations"][-1]["user_message"] == "msg 1204"
+
+        result = exporter.export_to_sqlite("alice", str(tmp_path / "copy.db"))
+        assert result["conversations"] == 1205
+    finally:
+        db.close()
@@ -0,0 +1,163 @@
+"""Process-wide embedding service, micro-batched encode and the embedding cache."""
+
+import threading
+
+import pytest
+
+from mem_llm.embedding_service import (
+    EmbeddingCache,
+    EmbeddingService,
+    ServiceEmbeddingFunction,
+    get_embedding_cache,
+    get_embedding_service,
+)
+
+
+class FakeModel:
+    """Stands in for a SentenceTransformer: records every encode call."""
+
+    def __init__(self, delay=None):
+        self.calls = []
+        self.delay = delay
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        if self.delay is not None:
+            self.delay.wait(timeout=5)
+        self.calls.append(list(texts))
+        return [[float(len(text)), float(i)] for i, text in enumerate(texts)]
+
+
+@pytest.mark.unit
+def test_model_is_loaded_once_per_name():
+    loads = []
+
+    def loader(name):
+        loads.append(name)
+        return FakeModel()
+
+    first = get_embedding_service("test/shared-model", loader=loader)
+    second = get_embedding_service("test/shared-model", loader=loader)
+    first.load()
+    second.load()
+
+    assert first is second
+    assert loads == ["test/shared-model"]
+    assert get_embedding_service("test/other-model", loader=loader) is not first
+
+
+@pytest.mark.unit
+def test_encode_returns_one_vector_per_text():
+    service = EmbeddingService("fake", loader=lambda name: FakeModel())
+    try:
+        assert service.encode("abc") == [[3.0, 0.0]]
+        assert service.encode(["a", "bb"]) == [[1.0, 0.0], [2.0, 1.0]]
+        assert service.encode([]) == []
+    finally:
+        service.close()
+
+
+@pytest.mark.unit
+def test_concurrent_requests_are_batched_and_routed_back():
+    release = threading.Event()
+    model = FakeModel(delay=release)
+    service = EmbeddingService("fake", max_wait_ms=50, loader=lambda name: model)
+    results = {}
+
+    def worker(n):
+        results[n] = service.encode(["x" * n])
+
+    try:
+        # The first request holds the model; the rest queue up behind it
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 17)]
+        threads[0].start()
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join()
+    finally:
+        service.close()
+
+    assert {n: vectors[0][0] for n, vectors in results.items()} == {
+        n: float(n) for n in range(1, 17)
+    }
+    assert sum(len(call) for call in model.calls) == 16
+    assert len(model.calls) < 16
+
+
+@pytest.mark.unit
+def test_encode_errors_reach_the_caller():
+    def loader(name):
+        raise ImportError("sentence-transformers not installed")
+
+    service = EmbeddingService("missing", loader=loader)
+    try:
+        with pytest.raises(ImportError):
+            service.encode("hello")
+    finally:
+        service.close()
+
+
+@pytest.mark.unit
+def test_chroma_embedding_function_delegates_to_service():
+    service = EmbeddingService("fake", loader=lambda name: FakeModel())
+    try:
+        fn = ServiceEmbeddingFunction(service)
+        assert fn.name() == "fake"
+        assert fn(input=["ab"]) == [[2.0, 0.0]]
+        assert fn.embed_query("abc") == [[3.0, 0.0]]
+    finally:
+        service.close()
+
+
+@pytest.mark.unit
+def test_cached_texts_skip_the_model(tmp_path):
+    model = FakeModel()
+    service = EmbeddingService("fake", loader=lambda name: model)
+    cache = EmbeddingCache(str(tmp_path / "cache.db"))
+    try:
+        fn = ServiceEmbeddingFunction(service, cache)
+        first = fn(["refund policy", "shipping times", "refund policy"])
+        again = fn(["shipping times", "refund policy"])
+
+        assert model.calls == [["refund policy", "shipping times"]]
+        assert again == [first[1], first[0]]
+        assert cache.get_stats()["hits"] == 2
+        assert cache.get_stats()["misses"] == 3
+    finally:
+        service.close()
+        cache.close()
+
+
+@pytest.mark.unit
+def test_cache_survives_restart_and_is_keyed_by_model(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path)
+    cache.put_many("model-a", ["hello"], [[0.5, -1.25]])
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    try:
+        assert reopened.get_many("model-a", ["hello", "bye"]) == [[0.5, -1.25], None]
+        assert reopened.get_many("model-b", ["hello"]) == [None]
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_memory_lru_is_bounded():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+
+    assert cache.get_stats()["memory_entries"] == 2
+    assert cache.get_many("m", ["a", "c"]) == [None, [3.0]]
+
+
+@pytest.mark.unit
+def test_stores_sharing_a_directory_share_a_cache(tmp_path):
+    path = tmp_path / "vector_store" / "embedding_cache.db"
+    first = get_embedding_cache(str(path))
+    try:
+        assert get_embedding_cache(str(path)) is first
+    finally:
+        first.close()
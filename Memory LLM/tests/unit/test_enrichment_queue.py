@@ -0,0 +1,131 @@
+"""Background post-turn memory enrichment: EnrichmentQueue and MemAgent integration."""
+
+import json
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from mem_llm.enrichment import EnrichmentQueue
+
+
+@pytest.mark.unit
+def test_jobs_for_one_user_run_in_order():
+    pool = EnrichmentQueue(workers=4, max_pending=100)
+    seen = {}
+    lock = threading.Lock()
+
+    def record(user, n):
+        time.sleep(0.001)
+        with lock:
+            seen.setdefault(user, []).append(n)
+
+    for n in range(20):
+        for user in ("alice", "bob", "carol"):
+            pool.submit(user, record, user, n)
+
+    assert pool.drain(timeout=5)
+    assert seen == {user: list(range(20)) for user in ("alice", "bob", "carol")}
+    stats = pool.stats()
+    assert stats["processed"] == 60
+    assert stats["queue_depth"] == 0
+    pool.close()
+
+
+@pytest.mark.unit
+def test_full_queue_applies_backpressure():
+    pool = EnrichmentQueue(workers=1, max_pending=2)
+    release = threading.Event()
+
+    pool.submit("u", release.wait)  # occupies the worker
+    time.sleep(0.05)
+    pool.submit("u", lambda: None)
+    pool.submit("u", lambda: None)
+
+    with pytest.raises(queue.Full):
+        pool.submit("u", lambda: None, timeout=0.05)
+    stats = pool.stats()
+    assert stats["queue_depth"] == 3
+    assert stats["lag_ms"] >= 50
+
+    release.set()
+    assert pool.drain(timeout=5)
+    assert pool.stats()["failed"] == 1  # the rejected submit
+    pool.close()
+
+
+@pytest.mark.unit
+def test_close_drains_and_failures_are_counted():
+    pool = EnrichmentQueue(workers=2)
+    done = []
+
+    def boom():
+        raise RuntimeError("extraction failed")
+
+    pool.submit("a", boom)
+    for n in range(10):
+        pool.submit("b", lambda n=n: (time.sleep(0.005), done.append(n)))
+    pool.close()
+
+    assert done == list(range(10))
+    assert pool.stats()["failed"] == 1
+    pool.submit("b", done.append, "inline")  # after close jobs run inline
+    assert done[-1] == "inline"
+
+
+class SlowExtractionLLM:
+    """Fast chat replies, slow memory extraction calls."""
+
+    model = "stub"
+
+    def chat(self, messages, **kwargs):
+        if "return ONLY one JSON object" in messages[-1]["content"]:
+            time.sleep(0.3)
+            return json.dumps(
+                {
+                    "triplets": [["Ada", "lives_in", "Izmir"]],
+                    "category": "travel",
+                    "domain": "lifestyle",
+                    "profile": {"location": "Izmir"},
+                }
+            )
+        return "Noted!"
+
+
+@pytest.mark.unit
+def test_agent_returns_before_enrichment(tmp_path):
+    from mem_llm import MemAgent
+
+    agent = MemAgent(
+        use_sql=True,
+        db_path=os.path.join(tmp_path, "agent.db"),
+        check_connection=False,
+        enable_hierarchical_memory=True,
+        enable_graph_memory=True,
+        background_enrichment=True,
+    )
+    if not (agent.hierarchical_memory and agent.graph_store):
+        agent.close()
+        pytest.skip("advanced memory features unavailable")
+    agent.llm = agent.hierarchical_memory.categorizer.llm = SlowExtractionLLM()
+
+    start = time.perf_counter()
+    assert agent.chat("I live in Izmir", user_id="ada") == "Noted!"
+    assert time.perf_counter() - start < 0.25
+
+    # The raw turn is stored, enrichment is still queued
+    history = agent.memory.get_recent_conversations("ada", limit=5)
+    assert [turn["bot_response"] for turn in history] == ["Noted!"]
+    assert agent.get_enrichment_stats()["queue_depth"] == 1
+    graph = agent.graph_store.shard("ada").graph
+    assert not graph.has_edge("Ada", "Izmir")
+
+    agent.close()  # drains the queue
+
+    assert graph.has_edge("Ada", "Izmir")
+    assert "travel" in agent.hierarchical_memory.category_layer.categories["ada"]
+    stats = agent.get_enrichment_stats()
+    assert stats["processed"] == 1 and stats["queue_depth"] == 0
+    assert stats["avg_lag_ms"] >= 250
@@ -125,3 +125,77 @@ def test_extractor():
 
     assert len(triplets) == 1
     assert triplets[0] == ["Alice", "knows", "Bob"]
+
+
+def test_search_many_matches_ego_graph_neighbourhood(graph_store):
+    graph_store.add_triplet("Alice", "knows", "Bob")
+    graph_store.add_triplet("Carol", "knows", "Alice")
+    graph_store.add_triplet("Bob", "knows", "Carol")  # between two neighbours of Alice
+    graph_store.add_triplet("Bob", "lives_in", "Paris")
+    graph_store.add_triplet("Dave", "likes", "Tea")
+
+    results = graph_store.search_many(["Alice", "Tea", "Nobody"])
+
+    assert set(results["Alice"]) == {
+        ("Alice", "knows", "Bob"),
+        ("Carol", "knows", "Alice"),
+        ("Bob", "knows", "Carol"),
+    }
+    assert results["Tea"] == [("Dave", "likes", "Tea")]
+    assert results["Nobody"] == []
+    assert ("Bob", "lives_in", "Paris") in graph_store.search_many(["Alice"], depth=2)["Alice"]
+
+
+def test_search_many_reparses_changed_validity(graph_store):
+    graph_store.add_triplet("User", "works_at", "Acme", metadata={"valid_from": "2026-01-01"})
+    at = datetime(2026, 6, 1)
+    assert graph_store.search_many(["User"], at_time=at)["User"] == [("User", "works_at", "Acme")]
+
+    graph_store.close_triplet("User", "works_at", "Acme", valid_to=datetime(2026, 5, 1))
+
+    assert graph_store.search_many(["User"], at_time=at)["User"] == []
+    assert graph_store.search_at_time("User", datetime(2026, 2, 1)) == [
+        ("User", "works_at", "Acme")
+    ]
+
+
+def test_entity_names_are_resolved_to_one_node(graph_store):
+    graph_store.add_triplet("User", "lives_in", "Paris")
+    graph_store.add_triplet("the user", "likes", "Coffee")
+    graph_store.add_triplet("USER", "works_at", "Acme Corp.")
+
+    assert sorted(graph_store.graph.nodes) == ["Acme Corp.", "Coffee", "Paris", "User"]
+    assert len(graph_store.search("user")) == 3
+    assert graph_store.search_many(["the User"])["the User"] == graph_store.search_current("User")
+
+
+def test_resolve_uses_the_word_index(graph_store):
+    graph_store.add_triplet("User", "lives_in", "New York")
+    graph_store.add_alias("NYC", "New York")
+
+    assert graph_store.resolve("Is it cold in york today?") == ["New York"]
+    assert graph_store.resolve(["nyc", "user", "unknown"]) == ["New York", "User"]
+    assert graph_store.search("nyc") == [("User", "lives_in", "New York")]
+
+
+def test_aliases_survive_save_and_load(tmp_path):
+    path = str(tmp_path / "graph.json")
+    store = GraphStore(path)
+    store.add_triplet("Istanbul", "located_in", "Turkey")
+    store.add_alias("Constantinople", "Istanbul")
+    store.save()
+
+    reloaded = GraphStore(path)
+    assert reloaded.search("constantinople") == [("Istanbul", "located_in", "Turkey")]
+
+
+def test_embedding_merge_folds_near_duplicates():
+    pytest.importorskip("numpy")
+    vectors = {"user": [1.0, 0.0], "person": [0.95, 0.05], "paris": [0.0, 1.0]}
+    store = GraphStore(embedding_function=lambda texts: [vectors[t] for t in texts])
+
+    store.add_triplet("User", "lives_in", "Paris")
+    store.add_triplet("The Person", "likes", "Paris")
+
+    assert sorted(store.graph.nodes) == ["Paris", "User"]
+    assert store.resolve("person") == ["User"]
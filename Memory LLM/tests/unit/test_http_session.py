@@ -0,0 +1,74 @@
+"""Connection-pooled HTTP sessions shared per backend URL."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mem_llm.base_llm_client import get_http_session
+from mem_llm.clients import LMStudioClient, OllamaClient, OpenAICompatibleClient
+from mem_llm.llm_client import OllamaClient as LegacyOllamaClient
+
+
+@pytest.fixture
+def stub_server():
+    peers = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = -1
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            peers.append(self.client_address[1])
+            body = json.dumps({"message": {"content": "pong"}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", peers
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+def test_clients_share_one_session_per_base_url():
+    first = OllamaClient(base_url="http://127.0.0.1:19001")
+    second = OllamaClient(base_url="http://127.0.0.1:19001/")
+    legacy = LegacyOllamaClient(base_url="http://127.0.0.1:19001")
+    other = LMStudioClient(base_url="http://127.0.0.1:19002")
+
+    assert first.session is second.session is legacy.session
+    assert other.session is not first.session
+    assert OpenAICompatibleClient(base_url="http://127.0.0.1:19002").session is other.session
+
+
+@pytest.mark.unit
+def test_pool_size_and_retries_are_configurable():
+    session = get_http_session("http://127.0.0.1:19003", pool_size=4, connect_retries=5)
+    adapter = session.get_adapter("http://127.0.0.1:19003/api/chat")
+
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.connect == 5
+    assert adapter.max_retries.read == 0
+
+
+@pytest.mark.unit
+def test_requests_reuse_the_connection(stub_server):
+    base_url, peers = stub_server
+    client = OllamaClient(model="test", base_url=base_url, timeout=5)
+
+    for _ in range(20):
+        assert client.chat([{"role": "user", "content": "ping"}]) == "pong"
+
+    assert len(peers) == 20
+    assert len(set(peers)) == 1
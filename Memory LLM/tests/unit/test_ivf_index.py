@@ -0,0 +1,153 @@
+"""IVF approximate nearest-neighbour index behind NumpyVectorStore."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mem_llm.vector_store import NumpyVectorStore  # noqa: E402
+
+DIM = 16
+
+
+def clustered_vectors(n, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, DIM))
+    labels = rng.integers(0, clusters, size=n)
+    return (centers[labels] + 0.3 * rng.normal(size=(n, DIM))).astype(np.float32)
+
+
+def docs(start, count):
+    return [
+        {"id": str(i), "text": f"doc {i}", "metadata": {"group": i % 2}}
+        for i in range(start, start + count)
+    ]
+
+
+def make_store(path=None, **kwargs):
+    store = NumpyVectorStore(
+        persist_directory=path,
+        embedding_function=lambda texts: [],
+        index="ivf",
+        nlist=32,
+        nprobe=8,
+        **kwargs,
+    )
+    store.IVF_MIN_ROWS = 500
+    return store
+
+
+def ids(results):
+    return [r["id"] for r in results]
+
+
+@pytest.mark.unit
+def test_small_collections_use_exact_search():
+    store = make_store()
+    store.add_embeddings(docs(0, 100), clustered_vectors(100))
+    assert store.get_stats()["ivf"]["trained"] is False
+
+
+@pytest.mark.unit
+def test_recall_against_exact_search():
+    vectors = clustered_vectors(3000)
+    store = make_store()
+    store.add_embeddings(docs(0, 3000), vectors)
+    assert store.wait_for_index(timeout=30)
+    assert store.get_stats()["ivf"]["trained"] is True
+
+    queries = clustered_vectors(50, seed=1)
+    hits = 0
+    for query in queries:
+        approx = set(ids(store.search_by_vector(query, limit=10)))
+        exact = set(ids(store.search_by_vector(query, limit=10, nprobe=32)))
+        hits += len(approx & exact)
+    assert hits / (50 * 10) >= 0.9
+
+
+@pytest.mark.unit
+def test_inserts_after_training_are_searchable_and_deletes_are_skipped():
+    store = make_store()
+    store.add_embeddings(docs(0, 1000), clustered_vectors(1000))
+    store.wait_for_index(timeout=30)
+
+    new = clustered_vectors(1, seed=7)
+    store.add_embeddings([{"id": "new", "text": "new", "metadata": {"group": 0}}], new)
+    assert ids(store.search_by_vector(new[0], limit=1)) == ["new"]
+
+    store.delete_documents(["new"])
+    assert "new" not in ids(store.search_by_vector(new[0], limit=5))
+    assert store.get_stats()["ivf"]["changes_since_training"] == 2
+
+
+@pytest.mark.unit
+def test_filtered_search_through_the_index():
+    vectors = clustered_vectors(2000)
+    store = make_store()
+    store.add_embeddings(docs(0, 2000), vectors)
+    store.wait_for_index(timeout=30)
+
+    results = store.search_by_vector(vectors[11], limit=5, filter_metadata={"group": 1})
+    assert results[0]["id"] == "11"
+    assert all(r["metadata"]["group"] == 1 for r in results)
+
+
+@pytest.mark.unit
+def test_index_is_retrained_after_many_changes():
+    store = make_store()
+    store.add_embeddings(docs(0, 1000), clustered_vectors(1000))
+    store.wait_for_index(timeout=30)
+    store.add_embeddings(docs(1000, 600), clustered_vectors(600, seed=2))
+    store.wait_for_index(timeout=30)
+
+    stats = store.get_stats()["ivf"]
+    assert stats["changes_since_training"] == 0
+
+
+@pytest.mark.unit
+def test_index_persists_next_to_the_vectors(tmp_path):
+    vectors = clustered_vectors(1500)
+    store = make_store(str(tmp_path))
+    store.add_embeddings(docs(0, 1500), vectors)
+    store.wait_for_index(timeout=30)
+    expected = ids(store.search_by_vector(vectors[3], limit=5))
+
+    reopened = make_store(str(tmp_path))
+
+    assert (tmp_path / "knowledge_base.ivf.npz").exists()
+    assert reopened.get_stats()["ivf"]["trained"] is True
+    assert ids(reopened.search_by_vector(vectors[3], limit=5)) == expected
+
+
+@pytest.mark.unit
+def test_writes_and_searches_are_not_blocked_by_training(monkeypatch):
+    import threading
+
+    from mem_llm.vector_store import IVFIndex
+
+    store = make_store()
+    store.add_embeddings(docs(0, 1000), clustered_vectors(1000))
+    store.wait_for_index(timeout=30)
+
+    training, release = threading.Event(), threading.Event()
+    fit = IVFIndex.fit
+
+    def slow_fit(self, *args):
+        training.set()
+        release.wait(30)
+        return fit(self, *args)
+
+    monkeypatch.setattr(IVFIndex, "fit", slow_fit)
+    store.add_embeddings(docs(1000, 600), clustered_vectors(600, seed=2))  # due for retraining
+    assert training.wait(30)
+
+    # k-means is running: the store still takes writes and answers queries
+    new = clustered_vectors(1, seed=9)
+    store.add_embeddings([{"id": "during", "text": "x", "metadata": {"group": 0}}], new)
+    store.delete_documents(["5"])
+    assert ids(store.search_by_vector(new[0], limit=1)) == ["during"]
+
+    release.set()
+    assert store.wait_for_index(timeout=30)
+    assert ids(store.search_by_vector(new[0], limit=1)) == ["during"]
+    assert "5" not in ids(store.search_by_vector(clustered_vectors(1000)[5], limit=5))
+    assert store.get_stats()["ivf"]["changes_since_training"] == 2
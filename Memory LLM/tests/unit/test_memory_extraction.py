@@ -0,0 +1,105 @@
+"""Combined post-turn memory extraction: one LLM call for graph, category and profile."""
+
+import json
+import os
+
+import pytest
+
+from mem_llm.memory.extraction import MemoryExtractor, TurnExtraction
+
+EXTRACTION = {
+    "triplets": [
+        ["Ada", "lives_in", "Izmir"],
+        {"source": "Ada", "relation": "likes", "target": "tea"},
+    ],
+    "category": "Travel Planning",
+    "domain": "lifestyle",
+    "profile": {"Favorite Food": "pizza", "age": 36, "empty": " "},
+}
+
+
+class CountingLLM:
+    """Answers chat turns and extraction prompts, counting every call."""
+
+    model = "stub"
+
+    def __init__(self):
+        self.calls = []
+
+    def chat(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.calls.append(prompt)
+        if "return ONLY one JSON object" in prompt:
+            return "Sure:\n```json\n" + json.dumps(EXTRACTION) + "\n```"
+        if "Categorize" in prompt or "category" in prompt.lower():
+            return '{"category": "travel_planning", "domain": "lifestyle"}'
+        if "triplet" in prompt.lower():
+            return '[["Ada", "lives_in", "Izmir"]]'
+        return "Noted!"
+
+
+@pytest.mark.unit
+def test_parse_normalizes_the_document():
+    result = MemoryExtractor(None).parse(json.dumps(EXTRACTION))
+
+    assert result.triplets == [("Ada", "lives_in", "Izmir"), ("Ada", "likes", "tea")]
+    assert (result.category, result.domain) == ("travel_planning", "lifestyle")
+    assert result.profile == {"favorite_food": "pizza", "age": "36"}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "response",
+    ["", "no json here", "{broken", '{"triplets": "nope", "category": null, "profile": []}'],
+)
+def test_parse_falls_back_to_defaults(response):
+    assert MemoryExtractor(None).parse(response) == TurnExtraction()
+
+
+@pytest.mark.unit
+def test_extract_returns_defaults_when_the_llm_fails():
+    class Broken:
+        def chat(self, messages, **kwargs):
+            raise ConnectionError("backend down")
+
+    assert MemoryExtractor(Broken()).extract("hi", "hello") == TurnExtraction()
+
+
+@pytest.fixture
+def agent(tmp_path):
+    from mem_llm import MemAgent
+
+    agent = MemAgent(
+        use_sql=True,
+        db_path=os.path.join(tmp_path, "agent.db"),
+        check_connection=False,
+        enable_hierarchical_memory=True,
+        enable_graph_memory=True,
+    )
+    if not (agent.hierarchical_memory and agent.graph_store):
+        agent.close()
+        pytest.skip("advanced memory features unavailable")
+    agent.llm = agent.hierarchical_memory.categorizer.llm = CountingLLM()
+    yield agent
+    agent.close()
+
+
+@pytest.mark.unit
+def test_turn_makes_one_extraction_call(agent):
+    assert agent.chat("I live in Izmir and love pizza", user_id="ada") == "Noted!"
+
+    assert len(agent.llm.calls) == 2  # chat + combined extraction
+    assert agent.graph_store.shard("ada").graph.has_edge("Ada", "Izmir")
+    assert "travel_planning" in agent.hierarchical_memory.category_layer.categories["ada"]
+    preferences = json.loads(agent.memory.get_user_profile("ada")["preferences"])
+    assert preferences["favorite_food"] == "pizza"
+
+
+@pytest.mark.unit
+def test_separate_extraction_can_be_restored(agent):
+    agent.combined_extraction = False
+
+    agent.chat("I live in Izmir", user_id="ada")
+
+    assert len(agent.llm.calls) == 3  # chat + graph extractor + categorizer
+    assert agent.graph_store.shard("ada").graph.has_edge("Ada", "Izmir")
@@ -38,3 +38,28 @@ def test_memory_router_build_context_includes_core_archival_and_recall(tmp_path)
     assert "CORE MEMORY" in context["text"]
     assert "ARCHIVAL MEMORY" in context["text"]
     assert "RELEVANT CONVERSATION RECALL" in context["text"]
+
+
+def test_memory_router_graph_context_uses_one_batched_search(tmp_path):
+    from mem_llm.memory.graph import GraphStore
+
+    graph = GraphStore()
+    graph.add_triplet("User", "lives_in", "Istanbul", metadata={"valid_from": "2026-01-01"})
+    graph.add_triplet(
+        "User", "lives_in", "Ankara", metadata={"valid_from": "2026-03-01", "supersedes": True}
+    )
+    calls = []
+    search_many = graph.search_many
+
+    def counting_search_many(entities, **kwargs):
+        calls.append(entities)
+        return search_many(entities, **kwargs)
+
+    graph.search_many = counting_search_many
+    router = MemoryRouter(MemoryManager(str(tmp_path)), graph_store=graph)
+
+    context = router.build_context("alice", "Where does the User live now?")
+
+    assert len(calls) == 1
+    assert "User --lives_in--> Ankara" in context["text"]
+    assert "Istanbul" not in context["text"]
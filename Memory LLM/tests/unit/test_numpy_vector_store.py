@@ -0,0 +1,144 @@
+"""Built-in NumPy vector store: top-k search, filters, deletes and persistence."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mem_llm.vector_store import NumpyVectorStore, create_vector_store  # noqa: E402
+
+VOCAB = ["refund", "shipping", "password", "invoice", "warranty", "delivery"]
+
+
+def bag_of_words(texts):
+    """Deterministic toy embedding: one dimension per vocabulary word."""
+    return [[float(text.lower().count(word)) for word in VOCAB] for text in texts]
+
+
+def make_docs():
+    return [
+        {"id": "1", "text": "refund refund policy", "metadata": {"category": "billing"}},
+        {"id": "2", "text": "shipping and delivery times", "metadata": {"category": "orders"}},
+        {"id": "3", "text": "reset your password", "metadata": {"category": "account"}},
+        {"id": "4", "text": "refund for late delivery", "metadata": {"category": "orders"}},
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=bag_of_words)
+    s.add_documents(make_docs())
+    return s
+
+
+@pytest.mark.unit
+def test_search_ranks_by_cosine_similarity(store):
+    results = store.search("refund", limit=2)
+
+    assert [r["id"] for r in results] == ["1", "4"]
+    assert results[0]["score"] == pytest.approx(1.0)
+    assert results[0]["metadata"]["category"] == "billing"
+
+
+@pytest.mark.unit
+def test_metadata_filter(store):
+    results = store.search("refund", limit=5, filter_metadata={"category": "orders"})
+    assert [r["id"] for r in results] == ["4", "2"]
+
+    store.add_documents(
+        [{"id": "5", "text": "refund refund shipping", "metadata": {"category": "orders"}}]
+    )
+    results = store.search("refund", limit=5, filter_metadata={"category": "orders"})
+    assert [r["id"] for r in results][:2] == ["5", "4"]
+    assert store.search("refund", filter_metadata={"category": "missing"}) == []
+
+
+@pytest.mark.unit
+def test_delete_and_replace(store):
+    store.delete_documents(["1"])
+    assert [r["id"] for r in store.search("refund", limit=1)] == ["4"]
+
+    store.add_documents([{"id": "4", "text": "password refund", "metadata": {"category": "x"}}])
+    assert store.get_stats()["total_documents"] == 3
+    assert [r["id"] for r in store.search("password", limit=2)] == ["3", "4"]
+    assert store.search("refund", filter_metadata={"category": "orders"})[0]["id"] == "2"
+
+
+@pytest.mark.unit
+def test_reopened_store_sees_adds_and_deletes(store, tmp_path):
+    store.delete_documents(["3"])
+
+    reopened = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=bag_of_words)
+
+    assert reopened.get_stats()["total_documents"] == 3
+    assert [r["id"] for r in reopened.search("refund", limit=2)] == ["1", "4"]
+    assert reopened.search("password", limit=5, filter_metadata={"category": "account"}) == []
+
+
+@pytest.mark.unit
+def test_replaced_rows_drop_their_text(store):
+    store.add_documents([{"id": "1", "text": "invoice", "metadata": {"category": "billing"}}])
+    assert store._texts.count("invoice") == 1
+    assert "refund refund policy" not in store._texts
+
+
+@pytest.mark.unit
+def test_dead_rows_are_compacted_away(store, tmp_path):
+    store.COMPACT_MIN_ROWS = 3
+    for i in range(3):
+        store.add_documents([{"id": "2", "text": f"shipping {i}", "metadata": {}}])
+    assert store.get_stats()["dead_rows"] == 3
+    log_lines = len((tmp_path / "knowledge_base.jsonl").read_text().splitlines())
+
+    store.delete_documents(["3"])  # 4 of 7 rows dead
+
+    stats = store.get_stats()
+    assert stats["dead_rows"] == 0 and stats["total_documents"] == 3
+    assert len((tmp_path / "knowledge_base.jsonl").read_text().splitlines()) == 3 < log_lines
+    assert [r["id"] for r in store.search("refund", limit=2)] == ["1", "4"]
+    assert store.search("shipping", limit=1)[0]["text"] == "shipping 2"
+
+    reopened = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=bag_of_words)
+    assert [r["id"] for r in reopened.search("refund", limit=2)] == ["1", "4"]
+    assert reopened.search("refund", filter_metadata={"category": "orders"})[0]["id"] == "4"
+
+
+@pytest.mark.unit
+def test_interrupted_compaction_is_finished_on_open(store, tmp_path, monkeypatch):
+    store.delete_documents(["1", "3"])
+
+    def crash():
+        raise OSError("power cut")
+
+    monkeypatch.setattr(store, "_finish_compaction", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    assert (tmp_path / "knowledge_base.jsonl.compact").exists()
+
+    reopened = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=bag_of_words)
+    assert not (tmp_path / "knowledge_base.jsonl.compact").exists()
+    assert reopened.get_stats()["dead_rows"] == 0
+    assert [r["id"] for r in reopened.search("refund", limit=5)] == ["4", "2"]
+
+
+@pytest.mark.unit
+def test_grows_past_initial_capacity(tmp_path):
+    store = NumpyVectorStore(persist_directory=str(tmp_path), embedding_function=bag_of_words)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(NumpyVectorStore.INITIAL_CAPACITY + 10, len(VOCAB)))
+    docs = [{"id": str(i), "text": f"doc {i}", "metadata": {}} for i in range(len(vectors))]
+
+    store.add_embeddings(docs[:500], vectors[:500])
+    store.add_embeddings(docs[500:], vectors[500:])
+
+    target = vectors[1030]
+    assert store.search_by_vector(target, limit=1)[0]["id"] == "1030"
+    assert store.get_stats()["capacity"] >= len(vectors)
+
+
+@pytest.mark.unit
+def test_factory_builds_numpy_store(tmp_path):
+    store = create_vector_store(
+        "numpy", persist_directory=str(tmp_path), embedding_function=bag_of_words
+    )
+    assert isinstance(store, NumpyVectorStore)
+    assert store.get_stats()["backend"] == "numpy"
@@ -0,0 +1,191 @@
+"""Append-only segmented JSON memory backend tests."""
+
+import json
+
+import pytest
+
+from mem_llm.memory_manager import MemoryManager
+from mem_llm.segmented_memory import SegmentedMemoryManager
+
+
+def _fill(memory, user_id, count, start=0):
+    for i in range(start, start + count):
+        memory.add_interaction(user_id, f"question {i}", f"answer {i}")
+
+
+@pytest.mark.unit
+def test_interactions_are_appended_not_rewritten(tmp_path):
+    memory = SegmentedMemoryManager(str(tmp_path), segment_max_records=100)
+    _fill(memory, "alice", 3)
+
+    segment = tmp_path / "alice" / "seg-000001.jsonl"
+    lines = segment.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[-1])["user_message"] == "question 2"
+    assert not (tmp_path / "alice.json").exists(), "whole-file JSON should not be written"
+
+
+@pytest.mark.unit
+def test_recent_conversations_survive_reopen_and_read_only_the_tail(tmp_path):
+    memory = SegmentedMemoryManager(str(tmp_path), segment_max_records=10, cache_size=5)
+    _fill(memory, "alice", 37)
+    memory.close()
+
+    reopened = SegmentedMemoryManager(str(tmp_path), segment_max_records=10, cache_size=5)
+    data = reopened.load_memory("alice")
+
+    assert [c["user_message"] for c in data["conversations"]] == [
+        f"question {i}" for i in range(32, 37)
+    ]
+    # Asking for more than the cache reads further back through older segments.
+    recent = reopened.get_recent_conversations("alice", limit=15)
+    assert [c["user_message"] for c in recent] == [f"question {i}" for i in range(22, 37)]
+    assert reopened.count_conversations("alice") == 37
+
+
+@pytest.mark.unit
+def test_compaction_merges_sealed_segments_without_losing_records(tmp_path):
+    memory = SegmentedMemoryManager(
+        str(tmp_path),
+        segment_max_records=5,
+        compact_after_segments=4,
+        background_compaction=False,
+    )
+    _fill(memory, "alice", 42)
+
+    manifest = json.loads((tmp_path / "alice" / "manifest.json").read_text(encoding="utf-8"))
+    assert len(manifest["segments"]) < 4
+    on_disk = {p.name for p in (tmp_path / "alice").glob("*.jsonl")}
+    assert on_disk == {s["file"] for s in manifest["segments"]} | {manifest["active"]}
+
+    messages = [r["user_message"] for r in memory.iter_records("alice")]
+    assert messages == [f"question {i}" for i in range(42)]
+    assert memory.count_conversations("alice") == 42
+
+
+@pytest.mark.unit
+def test_background_compaction_is_drained_on_close(tmp_path):
+    memory = SegmentedMemoryManager(str(tmp_path), segment_max_records=2, compact_after_segments=3)
+    _fill(memory, "alice", 20)
+    memory.close()
+
+    reopened = SegmentedMemoryManager(str(tmp_path))
+    assert [r["user_message"] for r in reopened.iter_records("alice")] == [
+        f"question {i}" for i in range(20)
+    ]
+
+
+@pytest.mark.unit
+def test_torn_final_record_is_dropped_on_open(tmp_path):
+    memory = SegmentedMemoryManager(str(tmp_path))
+    _fill(memory, "alice", 2)
+    with open(tmp_path / "alice" / "seg-000001.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"user_message": "half')
+
+    reopened = SegmentedMemoryManager(str(tmp_path))
+    assert reopened.count_conversations("alice") == 2
+    reopened.add_interaction("alice", "after crash", "ok")
+    assert reopened.get_recent_conversations("alice", limit=1)[0]["user_message"] == "after crash"
+
+
+@pytest.mark.unit
+def test_profile_lives_in_sidecar(tmp_path):
+    memory = SegmentedMemoryManager(str(tmp_path))
+    memory.add_interaction("alice", "hi", "hello")
+    memory.update_profile("alice", {"name": "Alice"})
+
+    reopened = SegmentedMemoryManager(str(tmp_path))
+    assert reopened.get_user_profile("alice")["name"] == "Alice"
+    assert reopened.get_recent_conversations("alice")[0]["user_message"] == "hi"
+
+
+@pytest.mark.unit
+def test_legacy_whole_file_memory_is_migrated(tmp_path):
+    legacy = MemoryManager(str(tmp_path))
+    _fill(legacy, "bob", 4)
+    legacy.update_profile("bob", {"name": "Bob"})
+
+    memory = SegmentedMemoryManager(str(tmp_path))
+    data = memory.load_memory("bob")
+
+    assert data["profile"]["name"] == "Bob"
+    assert [c["user_message"] for c in data["conversations"]] == [f"question {i}" for i in range(4)]
+    assert memory.search_conversations("bob", "question 3")[0]["bot_response"] == "answer 3"
+    assert not (tmp_path / "bob.json").exists()
+    assert (tmp_path / "bob.json.migrated").exists()
+
+
+@pytest.mark.unit
+def test_interrupted_migration_is_redone_on_next_open(tmp_path, monkeypatch):
+    legacy = MemoryManager(str(tmp_path))
+    _fill(legacy, "bob", 7)
+
+    def crash(self, user_id):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(SegmentedMemoryManager, "_save_manifest", crash)
+    with pytest.raises(OSError):
+        SegmentedMemoryManager(str(tmp_path), segment_max_records=3).load_memory("bob")
+    monkeypatch.undo()
+
+    assert (tmp_path / "bob.json").exists()
+    assert not (tmp_path / "bob" / "manifest.json").exists()
+
+    memory = SegmentedMemoryManager(str(tmp_path), segment_max_records=3)
+    assert memory.count_conversations("bob") == 7
+    assert [c["user_message"] for c in memory.get_recent_conversations("bob", 7)] == [
+        f"question {i}" for i in range(7)
+    ]
+    assert (tmp_path / "bob.json.migrated").exists()
+
+
+@pytest.mark.unit
+def test_corrupt_legacy_file_is_quarantined(tmp_path, caplog):
+    (tmp_path / "bob.json").write_text('{"conversations": [', encoding="utf-8")
+
+    memory = SegmentedMemoryManager(str(tmp_path))
+    with caplog.at_level("ERROR", logger="mem_llm.segmented_memory"):
+        assert memory.load_memory("bob")["conversations"] == []
+
+    assert "bob.json.corrupt" in caplog.text
+    assert not (tmp_path / "bob.json").exists()
+    assert (tmp_path / "bob.json.corrupt").read_text(encoding="utf-8") == '{"conversations": ['
+
+
+@pytest.mark.unit
+def test_unreadable_legacy_file_leaves_no_manifest(tmp_path, monkeypatch):
+    legacy = MemoryManager(str(tmp_path))
+    _fill(legacy, "bob", 2)
+
+    def unreadable(self, user_id):
+        raise PermissionError("denied")
+
+    memory = SegmentedMemoryManager(str(tmp_path))
+    monkeypatch.setattr(SegmentedMemoryManager, "_migrate_legacy_file", unreadable)
+    with pytest.raises(PermissionError):
+        memory.load_memory("bob")
+    monkeypatch.undo()
+
+    assert not (tmp_path / "bob" / "manifest.json").exists()
+    assert memory.count_conversations("bob") == 2
+
+
+@pytest.mark.unit
+def test_clear_memory_and_statistics(tmp_path):
+    memory = SegmentedMemoryManager(str(tmp_path), segment_max_records=3)
+    _fill(memory, "alice", 7)
+    _fill(memory, "bob", 2)
+
+    stats = memory.get_statistics()
+    assert stats["total_users"] == 2
+    assert stats["total_interactions"] == 9
+
+    memory.clear_memory("alice")
+    assert not (tmp_path / "alice").exists()
+    assert memory.count_conversations("alice") == 0
+    assert not (tmp_path / "alice").exists(), "counting must not recreate the user"
+    assert memory.get_statistics() == {
+        "total_users": 1,
+        "total_interactions": 2,
+        "knowledge_base_entries": 0,
+    }
@@ -0,0 +1,130 @@
+"""Per-user knowledge graph shards."""
+
+import pytest
+
+from mem_llm.memory.graph import ShardedGraphStore, SQLiteGraphStore
+from mem_llm.memory.graph.sharded_store import SPLIT_MARKER
+from mem_llm.memory_manager import MemoryManager
+from mem_llm.memory_router import MemoryRouter
+
+
+@pytest.mark.unit
+def test_users_get_isolated_graphs(tmp_path):
+    store = ShardedGraphStore(str(tmp_path / "shards"))
+    try:
+        store.shard("ada").add_triplet("User", "lives_in", "Izmir")
+        store.shard("bob").add_triplet("User", "lives_in", "Oslo")
+
+        assert store.shard("ada").search("User") == [("User", "lives_in", "Izmir")]
+        store.clear("bob")
+        assert store.shard("bob").search("User") == []
+        assert store.shard("ada").search("User") == [("User", "lives_in", "Izmir")]
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_evicted_shards_are_saved_and_reopened(tmp_path, backend):
+    store = ShardedGraphStore(str(tmp_path / "shards"), backend=backend, max_open_shards=2)
+    try:
+        for user in ("u1", "u2", "u3"):
+            store.shard(user).add_triplet(user, "likes", "Tea")
+        assert store.open_shards() == ["u2", "u3"]
+        assert store.get_stats()["evictions"] == 1
+
+        assert store.shard("u1").search("u1") == [("u1", "likes", "Tea")]
+        assert store.open_shards() == ["u3", "u1"]
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_a_shard_is_never_open_twice(tmp_path):
+    store = ShardedGraphStore(str(tmp_path / "shards"), max_open_shards=1)
+    try:
+        with store.use("ada") as ada:
+            store.shard("bob")
+            assert store.open_shards() == ["ada", "bob"], "pinned shards are not evicted"
+            ada.add_triplet("Ada", "likes", "Tea")
+        assert store.open_shards() == ["bob"]
+
+        # Evicted while still held elsewhere: the same instance comes back
+        held = store.shard("carol")
+        store.shard("bob")
+        assert store.shard("carol") is held
+        assert store.shard("ada").search("Ada") == [("Ada", "likes", "Tea")]
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_user_ids_map_to_distinct_files(tmp_path):
+    store = ShardedGraphStore(str(tmp_path / "shards"))
+    assert store.shard_path("a/b") != store.shard_path("a_b")
+    assert store.shard_path("../x").startswith(str(tmp_path / "shards"))
+
+
+@pytest.mark.unit
+def test_legacy_graph_is_split_by_user(tmp_path):
+    legacy = SQLiteGraphStore(str(tmp_path / "graph.db"))
+    legacy.add_triplet("User", "lives_in", "Izmir", metadata={"user_id": "ada"})
+    legacy.add_triplet("User", "likes", "Skiing", metadata={"user_id": "bob"})
+    legacy.close()
+
+    store = ShardedGraphStore(str(tmp_path / "shards"), legacy_path=str(tmp_path / "graph.db"))
+    try:
+        assert store.shard("ada").search("User") == [("User", "lives_in", "Izmir")]
+        assert store.shard("bob").search("User") == [("User", "likes", "Skiing")]
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_interrupted_legacy_split_is_redone(tmp_path, monkeypatch):
+    legacy = SQLiteGraphStore(str(tmp_path / "graph.db"))
+    legacy.add_triplet("User", "lives_in", "Izmir", metadata={"user_id": "ada"})
+    legacy.close()
+    shards = tmp_path / "shards"
+
+    def crash(self):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ShardedGraphStore, "save", crash)
+        with pytest.raises(OSError):
+            ShardedGraphStore(str(shards), legacy_path=str(tmp_path / "graph.db"))
+    assert shards.is_dir() and not (shards / SPLIT_MARKER).exists()
+
+    store = ShardedGraphStore(str(shards), legacy_path=str(tmp_path / "graph.db"))
+    try:
+        assert store.shard("ada").search("User") == [("User", "lives_in", "Izmir")]
+        assert (shards / SPLIT_MARKER).exists()
+    finally:
+        store.close()
+
+    # Done once: later starts leave the shards alone
+    store = ShardedGraphStore(str(shards), legacy_path=str(tmp_path / "graph.db"))
+    try:
+        store.shard("ada").add_triplet("Ada", "likes", "Tea")
+        store.save()
+    finally:
+        store.close()
+    store = ShardedGraphStore(str(shards), legacy_path=str(tmp_path / "graph.db"))
+    try:
+        assert store.shard("ada").search("Ada") == [("Ada", "likes", "Tea")]
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_router_searches_only_the_callers_graph(tmp_path):
+    store = ShardedGraphStore(str(tmp_path / "shards"))
+    store.shard("ada").add_triplet("Ada", "lives_in", "Izmir")
+    store.shard("bob").add_triplet("Bob", "lives_in", "Oslo")
+    router = MemoryRouter(MemoryManager(str(tmp_path / "memories")), graph_store=store)
+    try:
+        assert router._search_graph("Where does Ada live?", "ada") == [("Ada", "lives_in", "Izmir")]
+        assert router._search_graph("Where does Ada live?", "bob") == []
+    finally:
+        store.close()
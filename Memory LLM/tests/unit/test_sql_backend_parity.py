@@ -0,0 +1,124 @@
+"""Parity tests: every SQL memory configuration must behave identically."""
+
+import json
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from mem_llm.memory_db import SQLMemoryManager
+from mem_llm.thread_safe_db import ThreadSafeSQLMemory
+
+BACKENDS = {
+    "locked-connection": lambda path: SQLMemoryManager(path, read_pool_size=0),
+    "read-pool": lambda path: SQLMemoryManager(path),
+    "write-behind": lambda path: SQLMemoryManager(path, write_behind=True),
+    "thread-safe": lambda path: ThreadSafeSQLMemory(path, pool_size=3),
+}
+
+
+def _exercise(db):
+    """Run one scripted workload and return everything observable about it."""
+    db.add_user("alice", name="Alice", metadata={"tier": "gold"})
+    for i in range(5):
+        db.add_interaction("alice", f"order {i} is late", f"order {i} ships today", {"n": i})
+    db.add_interaction("bob", "reset my password", "use the reset link", resolved=True)
+    db.update_user_profile(
+        "alice", {"summary": "asks about orders", "preferences": {"tone": "brief"}}
+    )
+    db.add_knowledge("shipping", "When will my order ship?", "Orders ship in 2 days.", ["ship"])
+    db.add_knowledge("account", "How do I reset my password?", "Use the reset link.", ["password"])
+
+    def strip(rows):
+        return [{k: v for k, v in row.items() if k != "timestamp"} for row in rows]
+
+    profile = db.get_user_profile("alice")
+    observed = {
+        "recent": strip(db.get_recent_conversations("alice", limit=3)),
+        "search": strip(db.search_conversations("alice", "order 3")),
+        "profile": {k: profile[k] for k in ("name", "preferences", "summary", "metadata")},
+        "kb_bm25": [r["question"] for r in db.search_knowledge("password reset")],
+        "kb_category": [r["question"] for r in db.search_knowledge("order", category="shipping")],
+        "stats_before": db.get_statistics(),
+    }
+    db.clear_memory("alice")
+    observed["stats_after"] = db.get_statistics()
+    observed["recent_after"] = db.get_recent_conversations("alice")
+    return observed
+
+
+@pytest.fixture(scope="module")
+def reference(tmp_path_factory):
+    db = BACKENDS["locked-connection"](str(tmp_path_factory.mktemp("ref") / "ref.db"))
+    try:
+        return _exercise(db)
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_backends_return_identical_results(backend, reference, tmp_path):
+    db = BACKENDS[backend](str(tmp_path / "parity.db"))
+    try:
+        assert _exercise(db) == reference
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_reference_workload_is_meaningful(reference):
+    assert [r["user_message"] for r in reference["recent"]] == [
+        "order 4 is late",
+        "order 3 is late",
+        "order 2 is late",
+    ]
+    assert reference["profile"]["name"] == "Alice"
+    assert json.loads(reference["profile"]["metadata"]) == {"tier": "gold"}
+    assert reference["kb_bm25"][0] == "How do I reset my password?"
+    assert reference["stats_before"]["total_interactions"] == 6
+    assert reference["stats_after"]["total_interactions"] == 1
+    assert reference["recent_after"] == []
+
+
+@pytest.mark.unit
+def test_thread_safe_memory_keeps_its_pool_attribute(tmp_path):
+    db = ThreadSafeSQLMemory(str(tmp_path / "compat.db"), pool_size=2)
+    try:
+        assert db.pool is db._read_pool
+        assert db.pool.pool_size == 2
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_sql_agent_serves_users_from_many_threads(tmp_path):
+    from mem_llm import MemAgent
+
+    agent = MemAgent(
+        use_sql=True, memory_dir=os.path.join(tmp_path, "agent.db"), check_connection=False
+    )
+    agent.llm = MagicMock()
+    agent.llm.chat.side_effect = lambda messages, **kwargs: "echo " + messages[-1]["content"]
+    errors = []
+
+    def user_session(n):
+        try:
+            for i in range(10):
+                reply = agent.chat(f"msg {n}-{i}", user_id=f"user{n}")
+                assert reply == f"echo msg {n}-{i}"
+        except Exception as e:  # surfaced below; asserts in threads are lost
+            errors.append(e)
+
+    threads = [threading.Thread(target=user_session, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    for n in range(6):
+        history = agent.memory.get_recent_conversations(f"user{n}", limit=50)
+        assert len(history) == 10
+        assert all(turn["user_message"].startswith(f"msg {n}-") for turn in history)
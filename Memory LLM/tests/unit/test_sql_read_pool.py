@@ -0,0 +1,81 @@
+"""Read-connection pool tests for SQLMemoryManager."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from mem_llm.memory_db import SQLMemoryManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = SQLMemoryManager(db_path=str(tmp_path / "pool.db"), read_pool_size=2)
+    yield manager
+    manager.close()
+
+
+@pytest.mark.unit
+def test_reads_do_not_wait_for_the_write_lock(db):
+    db.add_interaction("alice", "hello", "hi there")
+    db.add_knowledge("billing", "Refund policy", "Refunds take 5 days.")
+
+    results = {}
+
+    def reader():
+        results["recent"] = db.get_recent_conversations("alice")
+        results["profile"] = db.get_user_profile("alice")
+        results["kb"] = db.search_knowledge("refund")
+        results["stats"] = db.get_statistics()
+
+    with db._lock:  # simulate a long-running write
+        thread = threading.Thread(target=reader)
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive(), "read blocked on the write lock"
+
+    assert results["recent"][0]["user_message"] == "hello"
+    assert results["profile"]["user_id"] == "alice"
+    assert results["kb"][0]["question"] == "Refund policy"
+    assert results["stats"]["total_interactions"] == 1
+
+
+@pytest.mark.unit
+def test_pooled_connections_are_read_only(db):
+    with db._read_pool.get_connection() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM conversations")
+
+
+@pytest.mark.unit
+def test_committed_writes_are_visible_to_other_threads(db):
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                db.add_interaction(f"user{n}", f"msg {i}", f"resp {i}")
+                latest = db.get_recent_conversations(f"user{n}", limit=1)
+                assert latest[0]["user_message"] == f"msg {i}"
+        except Exception as e:  # surfaced below; asserts in threads are lost
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert db.get_statistics()["total_interactions"] == 120
+
+
+@pytest.mark.unit
+def test_in_memory_database_reads_through_write_connection():
+    db = SQLMemoryManager(db_path=":memory:")
+    try:
+        assert db._read_pool is None
+        db.add_interaction("alice", "hello", "hi")
+        assert db.get_recent_conversations("alice")[0]["bot_response"] == "hi"
+    finally:
+        db.close()
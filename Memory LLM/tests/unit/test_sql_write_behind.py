@@ -0,0 +1,137 @@
+"""Write-behind group commit tests for SQLMemoryManager."""
+
+import threading
+
+import pytest
+
+from mem_llm.memory_db import SQLMemoryManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = SQLMemoryManager(db_path=str(tmp_path / "wb.db"), write_behind=True)
+    yield manager
+    manager.close()
+
+
+@pytest.mark.unit
+def test_reads_see_queued_writes(db):
+    """A read right after a queued write must observe it (read-your-writes)."""
+    assert db.add_interaction("alice", "hello", "hi there") is None
+    db.update_user_profile("alice", {"name": "Alice"})
+
+    recent = db.get_recent_conversations("alice", limit=5)
+    assert [c["user_message"] for c in recent] == ["hello"]
+    assert db.get_user_profile("alice")["name"] == "Alice"
+
+
+@pytest.mark.unit
+def test_knowledge_insert_returns_committed_id(db):
+    kb_id = db.add_knowledge("billing", "Refund policy", "Refunds take 5 days.")
+    assert kb_id > 0
+    assert db.search_knowledge("refund", limit=1)[0]["id"] == kb_id
+
+
+@pytest.mark.unit
+def test_concurrent_writers_are_batched_without_loss(db):
+    def worker(n):
+        for i in range(25):
+            db.add_interaction(f"user{n}", f"msg {i}", f"resp {i}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    db.flush()
+    stats = db.get_statistics()
+    assert stats["total_interactions"] == 200
+    assert stats["total_users"] == 8
+
+
+@pytest.mark.unit
+def test_one_bad_write_does_not_sink_its_batch(db):
+    good = db._enqueue_write("interaction", "alice", "kept", "yes", None, False)
+    bad = db._enqueue_write("interaction", "alice", None, "violates NOT NULL", None, False)
+    db.flush()
+
+    assert good.result() > 0
+    with pytest.raises(Exception):
+        bad.result()
+    assert [c["user_message"] for c in db.get_recent_conversations("alice")] == ["kept"]
+
+
+@pytest.mark.unit
+def test_queued_interaction_resolves_to_its_row_id(db):
+    future = db.queue_interaction("alice", "hello", "hi there")
+    episode_id = future.result(timeout=5)
+    assert isinstance(episode_id, int)
+    assert db.add_interaction("alice", "again", "hi") is None
+    assert db.queue_interaction("alice", "third", "hi").result(timeout=5) > episode_id
+
+
+@pytest.mark.unit
+def test_hierarchical_memory_gets_write_behind_episode_ids(tmp_path):
+    import json
+    import os
+
+    from mem_llm import MemAgent
+
+    class CategorizingLLM:
+        model = "stub"
+
+        def chat(self, messages, **kwargs):
+            if "return ONLY one JSON object" in messages[-1]["content"]:
+                return json.dumps({"category": "travel", "domain": "lifestyle"})
+            return "Noted!"
+
+    agent = MemAgent(
+        use_sql=True,
+        db_path=os.path.join(tmp_path, "agent.db"),
+        check_connection=False,
+        enable_hierarchical_memory=True,
+        enable_graph_memory=False,
+    )
+    if not agent.hierarchical_memory:
+        agent.close()
+        pytest.skip("hierarchical memory unavailable")
+    agent.memory.close()
+    agent.memory = SQLMemoryManager(db_path=os.path.join(tmp_path, "wb.db"), write_behind=True)
+    agent.llm = agent.hierarchical_memory.categorizer.llm = CategorizingLLM()
+    try:
+        agent.chat("I am flying to Izmir", user_id="ada")
+        traces = agent.hierarchical_memory.trace_layer.traces["ada"]
+        assert isinstance(traces[0]["original_episode_id"], int)
+    finally:
+        agent.close()
+
+
+@pytest.mark.unit
+def test_close_commits_pending_writes(tmp_path):
+    path = str(tmp_path / "close.db")
+    db = SQLMemoryManager(db_path=path, write_behind=True, write_batch_interval=1.0)
+    for i in range(10):
+        db.add_interaction("alice", f"m{i}", f"r{i}")
+    db.close()
+
+    reopened = SQLMemoryManager(db_path=path)
+    try:
+        assert len(reopened.get_recent_conversations("alice", limit=50)) == 10
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_interaction_keeps_existing_user_metadata(tmp_path):
+    """Recording a turn must not reset profile metadata written earlier."""
+    db = SQLMemoryManager(db_path=str(tmp_path / "meta.db"))
+    try:
+        db.add_user("alice", name="Alice", metadata={"tier": "gold"})
+        db.add_interaction("alice", "hello", "hi")
+        profile = db.get_user_profile("alice")
+        assert profile["name"] == "Alice"
+        assert '"tier": "gold"' in profile["metadata"]
+        assert profile["last_interaction"] is not None
+    finally:
+        db.close()
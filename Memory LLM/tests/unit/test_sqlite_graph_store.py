@@ -0,0 +1,163 @@
+"""Row-level SQLite persistence for the knowledge graph."""
+
+import json
+import sqlite3
+from datetime import datetime
+
+import networkx as nx
+import pytest
+
+from mem_llm.memory.graph import GraphStore, SQLiteGraphStore
+
+
+def edge_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM graph_edges").fetchone()[0]
+
+
+@pytest.mark.unit
+def test_round_trip_and_lazy_load(tmp_path):
+    path = str(tmp_path / "graph.db")
+    store = SQLiteGraphStore(path)
+    store.add_triplet("Alice", "knows", "Bob")
+    store.add_triplet("Bob", "lives_in", "Paris")
+    store.add_triplet("Carol", "likes", "Tea")
+    store.close()
+
+    reopened = SQLiteGraphStore(path)
+    try:
+        assert reopened.graph.number_of_nodes() == 0  # nothing read at startup
+        assert reopened.search("Alice") == [("Alice", "knows", "Bob")]
+        assert set(reopened.search("Alice", depth=2)) == {
+            ("Alice", "knows", "Bob"),
+            ("Bob", "lives_in", "Paris"),
+        }
+        assert not reopened.graph.has_node("Carol")
+        assert reopened.full_graph().number_of_edges() == 3
+        assert reopened.get_summary() == "Graph contains 5 entities and 3 relationships."
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_save_writes_only_changed_edges(tmp_path):
+    store = SQLiteGraphStore(str(tmp_path / "graph.db"))
+    try:
+        for i in range(50):
+            store.add_triplet(f"user{i}", "likes", f"topic{i}")
+        store.save()
+
+        statements = []
+        store.conn.set_trace_callback(statements.append)
+        store.add_triplet("user7", "likes", "topic7")
+        store.save()
+        store.conn.set_trace_callback(None)
+
+        upserts = [sql for sql in statements if "INSERT INTO graph_edges" in sql]
+        assert len(upserts) == 1 and "user7" in upserts[0]
+        (data,) = store.conn.execute(
+            "SELECT data FROM graph_edges WHERE source = 'user7'"
+        ).fetchone()
+        assert json.loads(data)["count"] == 2
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_temporal_updates_reach_unloaded_edges(tmp_path):
+    path = str(tmp_path / "graph.db")
+    store = SQLiteGraphStore(path)
+    store.add_triplet("User", "lives_in", "Istanbul", metadata={"valid_from": "2026-01-01"})
+    store.close()
+
+    store = SQLiteGraphStore(path)
+    store.add_triplet(
+        "User",
+        "lives_in",
+        "Ankara",
+        metadata={"valid_from": "2026-03-01", "supersedes": True},
+    )
+    store.close()
+
+    store = SQLiteGraphStore(path)
+    try:
+        assert store.search_current("User") == [("User", "lives_in", "Ankara")]
+        assert ("User", "lives_in", "Istanbul") in store.search_at_time(
+            "User", datetime(2026, 2, 1)
+        )
+    finally:
+        store.close()
+
+
+@pytest.mark.unit
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = GraphStore(str(tmp_path / "graph.json"))
+    legacy.add_triplet("A", "r", "B")
+    legacy.save()
+
+    path = str(tmp_path / "graph.db")
+    store = SQLiteGraphStore(path, import_path=legacy.persistence_path)
+    assert store.search("A") == [("A", "r", "B")]
+    store.clear()
+    store.close()
+
+    # The database exists now, so the JSON file is not imported again
+    reopened = SQLiteGraphStore(path, import_path=legacy.persistence_path)
+    try:
+        assert reopened.search("A") == []
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_snapshot_and_compact(tmp_path):
+    store = SQLiteGraphStore(str(tmp_path / "graph.db"))
+    try:
+        store.add_triplet("A", "r", "B")
+        store.conn.execute("INSERT INTO graph_nodes (name) VALUES ('orphan')")
+
+        store.snapshot(str(tmp_path / "snapshot.db"))
+        assert edge_rows(tmp_path / "snapshot.db") == 1
+
+        store.compact()
+        names = {row[0] for row in store.conn.execute("SELECT name FROM graph_nodes")}
+        assert names == {"A", "B"}
+    finally:
+        store.close()
+
+    snapshot = SQLiteGraphStore(str(tmp_path / "snapshot.db"))
+    try:
+        assert isinstance(snapshot.full_graph(), nx.DiGraph)
+        assert snapshot.search("B") == [("A", "r", "B")]
+    finally:
+        snapshot.close()
+
+
+@pytest.mark.unit
+def test_json_save_is_atomic(tmp_path):
+    path = tmp_path / "graph.json"
+    store = GraphStore(str(path))
+    store.add_triplet("A", "r", "B")
+    store.save()
+
+    assert GraphStore(str(path)).graph.has_edge("A", "B")
+    assert not (tmp_path / "graph.json.tmp").exists()
+
+
+@pytest.mark.unit
+def test_aliases_are_stored_and_resolved_lazily(tmp_path):
+    path = str(tmp_path / "graph.db")
+    store = SQLiteGraphStore(path)
+    store.add_triplet("User", "lives_in", "New York")
+    store.add_triplet("the user", "likes", "Tea")
+    store.add_alias("NYC", "New York")
+    store.close()
+
+    reopened = SQLiteGraphStore(path)
+    try:
+        assert reopened.resolve("user in york") == ["User", "New York"]
+        assert reopened.search("nyc") == [("User", "lives_in", "New York")]
+        assert len(reopened.search("USER")) == 2
+        assert reopened.full_graph().number_of_nodes() == 3
+    finally:
+        reopened.close()
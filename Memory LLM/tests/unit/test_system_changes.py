@@ -24,18 +24,41 @@ def test_agent_store_lru_eviction():
     store.set("user1", object())
     store.set("user2", object())
 
-    # Force LRU order: user1 oldest, user2 newest.
-    base_time = store._entries["user1"]["last_access"]
-    store._entries["user1"]["last_access"] = base_time - 10
-    store._entries["user2"]["last_access"] = base_time
-    store._lru["user1"] = store._entries["user1"]["last_access"]
-    store._lru["user2"] = store._entries["user2"]["last_access"]
+    # Touch user2 so user1 is the least recently used entry.
+    assert store.get("user2") is not None
 
     store.set("user3", object())
 
     assert store.get("user1") is None
     assert store.get("user2") is not None
     assert store.get("user3") is not None
+    stats = store.stats()
+    assert (stats["evictions"], stats["hits"], stats["misses"]) == (1, 3, 1)
+
+
+def test_agent_store_closes_removed_agents():
+    pytest.importorskip("fastapi")
+    from mem_llm.api_server import AgentStore
+
+    class Agent:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    store = AgentStore(ttl_seconds=3600, max_size=1)
+    first, second, third = Agent(), Agent(), Agent()
+    store.set("user1", first)
+    store.set("user2", second)
+    assert first.closed and not second.closed
+
+    released = []
+    store.on_evict = lambda user_id, agent: released.append(user_id)
+    store.delete("user2")
+    store.set("user3", third)
+    store.close()
+    assert released == ["user2", "user3"]
+    assert store.size() == 0
 
 
 def test_agent_store_ttl(monkeypatch):
@@ -51,7 +74,9 @@ def test_agent_store_ttl(monkeypatch):
         return base_time + 11
 
     monkeypatch.setattr("mem_llm.api_server.time.time", fake_time)
+    assert store.sweep() == 1
     assert store.get("user1") is None
+    assert store.stats()["expirations"] == 1
 
 
 def test_trace_layer_ttl_eviction():
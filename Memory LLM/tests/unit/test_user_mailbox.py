@@ -0,0 +1,68 @@
+"""Per-user turn ordering with bounded cross-user concurrency."""
+
+import asyncio
+
+import pytest
+
+from mem_llm.mailbox import UserMailbox
+
+
+async def run_turn(mailbox, user_id, label, log, delay=0.05):
+    async with mailbox.turn(user_id):
+        log.append(("start", label))
+        await asyncio.sleep(delay)
+        log.append(("end", label))
+
+
+@pytest.mark.unit
+async def test_same_user_turns_run_in_order():
+    mailbox = UserMailbox(max_concurrent=4)
+    log = []
+    tasks = [asyncio.create_task(run_turn(mailbox, "ada", i, log)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    assert mailbox.queue_depth("ada") == 2
+    await asyncio.gather(*tasks)
+
+    assert log == [(event, i) for i in range(3) for event in ("start", "end")]
+    assert mailbox.stats()["max_wait_ms"] >= 90
+    assert mailbox.stats()["active_users"] == 0
+
+
+@pytest.mark.unit
+async def test_users_run_concurrently_up_to_the_limit():
+    mailbox = UserMailbox(max_concurrent=2)
+    log = []
+    tasks = [asyncio.create_task(run_turn(mailbox, user, user, log)) for user in ("a", "b", "c")]
+    await asyncio.sleep(0.01)
+    stats = mailbox.stats()
+    assert (stats["running"], stats["queue_depth"]) == (2, 1)
+    await asyncio.gather(*tasks)
+
+    assert log[:2] == [("start", "a"), ("start", "b")]
+    assert mailbox.stats()["processed"] == 3
+
+
+@pytest.mark.unit
+async def test_waiting_user_does_not_hold_a_worker():
+    mailbox = UserMailbox(max_concurrent=1)
+    log = []
+    first = asyncio.create_task(run_turn(mailbox, "ada", "ada-1", log))
+    second = asyncio.create_task(run_turn(mailbox, "ada", "ada-2", log))
+    await asyncio.sleep(0.01)
+    other = asyncio.create_task(run_turn(mailbox, "bob", "bob", log, delay=0))
+    await asyncio.gather(first, second, other)
+
+    # ada-2 waits for ada-1 outside the worker pool, so bob gets the free worker
+    assert [label for event, label in log if event == "start"] == ["ada-1", "bob", "ada-2"]
+
+
+@pytest.mark.unit
+async def test_failed_turn_releases_the_user():
+    mailbox = UserMailbox()
+    with pytest.raises(RuntimeError):
+        async with mailbox.turn("ada"):
+            raise RuntimeError("boom")
+
+    async with mailbox.turn("ada"):
+        assert mailbox.stats()["running"] == 1
+    assert mailbox.stats()["running"] == 0
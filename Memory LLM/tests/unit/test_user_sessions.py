@@ -0,0 +1,149 @@
+"""Per-user sessions on one shared MemAgent."""
+
+import os
+
+import pytest
+
+
+class EchoLLM:
+    model = "stub"
+
+    def chat(self, messages, **kwargs):
+        return "echo: " + messages[-1]["content"][-20:]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    from mem_llm import MemAgent
+
+    agent = MemAgent(
+        use_sql=True,
+        db_path=os.path.join(tmp_path, "agent.db"),
+        check_connection=False,
+        load_knowledge_base=False,
+    )
+    agent.llm = EchoLLM()
+    yield agent
+    agent.close()
+
+
+@pytest.mark.unit
+def test_sessions_keep_users_apart(engine):
+    ada, bob = engine.session("ada"), engine.session("bob")
+    ada.chat("I am Ada")
+    bob.chat("I am Bob")
+    ada.chat("Still Ada")
+
+    assert ada.memory is bob.memory is engine.memory
+    ada_turns = [t["user_message"] for t in engine.memory.get_recent_conversations("ada", 5)]
+    bob_turns = [t["user_message"] for t in engine.memory.get_recent_conversations("bob", 5)]
+    assert sorted(ada_turns) == ["I am Ada", "Still Ada"]
+    assert bob_turns == ["I am Bob"]
+    assert bob.get_info()["current_user"] == "bob"
+    assert [t["user_message"] for t in bob.search_history("Bob")] == ["I am Bob"]
+
+
+@pytest.mark.unit
+async def test_async_session_chat_uses_its_user(engine):
+    session = engine.session("carol")
+    engine.set_user("someone_else")
+
+    assert (await session.achat("hello")).startswith("echo:")
+    assert engine.memory.get_recent_conversations("carol", 5)[0]["user_message"] == "hello"
+    with pytest.raises(ValueError):
+        session.set_user("mallory")
+
+
+@pytest.mark.unit
+def test_api_users_share_one_engine(tmp_path):
+    pytest.importorskip("fastapi")
+    from mem_llm import api_server
+
+    config = {
+        "db_path": os.path.join(tmp_path, "api.db"),
+        "check_connection": False,
+        "load_knowledge_base": False,
+        "enable_graph_memory": False,
+    }
+    store = api_server._get_agent_store()
+    try:
+        ada = api_server.get_or_create_agent("session_ada", config)
+        bob = api_server.get_or_create_agent("session_bob", config)
+        assert ada.engine is bob.engine
+        assert api_server.get_or_create_agent("session_ada") is ada
+    finally:
+        store.delete("session_ada")
+        store.delete("session_bob")
+        api_server.close_engines()
+
+
+@pytest.mark.unit
+def test_session_only_exposes_shared_engine_attributes(engine):
+    session = engine.session("ada")
+    assert session.memory is engine.memory
+    assert session.add_knowledge == engine.add_knowledge
+    # Metrics mix every user's answers, so they stay on the engine
+    with pytest.raises(AttributeError):
+        session.get_latest_response_metric()
+
+    released = []
+    session = engine.session("ada")
+    session._on_close = released.append
+    session.close()
+    session.close()
+    assert released == [session]
+
+
+@pytest.mark.unit
+def test_engines_close_when_their_last_session_goes(tmp_path):
+    pytest.importorskip("fastapi")
+    from mem_llm import api_server
+
+    config = {
+        "db_path": os.path.join(tmp_path, "custom.db"),
+        "check_connection": False,
+        "load_knowledge_base": False,
+        "enable_graph_memory": False,
+    }
+    store = api_server._get_agent_store()
+    try:
+        ada = api_server.get_or_create_agent("custom_ada", config)
+        api_server.get_or_create_agent("custom_bob", config)
+        engines = len(api_server._engines)
+
+        store.delete("custom_ada")
+        assert len(api_server._engines) == engines, "bob still uses the engine"
+        store.delete("custom_bob")
+        assert len(api_server._engines) == engines - 1
+        assert ada.engine not in [e["engine"] for e in api_server._engines.values()]
+    finally:
+        store.delete("custom_ada")
+        store.delete("custom_bob")
+        api_server.close_engines()
+
+
+@pytest.mark.unit
+async def test_engine_stays_open_while_a_turn_runs(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    from mem_llm import api_server
+
+    config = {
+        "db_path": os.path.join(tmp_path, "turn.db"),
+        "check_connection": False,
+        "load_knowledge_base": False,
+        "enable_graph_memory": False,
+    }
+    store = api_server._get_agent_store()
+    ada = api_server.get_or_create_agent("turn_ada", config)
+    closed = []
+    monkeypatch.setattr(ada.engine, "close", lambda: closed.append(True))
+    try:
+        async with api_server._agent_turn("turn_ada") as agent:
+            assert agent is ada
+            store.delete("turn_ada")  # evicted mid-turn
+            assert not closed, "engine closed under a running turn"
+        assert closed == [True]
+        assert ada.engine not in [e["engine"] for e in api_server._engines.values()]
+    finally:
+        store.delete("turn_ada")
+        api_server.close_engines()
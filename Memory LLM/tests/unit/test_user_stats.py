@@ -0,0 +1,98 @@
+"""Per-user aggregate counters (user_stats) maintained by SQLMemoryManager."""
+
+import sqlite3
+
+import pytest
+
+from mem_llm.memory_db import SQLMemoryManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = SQLMemoryManager(db_path=str(tmp_path / "stats.db"))
+    yield manager
+    manager.close()
+
+
+@pytest.mark.unit
+def test_counters_follow_interactions(db):
+    db.add_interaction("alice", "hello", "hi there", {"used_kb": True})
+    db.add_interaction("alice", "thanks", "welcome", resolved=True)
+    db.add_interaction("alice", "bye", "see you", "not json")
+    db.add_interaction("bob", "hey", "yo")
+
+    stats = db.get_user_stats("alice")
+    assert stats["turn_count"] == 3
+    assert stats["total_chars"] == len("hellohi therethankswelcomebyesee you")
+    assert stats["resolved_count"] == 1
+    assert stats["kb_hit_count"] == 1
+    assert stats["first_timestamp"] <= stats["last_timestamp"]
+    assert db.count_conversations("alice") == 3
+    assert db.get_user_stats("nobody") is None
+
+    totals = db.get_statistics()
+    assert totals["total_interactions"] == 4
+    assert totals["unresolved_issues"] == 3
+
+
+@pytest.mark.unit
+def test_clear_memory_resets_counters(db):
+    db.add_interaction("alice", "hello", "hi")
+    db.add_interaction("bob", "hey", "yo")
+
+    db.clear_memory("alice")
+
+    assert db.get_user_stats("alice") is None
+    assert db.count_conversations("alice") == 0
+    assert db.get_statistics()["total_interactions"] == 1
+
+
+@pytest.mark.unit
+def test_marking_resolved_updates_counters(db):
+    conv_id = db.add_interaction("alice", "broken", "try restarting")
+    with db._lock:
+        db.conn.execute("UPDATE conversations SET resolved = 1 WHERE id = ?", (conv_id,))
+
+    stats = db.get_user_stats("alice")
+    assert stats["turn_count"] == 1
+    assert stats["resolved_count"] == 1
+
+
+@pytest.mark.unit
+def test_counters_are_backfilled_for_existing_databases(tmp_path):
+    path = str(tmp_path / "old.db")
+    db = SQLMemoryManager(db_path=path)
+    for i in range(5):
+        db.add_interaction("alice", f"msg {i}", f"resp {i}", {"used_kb": i % 2 == 0})
+    db.close()
+
+    # Simulate a database written before user_stats existed
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        DROP TRIGGER user_stats_ai;
+        DROP TRIGGER user_stats_ad;
+        DROP TRIGGER user_stats_au;
+        DROP TABLE user_stats;
+    """
+    )
+    conn.close()
+
+    reopened = SQLMemoryManager(db_path=path)
+    try:
+        stats = reopened.get_user_stats("alice")
+        assert stats["turn_count"] == 5
+        assert stats["kb_hit_count"] == 3
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_counters_in_write_behind_mode(tmp_path):
+    db = SQLMemoryManager(db_path=str(tmp_path / "wb.db"), write_behind=True)
+    try:
+        for i in range(20):
+            db.add_interaction("alice", f"msg {i}", f"resp {i}")
+        assert db.count_conversations("alice") == 20
+    finally:
+        db.close()
@@ -0,0 +1,238 @@
+"""Incremental knowledge base -> vector store sync driven by the change log."""
+
+import time
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from mem_llm.memory_db import SQLMemoryManager  # noqa: E402
+
+VOCAB = ["refund", "shipping", "password", "invoice", "warranty", "delivery"]
+
+
+class CountingEmbedder:
+    """Bag-of-words embedding that records every text it encodes."""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts):
+        self.texts.extend(texts)
+        return [[float(text.lower().count(word)) + 0.01 for word in VOCAB] for text in texts]
+
+
+def open_db(tmp_path, embedder, **kwargs):
+    return SQLMemoryManager(
+        str(tmp_path / "memories.db"),
+        enable_vector_search=True,
+        vector_store_type="numpy",
+        vector_store_options={"embedding_function": embedder},
+        **kwargs,
+    )
+
+
+def pending(db):
+    return db.conn.execute("SELECT COUNT(*) FROM kb_vector_changes").fetchone()[0]
+
+
+@pytest.mark.unit
+def test_new_entries_are_pushed_and_the_log_drained(tmp_path):
+    embedder = CountingEmbedder()
+    db = open_db(tmp_path, embedder)
+    try:
+        kb_id = db.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+
+        assert db.vector_store.search("refund", limit=1)[0]["id"] == str(kb_id)
+        assert pending(db) == 0
+        assert db.sync_vector_store() == {"upserted": 0, "deleted": 0}
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_updates_and_deactivations_reach_the_store(tmp_path):
+    db = open_db(tmp_path, CountingEmbedder())
+    try:
+        first = db.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+        second = db.add_knowledge("orders", "shipping time?", "Two days")
+
+        db.conn.execute(
+            "UPDATE knowledge_base SET answer = 'password reset link' WHERE id = ?", (second,)
+        )
+        db.conn.execute("UPDATE knowledge_base SET active = 0 WHERE id = ?", (first,))
+        assert db.sync_vector_store() == {"upserted": 1, "deleted": 1}
+
+        assert [r["id"] for r in db.vector_store.search("refund", limit=5)] == [str(second)]
+        assert db.vector_store.search("password", limit=1)[0]["metadata"]["answer"] == (
+            "password reset link"
+        )
+
+        db.conn.execute("DELETE FROM knowledge_base WHERE id = ?", (second,))
+        assert db.sync_vector_store() == {"upserted": 0, "deleted": 1}
+        assert db.vector_store.get_stats()["total_documents"] == 0
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_restart_does_not_re_embed_synced_entries(tmp_path):
+    embedder = CountingEmbedder()
+    db = open_db(tmp_path, embedder)
+    for i in range(20):
+        db.add_knowledge("faq", f"question {i}", f"invoice answer {i}")
+    db.close()
+    encoded = len(embedder.texts)
+
+    reopened = open_db(tmp_path, embedder)
+    try:
+        assert reopened.sync_vector_store() == {"upserted": 0, "deleted": 0}
+        assert len(embedder.texts) == encoded
+        assert reopened.vector_store.get_stats()["total_documents"] == 20
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_changes_are_batched(tmp_path):
+    embedder = CountingEmbedder()
+    db = open_db(tmp_path, embedder)
+    try:
+        db.conn.executemany(
+            "INSERT INTO knowledge_base (category, question, answer) VALUES ('faq', ?, ?)",
+            [(f"question {i}", f"warranty answer {i}") for i in range(25)],
+        )
+        calls = []
+        add = db.vector_store.add_documents
+        db.vector_store.add_documents = lambda docs: calls.append(len(docs)) or add(docs)
+
+        assert db.sync_vector_store(batch_size=10) == {"upserted": 25, "deleted": 0}
+        assert calls == [10, 10, 5]
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_failed_sync_keeps_changes_for_retry(tmp_path):
+    db = open_db(tmp_path, CountingEmbedder())
+    try:
+        add = db.vector_store.add_documents
+
+        def broken(docs):
+            raise RuntimeError("embedding model unavailable")
+
+        db.vector_store.add_documents = broken
+        db.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+        assert pending(db) == 1
+
+        db.vector_store.add_documents = add
+        assert db.sync_vector_store()["upserted"] == 1
+        assert pending(db) == 0
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_background_sync_thread(tmp_path):
+    db = open_db(tmp_path, CountingEmbedder(), background_vector_sync=True)
+    try:
+        kb_id = db.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+        deadline = time.time() + 5
+        while pending(db) and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert db.vector_store.search("refund", limit=1)[0]["id"] == str(kb_id)
+    finally:
+        db.close()
+    assert db._vector_sync_thread is None
+
+
+@pytest.mark.unit
+def test_empty_vector_store_is_rebuilt_on_startup(tmp_path):
+    db = open_db(tmp_path, CountingEmbedder())
+    db.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+    db.vector_store.delete_collection()
+    db.close()
+
+    reopened = open_db(tmp_path, CountingEmbedder())
+    try:
+        assert reopened.vector_store.get_stats()["total_documents"] == 1
+    finally:
+        reopened.close()
+
+
+@pytest.mark.unit
+def test_existing_knowledge_base_is_queued_once(tmp_path):
+    db = SQLMemoryManager(str(tmp_path / "memories.db"))
+    db.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+    db.add_knowledge("orders", "shipping time?", "Two days")
+    # A database created before the change log existed
+    db.conn.execute("DROP TABLE kb_vector_changes")
+    db.close()
+
+    db = SQLMemoryManager(str(tmp_path / "memories.db"))
+    try:
+        assert pending(db) == 2
+    finally:
+        db.close()
+
+
+@pytest.mark.unit
+def test_every_worker_sharing_the_database_sees_every_change(tmp_path):
+    first = open_db(tmp_path, CountingEmbedder(), worker_id="0")
+    second = open_db(tmp_path, CountingEmbedder(), worker_id="1")
+    try:
+        kb_id = first.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+        assert pending(first) == 1, "kept until the second worker has synced"
+
+        assert second.sync_vector_store() == {"upserted": 1, "deleted": 0}
+        assert second.vector_store.search("refund", limit=1)[0]["id"] == str(kb_id)
+        assert first.vector_store is not second.vector_store
+        assert pending(first) == 0
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.unit
+def test_stale_worker_stops_holding_the_log_and_resyncs_on_return(tmp_path):
+    first = open_db(tmp_path, CountingEmbedder(), worker_id="0")
+    second = open_db(tmp_path, CountingEmbedder(), worker_id="1")
+    try:
+        first.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+        second.sync_vector_store()
+        # The second worker goes quiet for longer than the TTL
+        second.conn.execute(
+            "UPDATE kb_vector_sync_state SET last_seen = ? WHERE consumer = ?",
+            (time.time() - SQLMemoryManager.VECTOR_CONSUMER_TTL - 1, second.vector_consumer),
+        )
+        kb_id = first.add_knowledge("orders", "shipping time?", "Two days")
+
+        consumers = first.conn.execute("SELECT consumer FROM kb_vector_sync_state").fetchall()
+        assert [row[0] for row in consumers] == [first.vector_consumer]
+        assert pending(first) == 0
+
+        assert second.sync_vector_store() == {"upserted": 2, "deleted": 0}
+        assert second.vector_store.search("shipping", limit=1)[0]["id"] == str(kb_id)
+        assert second.vector_store.get_stats()["total_documents"] == 2
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.unit
+def test_unregistered_worker_releases_the_log(tmp_path):
+    first = open_db(tmp_path, CountingEmbedder(), worker_id="0")
+    second = open_db(tmp_path, CountingEmbedder(), worker_id="1")
+    try:
+        second.sync_vector_store()
+        first.add_knowledge("billing", "refund policy?", "Refunds within 14 days")
+        assert pending(first) == 1
+
+        second.unregister_vector_consumer()
+        assert pending(first) == 0
+        first.add_knowledge("orders", "shipping time?", "Two days")
+        assert pending(first) == 0
+    finally:
+        first.close()
+        second.close()